@@ -21,9 +21,13 @@ This module is not part of the public API surface.
 from __future__ import absolute_import
 
 import calendar
+import collections
+from concurrent.futures import ThreadPoolExecutor
 import datetime
+import itertools
 import os
 import re
+import threading
 from threading import local as Local
 
 import google.auth
@@ -40,6 +44,7 @@ except ImportError:  # pragma: NO COVER
 import httplib2
 import six
 from six.moves import http_client
+from six.moves import queue
 
 
 _NOW = datetime.datetime.utcnow  # To be replaced by tests.
@@ -66,6 +71,12 @@ _GCLOUD_CONFIG_FILE = os.path.join(
     'gcloud', 'configurations', 'config_default')
 _GCLOUD_CONFIG_SECTION = 'core'
 _GCLOUD_CONFIG_KEY = 'project'
+_DEFAULT_MAX_WORKERS = 8
+"""Default number of worker threads used for concurrent requests."""
+_QUEUED_ITEMS = 2
+"""Number of items each worker of :func:`_merge_concurrently` buffers."""
+_PUT_TIMEOUT = 0.1
+_DONE = object()
 
 
 class _LocalStack(Local):
@@ -512,6 +523,197 @@ def _name_from_project_path(path, project, template):
     return match.group('name')
 
 
+def _chunked(iterable, size):
+    """Split an iterable into lists of at most ``size`` items.
+
+    :type iterable: iterable
+    :param iterable: The items to split; may be an unbounded generator.
+
+    :type size: int
+    :param size: The maximum number of items in each chunk.
+
+    :rtype: iterator
+    :returns: An iterator of non-empty lists.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _map_concurrently(func, iterable, max_workers=None):
+    """Apply a function to each item using a pool of worker threads.
+
+    Results are yielded in the same order as ``iterable``.  At most
+    ``2 * max_workers`` items are in flight at any time, so ``iterable``
+    is consumed lazily and may be arbitrarily long.
+
+    :type func: callable
+    :param func: Takes a single item and returns its result.  Exceptions
+                 raised by ``func`` are re-raised when the corresponding
+                 result is reached.
+
+    :type iterable: iterable
+    :param iterable: The items to process.
+
+    :type max_workers: int
+    :param max_workers: (Optional) The number of worker threads.  Defaults
+                        to ``_DEFAULT_MAX_WORKERS``.  If ``1``, items are
+                        processed serially in the calling thread.
+
+    :rtype: iterator
+    :returns: The result of ``func`` for each item.
+    """
+    if max_workers is None:
+        max_workers = _DEFAULT_MAX_WORKERS
+
+    if max_workers <= 1:
+        for item in iterable:
+            yield func(item)
+        return
+
+    pending = collections.deque()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for item in iterable:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # Only reached early if the consumer stopped iterating or a result
+        # raised; don't start work nobody will collect.
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def _merge_concurrently(iterables, ordered=False, max_workers=None):
+    """Iterate over several iterables concurrently, merging their items.
+
+    Each iterable is consumed in a worker thread, which waits once a few
+    of its items are buffered, so the iterables may be arbitrarily long.
+    Iterables not yet started are abandoned if the consumer stops.
+
+    :type iterables: list
+    :param iterables: The iterables to consume, e.g. generators of pages.
+
+    :type ordered: bool
+    :param ordered: (Optional) If true, all items of an iterable are
+                    yielded before those of the next iterable.  If false
+                    (the default), items are yielded as they arrive.
+
+    :type max_workers: int
+    :param max_workers: (Optional) The maximum number of iterables consumed
+                        concurrently.  Defaults to ``_DEFAULT_MAX_WORKERS``.
+
+    :rtype: :class:`~types.GeneratorType`
+    :returns: A generator of the items of the iterables.
+    :raises: Any error raised while consuming an iterable, once reached.
+    """
+    if max_workers is None:
+        max_workers = _DEFAULT_MAX_WORKERS
+    stop = threading.Event()
+    if ordered:
+        queues = [queue.Queue(_QUEUED_ITEMS) for _ in iterables]
+    else:
+        shared = queue.Queue(_QUEUED_ITEMS * max_workers)
+        queues = [shared] * len(iterables)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = [
+        executor.submit(_consume_into, iterable, items, stop)
+        for iterable, items in zip(iterables, queues)]
+    try:
+        if ordered:
+            for items in queues:
+                for item in _drain(items, 1):
+                    yield item
+        else:
+            for item in _drain(shared, len(iterables)):
+                yield item
+    finally:
+        stop.set()
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def _drain(items, num_producers):
+    """Yield items from a queue until ``num_producers`` workers are done.
+
+    :type items: :class:`~six.moves.queue.Queue`
+    :param items: The queue the workers put their items into.
+
+    :type num_producers: int
+    :param num_producers: The number of workers putting into the queue.
+
+    :rtype: :class:`~types.GeneratorType`
+    :returns: A generator of the items.
+    :raises: Any error raised by a worker.
+    """
+    while num_producers:
+        item, error = items.get()
+        if error is not None:
+            raise error
+        if item is _DONE:
+            num_producers -= 1
+        else:
+            yield item
+
+
+def _consume_into(iterable, items, stop):
+    """Consume an iterable, putting each of its items into a queue.
+
+    Puts ``(item, None)`` for each item, then ``(_DONE, None)`` once the
+    iterable is exhausted, or ``(None, error)`` if it raises.
+
+    :type iterable: iterable
+    :param iterable: The iterable to consume.
+
+    :type items: :class:`~six.moves.queue.Queue`
+    :param items: The queue to put the items into.
+
+    :type stop: :class:`threading.Event`
+    :param stop: Set when the consumer has stopped reading the queue.
+    """
+    try:
+        for item in iterable:
+            if not _put(items, (item, None), stop):
+                return
+    except Exception as exc:  # pylint: disable=broad-except
+        _put(items, (None, exc), stop)
+    else:
+        _put(items, (_DONE, None), stop)
+
+
+def _put(items, item, stop):
+    """Put an item into a bounded queue unless the consumer has stopped.
+
+    :type items: :class:`~six.moves.queue.Queue`
+    :param items: The queue.
+
+    :type item: tuple
+    :param item: The item to put.
+
+    :type stop: :class:`threading.Event`
+    :param stop: Set when the consumer has stopped reading the queue.
+
+    :rtype: bool
+    :returns: Whether the item was put.
+    """
+    while not stop.is_set():
+        try:
+            items.put(item, timeout=_PUT_TIMEOUT)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
 def make_secure_channel(credentials, user_agent, host, extra_options=()):
     """Makes a secure channel for an RPC service.
 
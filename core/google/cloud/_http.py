@@ -16,6 +16,8 @@
 
 import json
 from pkg_resources import get_distribution
+import threading
+
 import six
 from six.moves.urllib.parse import urlencode
 
@@ -77,8 +79,16 @@ class Connection(object):
     Needs to be set by subclasses.
     """
 
+    _HTTP_PER_THREAD = False
+    """Whether each thread gets its own HTTP object, if none was passed.
+
+    Set by subclasses sending requests from several threads at once, since
+    :class:`httplib2.Http` is not thread-safe.
+    """
+
     def __init__(self, credentials=None, http=None):
         self._http = http
+        self._local = threading.local()
         self._credentials = google.auth.credentials.with_scopes_if_required(
             credentials, self.SCOPE)
 
@@ -96,16 +106,32 @@ class Connection(object):
     def http(self):
         """A getter for the HTTP transport used in talking to the API.
 
+        If :attr:`_HTTP_PER_THREAD` is set, and no ``http`` object was passed
+        to the constructor, a separate transport is created (lazily) for
+        each thread.
+
         :rtype: :class:`httplib2.Http`
         :returns: A Http object used to transport data.
         """
-        if self._http is None:
-            if self._credentials:
-                self._http = google_auth_httplib2.AuthorizedHttp(
-                    self._credentials)
-            else:
-                self._http = httplib2.Http()
-        return self._http
+        if self._http is not None:
+            return self._http
+        if not self._HTTP_PER_THREAD:
+            self._http = self._make_http()
+            return self._http
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._local.http = self._make_http()
+        return http
+
+    def _make_http(self):
+        """Create an HTTP transport, authorized with the credentials if any.
+
+        :rtype: :class:`httplib2.Http`
+        :returns: A new Http object.
+        """
+        if self._credentials:
+            return google_auth_httplib2.AuthorizedHttp(self._credentials)
+        return httplib2.Http()
 
 
 class JSONConnection(Connection):
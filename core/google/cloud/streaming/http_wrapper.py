@@ -355,7 +355,7 @@ def _make_api_request_no_retry(http, http_request, redirections=_REDIRECTIONS):
 
 
 def make_api_request(http, http_request, retries=7,
-                     redirections=_REDIRECTIONS):
+                     redirections=_REDIRECTIONS, retry_callback=None):
     """Send an HTTP request via the given http, performing error/retry handling.
 
     :type http: :class:`httplib2.Http`
@@ -371,6 +371,10 @@ def make_api_request(http, http_request, retries=7,
     :type redirections: int
     :param redirections: Number of redirects to follow.
 
+    :type retry_callback: callable
+    :param retry_callback: (Optional) Called with the exception before each
+                           retry.
+
     :rtype: :class:`Response`
     :returns: an object representing the server's response.
 
@@ -389,6 +393,8 @@ def make_api_request(http, http_request, retries=7,
             retry_after = getattr(exc, 'retry_after', None)
             if retry_after is None:
                 retry_after = calculate_wait_for_retry(retry)
+            if retry_callback is not None:
+                retry_callback(exc)
 
             _reset_http_connections(http)
             logging.debug('Retrying request to url %s after exception %s',
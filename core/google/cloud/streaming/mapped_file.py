@@ -0,0 +1,199 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Memory-mapped file stream, read without copying.
+
+Uploads read from a :class:`MappedFile` send views of the mapping as
+request bodies: the kernel copies the pages straight to the socket, and
+no chunk is ever copied into a Python bytes object.
+"""
+
+import hashlib
+import mmap
+import os
+
+import six
+
+
+class MappedFile(object):
+    """Read-only stream over a memory-mapped region of a file.
+
+    :meth:`read` returns :class:`memoryview` objects (copies of the region
+    on Python 2, whose :mod:`mmap` lacks the buffer protocol).  The MD5 hash
+    of the region is updated as the views are handed out, so that it is
+    computed in the same pass as the data is sent.
+
+    Positions (for :meth:`tell` and :meth:`seek`) are relative to the start
+    of the region.
+
+    :type file_obj: file
+    :param file_obj: A file open for reading in binary mode.  The region
+                     starts at its current position.
+
+    :type size: int
+    :param size: (Optional) The size of the region.  Defaults to the rest of
+                 the file.
+
+    :raises: :exc:`ValueError` if the region is empty or extends past the
+             end of the file; :exc:`EnvironmentError` if the file can't be
+             mapped.
+    """
+
+    def __init__(self, file_obj, size=None):
+        start = file_obj.tell()
+        file_size = os.fstat(file_obj.fileno()).st_size
+        if size is None:
+            size = file_size - start
+        if size <= 0 or start + size > file_size:
+            raise ValueError('Cannot map %r bytes at offset %d of a %d byte '
+                             'file' % (size, start, file_size))
+        self._map = mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ)
+        self._start = start
+        self._size = size
+        self._position = 0
+        self._md5 = hashlib.md5()
+        self._hashed = 0
+
+    def __len__(self):
+        return self._size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def closed(self):
+        """Whether :meth:`close` has been called.
+
+        :rtype: bool
+        :returns: True if the mapping was released.
+        """
+        return self._map is None
+
+    def _view(self, start, end):
+        """View a part of the region.
+
+        :type start: int
+        :param start: The first byte, relative to the region.
+
+        :type end: int
+        :param end: The byte after the last, relative to the region.
+
+        :rtype: :class:`memoryview`
+        :returns: The bytes, without copying them.
+        """
+        start += self._start
+        end += self._start
+        if six.PY2:  # pragma: NO COVER  Python2
+            return self._map[start:end]
+        return memoryview(self._map)[start:end]
+
+    def _hash_to(self, end):
+        """Add the bytes up to ``end`` to the MD5 hash, if not yet added.
+
+        :type end: int
+        :param end: The byte after the last to hash.
+        """
+        if end > self._hashed:
+            self._md5.update(self._view(self._hashed, end))
+            self._hashed = end
+
+    def read(self, size=None):
+        """Read bytes from the region, without copying them.
+
+        :type size: int
+        :param size: (Optional) The maximum number of bytes to read; if not
+                     passed or negative, read the rest of the region.
+
+        :rtype: :class:`memoryview`
+        :returns: A view of the bytes read, empty at the end of the region.
+        :raises: :exc:`ValueError` if the stream is closed.
+        """
+        if self.closed:
+            raise ValueError('I/O operation on closed MappedFile')
+        end = self._size
+        if size is not None and size >= 0:
+            end = min(end, self._position + size)
+        start, self._position = self._position, max(self._position, end)
+        self._hash_to(self._position)
+        return self._view(start, self._position)
+
+    def tell(self):
+        """Current position, relative to the start of the region.
+
+        :rtype: int
+        :returns: The position of the next byte to read.
+        """
+        return self._position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        """Move to a position, clamped to the region.
+
+        :type offset: int
+        :param offset: The offset, relative to ``whence``.
+
+        :type whence: int
+        :param whence: (Optional) One of :data:`os.SEEK_SET`,
+                       :data:`os.SEEK_CUR` and :data:`os.SEEK_END`.
+
+        :rtype: int
+        :returns: The new position.
+        :raises: :exc:`ValueError` if ``whence`` is invalid.
+        """
+        if whence == os.SEEK_SET:
+            base = 0
+        elif whence == os.SEEK_CUR:
+            base = self._position
+        elif whence == os.SEEK_END:
+            base = self._size
+        else:
+            raise ValueError('Invalid whence: %r' % (whence,))
+        self._position = min(max(0, base + offset), self._size)
+        return self._position
+
+    @staticmethod
+    def seekable():
+        """Mapped files are always seekable.
+
+        :rtype: bool
+        :returns: True.
+        """
+        return True
+
+    def md5_digest(self):
+        """MD5 hash of the whole region.
+
+        Bytes which were not read (e.g. skipped by seeking) are hashed now.
+
+        :rtype: bytes
+        :returns: The binary digest.
+        """
+        self._hash_to(self._size)
+        return self._md5.digest()
+
+    def close(self):
+        """Release the mapping.
+
+        If views returned by :meth:`read` are still in use, the memory is
+        unmapped once they are released.
+        """
+        if self._map is None:
+            return
+        try:
+            self._map.close()
+        except BufferError:  # pragma: NO COVER  Views still exported.
+            pass
+        self._map = None
@@ -0,0 +1,144 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bandwidth limiting for uploads and downloads.
+
+Transfers charge each chunk they send or receive to a
+:class:`BandwidthLimiter`: either the one passed to the transfer, or the
+process-wide default set with :func:`set_default_limiter`.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+
+_DEFAULT_LIMITER = None
+
+
+class BandwidthLimiter(object):
+    """Token bucket shared by concurrent transfers.
+
+    A transfer may send a chunk whenever the bucket is not in debt, even
+    if the chunk is larger than the tokens available; the resulting debt
+    delays the following chunks.  While the average rate stays under the
+    cap, chunks are therefore never delayed.
+
+    Waiting transfers are served in order of decreasing priority, and in
+    arrival order within a priority.
+
+    :type rate: int
+    :param rate: The cap, in bytes per second.
+
+    :type burst: int
+    :param burst: (Optional) The size of the bucket, i.e. how many bytes
+                  may be sent at once after an idle period.  Defaults to one
+                  second's worth at ``rate``.
+
+    :raises: :exc:`ValueError` if ``rate`` is not positive.
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError('rate must be positive', rate)
+        if burst is None:
+            burst = rate
+        self._rate = float(rate)
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = _now()
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._counter = itertools.count()
+
+    @property
+    def rate(self):
+        """The cap, in bytes per second.
+
+        :rtype: float
+        :returns: The rate passed to the constructor.
+        """
+        return self._rate
+
+    def acquire(self, num_bytes, priority=0):
+        """Charge a chunk, waiting until the bucket is out of debt.
+
+        :type num_bytes: int
+        :param num_bytes: The size of the chunk.
+
+        :type priority: int
+        :param priority: (Optional) Waiters with a higher priority are served
+                         first.
+        """
+        entry = (-priority, next(self._counter))
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    timeout = None
+                    if self._waiters[0] == entry:
+                        self._refill()
+                        if self._tokens >= 0:
+                            self._tokens -= num_bytes
+                            return
+                        timeout = -self._tokens / self._rate
+                    self._wait(timeout)
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    def _refill(self):
+        """Add the tokens accrued since the last refill."""
+        now = _now()
+        elapsed = max(0.0, now - self._updated)
+        self._updated = now
+        self._tokens = min(self._burst, self._tokens + elapsed * self._rate)
+
+    def _wait(self, timeout):
+        """Wait to be notified, or for ``timeout`` seconds.
+
+        :type timeout: float
+        :param timeout: The maximum time to wait, or ``None``.
+        """
+        self._cond.wait(timeout)
+
+
+def set_default_limiter(limiter):
+    """Set the limiter used by transfers which were not passed one.
+
+    :type limiter: :class:`BandwidthLimiter`
+    :param limiter: The process-wide limiter, or ``None`` to remove it.
+    """
+    global _DEFAULT_LIMITER  # pylint: disable=global-statement
+    _DEFAULT_LIMITER = limiter
+
+
+def get_default_limiter():
+    """Get the limiter used by transfers which were not passed one.
+
+    :rtype: :class:`BandwidthLimiter`
+    :returns: The process-wide limiter, or ``None`` if not set.
+    """
+    return _DEFAULT_LIMITER
+
+
+def _now():
+    """Current time, in seconds; patched in tests.
+
+    :rtype: float
+    :returns: The current time.
+    """
+    return time.time()
@@ -15,11 +15,13 @@
 
 """Upload and download support for apitools."""
 
+import collections
 import email.generator as email_generator
 import email.mime.multipart as mime_multipart
 import email.mime.nonmultipart as mime_nonmultipart
 import mimetypes
 import os
+import time
 
 import httplib2
 import six
@@ -34,7 +36,9 @@ from google.cloud.streaming.exceptions import TransferRetryError
 from google.cloud.streaming.http_wrapper import make_api_request
 from google.cloud.streaming.http_wrapper import Request
 from google.cloud.streaming.http_wrapper import RESUME_INCOMPLETE
+from google.cloud.streaming.mapped_file import MappedFile
 from google.cloud.streaming.stream_slice import StreamSlice
+from google.cloud.streaming.throttling import get_default_limiter
 from google.cloud.streaming.util import acceptable_mime_type
 
 
@@ -45,6 +49,38 @@ RESUMABLE_UPLOAD = 'resumable'
 
 _DEFAULT_CHUNKSIZE = 1 << 20
 
+_ADAPTIVE_MIN_CHUNKSIZE = 256 << 10
+_ADAPTIVE_MAX_CHUNKSIZE = 64 << 20
+_ADAPTIVE_FAST_SECONDS = 1.0
+
+
+class TransferProgress(collections.namedtuple(
+        'TransferProgress', 'bytes_transferred total_bytes elapsed rate '
+        'average_rate retries chunksize')):
+    """Statistics passed to a transfer's progress callback after each chunk.
+
+    :type bytes_transferred: int
+    :param bytes_transferred: Bytes transferred so far.
+
+    :type total_bytes: int
+    :param total_bytes: Size of the whole transfer, or ``None`` if unknown.
+
+    :type elapsed: float
+    :param elapsed: Seconds since the transfer started.
+
+    :type rate: float
+    :param rate: Bytes per second for the last chunk.
+
+    :type average_rate: float
+    :param average_rate: Bytes per second since the transfer started.
+
+    :type retries: int
+    :param retries: Requests retried so far.
+
+    :type chunksize: int
+    :param chunksize: The size of the next chunk.
+    """
+
 
 class _Transfer(object):
     """Generic bits common to Uploads and Downloads.
@@ -67,13 +103,31 @@ class _Transfer(object):
 
     :type num_retries: int
     :param num_retries: how many retries should the transfer attempt
+
+    :type limiter: :class:`~.streaming.throttling.BandwidthLimiter`
+    :param limiter: limiter charged for each chunk transferred; defaults
+                    to the process-wide limiter, if any
+
+    :type priority: int
+    :param priority: priority of this transfer's chunks when waiting on
+                     the limiter
+
+    :type progress_callback: callable
+    :param progress_callback: called with a :class:`TransferProgress`
+                              after each chunk
+
+    :type adaptive_chunksize: bool
+    :param adaptive_chunksize: if True, double :attr:`chunksize` after each
+                               chunk transferred in under a second, and
+                               halve it after each retry
     """
 
     _num_retries = None
 
     def __init__(self, stream, close_stream=False,
                  chunksize=_DEFAULT_CHUNKSIZE, auto_transfer=True,
-                 http=None, num_retries=5):
+                 http=None, num_retries=5, limiter=None, priority=0,
+                 progress_callback=None, adaptive_chunksize=False):
         self._bytes_http = None
         self._close_stream = close_stream
         self._http = http
@@ -85,6 +139,14 @@ class _Transfer(object):
 
         self.auto_transfer = auto_transfer
         self.chunksize = chunksize
+        self.limiter = limiter
+        self.priority = priority
+        self.progress_callback = progress_callback
+        self.adaptive_chunksize = adaptive_chunksize
+        self.retries = 0
+        self._chunk_retries = 0
+        self._started = None
+        self._last_chunk = None
 
     def __repr__(self):
         return str(self)
@@ -168,6 +230,86 @@ class _Transfer(object):
         """
         return self._url
 
+    def _throttle(self, num_bytes):
+        """Charge a chunk to the bandwidth limiter, if any.
+
+        :type num_bytes: int
+        :param num_bytes: the size of the chunk
+        """
+        limiter = self.limiter or get_default_limiter()
+        if limiter is not None and num_bytes:
+            limiter.acquire(num_bytes, priority=self.priority)
+
+    def _start_clock(self):
+        """Note the start of the transfer, for :meth:`report_progress`."""
+        if self._started is None:
+            self._started = self._last_chunk = time.time()
+
+    def _record_retry(self, exc):  # pylint: disable=unused-argument
+        """Count a retried request; passed to :func:`make_api_request`.
+
+        :type exc: :class:`Exception`
+        :param exc: the error which caused the retry
+        """
+        self.retries += 1
+        self._chunk_retries += 1
+        if self.adaptive_chunksize:
+            self._resize_chunks(self.chunksize // 2)
+
+    def _chunk_granularity(self):
+        """Multiple to which adapted chunk sizes are rounded.
+
+        :rtype: int
+        :returns: the granularity, in bytes
+        """
+        return _ADAPTIVE_MIN_CHUNKSIZE
+
+    def _resize_chunks(self, chunksize):
+        """Set :attr:`chunksize`, within bounds and rounded to granularity.
+
+        :type chunksize: int
+        :param chunksize: the requested chunk size
+        """
+        granularity = self._chunk_granularity()
+        chunksize = max(_ADAPTIVE_MIN_CHUNKSIZE,
+                        min(chunksize, _ADAPTIVE_MAX_CHUNKSIZE))
+        self.chunksize = max(granularity, chunksize - chunksize % granularity)
+
+    def report_progress(self, bytes_transferred, chunk_bytes):
+        """Record a transferred chunk.
+
+        Adapts :attr:`chunksize`, if enabled, and calls
+        :attr:`progress_callback`, if set.  Called by the transfer itself
+        after each chunk; callers sending the data in a request of their
+        own may call it when that request completes.
+
+        :type bytes_transferred: int
+        :param bytes_transferred: bytes transferred so far
+
+        :type chunk_bytes: int
+        :param chunk_bytes: bytes transferred in the last chunk
+        """
+        self._start_clock()
+        now = time.time()
+        chunk_elapsed = now - self._last_chunk
+        elapsed = now - self._started
+        self._last_chunk = now
+        if (self.adaptive_chunksize and not self._chunk_retries and
+                chunk_bytes >= self.chunksize and
+                chunk_elapsed < _ADAPTIVE_FAST_SECONDS):
+            self._resize_chunks(self.chunksize * 2)
+        self._chunk_retries = 0
+        if self.progress_callback is not None:
+            self.progress_callback(TransferProgress(
+                bytes_transferred=bytes_transferred,
+                total_bytes=self.total_size,
+                elapsed=elapsed,
+                rate=chunk_bytes / chunk_elapsed if chunk_elapsed else 0.0,
+                average_rate=(
+                    bytes_transferred / elapsed if elapsed else 0.0),
+                retries=self.retries,
+                chunksize=self.chunksize))
+
     def _initialize(self, http, url):
         """Initialize this download by setting :attr:`http` and :attr`url`.
 
@@ -372,6 +514,7 @@ class Download(_Transfer):
         :param http: Http instance for this request.
         """
         self._ensure_uninitialized()
+        self._start_clock()
         url = http_request.url
         if self.auto_transfer:
             end_byte = self._compute_end_byte(0)
@@ -506,7 +649,8 @@ class Download(_Transfer):
         request = Request(url=self.url, headers=headers)
         self._set_range_header(request, start, end=end)
         return make_api_request(
-            self.bytes_http, request, retries=self.num_retries)
+            self.bytes_http, request, retries=self.num_retries,
+            retry_callback=self._record_retry)
 
     def _process_response(self, response):
         """Update attribtes and writing stream, based on response.
@@ -533,6 +677,8 @@ class Download(_Transfer):
                                     http_client.PARTIAL_CONTENT):
             self.stream.write(response.content)
             self._progress += response.length
+            self._throttle(response.length)
+            self.report_progress(self.progress, response.length)
             if response.info and 'content-encoding' in response.info:
                 self._encoding = response.info['content-encoding']
         elif response.status_code == http_client.NO_CONTENT:
@@ -900,7 +1046,10 @@ class Upload(_Transfer):
         # attach the media as the second part
         msg = mime_nonmultipart.MIMENonMultipart(*self.mime_type.split('/'))
         msg['Content-Transfer-Encoding'] = 'binary'
-        msg.set_payload(self.stream.read())
+        payload = self.stream.read()
+        if isinstance(payload, memoryview):  # Read from a mapped file.
+            payload = payload.tobytes()
+        msg.set_payload(payload)
         msg_root.attach(msg)
 
         # NOTE: generate multipart message as bytes, not text
@@ -1052,6 +1201,15 @@ class Upload(_Transfer):
         _, _, end = range_header.partition('-')
         return int(end)
 
+    def _chunk_granularity(self):
+        """Multiple to which adapted chunk sizes are rounded.
+
+        :rtype: int
+        :returns: the server-specified granularity, if any
+        """
+        return (self._server_chunk_granularity or
+                super(Upload, self)._chunk_granularity())
+
     def _validate_chunksize(self, chunksize=None):
         """Validate chunksize against server-specified granularity.
 
@@ -1090,8 +1248,12 @@ class Upload(_Transfer):
         if use_chunks:
             self._validate_chunksize(self.chunksize)
         self._ensure_initialized()
+        self._start_clock()
         while not self.complete:
-            response = send_func(self.stream.tell())
+            start = self.stream.tell()
+            response = send_func(start)
+            position = self.stream.tell()
+            self.report_progress(position, position - start)
             if response.status_code in (http_client.OK, http_client.CREATED):
                 self._complete = True
                 break
@@ -1113,6 +1275,23 @@ class Upload(_Transfer):
                         (int(end_pos) - int(current_pos)))
         return response
 
+    def _read_body(self, size):
+        """Get the next ``size`` bytes of the stream as a request body.
+
+        Mapped files hand out views of the file, which are sent without
+        being copied (and may be sent again if the request is retried);
+        other streams are read as the request is sent.
+
+        :type size: int
+        :param size: The number of bytes.
+
+        :rtype: :class:`memoryview` or :class:`StreamSlice`
+        :returns: The body.
+        """
+        if isinstance(self.stream, MappedFile):
+            return self.stream.read(size)
+        return StreamSlice(self.stream, size)
+
     def _send_media_request(self, request, end):
         """Peform API upload request.
 
@@ -1130,7 +1309,8 @@ class Upload(_Transfer):
                  code from the response indicates an error.
         """
         response = make_api_request(
-            self.bytes_http, request, retries=self.num_retries)
+            self.bytes_http, request, retries=self.num_retries,
+            retry_callback=self._record_retry)
         if response.status_code not in (http_client.OK, http_client.CREATED,
                                         RESUME_INCOMPLETE):
             # We want to reset our state to wherever the server left us
@@ -1159,7 +1339,7 @@ class Upload(_Transfer):
         if self.total_size is None:
             raise TransferInvalidError(
                 'Total size must be known for SendMediaBody')
-        body_stream = StreamSlice(self.stream, self.total_size - start)
+        body_stream = self._read_body(self.total_size - start)
 
         request = Request(url=self.url, http_method='PUT', body=body_stream)
         request.headers['Content-Type'] = self.mime_type
@@ -1172,6 +1352,7 @@ class Upload(_Transfer):
 
         request.headers['Content-Range'] = range_string
 
+        self._throttle(self.total_size - start)
         return self._send_media_request(request, self.total_size)
 
     def _send_chunk(self, start):
@@ -1202,7 +1383,7 @@ class Upload(_Transfer):
             body_stream = body_stream.read(self.chunksize)
         else:
             end = min(start + self.chunksize, self.total_size)
-            body_stream = StreamSlice(self.stream, end - start)
+            body_stream = self._read_body(end - start)
         request = Request(url=self.url, http_method='PUT', body=body_stream)
         request.headers['Content-Type'] = self.mime_type
         if no_log_body:
@@ -1220,4 +1401,5 @@ class Upload(_Transfer):
 
         request.headers['Content-Range'] = range_string
 
+        self._throttle(end - start)
         return self._send_media_request(request, end)
@@ -58,6 +58,10 @@ REQUIREMENTS = [
     'six',
 ]
 
+EXTRAS_REQUIREMENTS = {
+    ':python_version<"3.2"': ['futures >= 3.0.0'],
+}
+
 setup(
     name='google-cloud-core',
     version='0.22.1',
@@ -69,5 +73,6 @@ setup(
     ],
     packages=find_packages(),
     install_requires=REQUIREMENTS,
+    extras_require=EXTRAS_REQUIREMENTS,
     **SETUP_BASE
 )
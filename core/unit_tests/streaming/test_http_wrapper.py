@@ -433,6 +433,32 @@ class Test_make_api_request(unittest.TestCase):
             self.assertEqual(attempt, ((HTTP, REQUEST), expected_kw))
         self.assertEqual(_checked, [])  # not called by '_wo_exception'
 
+    def test_w_retry_callback(self):
+        from google.cloud._testing import _Monkey
+        from google.cloud.streaming import http_wrapper as MUT
+
+        HTTP, RESPONSE = object(), object()
+        REQUEST = _Request()
+        errors = [ValueError('Retryable'), ValueError('Retryable')]
+        retried = []
+
+        def _wo_exception(*args, **kw):
+            if errors:
+                raise errors[0]
+            return RESPONSE
+
+        def _retry_callback(exc):
+            retried.append(exc)
+            errors.pop(0)
+
+        with _Monkey(MUT, calculate_wait_for_retry=lambda *ignored: 0.01,
+                     _make_api_request_no_retry=_wo_exception):
+            response = self._call_fut(HTTP, REQUEST, retries=3,
+                                      retry_callback=_retry_callback)
+
+        self.assertIs(response, RESPONSE)
+        self.assertEqual([str(exc) for exc in retried], ['Retryable'] * 2)
+
     def test_w_exceptions_gt_max_retries(self):
         from google.cloud._testing import _Monkey
         from google.cloud.streaming import http_wrapper as MUT
@@ -0,0 +1,131 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+
+class TestMappedFile(unittest.TestCase):
+
+    CONTENT = b'0123456789abcdef'
+
+    def setUp(self):
+        import os
+        import tempfile
+
+        handle, self.filename = tempfile.mkstemp()
+        os.write(handle, self.CONTENT)
+        os.close(handle)
+        self.file_obj = open(self.filename, 'rb')
+
+    def tearDown(self):
+        import os
+
+        self.file_obj.close()
+        os.remove(self.filename)
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.streaming.mapped_file import MappedFile
+
+        return MappedFile
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    @staticmethod
+    def _md5(data):
+        import hashlib
+
+        return hashlib.md5(data).digest()
+
+    def test_ctor_defaults(self):
+        with self._make_one(self.file_obj) as mapped:
+            self.assertEqual(len(mapped), len(self.CONTENT))
+            self.assertEqual(mapped.tell(), 0)
+            self.assertTrue(mapped.seekable())
+            self.assertFalse(mapped.closed)
+        self.assertTrue(mapped.closed)
+
+    def test_ctor_w_offset_and_size(self):
+        self.file_obj.seek(4)
+        mapped = self._make_one(self.file_obj, size=6)
+        self.assertEqual(len(mapped), 6)
+        self.assertEqual(bytes(mapped.read()), b'456789')
+        self.assertEqual(mapped.md5_digest(), self._md5(b'456789'))
+        mapped.close()
+
+    def test_ctor_invalid_region(self):
+        with self.assertRaises(ValueError):
+            self._make_one(self.file_obj, size=0)
+        with self.assertRaises(ValueError):
+            self._make_one(self.file_obj, size=len(self.CONTENT) + 1)
+        self.file_obj.seek(0, 2)
+        with self.assertRaises(ValueError):
+            self._make_one(self.file_obj)
+
+    def test_read(self):
+        mapped = self._make_one(self.file_obj)
+        view = mapped.read(4)
+        self.assertIsInstance(view, memoryview)
+        self.assertEqual(view.tobytes(), b'0123')
+        self.assertEqual(bytes(mapped.read(-1)), self.CONTENT[4:])
+        self.assertEqual(bytes(mapped.read(4)), b'')
+        self.assertEqual(mapped.tell(), len(self.CONTENT))
+        self.assertEqual(mapped.md5_digest(), self._md5(self.CONTENT))
+        del view
+        mapped.close()
+
+    def test_read_after_seek_hashes_once(self):
+        import os
+
+        mapped = self._make_one(self.file_obj)
+        mapped.read(10)
+        self.assertEqual(mapped.seek(-6, os.SEEK_CUR), 4)
+        self.assertEqual(bytes(mapped.read(8)), b'456789ab')
+        self.assertEqual(mapped.md5_digest(), self._md5(self.CONTENT))
+        mapped.close()
+
+    def test_seek(self):
+        import os
+
+        mapped = self._make_one(self.file_obj)
+        self.assertEqual(mapped.seek(3), 3)
+        self.assertEqual(mapped.seek(2, os.SEEK_CUR), 5)
+        self.assertEqual(mapped.seek(-1, os.SEEK_END), len(self.CONTENT) - 1)
+        self.assertEqual(mapped.seek(100), len(self.CONTENT))
+        self.assertEqual(mapped.seek(-100, os.SEEK_CUR), 0)
+        with self.assertRaises(ValueError):
+            mapped.seek(0, 3)
+        mapped.close()
+
+    def test_md5_digest_hashes_skipped_bytes(self):
+        mapped = self._make_one(self.file_obj)
+        mapped.seek(8)
+        self.assertEqual(bytes(mapped.read(2)), b'89')
+        self.assertEqual(mapped.md5_digest(), self._md5(self.CONTENT))
+        mapped.close()
+
+    def test_read_closed(self):
+        mapped = self._make_one(self.file_obj)
+        mapped.close()
+        mapped.close()
+        with self.assertRaises(ValueError):
+            mapped.read()
+
+    def test_close_w_views_in_use(self):
+        mapped = self._make_one(self.file_obj)
+        view = mapped.read(4)
+        mapped.close()
+        self.assertTrue(mapped.closed)
+        self.assertEqual(bytes(view), b'0123')
@@ -0,0 +1,202 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+
+class TestBandwidthLimiter(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.streaming.throttling import BandwidthLimiter
+
+        return BandwidthLimiter
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def _make_clocked(self, clock, *args, **kw):
+        import mock
+
+        with mock.patch('google.cloud.streaming.throttling._now', new=clock):
+            limiter = self._make_one(*args, **kw)
+
+        def _wait(timeout):
+            clock.waits.append(timeout)
+            clock.now += timeout
+
+        limiter._wait = _wait
+        return limiter
+
+    def test_ctor_defaults(self):
+        limiter = self._make_one(1000)
+        self.assertEqual(limiter.rate, 1000.0)
+        self.assertEqual(limiter._burst, 1000)
+        self.assertEqual(limiter._tokens, 1000.0)
+        self.assertEqual(limiter._waiters, [])
+
+    def test_ctor_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            self._make_one(0)
+
+    def test_acquire_within_burst(self):
+        import mock
+
+        clock = _Clock()
+        limiter = self._make_clocked(clock, 1000, burst=500)
+
+        with mock.patch('google.cloud.streaming.throttling._now', new=clock):
+            limiter.acquire(300)
+            limiter.acquire(200)
+
+        self.assertEqual(clock.waits, [])
+        self.assertEqual(limiter._tokens, 0.0)
+        self.assertEqual(limiter._waiters, [])
+
+    def test_acquire_larger_than_burst(self):
+        import mock
+
+        clock = _Clock()
+        limiter = self._make_clocked(clock, 1000, burst=500)
+
+        with mock.patch('google.cloud.streaming.throttling._now', new=clock):
+            # The first chunk goes through at once, in debt...
+            limiter.acquire(2500)
+            self.assertEqual(clock.waits, [])
+            # ... which the next chunk waits to be repaid.
+            limiter.acquire(100)
+
+        self.assertEqual(clock.waits, [2.0])
+        self.assertEqual(limiter._tokens, -100.0)
+
+    def test_acquire_refills_up_to_burst(self):
+        import mock
+
+        clock = _Clock()
+        limiter = self._make_clocked(clock, 1000, burst=500)
+
+        with mock.patch('google.cloud.streaming.throttling._now', new=clock):
+            limiter.acquire(500)
+            clock.now += 10.0
+            limiter.acquire(100)
+
+        self.assertEqual(clock.waits, [])
+        self.assertEqual(limiter._tokens, 400.0)
+
+    def test_acquire_clock_goes_backwards(self):
+        import mock
+
+        clock = _Clock()
+        limiter = self._make_clocked(clock, 1000)
+
+        with mock.patch('google.cloud.streaming.throttling._now', new=clock):
+            limiter.acquire(600)
+            clock.now -= 5.0
+            limiter.acquire(100)
+
+        self.assertEqual(limiter._tokens, 300.0)
+
+    def test_acquire_interrupted(self):
+        limiter = self._make_one(1000)
+        limiter._tokens = -1000.0
+
+        def _wait(timeout):
+            raise KeyboardInterrupt()
+
+        limiter._wait = _wait
+        with self.assertRaises(KeyboardInterrupt):
+            limiter.acquire(1)
+        self.assertEqual(limiter._waiters, [])
+
+    def test_acquire_priority_order(self):
+        import threading
+        import time
+
+        limiter = self._make_one(1000, burst=1)
+        limiter.acquire(200)  # In debt for ~200ms.
+        order = []
+
+        def _transfer(name, priority):
+            limiter.acquire(10, priority=priority)
+            order.append(name)
+
+        threads = []
+        for name, priority in [('low', -1), ('normal', 0), ('high', 5)]:
+            thread = threading.Thread(target=_transfer, args=(name, priority))
+            thread.start()
+            threads.append(thread)
+            while len(limiter._waiters) < len(threads):
+                time.sleep(0.001)
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(order, ['high', 'normal', 'low'])
+
+    def test_acquire_priority_wins_over_arrival(self):
+        limiter = self._make_one(1000)
+        limiter._waiters = [(0, -2)]
+        served = []
+
+        def _wait(timeout):
+            # The earlier, lower priority waiter is still queued: only the
+            # higher priority waiter may be served.
+            self.assertIsNone(timeout)
+            served.append(limiter._waiters[0])
+            limiter._waiters.remove((0, -2))
+
+        limiter._wait = _wait
+        limiter.acquire(10, priority=0)
+        self.assertEqual(len(served), 1)
+
+        limiter._waiters = [(0, -2)]
+        served = []
+        limiter.acquire(10, priority=1)
+        self.assertEqual(served, [])
+
+
+class Test_default_limiter(unittest.TestCase):
+
+    def test_set_and_get(self):
+        from google.cloud.streaming.throttling import get_default_limiter
+        from google.cloud.streaming.throttling import set_default_limiter
+
+        limiter = object()
+        self.assertIsNone(get_default_limiter())
+        set_default_limiter(limiter)
+        try:
+            self.assertIs(get_default_limiter(), limiter)
+        finally:
+            set_default_limiter(None)
+        self.assertIsNone(get_default_limiter())
+
+
+class Test__now(unittest.TestCase):
+
+    def test_it(self):
+        import time
+
+        from google.cloud.streaming.throttling import _now
+
+        before = time.time()
+        self.assertTrue(before <= _now() <= time.time())
+
+
+class _Clock(object):
+
+    def __init__(self):
+        self.now = 1000.0
+        self.waits = []
+
+    def __call__(self):
+        return self.now
@@ -41,18 +41,26 @@ class Test__Transfer(unittest.TestCase):
         self.assertEqual(xfer.num_retries, 5)
         self.assertIsNone(xfer.url)
         self.assertFalse(xfer.initialized)
+        self.assertIsNone(xfer.limiter)
+        self.assertEqual(xfer.priority, 0)
+        self.assertIsNone(xfer.progress_callback)
+        self.assertFalse(xfer.adaptive_chunksize)
+        self.assertEqual(xfer.retries, 0)
 
     def test_ctor_explicit(self):
         stream = _Stream()
         HTTP = object()
         CHUNK_SIZE = 1 << 18
         NUM_RETRIES = 8
+        LIMITER = object()
         xfer = self._make_one(stream,
                               close_stream=True,
                               chunksize=CHUNK_SIZE,
                               auto_transfer=False,
                               http=HTTP,
-                              num_retries=NUM_RETRIES)
+                              num_retries=NUM_RETRIES,
+                              limiter=LIMITER,
+                              priority=3)
         self.assertIs(xfer.stream, stream)
         self.assertTrue(xfer.close_stream)
         self.assertEqual(xfer.chunksize, CHUNK_SIZE)
@@ -60,6 +68,59 @@ class Test__Transfer(unittest.TestCase):
         self.assertIs(xfer.bytes_http, HTTP)
         self.assertIs(xfer.http, HTTP)
         self.assertEqual(xfer.num_retries, NUM_RETRIES)
+        self.assertIs(xfer.limiter, LIMITER)
+        self.assertEqual(xfer.priority, 3)
+
+    def test__throttle_wo_limiter(self):
+        xfer = self._make_one(_Stream())
+        xfer._throttle(10)  # No limiter, nothing to do.
+
+    def test__throttle_w_limiter(self):
+        limiter = _Limiter()
+        xfer = self._make_one(_Stream(), limiter=limiter, priority=2)
+        xfer._throttle(10)
+        xfer._throttle(0)
+        self.assertEqual(limiter._acquired, [(10, 2)])
+
+    def test__throttle_w_default_limiter(self):
+        import mock
+
+        limiter = _Limiter()
+        xfer = self._make_one(_Stream())
+        with mock.patch(
+                'google.cloud.streaming.throttling._DEFAULT_LIMITER',
+                new=limiter):
+            xfer._throttle(10)
+        self.assertEqual(limiter._acquired, [(10, 0)])
+
+    def test__record_retry(self):
+        xfer = self._make_one(_Stream(), chunksize=1 << 20)
+        xfer._record_retry(ValueError())
+        xfer._record_retry(ValueError())
+        self.assertEqual(xfer.retries, 2)
+        self.assertEqual(xfer.chunksize, 1 << 20)
+
+    def test__record_retry_w_adaptive_chunksize(self):
+        xfer = self._make_one(_Stream(), chunksize=1 << 20,
+                              adaptive_chunksize=True)
+        sizes = []
+        for _ in range(3):
+            xfer._record_retry(ValueError())
+            sizes.append(xfer.chunksize)
+        self.assertEqual(sizes, [512 << 10, 256 << 10, 256 << 10])
+        self.assertEqual(xfer.retries, 3)
+
+    def test__resize_chunks(self):
+        from google.cloud.streaming.transfer import _ADAPTIVE_MAX_CHUNKSIZE
+        from google.cloud.streaming.transfer import _ADAPTIVE_MIN_CHUNKSIZE
+
+        xfer = self._make_one(_Stream())
+        xfer._resize_chunks(1)
+        self.assertEqual(xfer.chunksize, _ADAPTIVE_MIN_CHUNKSIZE)
+        xfer._resize_chunks(1 << 40)
+        self.assertEqual(xfer.chunksize, _ADAPTIVE_MAX_CHUNKSIZE)
+        xfer._resize_chunks(700 << 10)
+        self.assertEqual(xfer.chunksize, 512 << 10)
 
     def test_bytes_http_fallback_to_http(self):
         stream = _Stream()
@@ -507,7 +568,8 @@ class Test_Download(unittest.TestCase):
         from six.moves import http_client
 
         stream = _Stream()
-        download = self._make_one(stream)
+        limiter = _Limiter()
+        download = self._make_one(stream, limiter=limiter)
         info = {'content-encoding': 'blah'}
         response = _makeResponse(http_client.OK, info, 'PARTIAL')
         found = download._process_response(response)
@@ -515,6 +577,7 @@ class Test_Download(unittest.TestCase):
         self.assertEqual(stream._written, ['PARTIAL'])
         self.assertEqual(download.progress, 7)
         self.assertEqual(download.encoding, 'blah')
+        self.assertEqual(limiter._acquired, [(7, 0)])
 
     def test__process_response_w_REQUESTED_RANGE_NOT_SATISFIABLE(self):
         from six.moves import http_client
@@ -830,6 +893,96 @@ class Test_Download(unittest.TestCase):
         self.assertEqual(stream._written, [CONTENT])
         self.assertEqual(download.total_size, LEN)
 
+    def test_report_progress(self):
+        import mock
+
+        reported = []
+        download = self._make_one(_Stream(), total_size=4096,
+                                  progress_callback=reported.append)
+        clock = _Clock(100.0, 100.5, 102.5, 102.5)
+        with mock.patch('google.cloud.streaming.transfer.time', new=clock):
+            download._start_clock()
+            download.report_progress(1024, 1024)
+            download.retries = 1
+            download.report_progress(4096, 3072)
+            download.report_progress(4096, 0)
+
+        self.assertEqual(len(reported), 3)
+        self.assertEqual(reported[0], (1024, 4096, 0.5, 2048.0, 2048.0, 0,
+                                       download.chunksize))
+        self.assertEqual(reported[1].bytes_transferred, 4096)
+        self.assertEqual(reported[1].elapsed, 2.5)
+        self.assertEqual(reported[1].rate, 1536.0)
+        self.assertEqual(reported[1].average_rate, 4096 / 2.5)
+        self.assertEqual(reported[1].retries, 1)
+        self.assertEqual(reported[2].rate, 0.0)
+
+    def test_report_progress_wo_elapsed_time(self):
+        import mock
+
+        reported = []
+        download = self._make_one(_Stream(),
+                                  progress_callback=reported.append)
+        clock = _Clock(100.0, 100.0)
+        with mock.patch('google.cloud.streaming.transfer.time', new=clock):
+            download.report_progress(10, 10)
+
+        self.assertEqual(reported[0].rate, 0.0)
+        self.assertEqual(reported[0].average_rate, 0.0)
+        self.assertIsNone(reported[0].total_bytes)
+
+    def test_report_progress_adaptive_chunksize(self):
+        import mock
+
+        chunksize = 256 << 10
+        download = self._make_one(_Stream(), chunksize=chunksize,
+                                  adaptive_chunksize=True)
+        clock = _Clock(0.0, 0.5, 1.0, 3.0, 3.5, 4.0)
+        with mock.patch('google.cloud.streaming.transfer.time', new=clock):
+            download._start_clock()
+            # Fast, full chunk:  grow.
+            download.report_progress(chunksize, chunksize)
+            self.assertEqual(download.chunksize, 2 * chunksize)
+            # Short (last) chunk:  keep.
+            download.report_progress(chunksize + 10, 10)
+            self.assertEqual(download.chunksize, 2 * chunksize)
+            # Slow chunk:  keep.
+            download.report_progress(3 * chunksize, 2 * chunksize)
+            self.assertEqual(download.chunksize, 2 * chunksize)
+            # Fast chunk which was retried:  shrink only.
+            download._record_retry(ValueError())
+            download.report_progress(4 * chunksize, chunksize)
+            self.assertEqual(download.chunksize, chunksize)
+            # Retries are counted per chunk.
+            download.report_progress(5 * chunksize, chunksize)
+            self.assertEqual(download.chunksize, 2 * chunksize)
+
+    def test_stream_file_reports_progress(self):
+        from six.moves import http_client
+        from google.cloud._testing import _Monkey
+        from google.cloud.streaming import transfer as MUT
+
+        CONTENT = b'ABCDEF'
+        reported = []
+        download = self._make_one(_Stream(), chunksize=3,
+                                  progress_callback=reported.append)
+        download._initial_response = _makeResponse(
+            http_client.PARTIAL_CONTENT, {'content-range': 'bytes 0-2/6'},
+            CONTENT[:3])
+        response_2 = _makeResponse(
+            http_client.OK, {'content-range': 'bytes 3-5/6'}, CONTENT[3:])
+        requester = _MakeRequest(response_2)
+        download._initialize(object(), _Request.URL)
+
+        with _Monkey(MUT, Request=_Request, make_api_request=requester):
+            download.stream_file()
+
+        self.assertEqual(
+            [(progress.bytes_transferred, progress.total_bytes)
+             for progress in reported], [(3, 6), (6, 6)])
+        _, _, kw = requester._requested[0]
+        self.assertEqual(kw['retry_callback'], download._record_retry)
+
 
 class Test_Upload(unittest.TestCase):
     URL = "http://example.com/api"
@@ -1144,6 +1297,32 @@ class Test_Upload(unittest.TestCase):
         self.assertEqual(app_msg._payload, CONTENT.decode('ascii'))
         self.assertTrue(b'<media body>' in request.loggable_body)
 
+    def test_configure_request_w_simple_w_body_mapped_file(self):
+        import os
+
+        from google.cloud._testing import _tempdir
+        from google.cloud.streaming.mapped_file import MappedFile
+        from google.cloud.streaming.transfer import SIMPLE_UPLOAD
+
+        CONTENT = b'CONTENT'
+        config = _UploadConfig()
+        request = _Request(body=b'BODY')
+        request.headers['content-type'] = 'text/plain'
+        url_builder = _Dummy(query_params={})
+        with _tempdir() as tempdir:
+            filename = os.path.join(tempdir, 'upload.bin')
+            with open(filename, 'wb') as file_obj:
+                file_obj.write(CONTENT)
+            with open(filename, 'rb') as file_obj:
+                with MappedFile(file_obj) as stream:
+                    upload = self._make_one(stream)
+                    upload.strategy = SIMPLE_UPLOAD
+
+                    upload.configure_request(config, request, url_builder)
+
+        self.assertEqual(url_builder.query_params, {'uploadType': 'multipart'})
+        self.assertIn(b'\n\nCONTENT\n', request.body)
+
     def test_configure_request_w_resumable_wo_total_size(self):
         from google.cloud.streaming.transfer import RESUMABLE_UPLOAD
 
@@ -1572,6 +1751,40 @@ class Test_Upload(unittest.TestCase):
         upload._complete = True
         self.assertIs(upload.stream_file(use_chunks=False), response)
 
+    def test__chunk_granularity(self):
+        upload = self._make_one(_Stream())
+        self.assertEqual(upload._chunk_granularity(), 256 << 10)
+        upload._server_chunk_granularity = 1 << 20
+        self.assertEqual(upload._chunk_granularity(), 1 << 20)
+        upload.adaptive_chunksize = True
+        upload._resize_chunks(3 << 19)
+        self.assertEqual(upload.chunksize, 1 << 20)
+
+    def test_stream_file_reports_progress(self):
+        from six.moves import http_client
+        from google.cloud._testing import _Monkey
+        from google.cloud.streaming import transfer as MUT
+        from google.cloud.streaming.http_wrapper import RESUME_INCOMPLETE
+        from google.cloud.streaming.transfer import RESUMABLE_UPLOAD
+
+        reported = []
+        upload = self._make_one(_Stream(b'ABCDEFGHIJ'), chunksize=6,
+                                progress_callback=reported.append)
+        upload.strategy = RESUMABLE_UPLOAD
+        upload._initialize(object(), self.UPLOAD_URL)
+        response_1 = _makeResponse(RESUME_INCOMPLETE, {'range': 'bytes=0-5'})
+        response_2 = _makeResponse(http_client.OK)
+        requester = _MakeRequest(response_1, response_2)
+
+        with _Monkey(MUT, Request=_Request, make_api_request=requester):
+            upload.stream_file()
+
+        self.assertEqual(
+            [(progress.bytes_transferred, progress.total_bytes)
+             for progress in reported], [(6, None), (10, 10)])
+        _, _, kw = requester._requested[0]
+        self.assertEqual(kw['retry_callback'], upload._record_retry)
+
     def test_stream_file_incomplete(self):
         from six.moves import http_client
         from google.cloud._testing import _Monkey
@@ -1749,7 +1962,8 @@ class Test_Upload(unittest.TestCase):
         SIZE = 1234
         http = object()
         stream = _Stream()
-        upload = self._make_one(stream, total_size=SIZE)
+        limiter = _Limiter()
+        upload = self._make_one(stream, total_size=SIZE, limiter=limiter)
         upload._initialize(http, self.UPLOAD_URL)
         response = object()
         streamer = _MediaStreamer(response)
@@ -1757,6 +1971,8 @@ class Test_Upload(unittest.TestCase):
 
         found = upload._send_media_body(0)
 
+        self.assertEqual(limiter._acquired, [(SIZE, 0)])
+
         self.assertIs(found, response)
         request, end = streamer._called_with
         self.assertEqual(request.url, self.UPLOAD_URL)
@@ -1867,7 +2083,9 @@ class Test_Upload(unittest.TestCase):
         CHUNK_SIZE = SIZE - 5
         http = object()
         stream = _Stream(CONTENT)
-        upload = self._make_one(stream, total_size=SIZE, chunksize=CHUNK_SIZE)
+        limiter = _Limiter()
+        upload = self._make_one(stream, total_size=SIZE, chunksize=CHUNK_SIZE,
+                                limiter=limiter, priority=-1)
         upload._initialize(http, self.UPLOAD_URL)
         response = object()
         streamer = _MediaStreamer(response)
@@ -1876,6 +2094,7 @@ class Test_Upload(unittest.TestCase):
         found = upload._send_chunk(0)
 
         self.assertIs(found, response)
+        self.assertEqual(limiter._acquired, [(CHUNK_SIZE, -1)])
         request, end = streamer._called_with
         self.assertEqual(request.url, self.UPLOAD_URL)
         self.assertEqual(request.http_method, 'PUT')
@@ -1921,6 +2140,48 @@ class Test_Upload(unittest.TestCase):
                           'Content-Range': 'bytes */%d' % (SIZE,)})
         self.assertEqual(end, SIZE)
 
+    def test__send_chunk_w_mapped_file(self):
+        import os
+
+        from google.cloud._testing import _tempdir
+        from google.cloud.streaming.mapped_file import MappedFile
+
+        CONTENT = b'ABCDEFGHIJ'
+        SIZE = len(CONTENT)
+        CHUNK_SIZE = SIZE - 5
+        http = object()
+        with _tempdir() as tempdir:
+            filename = os.path.join(tempdir, 'upload.bin')
+            with open(filename, 'wb') as file_obj:
+                file_obj.write(CONTENT)
+            with open(filename, 'rb') as file_obj:
+                with MappedFile(file_obj) as stream:
+                    upload = self._make_one(stream, total_size=SIZE,
+                                            chunksize=CHUNK_SIZE)
+                    upload._initialize(http, self.UPLOAD_URL)
+                    response = object()
+                    streamer = _MediaStreamer(response)
+                    upload._send_media_request = streamer
+
+                    found = upload._send_chunk(0)
+
+                    self.assertIs(found, response)
+                    request, end = streamer._called_with
+                    self.assertIsInstance(request.body, memoryview)
+                    self.assertEqual(request.body.tobytes(), b'ABCDE')
+                    self.assertEqual(request.loggable_body, '<media body>')
+                    self.assertEqual(request.headers['content-length'], '5')
+                    self.assertEqual(end, CHUNK_SIZE)
+                    self.assertEqual(stream.tell(), CHUNK_SIZE)
+
+                    streamer = _MediaStreamer(response)
+                    upload._send_media_request = streamer
+                    upload._send_media_body(CHUNK_SIZE)
+
+                    request, end = streamer._called_with
+                    self.assertEqual(request.body.tobytes(), b'FGHIJ')
+                    self.assertEqual(end, SIZE)
+
 
 def _email_chunk_parser():
     import six
@@ -2033,3 +2294,21 @@ class _MediaStreamer(object):
         assert self._called_with is None
         self._called_with = (request, end)
         return self._response
+
+
+class _Limiter(object):
+
+    def __init__(self):
+        self._acquired = []
+
+    def acquire(self, num_bytes, priority=0):
+        self._acquired.append((num_bytes, priority))
+
+
+class _Clock(object):
+
+    def __init__(self, *times):
+        self._times = list(times)
+
+    def time(self):
+        return self._times.pop(0)
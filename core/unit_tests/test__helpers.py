@@ -704,6 +704,160 @@ class Test__name_from_project_path(unittest.TestCase):
         self.assertEqual(name, self.THING_NAME)
 
 
+class Test__chunked(unittest.TestCase):
+
+    def _call_fut(self, iterable, size):
+        from google.cloud._helpers import _chunked
+
+        return _chunked(iterable, size)
+
+    def test_empty(self):
+        self.assertEqual(list(self._call_fut([], 2)), [])
+
+    def test_uneven(self):
+        chunks = self._call_fut(iter(range(5)), 2)
+        self.assertEqual(list(chunks), [[0, 1], [2, 3], [4]])
+
+
+class Test__map_concurrently(unittest.TestCase):
+
+    def _call_fut(self, func, iterable, max_workers=None):
+        from google.cloud._helpers import _map_concurrently
+
+        return _map_concurrently(func, iterable, max_workers=max_workers)
+
+    def test_serial(self):
+        import threading
+
+        threads = []
+
+        def func(item):
+            threads.append(threading.current_thread())
+            return item * 2
+
+        results = self._call_fut(func, [1, 2, 3], max_workers=1)
+        self.assertEqual(list(results), [2, 4, 6])
+        self.assertEqual(set(threads), set([threading.current_thread()]))
+
+    def test_concurrent_preserves_order(self):
+        import time
+
+        def func(item):
+            time.sleep(0.001 * (10 - item))
+            return item
+
+        results = self._call_fut(func, iter(range(10)), max_workers=3)
+        self.assertEqual(list(results), list(range(10)))
+
+    def test_default_workers(self):
+        results = self._call_fut(str, range(3))
+        self.assertEqual(list(results), ['0', '1', '2'])
+
+    def test_error_propagates(self):
+        def func(item):
+            if item == 1:
+                raise ValueError(item)
+            return item
+
+        results = self._call_fut(func, range(3), max_workers=2)
+        self.assertRaises(ValueError, list, results)
+
+    def test_bounded_lookahead(self):
+        from six.moves import map
+
+        consumed = []
+
+        def record(item):
+            consumed.append(item)
+            return item
+
+        results = self._call_fut(lambda item: item, map(record, range(100)),
+                                 max_workers=2)
+        self.assertEqual(next(results), 0)
+        results.close()
+        self.assertLessEqual(len(consumed), 5)
+
+
+class Test__merge_concurrently(unittest.TestCase):
+
+    def _call_fut(self, iterables, **kw):
+        from google.cloud._helpers import _merge_concurrently
+
+        return _merge_concurrently(iterables, **kw)
+
+    @staticmethod
+    def _slow(items, delay):
+        import time
+
+        for item in items:
+            time.sleep(delay)
+            yield item
+
+    def test_ordered(self):
+        iterables = [self._slow(range(0, 5), 0.002),
+                     self._slow(range(5, 10), 0.001),
+                     iter([]),
+                     self._slow(range(10, 15), 0)]
+
+        items = self._call_fut(iterables, ordered=True, max_workers=2)
+
+        self.assertEqual(list(items), list(range(15)))
+
+    def test_unordered(self):
+        import threading
+
+        threads = set()
+
+        def record(items):
+            for item in items:
+                threads.add(threading.current_thread())
+                yield item
+
+        iterables = [record(range(index * 10, index * 10 + 10))
+                     for index in range(5)]
+
+        items = list(self._call_fut(iterables, max_workers=3))
+
+        self.assertEqual(sorted(items), list(range(50)))
+        self.assertNotIn(threading.current_thread(), threads)
+
+    def test_yields_none(self):
+        items = self._call_fut([[None, 1], [None]], ordered=True)
+        self.assertEqual(list(items), [None, 1, None])
+
+    def test_empty(self):
+        self.assertEqual(list(self._call_fut([])), [])
+
+    def test_error(self):
+        def fail():
+            yield 1
+            raise ValueError('oops')
+
+        for ordered in (True, False):
+            items = self._call_fut([fail(), range(3)], ordered=ordered)
+            with self.assertRaises(ValueError):
+                list(items)
+
+    def test_consumer_stops_early(self):
+        started = []
+
+        def record(index):
+            started.append(index)
+            while True:
+                yield index
+
+        iterables = [record(index) for index in range(16)]
+
+        with mock.patch('google.cloud._helpers._PUT_TIMEOUT', new=0):
+            items = self._call_fut(iterables, ordered=True, max_workers=2)
+            self.assertEqual(next(items), 0)
+            items.close()
+
+        # Iterables not yet started when the consumer stopped are
+        # abandoned.
+        self.assertLess(len(started), 16)
+
+
 class Test_make_secure_channel(unittest.TestCase):
 
     def _call_fut(self, *args, **kwargs):
@@ -77,6 +77,48 @@ class TestConnection(unittest.TestCase):
         self.assertIsInstance(conn.http, google_auth_httplib2.AuthorizedHttp)
         self.assertIs(conn.http.credentials, credentials)
 
+    def test_http_shared_by_threads(self):
+        import threading
+
+        conn = self._make_one()
+        http = conn.http
+        found = []
+        thread = threading.Thread(target=lambda: found.append(conn.http))
+        thread.start()
+        thread.join()
+        self.assertIs(found[0], http)
+        self.assertIs(conn._http, http)
+
+    def test_http_per_thread(self):
+        import threading
+
+        class _Connection(self._get_target_class()):
+            _HTTP_PER_THREAD = True
+
+        conn = _Connection()
+        http = conn.http
+        self.assertIs(conn.http, http)
+        self.assertIsNone(conn._http)
+        found = []
+        thread = threading.Thread(target=lambda: found.append(conn.http))
+        thread.start()
+        thread.join()
+        self.assertIsNot(found[0], http)
+
+    def test_http_per_thread_w_explicit_http(self):
+        import threading
+
+        class _Connection(self._get_target_class()):
+            _HTTP_PER_THREAD = True
+
+        http = object()
+        conn = _Connection(http=http)
+        found = []
+        thread = threading.Thread(target=lambda: found.append(conn.http))
+        thread.start()
+        thread.join()
+        self.assertIs(found[0], http)
+
     def test_user_agent_format(self):
         from pkg_resources import get_distribution
 
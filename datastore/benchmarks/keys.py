@@ -0,0 +1,94 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark building, hashing and serializing datastore keys.
+
+Reports the number of keys per second for each step, for fresh keys and
+for keys already hashed / serialized once (as in join-like workloads
+looking up the same keys repeatedly), and compares decoding the keys of
+query results with and without interning.
+
+Usage::
+
+    $ python datastore/benchmarks/keys.py [--iterations N]
+"""
+
+import argparse
+import timeit
+
+from google.cloud.datastore.helpers import key_from_protobuf
+from google.cloud.datastore.key import Key
+
+
+NUM_KEYS = 1000
+PROJECT = 'benchmark'
+
+
+def _make_args():
+    """Create the path arguments of ``NUM_KEYS`` two-level keys."""
+    return [('Parent', 'parent-%d' % (index % 10,), 'Child', index + 1)
+            for index in range(NUM_KEYS)]
+
+
+def _build(args):
+    """Build one key per path."""
+    return [Key(*path, project=PROJECT) for path in args]
+
+
+def _report(label, func, iterations):
+    """Time ``func`` and print the cost per key."""
+    best = min(timeit.repeat(func, number=iterations, repeat=3))
+    per_key = best / iterations / NUM_KEYS
+    print('%-28s %9.2f usec / key  %11.0f keys / sec' % (
+        label, per_key * 1e6, 1.0 / per_key))
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    paths = _make_args()
+    keys = _build(paths)
+    key_pbs = [key.to_protobuf() for key in keys]
+    # Query results referencing the same few keys.
+    ref_pbs = [key_pbs[index % 10] for index in range(NUM_KEYS)]
+
+    print('%d keys' % (NUM_KEYS,))
+    _report('construct', lambda: _build(paths), args.iterations)
+    _report('hash (fresh keys)',
+            lambda: [hash(key) for key in _build(paths)], args.iterations)
+    _report('hash (cached)',
+            lambda: [hash(key) for key in keys], args.iterations)
+    _report('to_protobuf (fresh keys)',
+            lambda: [key.to_protobuf() for key in _build(paths)],
+            args.iterations)
+    _report('to_protobuf (cached)',
+            lambda: [key.to_protobuf() for key in keys], args.iterations)
+    _report('_protobuf (cached, shared)',
+            lambda: [key._protobuf() for key in keys], args.iterations)
+    _report('_to_protobuf_string (cached)',
+            lambda: [key._to_protobuf_string() for key in keys],
+            args.iterations)
+    _report('key_from_protobuf',
+            lambda: [key_from_protobuf(pb) for pb in ref_pbs],
+            args.iterations)
+    _report('key_from_protobuf (interned)',
+            lambda: [key_from_protobuf(pb, interned=True) for pb in ref_pbs],
+            args.iterations)
+
+
+if __name__ == '__main__':
+    main()
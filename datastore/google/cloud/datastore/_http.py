@@ -401,7 +401,10 @@ class Connection(connection_module.Connection):
     :param credentials: The OAuth2 Credentials to use for this connection.
 
     :type http: :class:`httplib2.Http` or class that defines ``request()``.
-    :param http: An optional HTTP object to make requests.
+    :param http: (Optional) HTTP object to make requests. If passed, it is
+                 shared by every thread using this connection, so it must be
+                 safe for concurrent use. If not passed, each thread gets its
+                 own HTTP object (:class:`httplib2.Http` is not thread-safe).
     """
 
     API_BASE_URL = 'https://' + DATASTORE_API_HOST
@@ -417,6 +420,8 @@ class Connection(connection_module.Connection):
     SCOPE = ('https://www.googleapis.com/auth/datastore',)
     """The scopes required for authenticating as a Cloud Datastore consumer."""
 
+    _HTTP_PER_THREAD = True
+
     def __init__(self, credentials=None, http=None):
         super(Connection, self).__init__(credentials=credentials, http=http)
         try:
@@ -0,0 +1,194 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Stream entities between queries, files and commits, without decoding.
+
+:func:`export_entities` writes the entities matching a query to a file as
+serialized ``Entity`` protobufs, each preceded by its length as a varint
+(the format of protobuf's ``writeDelimitedTo``), optionally compressed
+with gzip.  :func:`import_entities` reads them back into concurrent,
+non-transactional commits.  Neither builds
+:class:`~google.cloud.datastore.entity.Entity` objects:
+
+.. code-block:: python
+
+  >>> from google.cloud import datastore
+  >>> from google.cloud.datastore.backup import export_entities
+  >>> from google.cloud.datastore.backup import import_entities
+  >>> client = datastore.Client(namespace='prod')
+  >>> with open('events.pb.gz', 'wb') as file_obj:
+  ...     export_entities(client.query(kind='Event'), file_obj,
+  ...                     compress=True)
+  12345
+  >>> with open('events.pb.gz', 'rb') as file_obj:
+  ...     import_entities(client, file_obj, compressed=True)
+  12345
+
+Imported entities keep their keys, including project and namespace, and
+overwrite existing entities with the same keys.  To export a large kind
+faster, split its query with
+:func:`~google.cloud.datastore.scan.split_query` and export the
+sub-queries to separate files concurrently.
+"""
+
+import gzip
+
+import six
+
+from google.cloud.datastore.batch import _commit_chunked
+
+
+def export_entities(query, file_obj, compress=False, client=None):
+    """Write the entities matching a query to a file, as protobufs.
+
+    :type query: :class:`~google.cloud.datastore.query.Query`
+    :param query: The query to run.  Projection (and keys-only) queries
+                  are not accepted: importing their partial entities would
+                  overwrite the full ones.
+
+    :type file_obj: file
+    :param file_obj: A file opened for writing bytes.  It is left open.
+
+    :type compress: bool
+    :param compress: (Optional) If true, compress the records with gzip.
+
+    :type client: :class:`~google.cloud.datastore.client.Client`
+    :param client: (Optional) The client used to run the query.  If not
+                   passed, uses the query's client.
+
+    :rtype: int
+    :returns: The number of entities written.
+    :raises: :class:`ValueError` if the query has a projection.
+    """
+    if query.projection:
+        raise ValueError('Projection queries cannot be exported',
+                         query.projection)
+
+    if compress:
+        file_obj = gzip.GzipFile(fileobj=file_obj, mode='wb')
+    try:
+        count = 0
+        for entity_pb in query.fetch(client=client, raw=True):
+            record = entity_pb.SerializeToString()
+            file_obj.write(_encode_varint(len(record)))
+            file_obj.write(record)
+            count += 1
+    finally:
+        if compress:
+            file_obj.close()
+    return count
+
+
+def import_entities(client, file_obj, compressed=False, max_workers=None):
+    """Write the entities read from a file through concurrent commits.
+
+    Entities are read as they are committed, so the file may be larger
+    than the available memory.  The commits are not transactional: if one
+    fails, entities of other commits may have been written.  Since each
+    entity overwrites any existing entity with the same key, importing a
+    file again is safe.
+
+    :type client: :class:`~google.cloud.datastore.client.Client`
+    :param client: The client used to commit the entities.
+
+    :type file_obj: file
+    :param file_obj: A file written by :func:`export_entities`, opened for
+                     reading bytes.  It is left open.
+
+    :type compressed: bool
+    :param compressed: (Optional) Whether the file was written with
+                       ``compress=True``.
+
+    :type max_workers: int
+    :param max_workers: (Optional) The number of commit requests in flight
+                        at once.
+
+    :rtype: int
+    :returns: The number of entities written.
+    :raises: The first error returned for a commit request, or
+             :class:`ValueError` if the file is truncated.
+    """
+    if compressed:
+        file_obj = gzip.GzipFile(fileobj=file_obj, mode='rb')
+    try:
+        count = 0
+        for result in _commit_chunked(client, _read_records(file_obj),
+                                      _add_record, max_workers):
+            if result.error is not None:
+                raise result.error
+            count += len(result.items)
+    finally:
+        if compressed:
+            file_obj.close()
+    return count
+
+
+def _add_record(batch, record):
+    """Add an upsert of a serialized entity protobuf to a batch.
+
+    :type batch: :class:`~google.cloud.datastore.batch.Batch`
+    :param batch: The batch to add to.
+
+    :type record: bytes
+    :param record: The serialized protobuf of an entity with a complete key.
+    """
+    batch._add_complete_key_entity_pb().MergeFromString(record)
+
+
+def _encode_varint(value):
+    """Encode a non-negative integer as a protobuf varint.
+
+    :type value: int
+    :param value: The integer to encode.
+
+    :rtype: bytes
+    :returns: The varint: 7 bits per byte, least significant first, with
+              the high bit set on all but the last byte.
+    """
+    encoded = []
+    while value > 0x7f:
+        encoded.append(six.int2byte(0x80 | (value & 0x7f)))
+        value >>= 7
+    encoded.append(six.int2byte(value))
+    return b''.join(encoded)
+
+
+def _read_records(file_obj):
+    """Read the length-delimited records of a file.
+
+    :type file_obj: file
+    :param file_obj: A file opened for reading bytes.
+
+    :rtype: :class:`~types.GeneratorType`
+    :returns: A generator of the records, as bytes.
+    :raises: :class:`ValueError` if the file ends within a record.
+    """
+    while True:
+        length = 0
+        shift = 0
+        while True:
+            byte = file_obj.read(1)
+            if not byte:
+                if shift:
+                    raise ValueError('Truncated record length')
+                return
+            value = six.indexbytes(byte, 0)
+            length |= (value & 0x7f) << shift
+            shift += 7
+            if not value & 0x80:
+                break
+        record = file_obj.read(length)
+        if len(record) != length:
+            raise ValueError('Truncated record', length, len(record))
+        yield record
@@ -21,10 +21,29 @@ See
 https://cloud.google.com/datastore/docs/concepts/entities#Datastore_Batch_operations
 """
 
+import collections
+
+from google.cloud._helpers import _chunked
+from google.cloud._helpers import _map_concurrently
 from google.cloud.datastore import helpers
+from google.cloud.datastore.cache import _delete_keys
+from google.cloud.exceptions import GoogleCloudError
 from google.cloud.grpc.datastore.v1 import datastore_pb2 as _datastore_pb2
 
 
+class CommitResult(collections.namedtuple('CommitResult', 'items error')):
+    """The outcome of one commit request sent by a chunked bulk write.
+
+    :type items: list
+    :param items: The entities (or keys) written by the commit request.  The
+                  partial keys of entities are completed if it succeeded.
+
+    :type error: :class:`~google.cloud.exceptions.GoogleCloudError`
+    :param error: The error returned for the commit request, or ``None`` if
+                  it succeeded.
+    """
+
+
 class Batch(object):
     """An abstraction representing a collected group of updates / deletes.
 
@@ -63,6 +82,9 @@ class Batch(object):
 
     _id = None  # "protected" attribute, always None for non-transactions
 
+    _MAX_MUTATIONS = 500
+    """Maximum number of mutations the API accepts in one commit."""
+
     _INITIAL = 0
     """Enum value for _INITIAL status of batch/transaction."""
 
@@ -214,7 +236,7 @@ class Batch(object):
         if self.project != key.project:
             raise ValueError("Key must be from same project as batch")
 
-        key_pb = key.to_protobuf()
+        key_pb = key._protobuf()
         self._add_delete_key_pb().CopyFrom(key_pb)
 
     def begin(self):
@@ -238,8 +260,13 @@ class Batch(object):
         This is called by :meth:`commit`.
         """
         # NOTE: ``self._commit_request`` will be modified.
-        _, updated_keys = self._client._connection.commit(
-            self.project, self._commit_request, self._id)
+        try:
+            _, updated_keys = self._client._connection.commit(
+                self.project, self._commit_request, self._id)
+        finally:
+            # A failed commit may have been applied all the same.
+            if self._client.cache is not None:
+                _delete_keys(self._client.cache, self._mutated_keys())
         # If the back-end returns without error, we are guaranteed that
         # :meth:`Connection.commit` will return keys that match (length and
         # order) directly ``_partial_key_entities``.
@@ -248,6 +275,21 @@ class Batch(object):
             new_id = new_key_pb.path[-1].id
             entity.key = entity.key.completed_key(new_id)
 
+    def _mutated_keys(self):
+        """Keys of the entities written or deleted by the batch.
+
+        :rtype: list of :class:`.entity_pb2.Key`
+        :returns: The keys of the mutations, in order.
+        """
+        key_pbs = []
+        for mutation in self._commit_request.mutations:
+            operation = mutation.WhichOneof('operation')
+            if operation == 'delete':
+                key_pbs.append(mutation.delete)
+            else:
+                key_pbs.append(getattr(mutation, operation).key)
+        return key_pbs
+
     def commit(self):
         """Commits the batch.
 
@@ -266,6 +308,22 @@ class Batch(object):
         finally:
             self._status = self._FINISHED
 
+    def commit_async(self):
+        """Start committing the batch.
+
+        The commit runs in a worker thread of the client.  The batch must
+        not be changed until the returned future is done.
+
+        :rtype: :class:`concurrent.futures.Future`
+        :returns: A future whose result is ``None`` once the batch (or
+                  transaction) is committed.
+        :raises: :class:`~exceptions.ValueError` if the batch is not
+                 in progress.
+        """
+        if self._status != self._IN_PROGRESS:
+            raise ValueError('Batch must be in progress to commit()')
+        return self._client._submit(self.commit)
+
     def rollback(self):
         """Rolls back the current batch.
 
@@ -311,3 +369,44 @@ def _assign_entity_to_pb(entity_pb, entity):
     bare_entity_pb = helpers.entity_to_protobuf(entity)
     bare_entity_pb.key.CopyFrom(bare_entity_pb.key)
     entity_pb.CopyFrom(bare_entity_pb)
+
+
+def _commit_chunked(client, items, add_func, max_workers=None):
+    """Write many items through concurrent, non-transactional commits.
+
+    Items are grouped into batches of at most ``Batch._MAX_MUTATIONS``
+    mutations, and up to ``max_workers`` batches are committed at once.
+    Errors are reported in the results rather than raised.
+
+    :type client: :class:`google.cloud.datastore.client.Client`
+    :param client: The client used to commit the batches.
+
+    :type items: iterable
+    :param items: The items to write.
+
+    :type add_func: callable
+    :param add_func: Takes ``(batch, item)`` and adds one mutation for
+                     ``item`` to ``batch``, e.g. :meth:`Batch.put`.
+
+    :type max_workers: int
+    :param max_workers: (Optional) The number of batches to commit
+                        concurrently.
+
+    :rtype: iterator
+    :returns: One :class:`CommitResult` per batch, in the order of
+              ``items``.
+    """
+    def _commit(chunk):
+        """Commit one chunk in the current (worker) thread."""
+        batch = Batch(client)
+        batch.begin()
+        for item in chunk:
+            add_func(batch, item)
+        try:
+            batch.commit()
+        except GoogleCloudError as exc:
+            return CommitResult(chunk, exc)
+        return CommitResult(chunk, None)
+
+    chunks = _chunked(items, Batch._MAX_MUTATIONS)
+    return _map_concurrently(_commit, chunks, max_workers)
@@ -0,0 +1,346 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Read-through caching of entities looked up by a client.
+
+A client created with a cache serves the entities found by
+:meth:`~google.cloud.datastore.client.Client.get_multi` from it when it
+can, and looks up the others:
+
+.. code-block:: python
+
+  >>> from google.cloud import datastore
+  >>> from google.cloud.datastore.cache import LRUCache
+  >>> cache = LRUCache(max_size=10000, ttl=60)
+  >>> client = datastore.Client(cache=cache)
+  >>> client.get(client.key('Config', 'main'))  # Looked up.
+  <Entity('Config', 'main') {...}>
+  >>> client.get(client.key('Config', 'main'))  # Served from the cache.
+  <Entity('Config', 'main') {...}>
+  >>> cache.stats
+  CacheStats(hits=1, misses=1, evictions=0, size=1)
+
+The keys written by the client's commits (including those of batches and
+transactions) are removed from the cache once committed.  Lookups made in
+a transaction neither read nor fill the cache.  A lookup only fills the
+cache with the entities whose keys were not invalidated since it started,
+so that one racing with a commit doesn't store what the commit replaced.
+
+.. note::
+
+   Writes made by other clients or processes are not seen until the
+   cached entities expire (if ``ttl`` is set) or are evicted; a cache
+   backend shared by several processes narrows that window to writes
+   made outside of them.
+"""
+
+import collections
+import threading
+import time
+
+from google.cloud.grpc.datastore.v1 import entity_pb2 as _entity_pb2
+
+from google.cloud.datastore import helpers
+
+
+_NOW = time.time  # To be replaced by tests.
+
+
+CacheStats = collections.namedtuple(
+    'CacheStats', 'hits misses evictions size')
+"""Counters of a :class:`LRUCache`."""
+
+
+class CacheBackend(object):
+    """Interface of the storage of cached entities.
+
+    Cache keys and values are both bytes (serialized key and entity
+    protobufs), so a backend may keep them outside of the process, e.g.
+    in memcached or Redis, to share them.  Methods may be called from
+    several threads at once.
+
+    Each key has an invalidation generation, which changes whenever the
+    key is deleted.  Lookups read the generations of the keys before they
+    start, and only store the entities found if the generations of their
+    keys are unchanged (a compare-and-set, e.g. memcached's ``cas``).
+    """
+
+    def get_multi(self, keys):
+        """Get the values stored for keys.
+
+        :type keys: list of bytes
+        :param keys: The cache keys to look up.
+
+        :rtype: dict
+        :returns: The values found, by key.  Keys not found (or expired)
+                  are left out.
+        """
+        raise NotImplementedError
+
+    def get_generations(self, keys):
+        """Get the invalidation generations of keys.
+
+        :type keys: list of bytes
+        :param keys: The cache keys.
+
+        :rtype: dict
+        :returns: The current generation of each key.  Generations are
+                  opaque; they only need to compare equal until the key is
+                  next deleted.
+        """
+        raise NotImplementedError
+
+    def set_multi(self, mapping, generations=None):
+        """Store values for keys.
+
+        :type mapping: dict
+        :param mapping: The values to store, by key.
+
+        :type generations: dict
+        :param generations: (Optional) The generations of the keys, as
+                            returned by :meth:`get_generations` before the
+                            values were read.  If passed, only the values
+                            of the keys whose generation is unchanged are
+                            stored, atomically with the check.
+        """
+        raise NotImplementedError
+
+    def delete_multi(self, keys):
+        """Remove keys, if stored, and change their generations.
+
+        :type keys: list of bytes
+        :param keys: The cache keys to remove.
+        """
+        raise NotImplementedError
+
+
+class LRUCache(CacheBackend):
+    """An in-process cache, evicting the least recently used entries.
+
+    :type max_size: int
+    :param max_size: (Optional) The maximum number of entries kept.
+
+    :type ttl: float
+    :param ttl: (Optional) The number of seconds an entry is kept for.  If
+                not passed, entries are kept until evicted or invalidated.
+    """
+
+    def __init__(self, max_size=10000, ttl=None):
+        if max_size < 1:
+            raise ValueError('max_size must be positive', max_size)
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+        # Generations of the keys deleted most recently, bounded by
+        # ``max_size``: keys forgotten get the generation of the last key
+        # forgotten, which only grows, so that they never compare equal
+        # to a generation read before they were deleted.
+        self._generation = 0
+        self._generations = collections.OrderedDict()
+        self._forgotten_generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self):
+        """The counters of the cache.
+
+        Expired entries count as misses, not evictions.
+
+        :rtype: :class:`CacheStats`
+        :returns: The numbers of hits, misses and evictions so far, and the
+                  current number of entries.
+        """
+        with self._lock:
+            return CacheStats(self.hits, self.misses, self.evictions,
+                              len(self._entries))
+
+    def get_multi(self, keys):
+        """Get the values stored for keys.
+
+        :type keys: list of bytes
+        :param keys: The cache keys to look up.
+
+        :rtype: dict
+        :returns: The values found, by key.  Keys not found (or expired)
+                  are left out.
+        """
+        now = _NOW()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.pop(key, None)
+                if entry is None or (
+                        entry[1] is not None and entry[1] <= now):
+                    self.misses += 1
+                    continue
+                # Re-insert the entry as the most recently used.
+                self._entries[key] = entry
+                self.hits += 1
+                found[key] = entry[0]
+        return found
+
+    def get_generations(self, keys):
+        """Get the invalidation generations of keys.
+
+        :type keys: list of bytes
+        :param keys: The cache keys.
+
+        :rtype: dict
+        :returns: The current generation of each key.
+        """
+        with self._lock:
+            return dict((key, self._get_generation(key)) for key in keys)
+
+    def _get_generation(self, key):
+        """Get the invalidation generation of a key, holding the lock.
+
+        :type key: bytes
+        :param key: The cache key.
+
+        :rtype: int
+        :returns: The current generation of the key.
+        """
+        return self._generations.get(key, self._forgotten_generation)
+
+    def set_multi(self, mapping, generations=None):
+        """Store values for keys.
+
+        :type mapping: dict
+        :param mapping: The values to store, by key.
+
+        :type generations: dict
+        :param generations: (Optional) The generations of the keys read
+                            before the values; keys whose generation has
+                            changed since are not stored.
+        """
+        expires = None if self.ttl is None else _NOW() + self.ttl
+        with self._lock:
+            for key, value in mapping.items():
+                if (generations is not None and
+                        generations.get(key) != self._get_generation(key)):
+                    continue
+                self._entries.pop(key, None)
+                self._entries[key] = (value, expires)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete_multi(self, keys):
+        """Remove keys, if stored.
+
+        :type keys: list of bytes
+        :param keys: The cache keys to remove.
+        """
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
+                self._generations.pop(key, None)
+                self._generations[key] = self._generation
+            while len(self._generations) > self.max_size:
+                _, self._forgotten_generation = self._generations.popitem(
+                    last=False)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+def _get_entities(cache, keys, lazy=False):
+    """Get the cached entities for keys.
+
+    :type cache: :class:`CacheBackend`
+    :param cache: The cache to read.
+
+    :type keys: list of :class:`~google.cloud.datastore.key.Key`
+    :param keys: The keys to look up.
+
+    :type lazy: bool
+    :param lazy: (Optional) Whether to decode the properties of the
+                 entities when first read.
+
+    :rtype: tuple
+    :returns: The list of cached entities, the list of keys not found in
+              the cache, and the generations of the latter, to pass to
+              :func:`_set_entities` once they are looked up.
+    """
+    cache_keys = [key._to_protobuf_string() for key in keys]
+    found = cache.get_multi(cache_keys)
+    entities = []
+    uncached = []
+    uncached_cache_keys = []
+    for key, cache_key in zip(keys, cache_keys):
+        value = found.get(cache_key)
+        if value is None:
+            uncached.append(key)
+            uncached_cache_keys.append(cache_key)
+        else:
+            entities.append(helpers.entity_from_protobuf(
+                _entity_pb2.Entity.FromString(value), lazy=lazy))
+    generations = {}
+    if uncached_cache_keys:
+        generations = cache.get_generations(uncached_cache_keys)
+    return entities, uncached, generations
+
+
+def _set_entities(cache, entity_pbs, generations):
+    """Store looked up entities in a cache.
+
+    :type cache: :class:`CacheBackend`
+    :param cache: The cache to fill.
+
+    :type entity_pbs: list of :class:`.entity_pb2.Entity`
+    :param entity_pbs: The entities found by a lookup.
+
+    :type generations: dict
+    :param generations: The generations of the keys looked up, read before
+                        the lookup started.  Entities whose keys were
+                        invalidated since are not stored.
+    """
+    if entity_pbs:
+        cache.set_multi(dict(
+            (_cache_key(entity_pb.key), entity_pb.SerializeToString())
+            for entity_pb in entity_pbs), generations)
+
+
+def _delete_keys(cache, key_pbs):
+    """Remove written keys from a cache.
+
+    :type cache: :class:`CacheBackend`
+    :param cache: The cache to invalidate.
+
+    :type key_pbs: list of :class:`.entity_pb2.Key`
+    :param key_pbs: The keys of the entities written.
+    """
+    if key_pbs:
+        cache.delete_multi([_cache_key(key_pb) for key_pb in key_pbs])
+
+
+def _cache_key(key_pb):
+    """Cache key of a key protobuf.
+
+    The key is rebuilt as :meth:`~google.cloud.datastore.key.Key.to_protobuf`
+    would, so that keys returned by the backend match the keys sent to it.
+
+    :type key_pb: :class:`.entity_pb2.Key`
+    :param key_pb: The key of an entity.
+
+    :rtype: bytes
+    :returns: The serialized key.
+    """
+    return helpers.key_from_protobuf(key_pb)._to_protobuf_string()
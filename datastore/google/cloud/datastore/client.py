@@ -13,9 +13,17 @@
 # limitations under the License.
 """Convenience wrapper for invoking APIs/factories w/ a project."""
 
+import collections
+from concurrent.futures import ThreadPoolExecutor
 import os
+import random
+import threading
+import time
 
+from google.cloud._helpers import _chunked
+from google.cloud._helpers import _DEFAULT_MAX_WORKERS
 from google.cloud._helpers import _LocalStack
+from google.cloud._helpers import _map_concurrently
 from google.cloud._helpers import (
     _determine_default_project as _base_default_project)
 from google.cloud.client import _ClientProjectMixin
@@ -23,16 +31,33 @@ from google.cloud.client import Client as _BaseClient
 from google.cloud.datastore._http import Connection
 from google.cloud.datastore import helpers
 from google.cloud.datastore.batch import Batch
+from google.cloud.datastore.batch import _commit_chunked
+from google.cloud.datastore.cache import _get_entities
+from google.cloud.datastore.cache import _set_entities
 from google.cloud.datastore.entity import Entity
 from google.cloud.datastore.key import Key
 from google.cloud.datastore.query import Query
 from google.cloud.datastore.transaction import Transaction
+from google.cloud.datastore.transaction import TransactionStats
 from google.cloud.environment_vars import GCD_DATASET
+from google.cloud.exceptions import Conflict
 
 
 _MAX_LOOPS = 128
 """Maximum number of iterations to wait for deferred keys."""
 
+_ASYNC_MAX_WORKERS = 16
+"""Number of worker threads serving the ``*_async`` methods of a client."""
+
+_MAX_LOOKUP_KEYS = 1000
+"""Maximum number of keys the API accepts in one ``lookup`` request."""
+
+_MIN_LOOKUP_KEYS = 100
+"""Smallest chunk of keys worth sending as a separate ``lookup`` request."""
+
+_MAX_TRANSACTION_RETRY_DELAY = 10.0
+"""Maximum delay, in seconds, before retrying a conflicting transaction."""
+
 
 def _get_gcd_project():
     """Gets the GCD application ID if it can be inferred."""
@@ -102,15 +127,7 @@ def _extended_lookup(connection, project, key_pbs,
 
     :rtype: list of :class:`.entity_pb2.Entity`
     :returns: The requested entities.
-    :raises: :class:`ValueError` if missing / deferred are not null or
-             empty list.
     """
-    if missing is not None and missing != []:
-        raise ValueError('missing must be None or an empty list')
-
-    if deferred is not None and deferred != []:
-        raise ValueError('deferred must be None or an empty list')
-
     results = []
 
     loop_num = 0
@@ -143,6 +160,62 @@ def _extended_lookup(connection, project, key_pbs,
     return results
 
 
+def _lookup_chunk_size(num_keys, max_workers):
+    """Choose how many keys to send in each ``lookup`` request.
+
+    Keys are spread over ``max_workers`` concurrent requests, as long as
+    each gets at least ``_MIN_LOOKUP_KEYS`` keys, and no request exceeds
+    ``_MAX_LOOKUP_KEYS`` keys.
+
+    :type num_keys: int
+    :param num_keys: The number of keys to look up.
+
+    :type max_workers: int
+    :param max_workers: The number of concurrent requests.
+
+    :rtype: int
+    :returns: The number of keys per request.
+    """
+    size = -(-num_keys // max(max_workers, 1))
+    return min(max(size, _MIN_LOOKUP_KEYS), _MAX_LOOKUP_KEYS)
+
+
+def _key_path_id(key):
+    """Identify a key by its path and namespace, for ordering results.
+
+    :type key: :class:`google.cloud.datastore.key.Key`
+    :param key: The key to identify.
+
+    :rtype: tuple
+    :returns: The key's flat path and namespace (``None`` if empty).
+    """
+    return key.flat_path, key.namespace or None
+
+
+def _entity_groups(transaction):
+    """Root keys of the entity groups written by a transaction.
+
+    Helper for :meth:`Client.run_in_transaction`.
+
+    :type transaction: :class:`~google.cloud.datastore.transaction.Transaction`
+    :param transaction: The transaction.
+
+    :rtype: set of :class:`~google.cloud.datastore.key.Key`
+    :returns: The complete root keys of the keys written.  Keys of new
+              root entities (without IDs) are left out.
+    """
+    groups = set()
+    for key_pb in transaction._mutated_keys():
+        root_pb = key_pb.path[0]
+        id_or_name = root_pb.id or root_pb.name
+        if id_or_name:
+            groups.add(Key(
+                root_pb.kind, id_or_name,
+                project=key_pb.partition_id.project_id,
+                namespace=key_pb.partition_id.namespace_id or None))
+    return groups
+
+
 class Client(_BaseClient, _ClientProjectMixin):
     """Convenience wrapper for invoking APIs/factories w/ a project.
 
@@ -169,17 +242,28 @@ class Client(_BaseClient, _ClientProjectMixin):
                  :meth:`~httplib2.Http.request`. If not passed, an
                  ``http`` object is created that is bound to the
                  ``credentials`` for the current object.
+
+    :type cache: :class:`~google.cloud.datastore.cache.CacheBackend`
+    :param cache: (Optional) Cache of the entities looked up by
+                  :meth:`get_multi` outside of transactions.  The keys
+                  written by the client's commits are removed from it.
     """
 
     def __init__(self, project=None, namespace=None,
-                 credentials=None, http=None):
+                 credentials=None, http=None, cache=None):
         _ClientProjectMixin.__init__(self, project=project)
         _BaseClient.__init__(self, credentials=credentials, http=http)
         self._connection = Connection(
             credentials=self._credentials, http=self._http)
 
         self.namespace = namespace
+        self.cache = cache
         self._batch_stack = _LocalStack()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._transaction_stats = TransactionStats(0, 0, 0, 0)
+        self._transaction_conflicts = collections.Counter()
+        self._transaction_stats_lock = threading.Lock()
 
     @staticmethod
     def _determine_default(project):
@@ -209,6 +293,25 @@ class Client(_BaseClient, _ClientProjectMixin):
         """
         return self._batch_stack.pop()
 
+    def _submit(self, func, *args, **kwargs):
+        """Call a function in a worker thread.
+
+        "Protected", intended for use by the ``*_async`` methods.  The
+        worker threads are created on first use and shared by the client.
+        Any current batch or transaction must be passed explicitly to
+        ``func``, since it is local to the calling thread.
+
+        :type func: callable
+        :param func: The function to call.
+
+        :rtype: :class:`concurrent.futures.Future`
+        :returns: The future result of ``func(*args, **kwargs)``.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(_ASYNC_MAX_WORKERS)
+        return self._executor.submit(func, *args, **kwargs)
+
     @property
     def current_batch(self):
         """Currently-active batch.
@@ -232,7 +335,8 @@ class Client(_BaseClient, _ClientProjectMixin):
         if isinstance(transaction, Transaction):
             return transaction
 
-    def get(self, key, missing=None, deferred=None, transaction=None):
+    def get(self, key, missing=None, deferred=None, transaction=None,
+            lazy=False):
         """Retrieve an entity from a single key (if it exists).
 
         .. note::
@@ -257,17 +361,71 @@ class Client(_BaseClient, _ClientProjectMixin):
         :param transaction: (Optional) Transaction to use for read consistency.
                             If not passed, uses current transaction, if set.
 
+        :type lazy: bool
+        :param lazy: (Optional) If true, the properties of the entities are
+                     decoded from protobuf when first read, which saves
+                     time when only a few of them are used.  See
+                     :func:`~google.cloud.datastore.helpers.entity_from_protobuf`.
+
         :rtype: :class:`google.cloud.datastore.entity.Entity` or ``NoneType``
         :returns: The requested entity if it exists.
         """
         entities = self.get_multi(keys=[key], missing=missing,
-                                  deferred=deferred, transaction=transaction)
+                                  deferred=deferred, transaction=transaction,
+                                  lazy=lazy)
         if entities:
             return entities[0]
 
-    def get_multi(self, keys, missing=None, deferred=None, transaction=None):
+    def get_async(self, key, missing=None, deferred=None, transaction=None,
+                  lazy=False):
+        """Start retrieving an entity from a single key.
+
+        The lookup runs in a worker thread of the client, so several
+        lookups can be in flight at once.  See :meth:`get`.
+
+        :type key: :class:`google.cloud.datastore.key.Key`
+        :param key: The key to be retrieved from the datastore.
+
+        :type missing: list
+        :param missing: (Optional) If a list is passed, the key-only entities
+                        returned by the backend as "missing" will be copied
+                        into it, once the future is done.
+
+        :type deferred: list
+        :param deferred: (Optional) If a list is passed, the keys returned
+                         by the backend as "deferred" will be copied into it,
+                         once the future is done.
+
+        :type transaction: :class:`~.transaction.Transaction`
+        :param transaction: (Optional) Transaction to use for read consistency.
+                            If not passed, uses current transaction, if set.
+
+        :type lazy: bool
+        :param lazy: (Optional) If true, the properties of the entities are
+                     decoded from protobuf when first read, which saves
+                     time when only a few of them are used.  See
+                     :func:`~google.cloud.datastore.helpers.entity_from_protobuf`.
+
+        :rtype: :class:`concurrent.futures.Future`
+        :returns: A future for the requested entity, or ``None``.
+        """
+        return self._submit(
+            self.get, key, missing=missing, deferred=deferred,
+            transaction=transaction or self.current_transaction, lazy=lazy)
+
+    def get_multi(self, keys, missing=None, deferred=None, transaction=None,
+                  max_workers=None, as_dict=False, lazy=False):
         """Retrieve entities, along with their attributes.
 
+        Keys are split into chunks of up to 1000, which are looked up
+        concurrently.  Unless ``deferred`` is passed, keys deferred by the
+        backend are looked up again by the worker of their chunk, so the
+        chunks' deferrals are resolved concurrently too.
+
+        If the client has a :attr:`cache`, entities found in it are not
+        looked up, and entities looked up are added to it, unless in a
+        transaction.
+
         :type keys: list of :class:`google.cloud.datastore.key.Key`
         :param keys: The keys to be retrieved from the datastore.
 
@@ -285,43 +443,157 @@ class Client(_BaseClient, _ClientProjectMixin):
         :param transaction: (Optional) Transaction to use for read consistency.
                             If not passed, uses current transaction, if set.
 
-        :rtype: list of :class:`google.cloud.datastore.entity.Entity`
-        :returns: The requested entities.
+        :type max_workers: int
+        :param max_workers: (Optional) The maximum number of concurrent
+                            ``lookup`` requests.
+
+        :type as_dict: bool
+        :param as_dict: (Optional) If true, return a mapping of the keys
+                        found to their entities, rather than a list.
+
+        :type lazy: bool
+        :param lazy: (Optional) If true, the properties of the entities are
+                     decoded from protobuf when first read, which saves
+                     time when only a few of them are used.  See
+                     :func:`~google.cloud.datastore.helpers.entity_from_protobuf`.
+
+        :rtype: list of :class:`google.cloud.datastore.entity.Entity`, or
+                :class:`collections.OrderedDict`
+        :returns: The requested entities which exist, in the order of
+                  ``keys``; or, if ``as_dict`` is true, an ordered mapping of
+                  their keys to them.  ``missing`` and ``deferred`` are
+                  filled in the order of ``keys`` too.
         :raises: :class:`ValueError` if one or more of ``keys`` has a project
-                 which does not match our project.
+                 which does not match our project, or if ``missing`` or
+                 ``deferred`` is not empty.
         """
         if not keys:
-            return []
+            return collections.OrderedDict() if as_dict else []
 
         ids = set(key.project for key in keys)
         for current_id in ids:
             if current_id != self.project:
                 raise ValueError('Keys do not match project')
 
+        if missing is not None and missing != []:
+            raise ValueError('missing must be None or an empty list')
+
+        if deferred is not None and deferred != []:
+            raise ValueError('deferred must be None or an empty list')
+
         if transaction is None:
             transaction = self.current_transaction
 
-        entity_pbs = _extended_lookup(
-            connection=self._connection,
-            project=self.project,
-            key_pbs=[k.to_protobuf() for k in keys],
-            missing=missing,
-            deferred=deferred,
-            transaction_id=transaction and transaction.id,
-        )
-
+        if max_workers is None:
+            max_workers = _DEFAULT_MAX_WORKERS
+
+        entities = []
+        lookup_keys = keys
+        cache = self.cache if transaction is None else None
+        if cache is not None:
+            entities, lookup_keys, generations = _get_entities(
+                cache, keys, lazy=lazy)
+
+        def _lookup(key_pbs):
+            """Look up one chunk of keys."""
+            chunk_missing = [] if missing is not None else None
+            chunk_deferred = [] if deferred is not None else None
+            found = _extended_lookup(
+                connection=self._connection,
+                project=self.project,
+                key_pbs=key_pbs,
+                missing=chunk_missing,
+                deferred=chunk_deferred,
+                transaction_id=transaction and transaction.id,
+            )
+            return found, chunk_missing, chunk_deferred
+
+        chunks = _chunked(
+            [key._protobuf() for key in lookup_keys],
+            _lookup_chunk_size(len(lookup_keys), max_workers))
+        for found, chunk_missing, chunk_deferred in _map_concurrently(
+                _lookup, chunks, max_workers=max_workers):
+            if cache is not None:
+                _set_entities(cache, found, generations)
+            entities.extend(
+                helpers.entity_from_protobuf(entity_pb, lazy=lazy)
+                for entity_pb in found)
+            if missing is not None:
+                missing.extend(
+                    helpers.entity_from_protobuf(missed_pb)
+                    for missed_pb in chunk_missing)
+            if deferred is not None:
+                deferred.extend(
+                    helpers.key_from_protobuf(deferred_pb)
+                    for deferred_pb in chunk_deferred)
+
+        # Results arrive in the order chosen by the backend: put them in
+        # the order of the keys asked for.
+        positions = {}
+        for index, key in enumerate(keys):
+            positions.setdefault(_key_path_id(key), index)
+
+        def _position(key):
+            """Index of the first of ``keys`` matching ``key``."""
+            return positions.get(_key_path_id(key), len(keys))
+
+        entities.sort(key=lambda entity: _position(entity.key))
         if missing is not None:
-            missing[:] = [
-                helpers.entity_from_protobuf(missed_pb)
-                for missed_pb in missing]
-
+            missing.sort(key=lambda entity: _position(entity.key))
         if deferred is not None:
-            deferred[:] = [
-                helpers.key_from_protobuf(deferred_pb)
-                for deferred_pb in deferred]
+            deferred.sort(key=_position)
+
+        if as_dict:
+            return collections.OrderedDict(
+                (entity.key, entity) for entity in entities)
+        return entities
+
+    def get_multi_async(self, keys, missing=None, deferred=None,
+                        transaction=None, max_workers=None, as_dict=False,
+                        lazy=False):
+        """Start retrieving entities, along with their attributes.
+
+        The lookups run in a worker thread of the client, so several
+        of them can be in flight at once.  See :meth:`get_multi`.
+
+        :type keys: list of :class:`google.cloud.datastore.key.Key`
+        :param keys: The keys to be retrieved from the datastore.
+
+        :type missing: list
+        :param missing: (Optional) If a list is passed, the key-only entities
+                        returned by the backend as "missing" will be copied
+                        into it, once the future is done.
+
+        :type deferred: list
+        :param deferred: (Optional) If a list is passed, the keys returned
+                         by the backend as "deferred" will be copied into it,
+                         once the future is done.
+
+        :type transaction: :class:`~.transaction.Transaction`
+        :param transaction: (Optional) Transaction to use for read consistency.
+                            If not passed, uses current transaction, if set.
 
-        return [helpers.entity_from_protobuf(entity_pb)
-                for entity_pb in entity_pbs]
+        :type max_workers: int
+        :param max_workers: (Optional) The maximum number of concurrent
+                            ``lookup`` requests.
+
+        :type as_dict: bool
+        :param as_dict: (Optional) If true, the future's result maps keys to
+                        entities.
+
+        :type lazy: bool
+        :param lazy: (Optional) If true, the properties of the entities are
+                     decoded from protobuf when first read, which saves
+                     time when only a few of them are used.  See
+                     :func:`~google.cloud.datastore.helpers.entity_from_protobuf`.
+
+        :rtype: :class:`concurrent.futures.Future`
+        :returns: A future for the requested entities.
+        """
+        return self._submit(
+            self.get_multi, list(keys), missing=missing, deferred=deferred,
+            transaction=transaction or self.current_transaction,
+            max_workers=max_workers, as_dict=as_dict, lazy=lazy)
 
     def put(self, entity):
         """Save an entity in the Cloud Datastore.
@@ -340,6 +612,10 @@ class Client(_BaseClient, _ClientProjectMixin):
     def put_multi(self, entities):
         """Save entities in the Cloud Datastore.
 
+        Outside of a batch or transaction, the entities are saved atomically,
+        in a single commit (of at most 500 entities, the API's limit).  To
+        save more, in several non-atomic commits, use :meth:`bulk_put`.
+
         :type entities: list of :class:`google.cloud.datastore.entity.Entity`
         :param entities: The entities to be saved to the datastore.
 
@@ -364,6 +640,76 @@ class Client(_BaseClient, _ClientProjectMixin):
         if not in_batch:
             current.commit()
 
+    def bulk_put(self, entities, max_workers=None):
+        """Save many entities using concurrent, non-transactional commits.
+
+        The entities are split into commits of up to 500 mutations (the
+        API's limit), with up to ``max_workers`` commits in flight at once.
+        Entities with partial keys have their keys completed in place.
+        A failed commit does not prevent the others.
+
+        .. note::
+
+           Saves of the same key in different commits may be applied in any
+           order.
+
+        :type entities: list of :class:`google.cloud.datastore.entity.Entity`
+        :param entities: The entities to be saved to the datastore.
+
+        :type max_workers: int
+        :param max_workers: (Optional) The maximum number of concurrent
+                            commits.
+
+        :rtype: list of :class:`~google.cloud.datastore.batch.CommitResult`
+        :returns: One result per commit, in the order of ``entities``.
+        :raises: :class:`ValueError` if one of ``entities`` has no key, or a
+                 key whose project does not match ours; nothing is saved
+                 then.
+        """
+        entities = list(entities)
+        for entity in entities:
+            if entity.key is None:
+                raise ValueError('Entity must have a key')
+            if entity.key.project != self.project:
+                raise ValueError('Key must be from same project as client')
+        return list(_commit_chunked(
+            self, entities, Batch.put, max_workers=max_workers))
+
+    def put_async(self, entity):
+        """Start saving an entity in the Cloud Datastore.
+
+        See :meth:`put_multi_async`.
+
+        :type entity: :class:`google.cloud.datastore.entity.Entity`
+        :param entity: The entity to be saved to the datastore.
+
+        :rtype: :class:`concurrent.futures.Future`
+        :returns: A future whose result is ``None`` once the entity is saved.
+        """
+        return self.put_multi_async(entities=[entity])
+
+    def put_multi_async(self, entities):
+        """Start saving entities in the Cloud Datastore.
+
+        The commit runs in a worker thread of the client, so several of
+        them can be in flight at once.  Inside a batch or transaction, the
+        entities are added to it right away, and the returned future is
+        already done.  See :meth:`put_multi`.
+
+        :type entities: list of :class:`google.cloud.datastore.entity.Entity`
+        :param entities: The entities to be saved to the datastore.
+
+        :rtype: :class:`concurrent.futures.Future`
+        :returns: A future whose result is ``None`` once the entities are
+                  saved.
+        :raises: :class:`ValueError` if ``entities`` is a single entity.
+        """
+        if isinstance(entities, Entity):
+            raise ValueError("Pass a sequence of entities")
+        if self.current_batch is not None:
+            return helpers._completed_future(self.put_multi(entities))
+        return self._submit(self.put_multi, list(entities))
+
     def delete(self, key):
         """Delete the key in the Cloud Datastore.
 
@@ -381,6 +727,10 @@ class Client(_BaseClient, _ClientProjectMixin):
     def delete_multi(self, keys):
         """Delete keys from the Cloud Datastore.
 
+        Outside of a batch or transaction, the keys are deleted atomically,
+        in a single commit (of at most 500 keys, the API's limit).  To
+        delete more, in several non-atomic commits, use :meth:`bulk_delete`.
+
         :type keys: list of :class:`google.cloud.datastore.key.Key`
         :param keys: The keys to be deleted from the Datastore.
         """
@@ -401,6 +751,66 @@ class Client(_BaseClient, _ClientProjectMixin):
         if not in_batch:
             current.commit()
 
+    def bulk_delete(self, keys, max_workers=None):
+        """Delete many keys using concurrent, non-transactional commits.
+
+        The keys are split into commits of up to 500 mutations (the API's
+        limit), with up to ``max_workers`` commits in flight at once.  A
+        failed commit does not prevent the others.
+
+        :type keys: list of :class:`google.cloud.datastore.key.Key`
+        :param keys: The keys to be deleted from the Datastore.
+
+        :type max_workers: int
+        :param max_workers: (Optional) The maximum number of concurrent
+                            commits.
+
+        :rtype: list of :class:`~google.cloud.datastore.batch.CommitResult`
+        :returns: One result per commit, in the order of ``keys``.
+        :raises: :class:`ValueError` if one of ``keys`` is partial or its
+                 project does not match ours; nothing is deleted then.
+        """
+        keys = list(keys)
+        for key in keys:
+            if key.is_partial:
+                raise ValueError('Key must be complete')
+            if key.project != self.project:
+                raise ValueError('Key must be from same project as client')
+        return list(_commit_chunked(
+            self, keys, Batch.delete, max_workers=max_workers))
+
+    def delete_async(self, key):
+        """Start deleting the key in the Cloud Datastore.
+
+        See :meth:`delete_multi_async`.
+
+        :type key: :class:`google.cloud.datastore.key.Key`
+        :param key: The key to be deleted from the datastore.
+
+        :rtype: :class:`concurrent.futures.Future`
+        :returns: A future whose result is ``None`` once the key is deleted.
+        """
+        return self.delete_multi_async(keys=[key])
+
+    def delete_multi_async(self, keys):
+        """Start deleting keys from the Cloud Datastore.
+
+        The commit runs in a worker thread of the client, so several of
+        them can be in flight at once.  Inside a batch or transaction, the
+        keys are added to it right away, and the returned future is
+        already done.  See :meth:`delete_multi`.
+
+        :type keys: list of :class:`google.cloud.datastore.key.Key`
+        :param keys: The keys to be deleted from the Datastore.
+
+        :rtype: :class:`concurrent.futures.Future`
+        :returns: A future whose result is ``None`` once the keys are
+                  deleted.
+        """
+        if self.current_batch is not None:
+            return helpers._completed_future(self.delete_multi(keys))
+        return self._submit(self.delete_multi, list(keys))
+
     def allocate_ids(self, incomplete_key, num_ids):
         """Allocate a list of IDs from a partial key.
 
@@ -446,9 +856,126 @@ class Client(_BaseClient, _ClientProjectMixin):
         """Proxy to :class:`google.cloud.datastore.batch.Batch`."""
         return Batch(self)
 
-    def transaction(self):
-        """Proxy to :class:`google.cloud.datastore.transaction.Transaction`."""
-        return Transaction(self)
+    def transaction(self, read_only=False):
+        """Proxy to :class:`google.cloud.datastore.transaction.Transaction`.
+
+        :type read_only: bool
+        :param read_only: (Optional) If true, the transaction refuses
+                          mutations.
+        """
+        return Transaction(self, read_only=read_only)
+
+    def run_in_transaction(self, func, retries=3, read_only=False,
+                           retry_delay=0.1):
+        """Run a function in a transaction, retrying it on contention.
+
+        ``func`` is called with a new, current transaction, which is
+        committed once ``func`` returns (or rolled back if it raises).  If
+        the transaction fails with a
+        :class:`~google.cloud.exceptions.Conflict` (another transaction
+        changed the same entity groups), ``func`` is run again in a fresh
+        transaction, after an exponential, jittered delay.  ``func`` must
+        therefore be safe to call more than once:
+
+        .. code-block:: python
+
+          >>> def transfer(transaction):
+          ...     source, dest = client.get_multi([source_key, dest_key])
+          ...     source['balance'] -= 10
+          ...     dest['balance'] += 10
+          ...     client.put_multi([source, dest])
+          >>> client.run_in_transaction(transfer)
+
+        Attempts and conflicts are counted in :attr:`transaction_stats`,
+        and conflicts by entity group in :attr:`transaction_conflicts`.
+
+        :type func: callable
+        :param func: Takes the
+                     :class:`~google.cloud.datastore.transaction.Transaction`
+                     and returns the result.
+
+        :type retries: int
+        :param retries: (Optional) The number of times ``func`` is run
+                        again after a conflict.
+
+        :type read_only: bool
+        :param read_only: (Optional) If true, the transaction refuses
+                          mutations.
+
+        :type retry_delay: float
+        :param retry_delay: (Optional) The delay, in seconds, before the
+                            first retry; doubled for each further retry, up
+                            to 10 seconds, and randomized by up to 50%.
+
+        :rtype: object
+        :returns: The value returned by ``func``.
+        :raises: :class:`~google.cloud.exceptions.Conflict` if the last
+                 attempt conflicts, or any other error raised by ``func``
+                 or the transaction.
+        """
+        attempts = 0
+        while True:
+            attempts += 1
+            transaction = self.transaction(read_only=read_only)
+            try:
+                with transaction:
+                    result = func(transaction)
+            except Conflict:
+                self._record_transaction(
+                    attempts=1, conflicts=1,
+                    groups=_entity_groups(transaction))
+                if attempts > retries:
+                    self._record_transaction(runs=1, failures=1)
+                    raise
+                delay = min(retry_delay * 2 ** (attempts - 1),
+                            _MAX_TRANSACTION_RETRY_DELAY)
+                time.sleep(delay * random.uniform(0.5, 1.0))
+                continue
+            except Exception:
+                self._record_transaction(runs=1, attempts=1, failures=1)
+                raise
+            self._record_transaction(runs=1, attempts=1)
+            return result
+
+    @property
+    def transaction_stats(self):
+        """Counters of the transactions run by :meth:`run_in_transaction`.
+
+        :rtype: :class:`~google.cloud.datastore.transaction.TransactionStats`
+        :returns: The numbers of runs, attempts, conflicting attempts and
+                  failed runs so far.
+        """
+        return self._transaction_stats
+
+    @property
+    def transaction_conflicts(self):
+        """Conflicts of :meth:`run_in_transaction`, by entity group.
+
+        Each conflicting attempt counts once for each entity group it
+        wrote to, so the most common groups are the most contended ones.
+
+        :rtype: :class:`collections.Counter`
+        :returns: The number of conflicts, by root key.
+        """
+        with self._transaction_stats_lock:
+            return collections.Counter(self._transaction_conflicts)
+
+    def _record_transaction(self, groups=(), **counts):
+        """Add to the counters of :meth:`run_in_transaction`.
+
+        :type groups: set of :class:`~google.cloud.datastore.key.Key`
+        :param groups: The entity groups of a conflicting attempt.
+
+        :type counts: dict
+        :param counts: Increments of
+                       :class:`~google.cloud.datastore.transaction.\\
+                       TransactionStats` fields.
+        """
+        with self._transaction_stats_lock:
+            self._transaction_stats = self._transaction_stats._replace(**dict(
+                (name, getattr(self._transaction_stats, name) + count)
+                for name, count in counts.items()))
+            self._transaction_conflicts.update(groups)
 
     def query(self, **kwargs):
         """Proxy to :class:`google.cloud.datastore.query.Query`.
@@ -17,6 +17,7 @@
 The non-private functions are part of the API.
 """
 
+from concurrent.futures import Future
 import datetime
 import itertools
 
@@ -29,6 +30,7 @@ from google.cloud._helpers import _pb_timestamp_to_datetime
 from google.cloud.grpc.datastore.v1 import entity_pb2 as _entity_pb2
 from google.cloud.datastore.entity import Entity
 from google.cloud.datastore.key import Key
+from google.cloud.datastore.key import _intern
 
 
 def _get_meaning(value_pb, is_list=False):
@@ -100,7 +102,7 @@ def _property_tuples(entity_pb):
     return six.iteritems(entity_pb.properties)
 
 
-def entity_from_protobuf(pb):
+def entity_from_protobuf(pb, lazy=False, intern_keys=False):
     """Factory method for creating an entity based on a protobuf.
 
     The protobuf should be one returned from the Cloud Datastore
@@ -109,43 +111,44 @@ def entity_from_protobuf(pb):
     :type pb: :class:`.entity_pb2.Entity`
     :param pb: The Protobuf representing the entity.
 
+    :type lazy: bool
+    :param lazy: (Optional) If true, each property is decoded from ``pb``
+                 the first time it is read, rather than up front.  Values
+                 of such an entity must be read through its methods: C
+                 code treating it as a plain :class:`dict` (e.g.
+                 :func:`json.dumps`) sees undecoded placeholders.  Ignored
+                 on Python 2, where ``dict(entity)`` and
+                 ``other.update(entity)`` would copy the placeholders too.
+
+    :type intern_keys: bool
+    :param intern_keys: (Optional) If true, the key of the entity and the
+                        keys among its values are interned: see
+                        :func:`~google.cloud.datastore.key.intern_key`.
+
     :rtype: :class:`google.cloud.datastore.entity.Entity`
     :returns: The entity derived from the protobuf.
     """
     key = None
     if pb.HasField('key'):  # Message field (Key)
-        key = key_from_protobuf(pb.key)
+        key = key_from_protobuf(pb.key, interned=intern_keys)
+
+    if not pb.properties:  # E.g. the results of a keys-only query.
+        return Entity(key=key)
+
+    if lazy and not six.PY2:
+        return _LazyEntity(key, pb, intern_keys)
 
     entity_props = {}
     entity_meanings = {}
     exclude_from_indexes = []
 
     for prop_name, value_pb in _property_tuples(pb):
-        value = _get_value_from_value_pb(value_pb)
+        value, meaning = _decode_property(value_pb, intern_keys)
         entity_props[prop_name] = value
-
-        # Check if the property has an associated meaning.
-        is_list = isinstance(value, list)
-        meaning = _get_meaning(value_pb, is_list=is_list)
         if meaning is not None:
             entity_meanings[prop_name] = (meaning, value)
-
-        # Check if ``value_pb`` was excluded from index. Lists need to be
-        # special-cased and we require all ``exclude_from_indexes`` values
-        # in a list agree.
-        if is_list:
-            exclude_values = set(value_pb.exclude_from_indexes
-                                 for value_pb in value_pb.array_value.values)
-            if len(exclude_values) != 1:
-                raise ValueError('For an array_value, subvalues must either '
-                                 'all be indexed or all excluded from '
-                                 'indexes.')
-
-            if exclude_values.pop():
-                exclude_from_indexes.append(prop_name)
-        else:
-            if value_pb.exclude_from_indexes:
-                exclude_from_indexes.append(prop_name)
+        if _is_excluded_from_indexes(value_pb):
+            exclude_from_indexes.append(prop_name)
 
     entity = Entity(key=key, exclude_from_indexes=exclude_from_indexes)
     entity.update(entity_props)
@@ -153,6 +156,202 @@ def entity_from_protobuf(pb):
     return entity
 
 
+def _decode_property(value_pb, intern_keys=False):
+    """Decode the value of a property, and its meaning.
+
+    :type value_pb: :class:`.entity_pb2.Value`
+    :param value_pb: The protobuf value of the property.
+
+    :type intern_keys: bool
+    :param intern_keys: (Optional) Whether to intern decoded keys.
+
+    :rtype: tuple
+    :returns: The pair of the native value and its meaning (or ``None``).
+    """
+    value = _get_value_from_value_pb(value_pb, intern_keys)
+    meaning = _get_meaning(value_pb, is_list=isinstance(value, list))
+    return value, meaning
+
+
+def _is_excluded_from_indexes(value_pb):
+    """Check if the value of a property is excluded from indexes.
+
+    Lists need to be special-cased and we require all
+    ``exclude_from_indexes`` values in a list agree.
+
+    :type value_pb: :class:`.entity_pb2.Value`
+    :param value_pb: The protobuf value of the property.
+
+    :rtype: bool
+    :returns: Whether the value is excluded from indexes.
+    :raises: :class:`ValueError` if the subvalues of a list disagree.
+    """
+    if value_pb.WhichOneof('value_type') != 'array_value':
+        return value_pb.exclude_from_indexes
+
+    exclude_values = set(sub_value_pb.exclude_from_indexes
+                         for sub_value_pb in value_pb.array_value.values)
+    if len(exclude_values) != 1:
+        raise ValueError('For an array_value, subvalues must either '
+                         'all be indexed or all excluded from '
+                         'indexes.')
+    return exclude_values.pop()
+
+
+_UNDECODED = object()
+"""Placeholder for the values of a :class:`_LazyEntity` not yet decoded."""
+
+
+class _LazyEntity(Entity):
+    """An entity decoding its properties from protobuf on first access.
+
+    Property names and index exclusions are known up front; values (and
+    their meanings) are decoded when read.  Methods which return all the
+    values, or compare or change the entity as a whole, decode all of
+    them first.
+
+    :type key: :class:`google.cloud.datastore.key.Key`
+    :param key: The key of the entity.
+
+    :type pb: :class:`.entity_pb2.Entity`
+    :param pb: The Protobuf representing the entity.
+
+    :type intern_keys: bool
+    :param intern_keys: Whether to intern the keys among the values.
+    """
+
+    def __init__(self, key, pb, intern_keys):
+        exclude_from_indexes = [
+            prop_name for prop_name, value_pb in _property_tuples(pb)
+            if _is_excluded_from_indexes(value_pb)]
+        super(_LazyEntity, self).__init__(
+            key=key, exclude_from_indexes=exclude_from_indexes)
+        self._value_pbs = dict(_property_tuples(pb))
+        self._intern_keys = intern_keys
+        dict.update(self, dict.fromkeys(self._value_pbs, _UNDECODED))
+
+    def _decode(self, name):
+        """Decode one property, unless already decoded.
+
+        :type name: str
+        :param name: The name of the property.
+
+        :rtype: object
+        :returns: The value of the property.
+        """
+        value_pb = self._value_pbs.get(name)
+        if value_pb is None:
+            return dict.__getitem__(self, name)
+        value, meaning = _decode_property(value_pb, self._intern_keys)
+        dict.__setitem__(self, name, value)
+        if meaning is not None:
+            self._meanings[name] = (meaning, value)
+        # Dropped last, so that concurrent readers find the value set.
+        self._value_pbs.pop(name, None)
+        return value
+
+    def _decode_all(self):
+        """Decode all properties not yet decoded."""
+        for name in list(self._value_pbs):
+            self._decode(name)
+
+    def __iter__(self):
+        # Overriding ``__iter__`` keeps CPython 3 from copying the stored
+        # placeholders in ``dict(entity)`` or ``other.update(entity)``: the
+        # values of such mappings are read through ``__getitem__``.
+        # Python 2 copies them regardless, so it never builds lazy
+        # entities.
+        return super(_LazyEntity, self).__iter__()
+
+    def __reduce__(self):
+        # Pickled as a plain entity, with all of its values decoded.
+        entity = Entity(key=self.key,
+                        exclude_from_indexes=list(self.exclude_from_indexes))
+        entity.update(self)
+        entity._meanings.update(self._meanings)
+        return Entity, (), vars(entity), None, iter(entity.items())
+
+    def __getitem__(self, name):
+        value = super(_LazyEntity, self).__getitem__(name)
+        if value is _UNDECODED:
+            value = self._decode(name)
+        return value
+
+    def get(self, name, default=None):
+        if name in self:
+            return self[name]
+        return default
+
+    def __setitem__(self, name, value):
+        self._value_pbs.pop(name, None)
+        super(_LazyEntity, self).__setitem__(name, value)
+
+    def __delitem__(self, name):
+        self._value_pbs.pop(name, None)
+        super(_LazyEntity, self).__delitem__(name)
+
+    def pop(self, name, *default):
+        if name in self._value_pbs:
+            self._decode(name)
+        return super(_LazyEntity, self).pop(name, *default)
+
+    def __eq__(self, other):
+        self._decode_all()
+        if isinstance(other, _LazyEntity):
+            other._decode_all()
+        return super(_LazyEntity, self).__eq__(other)
+
+    def __repr__(self):
+        self._decode_all()
+        return super(_LazyEntity, self).__repr__()
+
+    def clear(self):
+        self._value_pbs.clear()
+        super(_LazyEntity, self).clear()
+
+    def copy(self):
+        self._decode_all()
+        return super(_LazyEntity, self).copy()
+
+    def items(self):
+        self._decode_all()
+        return super(_LazyEntity, self).items()
+
+    def values(self):
+        self._decode_all()
+        return super(_LazyEntity, self).values()
+
+    def popitem(self):
+        self._decode_all()
+        return super(_LazyEntity, self).popitem()
+
+    def setdefault(self, name, default=None):
+        if name in self._value_pbs:
+            self._decode(name)
+        return super(_LazyEntity, self).setdefault(name, default)
+
+    def update(self, *args, **kwargs):
+        self._decode_all()
+        super(_LazyEntity, self).update(*args, **kwargs)
+
+    if six.PY2:  # pragma: NO COVER
+        def iteritems(self):
+            self._decode_all()
+            return super(_LazyEntity, self).iteritems()
+
+        def itervalues(self):
+            self._decode_all()
+            return super(_LazyEntity, self).itervalues()
+
+        def viewitems(self):
+            self._decode_all()
+            return super(_LazyEntity, self).viewitems()
+
+        def viewvalues(self):
+            self._decode_all()
+            return super(_LazyEntity, self).viewvalues()
+
+
 def _set_pb_meaning_from_entity(entity, name, value, value_pb,
                                 is_list=False):
     """Add meaning information (from an entity) to a protobuf.
@@ -206,7 +405,7 @@ def entity_to_protobuf(entity):
     """
     entity_pb = _entity_pb2.Entity()
     if entity.key is not None:
-        key_pb = entity.key.to_protobuf()
+        key_pb = entity.key._protobuf()
         entity_pb.key.CopyFrom(key_pb)
 
     for name, value in entity.items():
@@ -233,7 +432,7 @@ def entity_to_protobuf(entity):
     return entity_pb
 
 
-def key_from_protobuf(pb):
+def key_from_protobuf(pb, interned=False):
     """Factory method for creating a key based on a protobuf.
 
     The protobuf should be one returned from the Cloud Datastore
@@ -242,8 +441,14 @@ def key_from_protobuf(pb):
     :type pb: :class:`.entity_pb2.Key`
     :param pb: The Protobuf representing the key.
 
+    :type interned: bool
+    :param interned: (Optional) If true, return the interned key equal to
+                     the protobuf (see
+                     :func:`~google.cloud.datastore.key.intern_key`),
+                     only building a new key the first time.
+
     :rtype: :class:`google.cloud.datastore.key.Key`
-    :returns: a new `Key` instance
+    :returns: a new `Key` instance, or an interned one.
     """
     path_args = []
     for element in pb.path:
@@ -262,6 +467,10 @@ def key_from_protobuf(pb):
     if pb.partition_id.namespace_id:  # Simple field (string)
         namespace = pb.partition_id.namespace_id
 
+    if interned and path_args and len(path_args) % 2 == 0:
+        return _intern(
+            tuple(path_args), project, namespace,
+            lambda: Key(*path_args, namespace=namespace, project=project))
     return Key(*path_args, namespace=namespace, project=project)
 
 
@@ -302,7 +511,7 @@ def _pb_attr_value(val):
         name = 'timestamp'
         value = _datetime_to_pb_timestamp(val)
     elif isinstance(val, Key):
-        name, value = 'key', val.to_protobuf()
+        name, value = 'key', val._protobuf()
     elif isinstance(val, bool):
         name, value = 'boolean', val
     elif isinstance(val, float):
@@ -327,7 +536,7 @@ def _pb_attr_value(val):
     return name + '_value', value
 
 
-def _get_value_from_value_pb(value_pb):
+def _get_value_from_value_pb(value_pb, intern_keys=False):
     """Given a protobuf for a Value, get the correct value.
 
     The Cloud Datastore Protobuf API returns a Property Protobuf which
@@ -340,6 +549,9 @@ def _get_value_from_value_pb(value_pb):
     :type value_pb: :class:`.entity_pb2.Value`
     :param value_pb: The Value Protobuf.
 
+    :type intern_keys: bool
+    :param intern_keys: (Optional) Whether to intern key values.
+
     :rtype: object
     :returns: The value provided by the Protobuf.
     :raises: :class:`ValueError <exceptions.ValueError>` if no value type
@@ -351,7 +563,7 @@ def _get_value_from_value_pb(value_pb):
         result = _pb_timestamp_to_datetime(value_pb.timestamp_value)
 
     elif value_type == 'key_value':
-        result = key_from_protobuf(value_pb.key_value)
+        result = key_from_protobuf(value_pb.key_value, interned=intern_keys)
 
     elif value_type == 'boolean_value':
         result = value_pb.boolean_value
@@ -369,10 +581,11 @@ def _get_value_from_value_pb(value_pb):
         result = value_pb.blob_value
 
     elif value_type == 'entity_value':
-        result = entity_from_protobuf(value_pb.entity_value)
+        result = entity_from_protobuf(value_pb.entity_value,
+                                      intern_keys=intern_keys)
 
     elif value_type == 'array_value':
-        result = [_get_value_from_value_pb(value)
+        result = [_get_value_from_value_pb(value, intern_keys)
                   for value in value_pb.array_value.values]
 
     elif value_type == 'geo_point_value':
@@ -466,3 +679,17 @@ class GeoPoint(object):
         :returns: False if the points compare equal, else True.
         """
         return not self.__eq__(other)
+
+
+def _completed_future(result):
+    """Wrap a result already available in a future.
+
+    :type result: object
+    :param result: The result of the future.
+
+    :rtype: :class:`concurrent.futures.Future`
+    :returns: A future which is already done.
+    """
+    future = Future()
+    future.set_result(result)
+    return future
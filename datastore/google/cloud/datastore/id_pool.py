@@ -0,0 +1,185 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Hand out complete keys from IDs allocated ahead of time.
+
+:meth:`~google.cloud.datastore.client.Client.allocate_ids` makes a request
+each time it is called.  An :class:`IDPool` instead allocates IDs in
+batches, per partial key, and completes keys from them without waiting;
+it allocates the next batch in the background once few IDs are left:
+
+.. code-block:: python
+
+  >>> from google.cloud import datastore
+  >>> from google.cloud.datastore.id_pool import IDPool
+  >>> client = datastore.Client()
+  >>> pool = IDPool(client, batch_size=1000)
+  >>> order = datastore.Entity(pool.next_key(client.key('Order')))
+  >>> item = datastore.Entity(pool.next_key(client.key('Item')))
+  >>> item['order'] = order.key
+  >>> client.put_multi([order, item])
+
+A pool may be shared by several threads.  IDs left in the pool when it is
+discarded are never used, which is harmless: allocated IDs are only
+reserved, not stored.
+"""
+
+import collections
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+
+_REFILL_MAX_WORKERS = 4
+"""Maximum number of batches of IDs allocated concurrently by a pool."""
+
+
+class IDPool(object):
+    """A thread-safe pool of IDs allocated ahead of time, per partial key.
+
+    :type client: :class:`~google.cloud.datastore.client.Client`
+    :param client: The client used to allocate IDs.
+
+    :type batch_size: int
+    :param batch_size: (Optional) The number of IDs allocated per request.
+
+    :type low_water_mark: int
+    :param low_water_mark: (Optional) The number of IDs left for a partial
+                           key at which the next batch is allocated in the
+                           background.  Defaults to a quarter of
+                           ``batch_size``.
+
+    :raises: :class:`ValueError` if ``batch_size`` is not positive, or
+             ``low_water_mark`` is not less than ``batch_size``.
+    """
+
+    def __init__(self, client, batch_size=500, low_water_mark=None):
+        if batch_size < 1:
+            raise ValueError('batch_size must be positive', batch_size)
+        if low_water_mark is None:
+            low_water_mark = batch_size // 4
+        if not 0 <= low_water_mark < batch_size:
+            raise ValueError('low_water_mark must be in [0, batch_size)',
+                             low_water_mark)
+        self._client = client
+        self.batch_size = batch_size
+        self.low_water_mark = low_water_mark
+        self._ranges = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=_REFILL_MAX_WORKERS)
+
+    def next_key(self, incomplete_key):
+        """Complete a partial key with the next ID of the pool.
+
+        :type incomplete_key: :class:`~google.cloud.datastore.key.Key`
+        :param incomplete_key: The partial key to complete.
+
+        :rtype: :class:`~google.cloud.datastore.key.Key`
+        :returns: A complete key, with ``incomplete_key`` as root.
+        :raises: :class:`ValueError` if ``incomplete_key`` is not a partial
+                 key, or any error raised while allocating IDs.
+        """
+        key, = self.next_keys(incomplete_key, 1)
+        return key
+
+    def next_keys(self, incomplete_key, num_keys):
+        """Complete a partial key with the next IDs of the pool.
+
+        Only blocks if the pool has fewer than ``num_keys`` IDs for
+        ``incomplete_key``, until the IDs being allocated arrive.
+
+        :type incomplete_key: :class:`~google.cloud.datastore.key.Key`
+        :param incomplete_key: The partial key to complete.
+
+        :type num_keys: int
+        :param num_keys: The number of keys wanted.
+
+        :rtype: list of :class:`~google.cloud.datastore.key.Key`
+        :returns: Complete keys, with ``incomplete_key`` as root.
+        :raises: :class:`ValueError` if ``incomplete_key`` is not a partial
+                 key, or any error raised while allocating IDs.
+        """
+        if not incomplete_key.is_partial:
+            raise ValueError(('Key is not partial.', incomplete_key))
+
+        id_range = self._range(incomplete_key)
+        ids = []
+        try:
+            while True:
+                with id_range.lock:
+                    while id_range.ids and len(ids) < num_keys:
+                        ids.append(id_range.ids.popleft())
+                    if (len(id_range.ids) <= self.low_water_mark and
+                            id_range.refill is None):
+                        id_range.refill = self._executor.submit(
+                            self._refill, id_range, incomplete_key)
+                    refill = id_range.refill
+                if len(ids) == num_keys:
+                    break
+                refill.result()
+        except Exception:
+            # Return the IDs taken so far, for the next caller.
+            with id_range.lock:
+                id_range.ids.extendleft(reversed(ids))
+            raise
+
+        return [incomplete_key.completed_key(allocated_id)
+                for allocated_id in ids]
+
+    def _range(self, incomplete_key):
+        """Get the IDs allocated for a partial key.
+
+        :type incomplete_key: :class:`~google.cloud.datastore.key.Key`
+        :param incomplete_key: The partial key.
+
+        :rtype: :class:`_IDRange`
+        :returns: The IDs of the pool for ``incomplete_key``.
+        """
+        # Partial keys never compare equal: look them up by their parts.
+        range_key = (incomplete_key.flat_path, incomplete_key.project,
+                     incomplete_key.namespace)
+        with self._lock:
+            id_range = self._ranges.get(range_key)
+            if id_range is None:
+                id_range = self._ranges[range_key] = _IDRange()
+            return id_range
+
+    def _refill(self, id_range, incomplete_key):
+        """Allocate a batch of IDs for a partial key.
+
+        :type id_range: :class:`_IDRange`
+        :param id_range: The IDs of the pool for ``incomplete_key``.
+
+        :type incomplete_key: :class:`~google.cloud.datastore.key.Key`
+        :param incomplete_key: The partial key.
+
+        :raises: Any error raised by the request.
+        """
+        try:
+            keys = self._client.allocate_ids(incomplete_key, self.batch_size)
+        except Exception:
+            with id_range.lock:
+                id_range.refill = None
+            raise
+        with id_range.lock:
+            id_range.ids.extend(key.id for key in keys)
+            id_range.refill = None
+
+
+class _IDRange(object):
+    """The IDs of a pool for one partial key."""
+
+    def __init__(self):
+        self.ids = collections.deque()
+        self.refill = None
+        self.lock = threading.Lock()
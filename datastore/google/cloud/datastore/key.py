@@ -15,11 +15,23 @@
 """Create / interact with Google Cloud Datastore keys."""
 
 import copy
+import threading
+import weakref
+
 import six
 
 from google.cloud.grpc.datastore.v1 import entity_pb2 as _entity_pb2
 
 
+_INTERNED = weakref.WeakValueDictionary()
+"""Keys returned by :func:`intern_key`, by project, namespace and path."""
+
+_INTERNED_LOCK = threading.Lock()
+
+_PICKLED_SLOTS = ('_flat_path', '_parent', '_namespace', '_project', '_path')
+"""Slots of :class:`Key` kept when pickling; the others are caches."""
+
+
 class Key(object):
     """An immutable representation of a datastore Key.
 
@@ -84,6 +96,9 @@ class Key(object):
     The project argument is required unless it has been set implicitly.
     """
 
+    __slots__ = ('_flat_path', '_parent', '_namespace', '_project', '_path',
+                 '_hash', '_pb', '_serialized', '__weakref__')
+
     def __init__(self, *path_args, **kwargs):
         self._flat_path = path_args
         parent = self._parent = kwargs.get('parent')
@@ -93,6 +108,10 @@ class Key(object):
         # _flat_path, _parent, _namespace and _project must be set before
         # _combine_args() is called.
         self._path = self._combine_args()
+        # Computed on first use: keys are immutable once built.
+        self._hash = None
+        self._pb = None
+        self._serialized = None
 
     def __eq__(self, other):
         """Compare two keys for equality.
@@ -134,9 +153,33 @@ class Key(object):
         :rtype: int
         :returns: a hash of the key's state.
         """
-        return (hash(self.flat_path) +
-                hash(self.project) +
-                hash(self.namespace))
+        if self._hash is None:
+            self._hash = hash(
+                (self._flat_path, self._project, self._namespace))
+        return self._hash
+
+    def __getstate__(self):
+        """Get the state to pickle, leaving out the cached values.
+
+        The cached hash would be wrong in a process using another hash
+        seed.
+
+        :rtype: dict
+        :returns: The values of the slots, by name.
+        """
+        return dict((name, getattr(self, name)) for name in _PICKLED_SLOTS)
+
+    def __setstate__(self, state):
+        """Restore the state of an unpickled key.
+
+        :type state: dict
+        :param state: The values returned by :meth:`__getstate__`.
+        """
+        for name, value in six.iteritems(state):
+            setattr(self, name, value)
+        self._hash = None
+        self._pb = None
+        self._serialized = None
 
     @staticmethod
     def _parse_path(path_args):
@@ -261,6 +304,40 @@ class Key(object):
     def to_protobuf(self):
         """Return a protobuf corresponding to the key.
 
+        :rtype: :class:`.entity_pb2.Key`
+        :returns: The protobuf representing the key.  A new message is
+                  returned each time, so callers may modify it.
+        """
+        key = _entity_pb2.Key()
+        key.MergeFrom(self._protobuf())
+        return key
+
+    def _protobuf(self):
+        """Return the protobuf corresponding to the key, shared and cached.
+
+        For use by callers copying it (e.g. into a request), which must
+        not modify it.
+
+        :rtype: :class:`.entity_pb2.Key`
+        :returns: The protobuf representing the key.
+        """
+        if self._pb is None:
+            self._pb = self._build_protobuf()
+        return self._pb
+
+    def _to_protobuf_string(self):
+        """Return the serialized protobuf corresponding to the key, cached.
+
+        :rtype: bytes
+        :returns: The serialized :class:`.entity_pb2.Key`.
+        """
+        if self._serialized is None:
+            self._serialized = self._protobuf().SerializeToString()
+        return self._serialized
+
+    def _build_protobuf(self):
+        """Build the protobuf corresponding to the key.
+
         :rtype: :class:`.entity_pb2.Key`
         :returns: The protobuf representing the key.
         """
@@ -270,7 +347,7 @@ class Key(object):
         if self.namespace:
             key.partition_id.namespace_id = self.namespace
 
-        for item in self.path:
+        for item in self._path:
             element = key.path.add()
             if 'kind' in item:
                 element.kind = item['kind']
@@ -327,7 +404,7 @@ class Key(object):
         :rtype: str
         :returns: The kind of the current key.
         """
-        return self.path[-1]['kind']
+        return self._path[-1]['kind']
 
     @property
     def id(self):
@@ -336,7 +413,7 @@ class Key(object):
         :rtype: int
         :returns: The (integer) ID of the key.
         """
-        return self.path[-1].get('id')
+        return self._path[-1].get('id')
 
     @property
     def name(self):
@@ -345,7 +422,7 @@ class Key(object):
         :rtype: str
         :returns: The (string) name of the key.
         """
-        return self.path[-1].get('name')
+        return self._path[-1].get('name')
 
     @property
     def id_or_name(self):
@@ -355,7 +432,8 @@ class Key(object):
         :returns: The last element of the key's path if it is either an ``id``
                   or a ``name``.
         """
-        return self.id or self.name
+        last_element = self._path[-1]
+        return last_element.get('id') or last_element.get('name')
 
     @property
     def project(self):
@@ -403,6 +481,54 @@ class Key(object):
         return '<Key%s, project=%s>' % (self._flat_path, self.project)
 
 
+def intern_key(key):
+    """Return the canonical instance of a key.
+
+    Interning the keys of many entities (e.g. query results referencing
+    the same few keys) lets equal keys share a single object, saving
+    memory and making comparisons between them an identity check.
+    Interned keys are kept only as long as they are referenced elsewhere.
+
+    :type key: :class:`Key`
+    :param key: The key to intern.
+
+    :rtype: :class:`Key`
+    :returns: A key equal to ``key``: ``key`` itself, unless an equal key
+              was interned before.  Partial keys are returned unchanged.
+    """
+    if key.is_partial:
+        return key
+    return _intern(key.flat_path, key.project, key.namespace, lambda: key)
+
+
+def _intern(flat_path, project, namespace, make_key):
+    """Look up an interned key, interning a new one if missing.
+
+    :type flat_path: tuple
+    :param flat_path: The (complete) path of the key.
+
+    :type project: str
+    :param project: The project of the key.
+
+    :type namespace: str
+    :param namespace: The namespace of the key, or ``None``.
+
+    :type make_key: callable
+    :param make_key: Called without arguments to create the key if none is
+                     interned yet.
+
+    :rtype: :class:`Key`
+    :returns: The interned key.
+    """
+    interned_as = (flat_path, project, namespace)
+    key = _INTERNED.get(interned_as)
+    if key is None:
+        key = make_key()
+        with _INTERNED_LOCK:
+            key = _INTERNED.setdefault(interned_as, key)
+    return key
+
+
 def _validate_project(project, parent):
     """Ensure the project is set appropriately.
 
@@ -328,7 +328,7 @@ class Query(object):
         self._distinct_on[:] = value
 
     def fetch(self, limit=None, offset=0, start_cursor=None, end_cursor=None,
-              client=None):
+              client=None, lazy=False, intern_keys=False, raw=False):
         """Execute the Query; return an iterator for the matching entities.
 
         For example::
@@ -358,6 +358,16 @@ class Query(object):
         :param client: client used to connect to datastore.
                        If not supplied, uses the query's value.
 
+        :type lazy: bool
+        :param lazy: (Optional) lazy flag passed through to the iterator.
+
+        :type intern_keys: bool
+        :param intern_keys: (Optional) intern_keys flag passed through to
+                            the iterator.
+
+        :type raw: bool
+        :param raw: (Optional) raw flag passed through to the iterator.
+
         :rtype: :class:`Iterator`
         :returns: The iterator for the query.
         :raises: ValueError if ``connection`` is not passed and no implicit
@@ -368,7 +378,8 @@ class Query(object):
 
         return Iterator(
             self, client, limit=limit, offset=offset,
-            start_cursor=start_cursor, end_cursor=end_cursor)
+            start_cursor=start_cursor, end_cursor=end_cursor, lazy=lazy,
+            intern_keys=intern_keys, raw=raw)
 
 
 class Iterator(BaseIterator):
@@ -395,16 +406,37 @@ class Iterator(BaseIterator):
     :type end_cursor: bytes
     :param end_cursor: (Optional) Cursor to end paging through
                        query results.
+
+    :type lazy: bool
+    :param lazy: (Optional) If true, the properties of the entities
+                 returned are decoded when first read (see
+                 :func:`~google.cloud.datastore.helpers.entity_from_protobuf`).
+                 Ignored for projection queries, whose few properties are
+                 decoded up front.
+
+    :type intern_keys: bool
+    :param intern_keys: (Optional) If true, equal keys decoded from the
+                        results (entity keys and key values) share a single
+                        object (see
+                        :func:`~google.cloud.datastore.key.intern_key`).
+
+    :type raw: bool
+    :param raw: (Optional) If true, the entity protobufs of the results are
+                returned as they are, without being decoded into entities.
     """
 
     next_page_token = None
 
     def __init__(self, query, client, limit=None, offset=None,
-                 start_cursor=None, end_cursor=None):
+                 start_cursor=None, end_cursor=None, lazy=False,
+                 intern_keys=False, raw=False):
         super(Iterator, self).__init__(
-            client=client, item_to_value=_item_to_entity,
+            client=client,
+            item_to_value=_item_to_protobuf if raw else _item_to_entity,
             page_token=start_cursor, max_results=limit)
         self._query = query
+        self._lazy = lazy and not query.projection
+        self._intern_keys = intern_keys
         self._offset = offset
         self._end_cursor = end_cursor
         # The attributes below will change over the life of the iterator.
@@ -482,6 +514,51 @@ class Iterator(BaseIterator):
     def _next_page(self):
         """Get the next page in the iterator.
 
+        :rtype: :class:`~google.cloud.iterator.Page`
+        :returns: The next page in the iterator (or :data:`None` if
+                  there are no pages left).
+        """
+        return self._fetch_page(self.client.current_transaction)
+
+    def next_page_async(self):
+        """Start getting the next page in the iterator.
+
+        The request runs in a worker thread of the client, so pages of
+        several queries can be fetched at once.  No other page of this
+        iterator may be requested until the returned future is done.
+
+        :rtype: :class:`concurrent.futures.Future`
+        :returns: A future for the next :class:`~google.cloud.iterator.Page`
+                  in the iterator (or :data:`None` if there are no pages
+                  left).
+        """
+        return self.client._submit(
+            self._fetch_counted_page, self.client.current_transaction)
+
+    def _fetch_counted_page(self, transaction):
+        """Get the next page, counting it as iterating over pages does.
+
+        :type transaction: :class:`~.transaction.Transaction`
+        :param transaction: The transaction to run the query in, or
+                            ``None``.
+
+        :rtype: :class:`~google.cloud.iterator.Page`
+        :returns: The next page in the iterator (or :data:`None` if
+                  there are no pages left).
+        """
+        page = self._fetch_page(transaction)
+        if page is not None:
+            self.page_number += 1
+            self.num_results += page.num_items
+        return page
+
+    def _fetch_page(self, transaction):
+        """Run the query for the next page.
+
+        :type transaction: :class:`~.transaction.Transaction`
+        :param transaction: The transaction to run the query in, or
+                            ``None``.
+
         :rtype: :class:`~google.cloud.iterator.Page`
         :returns: The next page in the iterator (or :data:`None` if
                   there are no pages left).
@@ -490,8 +567,6 @@ class Iterator(BaseIterator):
             return None
 
         pb = self._build_protobuf()
-        transaction = self.client.current_transaction
-
         query_results = self.client._connection.run_query(
             query_pb=pb,
             project=self._query.project,
@@ -525,7 +600,7 @@ def _pb_from_query(query):
     composite_filter.op = _query_pb2.CompositeFilter.AND
 
     if query.ancestor:
-        ancestor_pb = query.ancestor.to_protobuf()
+        ancestor_pb = query.ancestor._protobuf()
 
         # Filter on __key__ HAS_ANCESTOR == ancestor.
         ancestor_filter = composite_filter.filters.add().property_filter
@@ -543,7 +618,7 @@ def _pb_from_query(query):
 
         # Set the value to filter on based on the type.
         if property_name == '__key__':
-            key_pb = value.to_protobuf()
+            key_pb = value._protobuf()
             property_filter.value.key_value.CopyFrom(key_pb)
         else:
             helpers._set_protobuf_value(property_filter.value, value)
@@ -581,5 +656,22 @@ def _item_to_entity(iterator, entity_pb):
     :rtype: :class:`~google.cloud.datastore.entity.Entity`
     :returns: The next entity in the page.
     """
-    return helpers.entity_from_protobuf(entity_pb)
+    return helpers.entity_from_protobuf(
+        entity_pb, lazy=iterator._lazy, intern_keys=iterator._intern_keys)
+
+
+def _item_to_protobuf(iterator, entity_pb):
+    """Return a raw protobuf entity as it is.
+
+    :type iterator: :class:`~google.cloud.iterator.Iterator`
+    :param iterator: The iterator that is currently in use.
+
+    :type entity_pb:
+        :class:`.entity_pb2.Entity`
+    :param entity_pb: An entity protobuf.
+
+    :rtype: :class:`.entity_pb2.Entity`
+    :returns: ``entity_pb``.
+    """
+    return entity_pb
 # pylint: enable=unused-argument
@@ -0,0 +1,256 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Scan a kind by running queries over disjoint key ranges concurrently.
+
+:meth:`~google.cloud.datastore.query.Query.fetch` follows a single chain of
+cursors.  :func:`split_query` instead samples the keys of the kind (using
+the ``__scatter__`` property), splits the query into sub-queries over
+contiguous ``__key__`` ranges, and :func:`parallel_fetch` runs them
+concurrently, merging their results into one stream of entities:
+
+.. code-block:: python
+
+  >>> from google.cloud import datastore
+  >>> from google.cloud.datastore.scan import parallel_fetch
+  >>> client = datastore.Client()
+  >>> query = client.query(kind='Event')
+  >>> for entity in parallel_fetch(query, num_splits=32):
+  ...     export(entity)
+
+Only queries of a kind, with no inequality filter, sort order (other than
+by ``__key__``) or ``distinct_on``, can be split.  The sub-queries run
+outside of any transaction.
+"""
+
+from google.cloud._helpers import _merge_concurrently
+from google.cloud.datastore.query import Query
+
+
+_SCATTER_OVERSAMPLING = 32
+"""Number of keys sampled per split of a query."""
+
+
+def split_query(query, num_splits, client=None):
+    """Split a query into sub-queries over disjoint key ranges.
+
+    The split points are chosen among a sample of the kind's keys, so the
+    sub-queries return roughly as many entities as each other.  Fewer
+    sub-queries are returned if the kind has too few entities.
+
+    :type query: :class:`~google.cloud.datastore.query.Query`
+    :param query: The query to split.
+
+    :type num_splits: int
+    :param num_splits: The number of sub-queries wanted.
+
+    :type client: :class:`~google.cloud.datastore.client.Client`
+    :param client: (Optional) The client used to sample the keys.  If not
+                   passed, uses the query's client.
+
+    :rtype: list of :class:`~google.cloud.datastore.query.Query`
+    :returns: The sub-queries, in key order, each sorted by ``__key__``.
+    :raises: :class:`ValueError` if ``num_splits`` is less than 1, or the
+             query cannot be split.
+    """
+    if num_splits < 1:
+        raise ValueError('num_splits must be positive', num_splits)
+    if not query.kind:
+        raise ValueError('Only queries of a kind can be split')
+    if query.distinct_on:
+        raise ValueError('Queries with distinct_on cannot be split')
+    if list(query.order) not in ([], ['__key__']):
+        raise ValueError('Only queries sorted by __key__ can be split')
+    for property_name, operator, _ in query.filters:
+        if operator != '=':
+            raise ValueError(
+                'Queries with inequality filters cannot be split',
+                property_name)
+    if client is None:
+        client = query._client
+
+    split_keys = []
+    if num_splits > 1:
+        split_keys = _sample_split_keys(query, num_splits, client)
+    bounds = [None] + split_keys + [None]
+    return [_key_range_query(query, start, end)
+            for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def parallel_fetch(query, num_splits, ordered=False, max_workers=None,
+                   client=None):
+    """Fetch the entities matching a query, running sub-queries concurrently.
+
+    :type query: :class:`~google.cloud.datastore.query.Query`
+    :param query: The query to run; see :func:`split_query`.
+
+    :type num_splits: int
+    :param num_splits: The number of sub-queries to split the query into.
+
+    :type ordered: bool
+    :param ordered: (Optional) If true, entities are yielded in key order:
+                    sub-queries still run concurrently, but only a few
+                    pages of each are buffered until it is its turn.  If
+                    false (the default), entities are yielded as soon as
+                    their page arrives.
+
+    :type max_workers: int
+    :param max_workers: (Optional) The maximum number of sub-queries run
+                        concurrently.  Defaults to one per sub-query.
+
+    :type client: :class:`~google.cloud.datastore.client.Client`
+    :param client: (Optional) The client used to run the queries.  If not
+                   passed, uses the query's client.
+
+    :rtype: :class:`~types.GeneratorType`
+    :returns: A generator of :class:`~google.cloud.datastore.entity.Entity`.
+    :raises: :class:`ValueError` if the query cannot be split, or any
+             error raised by a sub-query, once reached.
+    """
+    if client is None:
+        client = query._client
+    queries = split_query(query, num_splits, client=client)
+    return _fetch_concurrently(
+        queries, client, ordered, max_workers or len(queries))
+
+
+def _sample_split_keys(query, num_splits, client):
+    """Choose the keys at which to split a query.
+
+    :type query: :class:`~google.cloud.datastore.query.Query`
+    :param query: The query to split.
+
+    :type num_splits: int
+    :param num_splits: The number of sub-queries wanted.
+
+    :type client: :class:`~google.cloud.datastore.client.Client`
+    :param client: The client used to sample the keys.
+
+    :rtype: list of :class:`~google.cloud.datastore.key.Key`
+    :returns: At most ``num_splits - 1`` distinct keys, in key order.
+    """
+    # Equality filters are left out: with ``__scatter__`` they would need
+    # a composite index.
+    scatter_query = Query(client, kind=query.kind, project=query.project,
+                          namespace=query.namespace, ancestor=query.ancestor,
+                          order=['__scatter__'])
+    scatter_query.keys_only()
+    sample = scatter_query.fetch(
+        limit=num_splits * _SCATTER_OVERSAMPLING, client=client)
+    keys = sorted(set(entity.key for entity in sample), key=_key_order)
+    if not keys:
+        return []
+
+    split_keys = []
+    step = len(keys) / float(num_splits)
+    for index in range(1, num_splits):
+        key = keys[int(step * index)]
+        if key not in split_keys:
+            split_keys.append(key)
+    return split_keys
+
+
+def _key_order(key):
+    """Sort key placing keys in the order used by the Cloud Datastore.
+
+    Path elements compare by kind, then IDs before names, and a key comes
+    before its descendants.
+
+    :type key: :class:`~google.cloud.datastore.key.Key`
+    :param key: The key.
+
+    :rtype: tuple
+    :returns: A value comparing as ``key`` does.
+    """
+    order = []
+    for element in key.path:
+        if 'id' in element:
+            order.append((element['kind'], 0, element['id'], u''))
+        else:
+            order.append((element['kind'], 1, 0, element['name']))
+    return tuple(order)
+
+
+def _key_range_query(query, start, end):
+    """Restrict a query to a range of keys.
+
+    :type query: :class:`~google.cloud.datastore.query.Query`
+    :param query: The query to restrict.
+
+    :type start: :class:`~google.cloud.datastore.key.Key`
+    :param start: The first key of the range, or ``None`` if unbounded.
+
+    :type end: :class:`~google.cloud.datastore.key.Key`
+    :param end: The key after the range, or ``None`` if unbounded.
+
+    :rtype: :class:`~google.cloud.datastore.query.Query`
+    :returns: A new query, sorted by ``__key__``.
+    """
+    filters = list(query.filters)
+    if start is not None:
+        filters.append(('__key__', '>=', start))
+    if end is not None:
+        filters.append(('__key__', '<', end))
+    return Query(query._client, kind=query.kind, project=query.project,
+                 namespace=query.namespace, ancestor=query.ancestor,
+                 filters=filters, projection=query.projection,
+                 order=['__key__'])
+
+
+def _fetch_concurrently(queries, client, ordered, max_workers):
+    """Run queries concurrently, yielding their entities.
+
+    :type queries: list of :class:`~google.cloud.datastore.query.Query`
+    :param queries: The queries to run.
+
+    :type client: :class:`~google.cloud.datastore.client.Client`
+    :param client: The client used to run the queries.
+
+    :type ordered: bool
+    :param ordered: Whether to yield all entities of a query before those
+                    of the next query.
+
+    :type max_workers: int
+    :param max_workers: The maximum number of queries run concurrently.
+
+    :rtype: :class:`~types.GeneratorType`
+    :returns: A generator of :class:`~google.cloud.datastore.entity.Entity`.
+    :raises: Any error raised by a query.
+    """
+    pages = _merge_concurrently(
+        [_fetch_pages(query, client) for query in queries],
+        ordered=ordered, max_workers=max_workers)
+    try:
+        for page in pages:
+            for entity in page:
+                yield entity
+    finally:
+        pages.close()
+
+
+def _fetch_pages(query, client):
+    """Run one query, yielding its pages of entities.
+
+    :type query: :class:`~google.cloud.datastore.query.Query`
+    :param query: The query to run.
+
+    :type client: :class:`~google.cloud.datastore.client.Client`
+    :param client: The client used to run the query.
+
+    :rtype: :class:`~types.GeneratorType`
+    :returns: A generator of lists of
+              :class:`~google.cloud.datastore.entity.Entity`.
+    """
+    for page in query.fetch(client=client).pages:
+        yield list(page)
@@ -14,9 +14,17 @@
 
 """Create / interact with Google Cloud Datastore transactions."""
 
+import collections
+
 from google.cloud.datastore.batch import Batch
 
 
+TransactionStats = collections.namedtuple(
+    'TransactionStats', 'runs attempts conflicts failures')
+"""Counters of the transactions run by
+:meth:`~google.cloud.datastore.client.Client.run_in_transaction`."""
+
+
 class Transaction(Batch):
     """An abstraction representing datastore Transactions.
 
@@ -140,13 +148,28 @@ class Transaction(Batch):
 
     :type client: :class:`google.cloud.datastore.client.Client`
     :param client: the client used to connect to datastore.
+
+    :type read_only: bool
+    :param read_only: (Optional) If true, the transaction only reads:
+                      :meth:`put` and :meth:`delete` raise
+                      :class:`ValueError`.
     """
 
     _status = None
 
-    def __init__(self, client):
+    def __init__(self, client, read_only=False):
         super(Transaction, self).__init__(client)
         self._id = None
+        self._read_only = read_only
+
+    @property
+    def read_only(self):
+        """Whether the transaction only reads.
+
+        :rtype: bool
+        :returns: True if mutations are refused.
+        """
+        return self._read_only
 
     @property
     def id(self):
@@ -172,6 +195,36 @@ class Transaction(Batch):
         if isinstance(top, Transaction):
             return top
 
+    def put(self, entity):
+        """Remember an entity's state to be saved during :meth:`commit`.
+
+        See :meth:`google.cloud.datastore.batch.Batch.put`.
+
+        :type entity: :class:`google.cloud.datastore.entity.Entity`
+        :param entity: the entity to be saved.
+
+        :raises: :class:`~exceptions.ValueError` if the transaction is
+                 read-only, or see :meth:`Batch.put`.
+        """
+        if self._read_only:
+            raise ValueError('Cannot put() in a read-only transaction')
+        super(Transaction, self).put(entity)
+
+    def delete(self, key):
+        """Remember a key to be deleted during :meth:`commit`.
+
+        See :meth:`google.cloud.datastore.batch.Batch.delete`.
+
+        :type key: :class:`google.cloud.datastore.key.Key`
+        :param key: the key to be deleted.
+
+        :raises: :class:`~exceptions.ValueError` if the transaction is
+                 read-only, or see :meth:`Batch.delete`.
+        """
+        if self._read_only:
+            raise ValueError('Cannot delete() in a read-only transaction')
+        super(Transaction, self).delete(key)
+
     def begin(self):
         """Begins a transaction.
 
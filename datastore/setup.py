@@ -55,6 +55,10 @@ REQUIREMENTS = [
     'gapic-google-cloud-datastore-v1 >= 0.14.0, < 0.15dev',
 ]
 
+EXTRAS_REQUIREMENTS = {
+    ':python_version<"3.2"': ['futures >= 3.0.0'],
+}
+
 setup(
     name='google-cloud-datastore',
     version='0.22.1',
@@ -66,5 +70,6 @@ setup(
     ],
     packages=find_packages(),
     install_requires=REQUIREMENTS,
+    extras_require=EXTRAS_REQUIREMENTS,
     **SETUP_BASE
 )
@@ -478,6 +478,18 @@ class TestConnection(unittest.TestCase):
         conn = self._make_one(creds)
         self.assertIs(conn.http.credentials, creds)
 
+    def test_http_per_thread(self):
+        import threading
+
+        conn = self._make_one()
+        http = conn.http
+        self.assertIs(conn.http, http)
+        found = []
+        thread = threading.Thread(target=lambda: found.append(conn.http))
+        thread.start()
+        thread.join()
+        self.assertIsNot(found[0], http)
+
     def test_build_api_url_w_default_base_version(self):
         PROJECT = 'PROJECT'
         METHOD = 'METHOD'
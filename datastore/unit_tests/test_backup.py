@@ -0,0 +1,259 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+
+_PROJECT = 'PROJECT'
+
+
+def _make_entity_pbs(count):
+    from google.cloud.datastore.entity import Entity
+    from google.cloud.datastore.helpers import entity_to_protobuf
+    from google.cloud.datastore.key import Key
+
+    entity_pbs = []
+    for index in range(count):
+        entity = Entity(key=Key('Kind', index + 1, project=_PROJECT))
+        entity['name'] = u'entity-%d' % (index,)
+        entity['payload'] = b'x' * (index * 3)
+        entity_pbs.append(entity_to_protobuf(entity))
+    return entity_pbs
+
+
+class Test_export_entities(unittest.TestCase):
+
+    def _call_fut(self, *args, **kw):
+        from google.cloud.datastore.backup import export_entities
+
+        return export_entities(*args, **kw)
+
+    def _make_query(self, client):
+        from google.cloud.datastore.query import Query
+
+        return Query(client, kind='Kind')
+
+    def _read(self, file_obj):
+        from google.cloud.grpc.datastore.v1 import entity_pb2
+        from google.cloud.datastore.backup import _read_records
+
+        file_obj.seek(0)
+        return [entity_pb2.Entity.FromString(record)
+                for record in _read_records(file_obj)]
+
+    def test_it(self):
+        import io
+        from google.cloud._testing import _Monkey
+        from google.cloud.datastore import helpers
+
+        entity_pbs = _make_entity_pbs(25)
+        connection = _Connection(entity_pbs)
+        file_obj = io.BytesIO()
+
+        # No entity is decoded.
+        with _Monkey(helpers, entity_from_protobuf=None):
+            count = self._call_fut(self._make_query(_Client(connection)),
+                                   file_obj)
+
+        self.assertEqual(count, 25)
+        self.assertEqual(self._read(file_obj), entity_pbs)
+        self.assertEqual(len(connection._queries), 3)
+        self.assertFalse(file_obj.closed)
+
+    def test_compressed_w_client(self):
+        import gzip
+        import io
+
+        entity_pbs = _make_entity_pbs(5)
+        connection = _Connection(entity_pbs)
+        file_obj = io.BytesIO()
+        query = self._make_query(_Client(None))
+
+        count = self._call_fut(query, file_obj, compress=True,
+                               client=_Client(connection))
+
+        self.assertEqual(count, 5)
+        self.assertFalse(file_obj.closed)
+        file_obj.seek(0)
+        self.assertEqual(
+            self._read(io.BytesIO(gzip.GzipFile(fileobj=file_obj).read())),
+            entity_pbs)
+
+    def test_projection(self):
+        import io
+
+        connection = _Connection(_make_entity_pbs(3))
+        query = self._make_query(_Client(connection))
+        file_obj = io.BytesIO()
+
+        for projection in (['name'], ['__key__']):
+            query.projection = projection
+            self.assertRaises(ValueError, self._call_fut, query, file_obj)
+
+        self.assertEqual(connection._queries, [])
+        self.assertEqual(file_obj.getvalue(), b'')
+
+    def test_empty(self):
+        import io
+
+        file_obj = io.BytesIO()
+
+        count = self._call_fut(self._make_query(_Client(_Connection([]))),
+                               file_obj)
+
+        self.assertEqual(count, 0)
+        self.assertEqual(file_obj.getvalue(), b'')
+
+
+class Test_import_entities(unittest.TestCase):
+
+    def _call_fut(self, *args, **kw):
+        from google.cloud.datastore.backup import import_entities
+
+        return import_entities(*args, **kw)
+
+    def _export(self, entity_pbs, compress=False):
+        import io
+        from google.cloud.datastore.backup import export_entities
+        from google.cloud.datastore.query import Query
+
+        file_obj = io.BytesIO()
+        client = _Client(_Connection(entity_pbs))
+        export_entities(Query(client, kind='Kind'), file_obj,
+                        compress=compress)
+        file_obj.seek(0)
+        return file_obj
+
+    def test_it(self):
+        entity_pbs = _make_entity_pbs(1234)
+        connection = _Connection()
+
+        count = self._call_fut(_Client(connection), self._export(entity_pbs),
+                               max_workers=4)
+
+        self.assertEqual(count, 1234)
+        self.assertEqual(sorted(connection._mutation_counts),
+                         [234, 500, 500])
+        self.assertEqual(
+            sorted(connection._upserts, key=lambda pb: pb.key.path[0].id),
+            entity_pbs)
+
+    def test_compressed(self):
+        entity_pbs = _make_entity_pbs(3)
+        connection = _Connection()
+        file_obj = self._export(entity_pbs, compress=True)
+
+        count = self._call_fut(_Client(connection), file_obj,
+                               compressed=True)
+
+        self.assertEqual(count, 3)
+        self.assertEqual(connection._upserts, entity_pbs)
+        self.assertFalse(file_obj.closed)
+
+    def test_error(self):
+        from google.cloud.exceptions import ServiceUnavailable
+
+        connection = _Connection(fail=True)
+
+        with self.assertRaises(ServiceUnavailable):
+            self._call_fut(_Client(connection),
+                           self._export(_make_entity_pbs(3)))
+
+
+class Test__read_records(unittest.TestCase):
+
+    def _call_fut(self, file_obj):
+        from google.cloud.datastore.backup import _read_records
+
+        return list(_read_records(file_obj))
+
+    def test_lengths(self):
+        import io
+        from google.cloud.datastore.backup import _encode_varint
+
+        records = [b'', b'a', b'b' * 127, b'c' * 128, b'd' * 20000]
+        file_obj = io.BytesIO(b''.join(
+            _encode_varint(len(record)) + record for record in records))
+
+        self.assertEqual(self._call_fut(file_obj), records)
+
+    def test_varint(self):
+        from google.cloud.datastore.backup import _encode_varint
+
+        self.assertEqual(_encode_varint(0), b'\x00')
+        self.assertEqual(_encode_varint(127), b'\x7f')
+        self.assertEqual(_encode_varint(300), b'\xac\x02')
+
+    def test_truncated_length(self):
+        import io
+
+        self.assertRaises(ValueError, self._call_fut, io.BytesIO(b'\x80'))
+
+    def test_truncated_record(self):
+        import io
+
+        self.assertRaises(ValueError, self._call_fut, io.BytesIO(b'\x05abc'))
+
+
+class _Client(object):
+
+    cache = None
+    namespace = None
+    project = _PROJECT
+    current_transaction = None
+
+    def __init__(self, connection):
+        self._connection = connection
+
+
+class _Connection(object):
+
+    PAGE_SIZE = 10
+
+    def __init__(self, entity_pbs=(), fail=False):
+        import threading
+
+        self._entity_pbs = list(entity_pbs)
+        self._fail = fail
+        self._lock = threading.Lock()
+        self._queries = []
+        self._mutation_counts = []
+        self._upserts = []
+
+    def run_query(self, project, query_pb, namespace=None,
+                  transaction_id=None):
+        from google.cloud.grpc.datastore.v1 import query_pb2
+
+        self._queries.append(query_pb)
+        start = int(query_pb.start_cursor or b'0')
+        page = self._entity_pbs[start:start + self.PAGE_SIZE]
+        end = start + len(page)
+        if end < len(self._entity_pbs):
+            more = query_pb2.QueryResultBatch.NOT_FINISHED
+        else:
+            more = query_pb2.QueryResultBatch.NO_MORE_RESULTS
+        return page, str(end).encode('ascii'), more, 0
+
+    def commit(self, project, commit_request, transaction_id):
+        from google.cloud.exceptions import ServiceUnavailable
+
+        assert project == _PROJECT
+        assert transaction_id is None
+        if self._fail:
+            raise ServiceUnavailable('oops')
+        with self._lock:
+            self._mutation_counts.append(len(commit_request.mutations))
+            self._upserts.extend(mutation.upsert
+                                 for mutation in commit_request.mutations)
+        return 0, []
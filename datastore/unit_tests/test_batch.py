@@ -239,6 +239,29 @@ class TestBatch(unittest.TestCase):
         self.assertEqual(connection._committed,
                          [(_PROJECT, batch._commit_request, None)])
 
+    def test_commit_async(self):
+        _PROJECT = 'PROJECT'
+        connection = _Connection()
+        client = _Client(_PROJECT, connection)
+        batch = self._make_one(client)
+        batch.begin()
+
+        future = batch.commit_async()
+
+        self.assertIsNone(future.result())
+        self.assertEqual(batch._status, batch._FINISHED)
+        self.assertEqual(connection._committed,
+                         [(_PROJECT, batch._commit_request, None)])
+
+    def test_commit_async_wrong_status(self):
+        _PROJECT = 'PROJECT'
+        connection = _Connection()
+        client = _Client(_PROJECT, connection)
+        batch = self._make_one(client)
+
+        self.assertRaises(ValueError, batch.commit_async)
+        self.assertEqual(connection._committed, [])
+
     def test_commit_wrong_status(self):
         _PROJECT = 'PROJECT'
         connection = _Connection()
@@ -270,6 +293,53 @@ class TestBatch(unittest.TestCase):
         self.assertFalse(entity.key.is_partial)
         self.assertEqual(entity.key._id, _NEW_ID)
 
+    def test_commit_invalidates_cache(self):
+        from google.cloud.datastore.cache import LRUCache
+        from google.cloud.datastore.entity import Entity
+        from google.cloud.datastore.key import Key
+
+        _PROJECT = 'PROJECT'
+        connection = _Connection()
+        client = _Client(_PROJECT, connection)
+        client.cache = cache = LRUCache()
+        put_key = Key('Kind', 1, project=_PROJECT)
+        deleted_key = Key('Kind', 2, project=_PROJECT)
+        kept_key = Key('Kind', 3, project=_PROJECT)
+        cache.set_multi(dict(
+            (key.to_protobuf().SerializeToString(), b'cached')
+            for key in (put_key, deleted_key, kept_key)))
+        batch = self._make_one(client)
+
+        batch.begin()
+        batch.put(Entity(key=put_key))
+        batch.delete(deleted_key)
+        batch.commit()
+
+        self.assertEqual(cache.stats.size, 1)
+        self.assertEqual(
+            cache.get_multi([kept_key.to_protobuf().SerializeToString()]),
+            {kept_key.to_protobuf().SerializeToString(): b'cached'})
+
+    def test_commit_failure_invalidates_cache(self):
+        from google.cloud.datastore.cache import LRUCache
+        from google.cloud.exceptions import Conflict
+        from google.cloud.datastore.key import Key
+
+        _PROJECT = 'PROJECT'
+        connection = _Connection()
+        connection._side_effect = Conflict('contention')
+        client = _Client(_PROJECT, connection)
+        client.cache = cache = LRUCache()
+        key = Key('Kind', 1, project=_PROJECT)
+        cache.set_multi({key.to_protobuf().SerializeToString(): b'cached'})
+        batch = self._make_one(client)
+
+        batch.begin()
+        batch.delete(key)
+        self.assertRaises(Conflict, batch.commit)
+
+        self.assertEqual(cache.stats.size, 0)
+
     def test_as_context_mgr_wo_error(self):
         _PROJECT = 'PROJECT'
         _PROPERTIES = {'foo': 'bar'}
@@ -369,6 +439,121 @@ class TestBatch(unittest.TestCase):
         self.assertEqual(client._batches, [])
 
 
+class Test__commit_chunked(unittest.TestCase):
+
+    _PROJECT = 'PROJECT'
+
+    def _call_fut(self, client, items, add_func, max_workers=None):
+        from google.cloud.datastore.batch import _commit_chunked
+
+        return _commit_chunked(client, items, add_func,
+                               max_workers=max_workers)
+
+    def _make_entities(self, count):
+        from google.cloud.datastore.entity import Entity
+        from google.cloud.datastore.key import Key
+
+        entities = []
+        for index in range(count):
+            if index % 3:
+                key = Key('Kind', project=self._PROJECT)
+            else:
+                key = Key('Kind', 'name-%d' % (index,), project=self._PROJECT)
+            entity = Entity(key=key)
+            entity['n'] = index
+            entities.append(entity)
+        return entities
+
+    def test_put_in_chunks(self):
+        import mock
+        from google.cloud.datastore.batch import Batch
+
+        connection = _AllocatingConnection()
+        client = _Client(self._PROJECT, connection)
+        entities = self._make_entities(7)
+
+        with mock.patch(
+                'google.cloud.datastore.batch.Batch._MAX_MUTATIONS', new=3):
+            results = list(self._call_fut(
+                client, iter(entities), Batch.put, max_workers=3))
+
+        self.assertEqual([result.items for result in results],
+                         [entities[:3], entities[3:6], entities[6:]])
+        self.assertEqual([result.error for result in results], [None] * 3)
+        self.assertEqual(sorted(connection._mutation_counts), [1, 3, 3])
+        for entity in entities:
+            self.assertFalse(entity.key.is_partial)
+            if entity['n'] % 3:
+                self.assertEqual(entity.key.id,
+                                 connection._allocated[entity['n']])
+
+    def test_errors_per_chunk(self):
+        import mock
+        from google.cloud.datastore.batch import Batch
+        from google.cloud.exceptions import Conflict
+
+        connection = _AllocatingConnection(fail_on=4)
+        client = _Client(self._PROJECT, connection)
+        entities = self._make_entities(6)
+
+        with mock.patch(
+                'google.cloud.datastore.batch.Batch._MAX_MUTATIONS', new=3):
+            results = list(self._call_fut(client, entities, Batch.put))
+
+        self.assertIsNone(results[0].error)
+        self.assertIsInstance(results[1].error, Conflict)
+        self.assertFalse(entities[1].key.is_partial)
+        self.assertTrue(entities[4].key.is_partial)
+
+    def test_delete(self):
+        from google.cloud.datastore.batch import Batch
+        from google.cloud.datastore.key import Key
+
+        connection = _AllocatingConnection()
+        client = _Client(self._PROJECT, connection)
+        keys = [Key('Kind', index, project=self._PROJECT)
+                for index in range(1, 4)]
+
+        result, = self._call_fut(client, keys, Batch.delete, max_workers=1)
+
+        self.assertEqual(result, (keys, None))
+        self.assertEqual(connection._mutation_counts, [3])
+
+
+class _AllocatingConnection(object):
+
+    def __init__(self, fail_on=None):
+        import threading
+
+        self._fail_on = fail_on
+        self._lock = threading.Lock()
+        self._next_id = 1000
+        self._allocated = {}
+        self._mutation_counts = []
+
+    def commit(self, project, commit_request, transaction_id):
+        from google.cloud.exceptions import Conflict
+        from google.cloud.grpc.datastore.v1 import entity_pb2
+
+        assert transaction_id is None
+        completed = []
+        with self._lock:
+            self._mutation_counts.append(len(commit_request.mutations))
+            for mutation in commit_request.mutations:
+                if mutation.WhichOneof('operation') != 'insert':
+                    continue
+                number = mutation.insert.properties['n'].integer_value
+                if number == self._fail_on:
+                    raise Conflict('contention')
+                self._next_id += 1
+                self._allocated[number] = self._next_id
+                key_pb = entity_pb2.Key()
+                key_pb.CopyFrom(mutation.insert.key)
+                key_pb.path[-1].id = self._next_id
+                completed.append(key_pb)
+        return 0, completed
+
+
 class _PathElementPB(object):
 
     def __init__(self, id_):
@@ -384,6 +569,7 @@ class _KeyPB(object):
 class _Connection(object):
     _marker = object()
     _save_result = (False, None)
+    _side_effect = None
 
     def __init__(self, *new_keys):
         self._completed_keys = [_KeyPB(key) for key in new_keys]
@@ -392,6 +578,8 @@ class _Connection(object):
 
     def commit(self, project, commit_request, transaction_id):
         self._committed.append((project, commit_request, transaction_id))
+        if self._side_effect is not None:
+            raise self._side_effect
         return self._index_updates, self._completed_keys
 
 
@@ -430,6 +618,8 @@ class _Key(object):
 
         return key
 
+    _protobuf = to_protobuf
+
     def completed_key(self, new_id):
         assert self.is_partial
         new_key = self.__class__(self.project)
@@ -439,6 +629,8 @@ class _Key(object):
 
 class _Client(object):
 
+    cache = None
+
     def __init__(self, project, connection, namespace=None):
         self.project = project
         self._connection = connection
@@ -456,6 +648,11 @@ class _Client(object):
         if self._batches:
             return self._batches[0]
 
+    def _submit(self, func, *args, **kwargs):
+        from google.cloud.datastore.helpers import _completed_future
+
+        return _completed_future(func(*args, **kwargs))
+
 
 def _assert_num_mutations(test_case, mutation_pb_list, num_mutations):
     test_case.assertEqual(len(mutation_pb_list), num_mutations)
@@ -0,0 +1,271 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+
+class TestCacheBackend(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.datastore.cache import CacheBackend
+
+        return CacheBackend
+
+    def test_interface(self):
+        backend = self._get_target_class()()
+        self.assertRaises(NotImplementedError, backend.get_multi, [b'k'])
+        self.assertRaises(NotImplementedError, backend.get_generations,
+                          [b'k'])
+        self.assertRaises(NotImplementedError, backend.set_multi, {b'k': b'v'})
+        self.assertRaises(NotImplementedError, backend.delete_multi, [b'k'])
+
+
+class TestLRUCache(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.datastore.cache import LRUCache
+
+        return LRUCache
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_ctor_defaults(self):
+        cache = self._make_one()
+        self.assertEqual(cache.max_size, 10000)
+        self.assertIsNone(cache.ttl)
+        self.assertEqual(cache.stats, (0, 0, 0, 0))
+
+    def test_ctor_invalid_max_size(self):
+        self.assertRaises(ValueError, self._make_one, max_size=0)
+
+    def test_get_multi_hits_and_misses(self):
+        cache = self._make_one()
+        cache.set_multi({b'a': b'1', b'b': b'2'})
+
+        found = cache.get_multi([b'a', b'c', b'b', b'a'])
+
+        self.assertEqual(found, {b'a': b'1', b'b': b'2'})
+        self.assertEqual(cache.stats, (3, 1, 0, 2))
+
+    def test_set_multi_evicts_least_recently_used(self):
+        cache = self._make_one(max_size=2)
+        cache.set_multi({b'a': b'1'})
+        cache.set_multi({b'b': b'2'})
+        cache.get_multi([b'a'])
+
+        cache.set_multi({b'c': b'3'})
+
+        self.assertEqual(cache.get_multi([b'a', b'b', b'c']),
+                         {b'a': b'1', b'c': b'3'})
+        self.assertEqual(cache.evictions, 1)
+
+    def test_set_multi_replaces(self):
+        cache = self._make_one(max_size=2)
+        cache.set_multi({b'a': b'1', b'b': b'2'})
+        cache.set_multi({b'a': b'3'})
+
+        self.assertEqual(cache.get_multi([b'a', b'b']),
+                         {b'a': b'3', b'b': b'2'})
+        self.assertEqual(cache.evictions, 0)
+
+    def test_ttl(self):
+        from google.cloud._testing import _Monkey
+        from google.cloud.datastore import cache as MUT
+
+        cache = self._make_one(ttl=10)
+        with _Monkey(MUT, _NOW=lambda: 100.0):
+            cache.set_multi({b'a': b'1'})
+        with _Monkey(MUT, _NOW=lambda: 109.0):
+            self.assertEqual(cache.get_multi([b'a']), {b'a': b'1'})
+        with _Monkey(MUT, _NOW=lambda: 110.0):
+            self.assertEqual(cache.get_multi([b'a']), {})
+
+        self.assertEqual(cache.stats, (1, 1, 0, 0))
+
+    def test_delete_multi(self):
+        cache = self._make_one()
+        cache.set_multi({b'a': b'1', b'b': b'2'})
+
+        cache.delete_multi([b'a', b'c'])
+
+        self.assertEqual(cache.get_multi([b'a', b'b']), {b'b': b'2'})
+
+    def test_delete_multi_changes_generations(self):
+        cache = self._make_one()
+        before = cache.get_generations([b'a', b'b'])
+
+        cache.delete_multi([b'a'])
+
+        after = cache.get_generations([b'a', b'b'])
+        self.assertNotEqual(after[b'a'], before[b'a'])
+        self.assertEqual(after[b'b'], before[b'b'])
+
+    def test_set_multi_w_generations(self):
+        cache = self._make_one()
+        generations = cache.get_generations([b'a', b'b'])
+        cache.delete_multi([b'a'])
+
+        cache.set_multi({b'a': b'stale', b'b': b'2'}, generations)
+
+        self.assertEqual(cache.get_multi([b'a', b'b']), {b'b': b'2'})
+        cache.set_multi({b'a': b'1'}, cache.get_generations([b'a']))
+        self.assertEqual(cache.get_multi([b'a']), {b'a': b'1'})
+
+    def test_set_multi_w_generations_forgotten(self):
+        cache = self._make_one(max_size=2)
+        generations = cache.get_generations([b'a', b'b'])
+        cache.delete_multi([b'a'])
+        # Pushes the generation of ``a`` out of the bounded record.
+        cache.delete_multi([b'c', b'd'])
+
+        cache.set_multi({b'a': b'stale', b'b': b'2'}, generations)
+
+        # Unsure whether ``b`` was deleted since: neither is stored.
+        self.assertEqual(cache.get_multi([b'a', b'b']), {})
+        self.assertEqual(len(cache._generations), 2)
+
+    def test_clear(self):
+        cache = self._make_one()
+        cache.set_multi({b'a': b'1'})
+
+        cache.clear()
+
+        self.assertEqual(cache.stats.size, 0)
+
+
+class Test__get_entities(unittest.TestCase):
+
+    def _call_fut(self, cache, keys):
+        from google.cloud.datastore.cache import _get_entities
+
+        return _get_entities(cache, keys)
+
+    def test_it(self):
+        from google.cloud.datastore.cache import LRUCache
+        from google.cloud.datastore.cache import _set_entities
+        from google.cloud.datastore.entity import Entity
+        from google.cloud.datastore.helpers import entity_to_protobuf
+        from google.cloud.datastore.key import Key
+
+        cached_key = Key('Kind', 1, project='PROJECT', namespace='ns')
+        other_key = Key('Kind', 2, project='PROJECT', namespace='ns')
+        entity = Entity(key=cached_key)
+        entity['foo'] = u'bar'
+        cache = LRUCache()
+        _set_entities(cache, [entity_to_protobuf(entity)], None)
+
+        entities, uncached, generations = self._call_fut(
+            cache, [other_key, cached_key])
+
+        self.assertEqual(entities, [entity])
+        self.assertEqual(entities[0].key, cached_key)
+        self.assertIsNot(entities[0], entity)
+        self.assertEqual(uncached, [other_key])
+        self.assertEqual(
+            generations,
+            cache.get_generations([other_key._to_protobuf_string()]))
+
+    def test_all_cached(self):
+        # No generations to read: ``_Cache`` has no ``get_generations``.
+        entities, uncached, generations = self._call_fut(_Cache(), [])
+
+        self.assertEqual((entities, uncached, generations), ([], [], {}))
+
+
+class Test__set_entities(unittest.TestCase):
+
+    def _call_fut(self, cache, entity_pbs, generations=None):
+        from google.cloud.datastore.cache import _set_entities
+
+        return _set_entities(cache, entity_pbs, generations)
+
+    def test_empty(self):
+        cache = _Cache()
+        self._call_fut(cache, [])
+        self.assertEqual(cache._set, [])
+
+    def test_w_generations(self):
+        from google.cloud.datastore.helpers import entity_to_protobuf
+        from google.cloud.datastore.entity import Entity
+        from google.cloud.datastore.key import Key
+
+        entity_pb = entity_to_protobuf(
+            Entity(key=Key('Kind', 1, project='PROJECT')))
+        generations = {b'key': 1}
+        cache = _Cache()
+
+        self._call_fut(cache, [entity_pb], generations)
+
+        (_, used), = cache._set
+        self.assertIs(used, generations)
+
+    def test_normalizes_keys(self):
+        from google.cloud.grpc.datastore.v1 import entity_pb2
+        from google.cloud.datastore.key import Key
+
+        entity_pb = entity_pb2.Entity()
+        element = entity_pb.key.path.add()
+        element.kind = 'Kind'
+        element.id = 1
+        entity_pb.key.partition_id.project_id = 'PROJECT'
+
+        cache = _Cache()
+        self._call_fut(cache, [entity_pb])
+
+        key_pb = Key('Kind', 1, project='PROJECT').to_protobuf()
+        self.assertEqual(cache._set, [({
+            key_pb.SerializeToString(): entity_pb.SerializeToString(),
+        }, None)])
+
+
+class Test__delete_keys(unittest.TestCase):
+
+    def _call_fut(self, cache, key_pbs):
+        from google.cloud.datastore.cache import _delete_keys
+
+        return _delete_keys(cache, key_pbs)
+
+    def test_empty(self):
+        cache = _Cache()
+        self._call_fut(cache, [])
+        self.assertEqual(cache._deleted, [])
+
+    def test_it(self):
+        from google.cloud.datastore.key import Key
+
+        key_pb = Key('Kind', 'name', project='PROJECT').to_protobuf()
+        cache = _Cache()
+
+        self._call_fut(cache, [key_pb])
+
+        self.assertEqual(cache._deleted, [[key_pb.SerializeToString()]])
+
+
+class _Cache(object):
+
+    def __init__(self):
+        self._set = []
+        self._deleted = []
+
+    def get_multi(self, keys):
+        return {}
+
+    def set_multi(self, mapping, generations=None):
+        self._set.append((mapping, generations))
+
+    def delete_multi(self, keys):
+        self._deleted.append(keys)
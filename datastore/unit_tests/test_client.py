@@ -138,11 +138,12 @@ class TestClient(unittest.TestCase):
         return Client
 
     def _make_one(self, project=PROJECT, namespace=None,
-                  credentials=None, http=None):
+                  credentials=None, http=None, cache=None):
         return self._get_target_class()(project=project,
                                         namespace=namespace,
                                         credentials=credentials,
-                                        http=http)
+                                        http=http,
+                                        cache=cache)
 
     def test_ctor_w_project_no_environ(self):
         # Some environments (e.g. AppVeyor CI) run in GCE, so
@@ -262,6 +263,179 @@ class TestClient(unittest.TestCase):
         self.assertIs(_called_with[0][1]['deferred'], deferred)
         self.assertEqual(_called_with[0][1]['transaction'], TXN_ID)
 
+    def test__submit(self):
+        import threading
+
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        self.assertIsNone(client._executor)
+
+        future = client._submit(threading.current_thread)
+        executor = client._executor
+        other = client._submit(lambda value, scale=1: value * scale, 2,
+                               scale=3)
+
+        self.assertIsNot(future.result(), threading.current_thread())
+        self.assertEqual(other.result(), 6)
+        self.assertIs(client._executor, executor)
+        executor.shutdown()
+
+    def test_get_async(self):
+        _called_with = []
+        _entity = object()
+
+        def _get(*args, **kw):
+            _called_with.append((args, kw))
+            return _entity
+
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        client.get = _get
+        key, missing, deferred = object(), [], []
+
+        future = client.get_async(key, missing, deferred)
+
+        self.assertIs(future.result(), _entity)
+        self.assertEqual(_called_with, [((key,), {
+            'missing': missing,
+            'deferred': deferred,
+            'transaction': None,
+            'lazy': False,
+        })])
+
+    def test_get_async_w_current_transaction(self):
+        _called_with = []
+
+        def _get(*args, **kw):
+            _called_with.append((args, kw))
+
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        client.get = _get
+
+        with _NoCommitTransaction(client) as CURR_XACT:
+            future = client.get_async(object())
+            future.result()
+
+        self.assertIs(_called_with[0][1]['transaction'], CURR_XACT)
+
+    def test_get_multi_w_cache(self):
+        from google.cloud.datastore.cache import LRUCache
+        from google.cloud.datastore.key import Key
+
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds, cache=LRUCache())
+        first_pb = _make_entity_pb(self.PROJECT, 'Kind', 1, 'foo', 'Foo')
+        second_pb = _make_entity_pb(self.PROJECT, 'Kind', 2, 'foo', 'Bar')
+        client._connection._add_lookup_result([first_pb])
+        client._connection._add_lookup_result([second_pb])
+        first = Key('Kind', 1, project=self.PROJECT)
+        second = Key('Kind', 2, project=self.PROJECT)
+
+        self.assertEqual(client.get(first)['foo'], 'Foo')
+        entities = client.get_multi([second, first])
+
+        self.assertEqual([entity['foo'] for entity in entities],
+                         ['Bar', 'Foo'])
+        lookups = client._connection._lookup_cw
+        self.assertEqual([len(key_pbs) for _, key_pbs, _, _ in lookups],
+                         [1, 1])
+        self.assertEqual(lookups[1][1], [second.to_protobuf()])
+        self.assertEqual(client.cache.stats, (1, 2, 0, 2))
+
+        self.assertEqual(len(client.get_multi([first, second])), 2)
+        self.assertEqual(len(lookups), 2)
+
+    def test_get_multi_w_cache_commit_during_lookup(self):
+        from google.cloud.datastore.cache import LRUCache
+        from google.cloud.datastore.entity import Entity
+        from google.cloud.datastore.key import Key
+
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds, cache=LRUCache())
+        connection = client._connection
+        old_pb = _make_entity_pb(self.PROJECT, 'Kind', 1, 'foo', 'Old')
+        new_pb = _make_entity_pb(self.PROJECT, 'Kind', 1, 'foo', 'New')
+        connection._add_lookup_result([old_pb])
+        connection._add_lookup_result([new_pb])
+        connection._commit.append([])
+        key = Key('Kind', 1, project=self.PROJECT)
+        entity = Entity(key=key)
+        entity['foo'] = 'New'
+        real_lookup = connection.lookup
+
+        def _lookup_racing_commit(*args, **kw):
+            # The commit lands after the lookup read the old entity.
+            result = real_lookup(*args, **kw)
+            client.put(entity)
+            return result
+
+        connection.lookup = _lookup_racing_commit
+        self.assertEqual(client.get(key)['foo'], 'Old')
+        connection.lookup = real_lookup
+
+        self.assertEqual(client.cache.stats.size, 0)
+        self.assertEqual(client.get(key)['foo'], 'New')
+        self.assertEqual(len(connection._lookup_cw), 2)
+
+    def test_get_multi_w_cache_in_transaction(self):
+        from google.cloud.datastore.cache import LRUCache
+        from google.cloud.datastore.key import Key
+
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds, cache=LRUCache())
+        entity_pb = _make_entity_pb(self.PROJECT, 'Kind', 1, 'foo', 'Foo')
+        client._connection._add_lookup_result([entity_pb])
+        key = Key('Kind', 1, project=self.PROJECT)
+        client.cache.set_multi(
+            {key.to_protobuf().SerializeToString(): b'stale'})
+
+        with _NoCommitTransaction(client):
+            entity = client.get(key)
+
+        self.assertEqual(entity['foo'], 'Foo')
+        self.assertEqual(client.cache.stats, (0, 0, 0, 1))
+
+    def test_put_multi_w_cache(self):
+        from google.cloud.datastore.cache import LRUCache
+        from google.cloud.datastore.entity import Entity
+        from google.cloud.datastore.key import Key
+
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds, cache=LRUCache())
+        old_pb = _make_entity_pb(self.PROJECT, 'Kind', 1, 'foo', 'Old')
+        new_pb = _make_entity_pb(self.PROJECT, 'Kind', 1, 'foo', 'New')
+        client._connection._add_lookup_result([old_pb])
+        client._connection._add_lookup_result([new_pb])
+        client._connection._commit.append([])
+        key = Key('Kind', 1, project=self.PROJECT)
+
+        self.assertEqual(client.get(key)['foo'], 'Old')
+        entity = Entity(key=key)
+        entity['foo'] = 'New'
+        client.put(entity)
+
+        self.assertEqual(client.get(key)['foo'], 'New')
+        self.assertEqual(len(client._connection._lookup_cw), 2)
+
+    def test_get_multi_async(self):
+        from google.cloud.datastore.key import Key
+
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        entity_pb = _make_entity_pb(self.PROJECT, 'Kind', 1234, 'foo', 'Foo')
+        client._connection._add_lookup_result([entity_pb])
+        key = Key('Kind', 1234, project=self.PROJECT)
+
+        with _NoCommitTransaction(client, transaction_id=b'xact'):
+            future = client.get_multi_async(iter([key]), as_dict=True)
+            result = future.result()
+
+        self.assertEqual(list(result), [key])
+        self.assertEqual(result[key]['foo'], 'Foo')
+        (_, _, _, transaction_id), = client._connection._lookup_cw
+        self.assertEqual(transaction_id, b'xact')
+
     def test_get_multi_no_keys(self):
         creds = _make_credentials()
         client = self._make_one(credentials=creds)
@@ -421,6 +595,28 @@ class TestClient(unittest.TestCase):
         self.assertEqual(list(result), ['foo'])
         self.assertEqual(result['foo'], 'Foo')
 
+    def test_get_multi_hit_lazy(self):
+        import six
+        from google.cloud._testing import _Monkey
+        from google.cloud.datastore.cache import LRUCache
+        from google.cloud.datastore.helpers import _LazyEntity
+        from google.cloud.datastore.key import Key
+
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds, cache=LRUCache())
+        entity_pb = _make_entity_pb(self.PROJECT, 'Kind', 1234, 'foo', 'Foo')
+        client._connection._add_lookup_result([entity_pb])
+        key = Key('Kind', 1234, project=self.PROJECT)
+
+        # Looked up, then served from the cache.
+        for _ in range(2):
+            with _Monkey(six, PY2=False):
+                result = client.get(key, lazy=True)
+            self.assertIsInstance(result, _LazyEntity)
+            self.assertEqual(list(result._value_pbs), ['foo'])
+            self.assertEqual(result['foo'], 'Foo')
+        self.assertEqual(len(client._connection._lookup_cw), 1)
+
     def test_get_multi_hit_w_transaction(self):
         from google.cloud.datastore.key import Key
 
@@ -529,6 +725,82 @@ class TestClient(unittest.TestCase):
         self.assertEqual(missing, [])
         self.assertEqual(deferred, [])
 
+    def test_get_multi_orders_results_by_keys(self):
+        from google.cloud.datastore.key import Key
+
+        entity_pb1 = _make_entity_pb(self.PROJECT, 'Kind', 1)
+        entity_pb2 = _make_entity_pb(self.PROJECT, 'Kind', 2)
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        client._connection._add_lookup_result([entity_pb2, entity_pb1])
+
+        key1 = Key('Kind', 1, project=self.PROJECT)
+        key2 = Key('Kind', 2, project=self.PROJECT)
+        found = client.get_multi([key1, key2])
+
+        self.assertEqual([entity.key for entity in found], [key1, key2])
+
+    def test_get_multi_as_dict(self):
+        from google.cloud.datastore.key import Key
+
+        entity_pb = _make_entity_pb(self.PROJECT, 'Kind', 1, 'foo', 'Foo')
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        client._connection._add_lookup_result([entity_pb])
+
+        key1 = Key('Kind', 1, project=self.PROJECT)
+        key2 = Key('Kind', 2, project=self.PROJECT)
+        found = client.get_multi([key2, key1], as_dict=True)
+
+        self.assertEqual(list(found), [key1])
+        self.assertEqual(found[key1]['foo'], 'Foo')
+
+    def test_get_multi_as_dict_no_keys(self):
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        self.assertEqual(client.get_multi([], as_dict=True), {})
+
+    def test_get_multi_chunked_concurrent(self):
+        from google.cloud.datastore.key import Key
+
+        ids = list(range(1, 2501))
+        existing = set(id_ for id_ in ids if id_ % 7)
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        connection = client._connection = _LookupConnection(
+            [_make_entity_pb(self.PROJECT, 'Kind', id_) for id_ in existing],
+            defer_every=10)
+
+        keys = [Key('Kind', id_, project=self.PROJECT) for id_ in ids]
+        missing = []
+        found = client.get_multi(keys, missing=missing, max_workers=4)
+
+        self.assertEqual([entity.key.id for entity in found],
+                         [id_ for id_ in ids if id_ in existing])
+        self.assertEqual([entity.key.id for entity in missing],
+                         [id_ for id_ in ids if id_ not in existing])
+        # 4 chunks of 625 keys, each looked up again for its deferrals.
+        self.assertEqual(sorted(len(key_pbs) for key_pbs in connection._calls),
+                         [62, 62, 63, 63] + [625] * 4)
+        self.assertGreater(len(connection._threads), 1)
+
+    def test_get_multi_chunked_w_deferred(self):
+        from google.cloud.datastore.key import Key
+
+        ids = list(range(1, 251))
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        client._connection = _LookupConnection(
+            [_make_entity_pb(self.PROJECT, 'Kind', id_) for id_ in ids],
+            defer_every=2)
+
+        keys = [Key('Kind', id_, project=self.PROJECT) for id_ in ids]
+        deferred = []
+        found = client.get_multi(keys, deferred=deferred, max_workers=1)
+
+        self.assertEqual([entity.key.id for entity in found], ids[::2])
+        self.assertEqual(deferred, keys[1::2])
+
     def test_put(self):
         _called_with = []
 
@@ -609,6 +881,102 @@ class TestClient(unittest.TestCase):
         self.assertEqual(name, 'foo')
         self.assertEqual(value_pb.string_value, u'bar')
 
+    def test_put_multi_no_batch_single_commit(self):
+        import mock
+
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        entities = [_Entity(foo=index) for index in range(3)]
+        for entity in entities:
+            entity.key = _Key(self.PROJECT)
+        client._connection._commit.append([])
+
+        with mock.patch(
+                'google.cloud.datastore.batch.Batch._MAX_MUTATIONS', new=1):
+            client.put_multi(entities)
+
+        self.assertEqual(len(client._connection._commit_cw), 1)
+        (_, commit_req, _) = client._connection._commit_cw[0]
+        self.assertEqual(len(commit_req.mutations), 3)
+
+    def test_bulk_put(self):
+        import mock
+        from google.cloud.exceptions import Conflict
+
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        entities = [_Entity(foo=index) for index in range(5)]
+        for entity in entities:
+            entity.key = _Key(self.PROJECT)
+        conflict = Conflict('contention')
+        client._connection._commit.extend([[], conflict, []])
+
+        with mock.patch(
+                'google.cloud.datastore.batch.Batch._MAX_MUTATIONS', new=2):
+            results = client.bulk_put(iter(entities), max_workers=1)
+
+        self.assertEqual(results, [(entities[:2], None),
+                                   (entities[2:4], conflict),
+                                   (entities[4:], None)])
+        sizes = [len(commit_req.mutations)
+                 for _, commit_req, _ in client._connection._commit_cw]
+        self.assertEqual(sizes, [2, 2, 1])
+
+    def test_bulk_put_wo_key(self):
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        entity = _Entity(foo=u'bar')
+        entity.key = None
+
+        self.assertRaises(ValueError, client.bulk_put, [entity])
+        self.assertEqual(len(client._connection._commit_cw), 0)
+
+    def test_bulk_put_w_other_project(self):
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        good, bad = _Entity(foo=1), _Entity(foo=2)
+        good.key = _Key(self.PROJECT)
+        bad.key = _Key('OTHER')
+
+        self.assertRaises(ValueError, client.bulk_put, [good, bad])
+        self.assertEqual(len(client._connection._commit_cw), 0)
+
+    def test_put_async(self):
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        entity = _Entity(foo=u'bar')
+        entity.key = _Key(self.PROJECT)
+        client._connection._commit.append([])
+
+        future = client.put_async(entity)
+
+        self.assertIsNone(future.result())
+        (_, commit_req, transaction_id), = client._connection._commit_cw
+        mutated_entity = _mutated_pb(self, commit_req.mutations, 'upsert')
+        self.assertEqual(mutated_entity.key, entity.key.to_protobuf())
+        self.assertIsNone(transaction_id)
+
+    def test_put_multi_async_w_single_entity(self):
+        from google.cloud.datastore.entity import Entity
+
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        self.assertRaises(ValueError, client.put_multi_async, Entity())
+
+    def test_put_multi_async_w_existing_batch(self):
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        entity = _Entity(foo=u'bar')
+        entity.key = _Key(self.PROJECT)
+
+        with _NoCommitBatch(client) as CURR_BATCH:
+            future = client.put_multi_async([entity])
+            self.assertTrue(future.done())
+            self.assertEqual(len(CURR_BATCH.mutations), 1)
+
+        self.assertIsNone(future.result())
+        self.assertEqual(len(client._connection._commit_cw), 0)
+
     def test_delete(self):
         _called_with = []
 
@@ -650,6 +1018,50 @@ class TestClient(unittest.TestCase):
         self.assertEqual(mutated_key, key.to_protobuf())
         self.assertIsNone(transaction_id)
 
+    def test_delete_multi_no_batch_single_commit(self):
+        import mock
+
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        keys = [_Key(self.PROJECT), _Key(self.PROJECT)]
+        client._connection._commit.append([])
+
+        with mock.patch(
+                'google.cloud.datastore.batch.Batch._MAX_MUTATIONS', new=1):
+            client.delete_multi(keys)
+
+        self.assertEqual(len(client._connection._commit_cw), 1)
+        (_, commit_req, _) = client._connection._commit_cw[0]
+        self.assertEqual(len(commit_req.mutations), 2)
+
+    def test_bulk_delete(self):
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        keys = [_Key(self.PROJECT), _Key(self.PROJECT)]
+        client._connection._commit.append([])
+
+        results = client.bulk_delete(keys)
+
+        self.assertEqual(results, [(keys, None)])
+        (_, commit_req, _), = client._connection._commit_cw
+        self.assertEqual(len(commit_req.mutations), 2)
+
+    def test_bulk_delete_w_partial_key(self):
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        key = _Key(self.PROJECT)
+        key._id = None
+
+        self.assertRaises(ValueError, client.bulk_delete, [key])
+        self.assertEqual(len(client._connection._commit_cw), 0)
+
+    def test_bulk_delete_w_other_project(self):
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+
+        self.assertRaises(ValueError, client.bulk_delete, [_Key('OTHER')])
+        self.assertEqual(len(client._connection._commit_cw), 0)
+
     def test_delete_multi_w_existing_batch(self):
         creds = _make_credentials()
         client = self._make_one(credentials=creds)
@@ -676,6 +1088,32 @@ class TestClient(unittest.TestCase):
         self.assertEqual(mutated_key, key._key)
         self.assertEqual(len(client._connection._commit_cw), 0)
 
+    def test_delete_async(self):
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        key = _Key(self.PROJECT)
+        client._connection._commit.append([])
+
+        future = client.delete_async(key)
+
+        self.assertIsNone(future.result())
+        (_, commit_req, _), = client._connection._commit_cw
+        mutated_key = _mutated_pb(self, commit_req.mutations, 'delete')
+        self.assertEqual(mutated_key, key.to_protobuf())
+
+    def test_delete_multi_async_w_existing_transaction(self):
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        key = _Key(self.PROJECT)
+
+        with _NoCommitTransaction(client) as CURR_XACT:
+            future = client.delete_multi_async([key])
+            self.assertTrue(future.done())
+
+        mutated_key = _mutated_pb(self, CURR_XACT.mutations, 'delete')
+        self.assertEqual(mutated_key, key._key)
+        self.assertEqual(len(client._connection._commit_cw), 0)
+
     def test_allocate_ids_w_partial_key(self):
         NUM_IDS = 2
 
@@ -792,7 +1230,136 @@ class TestClient(unittest.TestCase):
 
         self.assertIsInstance(xact, _Dummy)
         self.assertEqual(xact.args, (client,))
-        self.assertEqual(xact.kwargs, {})
+        self.assertEqual(xact.kwargs, {'read_only': False})
+
+    def test_transaction_read_only(self):
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+
+        xact = client.transaction(read_only=True)
+
+        self.assertTrue(xact.read_only)
+
+    def _make_entity(self, client, *path):
+        from google.cloud.datastore.entity import Entity
+
+        entity = Entity(key=client.key(*path))
+        entity['foo'] = u'bar'
+        return entity
+
+    def test_run_in_transaction(self):
+        from google.cloud.datastore.transaction import Transaction
+
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        client._connection._commit.append([])
+        entity = self._make_entity(client, 'Kind', 1234)
+        called = []
+
+        def func(transaction):
+            self.assertIsInstance(transaction, Transaction)
+            self.assertIs(client.current_transaction, transaction)
+            called.append(transaction)
+            client.put(entity)
+            return 'result'
+
+        self.assertEqual(client.run_in_transaction(func), 'result')
+
+        transaction, = called
+        (_, commit_req, transaction_id), = client._connection._commit_cw
+        self.assertEqual(transaction_id, 'TRANSACTION-1')
+        self.assertEqual(len(commit_req.mutations), 1)
+        self.assertIsNone(client.current_transaction)
+        self.assertEqual(client.transaction_stats, (1, 1, 0, 0))
+        self.assertEqual(client.transaction_conflicts, {})
+
+    def test_run_in_transaction_retries_conflicts(self):
+        from google.cloud.exceptions import Conflict
+
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        client._connection._commit.extend(
+            [Conflict('contention'), Conflict('contention'), []])
+        entities = [
+            self._make_entity(client, 'Parent', 'p', 'Child', 1),
+            self._make_entity(client, 'Other', 2),
+            self._make_entity(client, 'New'),
+        ]
+        transactions = []
+
+        def func(transaction):
+            transactions.append(transaction)
+            client.put_multi(entities)
+            return len(transactions)
+
+        with mock.patch('time.sleep') as sleep:
+            with mock.patch('random.uniform', return_value=0.75):
+                result = client.run_in_transaction(func, retry_delay=1.0)
+
+        self.assertEqual(result, 3)
+        self.assertEqual(len(set(id(xact) for xact in transactions)), 3)
+        self.assertEqual(
+            [transaction_id
+             for _, _, transaction_id in client._connection._commit_cw],
+            ['TRANSACTION-1', 'TRANSACTION-2', 'TRANSACTION-3'])
+        self.assertEqual([call[0][0] for call in sleep.call_args_list],
+                         [0.75, 1.5])
+        self.assertEqual(client.transaction_stats, (1, 3, 2, 0))
+        self.assertEqual(client.transaction_conflicts, {
+            client.key('Parent', 'p'): 2,
+            client.key('Other', 2): 2,
+        })
+
+    def test_run_in_transaction_conflicts_exhausted(self):
+        from google.cloud.exceptions import Conflict
+
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        client._connection._commit.extend(
+            [Conflict('contention'), Conflict('contention')])
+        entity = self._make_entity(client, 'Kind', 1234)
+
+        with mock.patch('time.sleep') as sleep:
+            with self.assertRaises(Conflict):
+                client.run_in_transaction(
+                    lambda transaction: client.put(entity), retries=1)
+
+        self.assertEqual(sleep.call_count, 1)
+        self.assertEqual(client.transaction_stats, (1, 2, 2, 1))
+        self.assertEqual(client.transaction_conflicts,
+                         {client.key('Kind', 1234): 2})
+
+    def test_run_in_transaction_error(self):
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+
+        def func(transaction):
+            raise ValueError('oops')
+
+        with self.assertRaises(ValueError):
+            client.run_in_transaction(func)
+
+        self.assertEqual(client._connection._commit_cw, [])
+        self.assertEqual(client._connection._rollback_cw,
+                         [(self.PROJECT, 'TRANSACTION-1')])
+        self.assertEqual(client.transaction_stats, (1, 1, 0, 1))
+
+    def test_run_in_transaction_read_only(self):
+        creds = _make_credentials()
+        client = self._make_one(credentials=creds)
+        client._connection._commit.append([])
+        entity = self._make_entity(client, 'Kind', 1234)
+        client._connection._add_lookup_result([])
+
+        def read(transaction):
+            self.assertTrue(transaction.read_only)
+            return client.get(entity.key)
+
+        self.assertIsNone(client.run_in_transaction(read, read_only=True))
+        with self.assertRaises(ValueError):
+            client.run_in_transaction(
+                lambda transaction: client.put(entity), read_only=True)
+        self.assertEqual(client.transaction_stats, (2, 2, 0, 1))
 
     def test_query_w_client(self):
         KIND = 'KIND'
@@ -931,6 +1498,8 @@ class _MockConnection(object):
         self._alloc_cw = []
         self._alloc = []
         self._index_updates = 0
+        self._begin_cw = []
+        self._rollback_cw = []
 
     def _add_lookup_result(self, results=(), missing=(), deferred=()):
         self._lookup.append((list(results), list(missing), list(deferred)))
@@ -944,14 +1513,62 @@ class _MockConnection(object):
     def commit(self, project, commit_request, transaction_id):
         self._commit_cw.append((project, commit_request, transaction_id))
         response, self._commit = self._commit[0], self._commit[1:]
+        if isinstance(response, Exception):
+            raise response
         return self._index_updates, response
 
+    def begin_transaction(self, project):
+        self._begin_cw.append(project)
+        return 'TRANSACTION-%d' % (len(self._begin_cw),)
+
+    def rollback(self, project, transaction_id):
+        self._rollback_cw.append((project, transaction_id))
+
     def allocate_ids(self, project, key_pbs):
         self._alloc_cw.append((project, key_pbs))
         num_pbs = len(key_pbs)
         return [_KeyPB(i) for i in list(range(num_pbs))]
 
 
+class _LookupConnection(object):
+
+    def __init__(self, entity_pbs, defer_every=None):
+        import threading
+
+        self._entity_pbs = dict(
+            (entity_pb.key.SerializeToString(), entity_pb)
+            for entity_pb in entity_pbs)
+        self._defer_every = defer_every
+        self._deferred_once = set()
+        self._lock = threading.Lock()
+        self._calls = []
+        self._threads = set()
+
+    def lookup(self, project, key_pbs, eventual=False, transaction_id=None):
+        import threading
+        import time
+        from google.cloud.grpc.datastore.v1 import entity_pb2
+
+        with self._lock:
+            self._calls.append(key_pbs)
+            self._threads.add(threading.current_thread())
+        time.sleep(0.01)
+        results, missing, deferred = [], [], []
+        for key_pb in key_pbs:
+            serialized = key_pb.SerializeToString()
+            if (self._defer_every and
+                    key_pb.path[-1].id % self._defer_every == 0 and
+                    serialized not in self._deferred_once):
+                self._deferred_once.add(serialized)
+                deferred.append(key_pb)
+            elif serialized in self._entity_pbs:
+                results.append(self._entity_pbs[serialized])
+            else:
+                missing.append(entity_pb2.Entity(key=key_pb))
+        # The backend returns results in no particular order.
+        return results[::-1], missing[::-1], deferred[::-1]
+
+
 class _NoCommitBatch(object):
 
     def __init__(self, client):
@@ -1023,6 +1640,8 @@ class _Key(object):
 
         return key
 
+    _protobuf = to_protobuf
+
     def completed_key(self, new_id):
         assert self.is_partial
         new_key = self.__class__(self.project)
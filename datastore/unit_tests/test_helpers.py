@@ -192,6 +192,219 @@ class Test_entity_from_protobuf(unittest.TestCase):
         self.assertEqual(inside_entity[INSIDE_NAME], INSIDE_VALUE)
 
 
+class Test_entity_from_protobuf_lazy(unittest.TestCase):
+
+    def _call_fut(self, val):
+        import six
+        from google.cloud._testing import _Monkey
+        from google.cloud.datastore.helpers import entity_from_protobuf
+
+        # Entities are never lazy on Python 2.
+        with _Monkey(six, PY2=False):
+            return entity_from_protobuf(val, lazy=True)
+
+    def _make_entity_pb(self):
+        from google.cloud.grpc.datastore.v1 import entity_pb2
+        from google.cloud.datastore.helpers import _new_value_pb
+
+        entity_pb = entity_pb2.Entity()
+        entity_pb.key.partition_id.project_id = 'PROJECT'
+        entity_pb.key.path.add(kind='KIND', id=1234)
+        _new_value_pb(entity_pb, 'foo').string_value = u'Foo'
+        unindexed_pb = _new_value_pb(entity_pb, 'bar')
+        unindexed_pb.integer_value = 10
+        unindexed_pb.exclude_from_indexes = True
+        meaning_pb = _new_value_pb(entity_pb, 'baz')
+        meaning_pb.string_value = u'Baz'
+        meaning_pb.meaning = 9
+        array_pb = _new_value_pb(entity_pb, 'qux').array_value.values
+        array_pb.add(integer_value=1, exclude_from_indexes=True)
+        array_pb.add(integer_value=2, exclude_from_indexes=True)
+        return entity_pb
+
+    def _eager(self, entity_pb):
+        from google.cloud.datastore.helpers import entity_from_protobuf
+
+        return entity_from_protobuf(entity_pb)
+
+    def test_key_only(self):
+        from google.cloud.grpc.datastore.v1 import entity_pb2
+        from google.cloud.datastore.entity import Entity
+
+        entity_pb = entity_pb2.Entity()
+        entity_pb.key.partition_id.project_id = 'PROJECT'
+        entity_pb.key.path.add(kind='KIND', id=1234)
+
+        entity = self._call_fut(entity_pb)
+
+        self.assertIs(type(entity), Entity)
+        self.assertEqual(entity.key.flat_path, ('KIND', 1234))
+        self.assertEqual(dict(entity), {})
+
+    def test_decodes_on_access(self):
+        entity_pb = self._make_entity_pb()
+
+        entity = self._call_fut(entity_pb)
+
+        self.assertEqual(entity.key.flat_path, ('KIND', 1234))
+        self.assertEqual(sorted(entity), ['bar', 'baz', 'foo', 'qux'])
+        self.assertEqual(entity.exclude_from_indexes, set(['bar', 'qux']))
+        self.assertEqual(sorted(entity._value_pbs),
+                         ['bar', 'baz', 'foo', 'qux'])
+        self.assertEqual(entity['foo'], u'Foo')
+        self.assertEqual(entity.get('baz'), u'Baz')
+        self.assertIsNone(entity.get('nonesuch'))
+        self.assertEqual(sorted(entity._value_pbs), ['bar', 'qux'])
+        self.assertEqual(entity._meanings, {'baz': (9, u'Baz')})
+        # As when another thread decoded it first.
+        self.assertEqual(entity._decode('foo'), u'Foo')
+        self.assertEqual(entity, self._eager(entity_pb))
+        self.assertEqual(entity._value_pbs, {})
+
+    def test_intern_keys(self):
+        from google.cloud.datastore.helpers import entity_from_protobuf
+        from google.cloud.datastore.helpers import _new_value_pb
+        from google.cloud.datastore.key import Key
+
+        entity_pb = self._make_entity_pb()
+        ref = Key('REF', 'ref', project='PROJECT')
+        _new_value_pb(entity_pb, 'ref').key_value.CopyFrom(ref.to_protobuf())
+        refs_pb = _new_value_pb(entity_pb, 'refs').array_value.values
+        refs_pb.add().key_value.CopyFrom(ref.to_protobuf())
+        nested_pb = _new_value_pb(entity_pb, 'nested').entity_value
+        _new_value_pb(nested_pb, 'ref').key_value.CopyFrom(ref.to_protobuf())
+
+        lazy = entity_from_protobuf(entity_pb, lazy=True, intern_keys=True)
+        eager = entity_from_protobuf(entity_pb, intern_keys=True)
+        other = entity_from_protobuf(entity_pb, intern_keys=True)
+
+        self.assertIs(eager.key, other.key)
+        self.assertIs(eager['ref'], other['ref'])
+        self.assertIs(eager['refs'][0], eager['ref'])
+        self.assertIs(eager['nested']['ref'], eager['ref'])
+        self.assertIs(lazy['ref'], eager['ref'])
+        self.assertIsNot(self._eager(entity_pb)['ref'], eager['ref'])
+
+    def test_round_trip(self):
+        from google.cloud.datastore.helpers import entity_to_protobuf
+
+        entity_pb = self._make_entity_pb()
+
+        self.assertEqual(entity_to_protobuf(self._call_fut(entity_pb)),
+                         entity_to_protobuf(self._eager(entity_pb)))
+
+    def test_eq_lazy(self):
+        entity_pb = self._make_entity_pb()
+
+        self.assertEqual(self._call_fut(entity_pb), self._call_fut(entity_pb))
+
+    def test_repr(self):
+        entity_pb = self._make_entity_pb()
+
+        self.assertEqual(repr(self._call_fut(entity_pb)),
+                         repr(self._eager(entity_pb)))
+
+    def test_views(self):
+        entity_pb = self._make_entity_pb()
+        eager = self._eager(entity_pb)
+
+        self.assertEqual(sorted(self._call_fut(entity_pb).items()),
+                         sorted(eager.items()))
+        self.assertEqual(sorted(self._call_fut(entity_pb).values(),
+                                key=repr),
+                         sorted(eager.values(), key=repr))
+        self.assertEqual(self._call_fut(entity_pb).copy(), dict(eager))
+
+    def test_mutations(self):
+        entity = self._call_fut(self._make_entity_pb())
+
+        entity['foo'] = u'Other'
+        del entity['bar']
+
+        self.assertEqual(entity['foo'], u'Other')
+        self.assertNotIn('bar', entity)
+        self.assertEqual(entity.pop('baz'), u'Baz')
+        self.assertEqual(entity.pop('baz', None), None)
+        self.assertEqual(entity.setdefault('qux'), [1, 2])
+        self.assertEqual(entity.setdefault('spam', 3), 3)
+        self.assertEqual(entity._value_pbs, {})
+
+    def test_update(self):
+        entity = self._call_fut(self._make_entity_pb())
+
+        entity.update({'foo': u'Other'})
+
+        self.assertEqual(entity['foo'], u'Other')
+        self.assertEqual(entity['bar'], 10)
+
+    def test_popitem(self):
+        entity = self._call_fut(self._make_entity_pb())
+
+        for _ in range(4):
+            _, value = entity.popitem()
+            self.assertIsNotNone(value)
+        self.assertEqual(dict(entity), {})
+
+    def test_clear(self):
+        entity = self._call_fut(self._make_entity_pb())
+
+        entity.clear()
+
+        self.assertEqual(dict(entity), {})
+        self.assertEqual(entity._value_pbs, {})
+
+    def test_copied_into_dicts(self):
+        from google.cloud.datastore.entity import Entity
+        from google.cloud.datastore.helpers import entity_from_protobuf
+
+        entity_pb = self._make_entity_pb()
+        expected = dict(self._eager(entity_pb))
+
+        def lazy():
+            # Lazy on Python 3 only, as Python 2 would copy placeholders.
+            return entity_from_protobuf(entity_pb, lazy=True)
+
+        self.assertEqual(dict(lazy()), expected)
+        self.assertEqual(dict(**lazy()), expected)
+        other = Entity()
+        other.update(lazy())
+        self.assertEqual(dict(other), expected)
+
+    def test_eager_on_python_2(self):
+        import six
+        from google.cloud._testing import _Monkey
+        from google.cloud.datastore.entity import Entity
+        from google.cloud.datastore.helpers import entity_from_protobuf
+
+        entity_pb = self._make_entity_pb()
+
+        with _Monkey(six, PY2=True):
+            entity = entity_from_protobuf(entity_pb, lazy=True)
+
+        self.assertIs(type(entity), Entity)
+        # Python 2 merges dict subclasses through their own storage.
+        self.assertEqual(dict(dict.items(entity)),
+                         dict(self._eager(entity_pb)))
+
+    def test_pickle(self):
+        import pickle
+        from google.cloud.datastore.entity import Entity
+
+        entity_pb = self._make_entity_pb()
+        eager = self._eager(entity_pb)
+
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            entity = self._call_fut(entity_pb)
+            entity['foo']
+            loaded = pickle.loads(pickle.dumps(entity, protocol))
+            self.assertIs(type(loaded), Entity)
+            self.assertEqual(loaded, eager)
+            self.assertEqual(loaded.key, eager.key)
+            self.assertEqual(loaded.exclude_from_indexes,
+                             eager.exclude_from_indexes)
+            self.assertEqual(loaded._meanings, eager._meanings)
+
+
 class Test_entity_to_protobuf(unittest.TestCase):
 
     def _call_fut(self, entity):
@@ -426,6 +639,26 @@ class Test_key_from_protobuf(unittest.TestCase):
         pb = self._makePB()
         self.assertRaises(ValueError, self._call_fut, pb)
 
+    def test_interned(self):
+        from google.cloud.datastore.helpers import key_from_protobuf
+
+        pb = self._makePB(path=[{'kind': 'KIND', 'id': 1234}],
+                          project='PROJECT')
+
+        key = key_from_protobuf(pb, interned=True)
+
+        self.assertIs(key_from_protobuf(pb, interned=True), key)
+        self.assertIsNot(self._call_fut(pb), key)
+        self.assertEqual(self._call_fut(pb), key)
+
+    def test_interned_partial(self):
+        from google.cloud.datastore.helpers import key_from_protobuf
+
+        pb = self._makePB(path=[{'kind': 'KIND'}], project='PROJECT')
+
+        self.assertIsNot(key_from_protobuf(pb, interned=True),
+                         key_from_protobuf(pb, interned=True))
+
 
 class Test__pb_attr_value(unittest.TestCase):
 
@@ -935,3 +1168,17 @@ class TestGeoPoint(unittest.TestCase):
         geo_pt1 = self._make_one(0.0, 1.0)
         geo_pt2 = self._make_one(2.0, 3.0)
         self.assertNotEqual(geo_pt1, geo_pt2)
+
+
+class Test__completed_future(unittest.TestCase):
+
+    def _call_fut(self, result):
+        from google.cloud.datastore.helpers import _completed_future
+
+        return _completed_future(result)
+
+    def test_it(self):
+        result = object()
+        future = self._call_fut(result)
+        self.assertTrue(future.done())
+        self.assertIs(future.result(), result)
@@ -0,0 +1,168 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+
+_PROJECT = 'PROJECT'
+
+
+class TestIDPool(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.datastore.id_pool import IDPool
+
+        return IDPool
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def _make_key(self, *path, **kw):
+        from google.cloud.datastore.key import Key
+
+        return Key(*path, project=_PROJECT, **kw)
+
+    def test_ctor_defaults(self):
+        client = _Client()
+        pool = self._make_one(client)
+        self.assertIs(pool._client, client)
+        self.assertEqual(pool.batch_size, 500)
+        self.assertEqual(pool.low_water_mark, 125)
+
+    def test_ctor_invalid(self):
+        self.assertRaises(ValueError, self._make_one, _Client(), batch_size=0)
+        self.assertRaises(ValueError, self._make_one, _Client(),
+                          batch_size=10, low_water_mark=10)
+        self.assertRaises(ValueError, self._make_one, _Client(),
+                          batch_size=10, low_water_mark=-1)
+
+    def test_next_key_complete_key(self):
+        client = _Client()
+        pool = self._make_one(client)
+        self.assertRaises(ValueError, pool.next_key,
+                          self._make_key('Kind', 1))
+        self.assertEqual(client._allocated, [])
+
+    def test_next_key(self):
+        client = _Client()
+        pool = self._make_one(client, batch_size=10, low_water_mark=0)
+        incomplete_key = self._make_key('Parent', 'p', 'Kind', namespace='ns')
+
+        key = pool.next_key(incomplete_key)
+
+        self.assertEqual(key.flat_path, ('Parent', 'p', 'Kind', 1))
+        self.assertEqual(key.namespace, 'ns')
+        self.assertEqual(pool.next_key(incomplete_key).id, 2)
+        self.assertEqual(client._allocated,
+                         [(('Parent', 'p', 'Kind'), 10)])
+
+    def test_next_keys_per_partial_key(self):
+        client = _Client()
+        pool = self._make_one(client, batch_size=10, low_water_mark=0)
+
+        first = pool.next_keys(self._make_key('First'), 3)
+        second = pool.next_keys(self._make_key('Second'), 2)
+        more = pool.next_keys(self._make_key('First'), 2)
+
+        self.assertEqual([key.id for key in first], [1, 2, 3])
+        self.assertEqual([key.id for key in second], [11, 12])
+        self.assertEqual([key.id for key in more], [4, 5])
+        self.assertEqual([path for path, _ in client._allocated],
+                         [('First',), ('Second',)])
+
+    def test_next_keys_more_than_batch(self):
+        client = _Client()
+        pool = self._make_one(client, batch_size=4, low_water_mark=0)
+
+        keys = pool.next_keys(self._make_key('Kind'), 10)
+
+        self.assertEqual([key.id for key in keys], list(range(1, 11)))
+        self.assertEqual(len(client._allocated), 3)
+
+    def test_refills_in_background(self):
+        client = _Client()
+        pool = self._make_one(client, batch_size=10, low_water_mark=5)
+        incomplete_key = self._make_key('Kind')
+
+        pool.next_keys(incomplete_key, 4)
+        client._blocked.clear()
+        keys = pool.next_keys(incomplete_key, 2)
+
+        # Served from the pool while the refill is still pending.
+        self.assertEqual([key.id for key in keys], [5, 6])
+        client._blocked.set()
+        keys = pool.next_keys(incomplete_key, 8)
+        self.assertEqual([key.id for key in keys], list(range(7, 15)))
+        self.assertEqual(len(client._allocated), 2)
+
+    def test_error_keeps_ids(self):
+        from google.cloud.exceptions import ServiceUnavailable
+
+        client = _Client()
+        pool = self._make_one(client, batch_size=4, low_water_mark=0)
+        incomplete_key = self._make_key('Kind')
+        pool.next_keys(incomplete_key, 2)
+        client._fail = True
+
+        with self.assertRaises(ServiceUnavailable):
+            pool.next_keys(incomplete_key, 4)
+
+        client._fail = False
+        keys = pool.next_keys(incomplete_key, 4)
+        self.assertEqual([key.id for key in keys], [3, 4, 5, 6])
+
+    def test_threads(self):
+        import threading
+
+        client = _Client()
+        pool = self._make_one(client, batch_size=7, low_water_mark=2)
+        incomplete_key = self._make_key('Kind')
+        ids = []
+
+        def take():
+            for _ in range(20):
+                ids.extend(key.id for key in pool.next_keys(incomplete_key, 3))
+
+        threads = [threading.Thread(target=take) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(ids), 4 * 20 * 3)
+        self.assertEqual(len(set(ids)), len(ids))
+
+
+class _Client(object):
+
+    def __init__(self):
+        import threading
+
+        self._next_id = 1
+        self._allocated = []
+        self._fail = False
+        self._blocked = threading.Event()
+        self._blocked.set()
+
+    def allocate_ids(self, incomplete_key, num_ids):
+        from google.cloud.exceptions import ServiceUnavailable
+
+        self._blocked.wait()
+        if self._fail:
+            raise ServiceUnavailable('oops')
+        self._allocated.append((incomplete_key.flat_path, num_ids))
+        first_id, self._next_id = self._next_id, self._next_id + num_ids
+        return [incomplete_key.completed_key(allocated_id)
+                for allocated_id in range(first_id, self._next_id)]
@@ -290,6 +290,51 @@ class TestKey(unittest.TestCase):
                             hash(_KIND) + hash(_NAME) +
                             hash(_PROJECT) + hash(None))
 
+    def test___hash___cached(self):
+        key = self._make_one('KIND', 1234, project=self._DEFAULT_PROJECT)
+        self.assertIsNone(key._hash)
+        key_hash = hash(key)
+        self.assertEqual(key._hash, key_hash)
+        self.assertEqual(hash(key), key_hash)
+
+    def test___slots__(self):
+        key = self._make_one('KIND', 1234, project=self._DEFAULT_PROJECT)
+        self.assertFalse(hasattr(key, '__dict__'))
+        with self.assertRaises(AttributeError):
+            key.foo = 'bar'
+
+    def test_pickle(self):
+        import pickle
+
+        parent = self._make_one('PARENT', 'p', project=self._DEFAULT_PROJECT,
+                                namespace='ns')
+        key = self._make_one('KIND', 1234, parent=parent)
+        hash(key)
+        key._to_protobuf_string()
+
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            loaded = pickle.loads(pickle.dumps(key, protocol))
+            self.assertEqual(loaded, key)
+            self.assertEqual(loaded.parent, parent)
+            self.assertEqual(loaded.namespace, 'ns')
+            self.assertIsNone(loaded._hash)
+            self.assertIsNone(loaded._pb)
+            self.assertIsNone(loaded._serialized)
+            self.assertEqual(hash(loaded), hash(key))
+
+    def test_pickle_leaves_out_cached_hash(self):
+        import pickle
+
+        key = self._make_one('KIND', 1234, project=self._DEFAULT_PROJECT)
+        # As if hashed in a process with another hash seed.
+        key._hash = 42
+
+        loaded = pickle.loads(pickle.dumps(key, 0))
+
+        self.assertEqual(
+            hash(loaded),
+            hash((('KIND', 1234), self._DEFAULT_PROJECT, None)))
+
     def test_completed_key_on_partial_w_id(self):
         key = self._make_one('KIND', project=self._DEFAULT_PROJECT)
         _ID = 1234
@@ -335,6 +380,35 @@ class TestKey(unittest.TestCase):
         # Unset values are False-y.
         self.assertEqual(elem.id, 0)
 
+    def test_to_protobuf_cached(self):
+        key = self._make_one('KIND', 1234, project=self._DEFAULT_PROJECT)
+
+        first = key.to_protobuf()
+        cached = key._protobuf()
+        first.partition_id.project_id = 'OTHER'
+        second = key.to_protobuf()
+
+        self.assertIs(key._protobuf(), cached)
+        self.assertIsNot(second, cached)
+        self.assertEqual(second, cached)
+        self.assertEqual(second.partition_id.project_id,
+                         self._DEFAULT_PROJECT)
+        serialized = key._to_protobuf_string()
+        self.assertIs(key._to_protobuf_string(), serialized)
+        self.assertEqual(serialized, second.SerializeToString())
+
+    def test_completed_key_not_cached(self):
+        key = self._make_one('KIND', project=self._DEFAULT_PROJECT)
+        hash(key)
+        key.to_protobuf()
+
+        new_key = key.completed_key(1234)
+
+        self.assertEqual(new_key.to_protobuf().path[0].id, 1234)
+        self.assertEqual(
+            hash(new_key),
+            hash(self._make_one('KIND', 1234, project=self._DEFAULT_PROJECT)))
+
     def test_to_protobuf_w_explicit_project(self):
         _PROJECT = 'PROJECT-ALT'
         key = self._make_one('KIND', project=_PROJECT)
@@ -431,3 +505,46 @@ class TestKey(unittest.TestCase):
         self.assertEqual(parent.path, _PARENT_PATH)
         new_parent = key.parent
         self.assertIs(parent, new_parent)
+
+
+class Test_intern_key(unittest.TestCase):
+
+    def _call_fut(self, key):
+        from google.cloud.datastore.key import intern_key
+
+        return intern_key(key)
+
+    def test_partial(self):
+        from google.cloud.datastore.key import Key
+
+        key = Key('KIND', project='PROJECT')
+        self.assertIs(self._call_fut(key), key)
+        self.assertIsNot(self._call_fut(Key('KIND', project='PROJECT')), key)
+
+    def test_complete(self):
+        from google.cloud.datastore.key import Key
+
+        key = Key('KIND', 1234, project='PROJECT', namespace='NS')
+        other = Key('KIND', 1234, project='PROJECT', namespace='NS')
+        different = Key('KIND', 1234, project='PROJECT')
+
+        interned = self._call_fut(key)
+
+        self.assertIs(interned, key)
+        self.assertIs(self._call_fut(other), key)
+        self.assertIs(self._call_fut(different), different)
+
+    def test_released(self):
+        import gc
+        from google.cloud.datastore import key as MUT
+        from google.cloud.datastore.key import Key
+
+        key = Key('KIND', 'released', project='PROJECT')
+        self._call_fut(key)
+        interned_as = (('KIND', 'released'), 'PROJECT', None)
+        self.assertIs(MUT._INTERNED[interned_as], key)
+
+        del key
+        gc.collect()
+
+        self.assertNotIn(interned_as, MUT._INTERNED)
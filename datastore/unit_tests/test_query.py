@@ -344,6 +344,33 @@ class TestQuery(unittest.TestCase):
         self.assertEqual(iterator.max_results, 7)
         self.assertEqual(iterator._offset, 8)
 
+    def test_fetch_lazy(self):
+        client = self._makeClient(_Connection())
+        query = self._make_one(client)
+
+        self.assertFalse(query.fetch()._lazy)
+        self.assertTrue(query.fetch(lazy=True)._lazy)
+
+        query.projection = ['name']
+        self.assertFalse(query.fetch(lazy=True)._lazy)
+
+    def test_fetch_intern_keys(self):
+        client = self._makeClient(_Connection())
+        query = self._make_one(client)
+
+        self.assertFalse(query.fetch()._intern_keys)
+        self.assertTrue(query.fetch(intern_keys=True)._intern_keys)
+
+    def test_fetch_raw(self):
+        from google.cloud.datastore.query import _item_to_entity
+        from google.cloud.datastore.query import _item_to_protobuf
+
+        client = self._makeClient(_Connection())
+        query = self._make_one(client)
+
+        self.assertIs(query.fetch()._item_to_value, _item_to_entity)
+        self.assertIs(query.fetch(raw=True)._item_to_value, _item_to_protobuf)
+
 
 class TestIterator(unittest.TestCase):
 
@@ -509,6 +536,38 @@ class TestIterator(unittest.TestCase):
             'transaction_id': None,
         }])
 
+    def test_next_page_async(self):
+        from google.cloud.iterator import Page
+        from google.cloud.grpc.datastore.v1 import entity_pb2
+        from google.cloud.grpc.datastore.v1 import query_pb2
+        from google.cloud.datastore.query import Query
+
+        connection = _Connection()
+        more_enum = query_pb2.QueryResultBatch.NOT_FINISHED
+        done_enum = query_pb2.QueryResultBatch.NO_MORE_RESULTS
+        entity_pb = entity_pb2.Entity()
+        connection._results = [([entity_pb], b'\x01', more_enum, 0),
+                               ([], b'', done_enum, 0)]
+        client = _Client('prujekt', connection)
+        client._current_transaction = _Transaction(b'xact')
+        query = Query(client)
+        iterator = self._make_one(query, client)
+
+        page = iterator.next_page_async().result()
+        self.assertIsInstance(page, Page)
+        self.assertEqual(page.num_items, 1)
+        self.assertEqual(iterator.page_number, 1)
+        self.assertEqual(iterator.num_results, 1)
+        self.assertEqual(
+            connection._called_with[0]['transaction_id'], b'xact')
+
+        page = iterator.next_page_async().result()
+        self.assertEqual(page.num_items, 0)
+        self.assertIsNone(iterator.next_page_async().result())
+        self.assertEqual(iterator.page_number, 2)
+        self.assertEqual(iterator.num_results, 1)
+        self.assertEqual(len(connection._called_with), 2)
+
     def test__next_page_no_more(self):
         from google.cloud.datastore.query import Query
 
@@ -537,15 +596,28 @@ class Test__item_to_entity(unittest.TestCase):
         result = object()
         entities = []
 
-        def mocked(entity_pb):
-            entities.append(entity_pb)
+        def mocked(entity_pb, lazy, intern_keys):
+            entities.append((entity_pb, lazy, intern_keys))
             return result
 
+        iterator = _Iterator(lazy=True)
         entity_pb = object()
         with _Monkey(helpers, entity_from_protobuf=mocked):
-            self.assertIs(result, self._call_fut(None, entity_pb))
+            self.assertIs(result, self._call_fut(iterator, entity_pb))
+
+        self.assertEqual(entities, [(entity_pb, True, False)])
+
 
-        self.assertEqual(entities, [entity_pb])
+class Test__item_to_protobuf(unittest.TestCase):
+
+    def _call_fut(self, iterator, entity_pb):
+        from google.cloud.datastore.query import _item_to_protobuf
+
+        return _item_to_protobuf(iterator, entity_pb)
+
+    def test_it(self):
+        entity_pb = object()
+        self.assertIs(self._call_fut(_Iterator(), entity_pb), entity_pb)
 
 
 class Test__pb_from_query(unittest.TestCase):
@@ -685,8 +757,16 @@ class _Connection(object):
         return result
 
 
+class _Transaction(object):
+
+    def __init__(self, id_):
+        self.id = id_
+
+
 class _Client(object):
 
+    _current_transaction = None
+
     def __init__(self, project, connection, namespace=None):
         self.project = project
         self._connection = connection
@@ -694,4 +774,16 @@ class _Client(object):
 
     @property
     def current_transaction(self):
-        pass
+        return self._current_transaction
+
+    def _submit(self, func, *args, **kwargs):
+        from google.cloud.datastore.helpers import _completed_future
+
+        return _completed_future(func(*args, **kwargs))
+
+
+class _Iterator(object):
+
+    def __init__(self, lazy=False, intern_keys=False):
+        self._lazy = lazy
+        self._intern_keys = intern_keys
@@ -0,0 +1,301 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+
+_PROJECT = 'PROJECT'
+
+
+def _make_keys(count):
+    from google.cloud.datastore.key import Key
+
+    keys = [Key('Kind', index, project=_PROJECT)
+            for index in range(1, count + 1)]
+    keys.extend(Key('Kind', 'name-%03d' % (index,), project=_PROJECT)
+                for index in range(count // 4))
+    return keys
+
+
+class Test_split_query(unittest.TestCase):
+
+    def _call_fut(self, query, num_splits, client=None):
+        from google.cloud.datastore.scan import split_query
+
+        return split_query(query, num_splits, client=client)
+
+    def _make_query(self, client, **kw):
+        from google.cloud.datastore.query import Query
+
+        kw.setdefault('kind', 'Kind')
+        return Query(client, **kw)
+
+    def test_invalid(self):
+        client = _Client(_Connection([]))
+        invalid = [
+            (self._make_query(client), 0),
+            (self._make_query(client, kind=None), 2),
+            (self._make_query(client, distinct_on=['foo']), 2),
+            (self._make_query(client, order=['-__key__']), 2),
+            (self._make_query(client, filters=[('foo', '>', 1)]), 2),
+        ]
+        for query, num_splits in invalid:
+            self.assertRaises(ValueError, self._call_fut, query, num_splits)
+        self.assertEqual(client._connection._queries, [])
+
+    def test_single(self):
+        client = _Client(_Connection(_make_keys(10)))
+        query = self._make_query(client, filters=[('foo', '=', 1)])
+
+        sub_query, = self._call_fut(query, 1)
+
+        self.assertEqual(sub_query.kind, 'Kind')
+        self.assertEqual(sub_query.filters, [('foo', '=', 1)])
+        self.assertEqual(sub_query.order, ['__key__'])
+        self.assertEqual(client._connection._queries, [])
+
+    def test_splits(self):
+        from google.cloud.datastore.scan import _key_order
+
+        keys = _make_keys(400)
+        connection = _Connection(keys)
+        query = self._make_query(_Client(connection))
+        other_client = _Client(connection)
+
+        sub_queries = self._call_fut(query, 4, client=other_client)
+
+        self.assertEqual(len(sub_queries), 4)
+        scatter_pb, = connection._queries
+        self.assertEqual(scatter_pb.order[0].property.name, '__scatter__')
+        self.assertEqual(scatter_pb.limit.value, 4 * 32)
+        self.assertEqual(sub_queries[0].filters[0][1], '<')
+        self.assertEqual(sub_queries[-1].filters[0][1], '>=')
+        for before, after in zip(sub_queries, sub_queries[1:]):
+            self.assertEqual(before.filters[-1][2], after.filters[0][2])
+        split_keys = [sub_query.filters[-1][2]
+                      for sub_query in sub_queries[:-1]]
+        self.assertEqual(
+            [_key_order(key) for key in split_keys],
+            sorted(set(_key_order(key) for key in split_keys)))
+
+        found = []
+        for sub_query in sub_queries:
+            entities = list(sub_query.fetch())
+            self.assertTrue(entities)
+            found.extend(entity.key for entity in entities)
+        self.assertEqual(found, sorted(keys, key=_key_order))
+
+    def test_splits_w_ancestor(self):
+        from google.cloud.grpc.datastore.v1 import query_pb2
+        from google.cloud.datastore.helpers import key_from_protobuf
+        from google.cloud.datastore.key import Key
+
+        ancestor = Key('Parent', 1, project=_PROJECT)
+        connection = _Connection(_make_keys(100))
+        query = self._make_query(_Client(connection), ancestor=ancestor)
+
+        sub_queries = self._call_fut(query, 2)
+
+        scatter_pb, = connection._queries
+        filter_pb, = scatter_pb.filter.composite_filter.filters
+        self.assertEqual(filter_pb.property_filter.op,
+                         query_pb2.PropertyFilter.HAS_ANCESTOR)
+        self.assertEqual(
+            key_from_protobuf(filter_pb.property_filter.value.key_value),
+            ancestor)
+        self.assertEqual(len(sub_queries), 2)
+        for sub_query in sub_queries:
+            self.assertEqual(sub_query.ancestor, ancestor)
+
+    def test_few_keys(self):
+        from google.cloud.datastore.scan import _key_order
+
+        keys = _make_keys(2)
+        client = _Client(_Connection(keys))
+        query = self._make_query(client)
+
+        sub_queries = self._call_fut(query, 8)
+
+        self.assertEqual(len(sub_queries), 3)
+        found = [entity.key for sub_query in sub_queries
+                 for entity in sub_query.fetch()]
+        self.assertEqual(sorted(found, key=_key_order),
+                         sorted(keys, key=_key_order))
+
+    def test_empty_kind(self):
+        client = _Client(_Connection([]))
+        query = self._make_query(client, order=['__key__'])
+
+        sub_query, = self._call_fut(query, 8)
+
+        self.assertEqual(sub_query.filters, [])
+
+
+class Test_parallel_fetch(unittest.TestCase):
+
+    def _call_fut(self, query, num_splits, **kw):
+        from google.cloud.datastore.scan import parallel_fetch
+
+        return parallel_fetch(query, num_splits, **kw)
+
+    def _make_query(self, connection):
+        from google.cloud.datastore.query import Query
+
+        return Query(_Client(connection), kind='Kind')
+
+    def test_ordered(self):
+        from google.cloud.datastore.scan import _key_order
+
+        keys = _make_keys(200)
+        connection = _Connection(keys, delay=0.001)
+
+        entities = self._call_fut(self._make_query(connection), 8,
+                                  ordered=True)
+
+        self.assertEqual([entity.key for entity in entities],
+                         sorted(keys, key=_key_order))
+        self.assertGreater(len(connection._threads), 1)
+
+    def test_unordered(self):
+        from google.cloud.datastore.scan import _key_order
+
+        keys = _make_keys(200)
+        connection = _Connection(keys)
+
+        entities = list(self._call_fut(
+            self._make_query(connection), 8, max_workers=2,
+            client=_Client(connection)))
+
+        self.assertEqual(
+            sorted((entity.key for entity in entities), key=_key_order),
+            sorted(keys, key=_key_order))
+
+    def test_error(self):
+        from google.cloud.exceptions import ServiceUnavailable
+
+        keys = _make_keys(100)
+        connection = _Connection(keys, fail_at=keys[60])
+
+        for ordered in (True, False):
+            entities = self._call_fut(
+                self._make_query(connection), 4, ordered=ordered)
+            with self.assertRaises(ServiceUnavailable):
+                list(entities)
+
+    def test_consumer_stops_early(self):
+        import mock
+
+        keys = _make_keys(400)
+        connection = _Connection(keys)
+
+        with mock.patch('google.cloud._helpers._PUT_TIMEOUT', new=0):
+            entities = self._call_fut(self._make_query(connection), 16,
+                                      ordered=True, max_workers=2)
+            next(entities)
+            entities.close()
+
+        # Sub-queries not yet started when the consumer stopped are
+        # cancelled.
+        started = [query_pb for query_pb in connection._queries[1:]
+                   if not query_pb.start_cursor]
+        self.assertLess(len(started), 16)
+
+
+class _Client(object):
+
+    namespace = None
+    project = _PROJECT
+    current_transaction = None
+
+    def __init__(self, connection):
+        self._connection = connection
+
+
+class _Connection(object):
+
+    PAGE_SIZE = 10
+
+    def __init__(self, keys, fail_at=None, delay=0):
+        import threading
+
+        self._keys = keys
+        self._fail_at = fail_at
+        self._delay = delay
+        self._lock = threading.Lock()
+        self._queries = []
+        self._threads = set()
+
+    def run_query(self, project, query_pb, namespace=None,
+                  transaction_id=None):
+        import threading
+        import time
+        from google.cloud.grpc.datastore.v1 import query_pb2
+        from google.cloud.exceptions import ServiceUnavailable
+        from google.cloud.datastore.scan import _key_order
+
+        assert project == _PROJECT
+        assert transaction_id is None
+        with self._lock:
+            self._queries.append(query_pb)
+            self._threads.add(threading.current_thread())
+        time.sleep(self._delay)
+
+        if query_pb.order[0].property.name == '__scatter__':
+            # Any permutation of the keys is a fair "scatter" order.
+            keys = sorted(self._keys, key=lambda key: hash(key) % 97)
+            keys = keys[:query_pb.limit.value]
+            page_size, fail_at = len(keys), None
+        else:
+            keys = sorted(self._keys, key=_key_order)
+            keys = [key for key in keys
+                    if _in_range(query_pb, _key_order(key))]
+            page_size, fail_at = self.PAGE_SIZE, self._fail_at
+
+        start = int(query_pb.start_cursor or b'0')
+        page = keys[start:start + page_size]
+        if fail_at in page:
+            raise ServiceUnavailable('oops')
+        end = start + len(page)
+        if end < len(keys):
+            more = query_pb2.QueryResultBatch.NOT_FINISHED
+        else:
+            more = query_pb2.QueryResultBatch.NO_MORE_RESULTS
+        return ([_entity_pb(key) for key in page],
+                str(end).encode('ascii'), more, 0)
+
+
+def _in_range(query_pb, order):
+    from google.cloud.grpc.datastore.v1 import query_pb2
+    from google.cloud.datastore.helpers import key_from_protobuf
+    from google.cloud.datastore.scan import _key_order
+
+    for filter_pb in query_pb.filter.composite_filter.filters:
+        property_filter = filter_pb.property_filter
+        assert property_filter.property.name == '__key__'
+        bound = _key_order(key_from_protobuf(
+            property_filter.value.key_value))
+        if property_filter.op == query_pb2.PropertyFilter.LESS_THAN:
+            if not order < bound:
+                return False
+        elif not order >= bound:
+            return False
+    return True
+
+
+def _entity_pb(key):
+    from google.cloud.grpc.datastore.v1 import entity_pb2
+
+    entity_pb = entity_pb2.Entity()
+    entity_pb.key.CopyFrom(key.to_protobuf())
+    return entity_pb
@@ -41,6 +41,7 @@ class TestTransaction(unittest.TestCase):
                               datastore_pb2.CommitRequest)
         self.assertIs(xact.mutations, xact._commit_request.mutations)
         self.assertEqual(len(xact._partial_key_entities), 0)
+        self.assertFalse(xact.read_only)
 
     def test_current(self):
         _PROJECT = 'PROJECT'
@@ -125,6 +126,20 @@ class TestTransaction(unittest.TestCase):
                          (_PROJECT, commit_request, 234))
         self.assertIsNone(xact.id)
 
+    def test_commit_async(self):
+        _PROJECT = 'PROJECT'
+        connection = _Connection(234)
+        client = _Client(_PROJECT, connection)
+        xact = self._make_one(client)
+        xact._commit_request = commit_request = object()
+        xact.begin()
+
+        self.assertIsNone(xact.commit_async().result())
+
+        self.assertEqual(connection._committed,
+                         (_PROJECT, commit_request, 234))
+        self.assertIsNone(xact.id)
+
     def test_commit_w_partial_keys(self):
         _PROJECT = 'PROJECT'
         _KIND = 'KIND'
@@ -143,6 +158,35 @@ class TestTransaction(unittest.TestCase):
         self.assertIsNone(xact.id)
         self.assertEqual(entity.key.path, [{'kind': _KIND, 'id': _ID}])
 
+    def test_put_delete_read_only(self):
+        from google.cloud.datastore.key import Key
+
+        _PROJECT = 'PROJECT'
+        connection = _Connection(234)
+        client = _Client(_PROJECT, connection)
+        xact = self._make_one(client, read_only=True)
+        xact.begin()
+
+        self.assertTrue(xact.read_only)
+        self.assertRaises(ValueError, xact.put, _Entity())
+        self.assertRaises(ValueError, xact.delete,
+                          Key('KIND', 1234, project=_PROJECT))
+        self.assertEqual(len(xact.mutations), 0)
+
+    def test_put_delete(self):
+        from google.cloud.datastore.key import Key
+
+        _PROJECT = 'PROJECT'
+        connection = _Connection(234)
+        client = _Client(_PROJECT, connection)
+        xact = self._make_one(client)
+        xact.begin()
+
+        xact.put(_Entity())
+        xact.delete(Key('KIND', 1234, project=_PROJECT))
+
+        self.assertEqual(len(xact.mutations), 2)
+
     def test_context_manager_no_raise(self):
         _PROJECT = 'PROJECT'
         connection = _Connection(234)
@@ -227,6 +271,8 @@ class _Entity(dict):
 
 class _Client(object):
 
+    cache = None
+
     def __init__(self, project, connection, namespace=None):
         self.project = project
         self._connection = connection
@@ -243,6 +289,11 @@ class _Client(object):
     def current_batch(self):
         return self._batches and self._batches[0] or None
 
+    def _submit(self, func, *args, **kwargs):
+        from google.cloud.datastore.helpers import _completed_future
+
+        return _completed_future(func(*args, **kwargs))
+
 
 class _NoCommitBatch(object):
 
@@ -48,7 +48,9 @@ IGNORED_MODULES = frozenset([
     'google.cloud.streaming.buffered_stream',
     'google.cloud.streaming.exceptions',
     'google.cloud.streaming.http_wrapper',
+    'google.cloud.streaming.mapped_file',
     'google.cloud.streaming.stream_slice',
+    'google.cloud.streaming.throttling',
     'google.cloud.streaming.transfer',
     'google.cloud.streaming.util',
     'google.cloud.translate',
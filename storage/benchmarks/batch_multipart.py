@@ -0,0 +1,144 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark multipart encoding / decoding of 100-request storage batches.
+
+Compares :meth:`google.cloud.storage.batch.Batch._prepare_batch_request`
+and :func:`google.cloud.storage.batch._unpack_batch_response` against the
+equivalent round trip through the :mod:`email` package.
+
+Usage::
+
+    $ python storage/benchmarks/batch_multipart.py [--iterations N]
+"""
+
+import argparse
+import json
+import timeit
+
+from email.generator import Generator
+from email.mime.multipart import MIMEMultipart
+from email.parser import Parser
+from six.moves import StringIO
+
+from google.cloud.storage.batch import Batch
+from google.cloud.storage.batch import MIMEApplicationHTTP
+from google.cloud.storage.batch import _unpack_batch_response
+
+
+BATCH_SIZE = 100
+URL_TEMPLATE = 'https://www.googleapis.com/storage/v1/b/bucket/o/blob-%03d'
+BOUNDARY = 'batch_benchmark'
+
+
+def _make_batch():
+    """Create a batch holding ``BATCH_SIZE`` deferred PATCH requests."""
+    batch = Batch(client=None)
+    for index in range(BATCH_SIZE):
+        data = json.dumps({'metadata': {'index': str(index)}})
+        headers = {
+            'Accept-Encoding': 'gzip',
+            'Content-Length': str(len(data)),
+            'Content-Type': 'application/json',
+        }
+        batch._requests.append(
+            ('PATCH', URL_TEMPLATE % (index,), headers, data))
+    return batch
+
+
+def _make_response():
+    """Create a batch response with ``BATCH_SIZE`` JSON sub-responses."""
+    lines = []
+    for index in range(BATCH_SIZE):
+        payload = json.dumps({
+            'kind': 'storage#object',
+            'name': 'blob-%03d' % (index,),
+            'bucket': 'bucket',
+            'generation': '1479317854215000',
+            'metageneration': '2',
+            'size': '1024',
+            'metadata': {'index': str(index)},
+        })
+        lines.extend([
+            '--' + BOUNDARY,
+            'Content-Type: application/http',
+            'Content-ID: <response-%d>' % (index,),
+            '',
+            'HTTP/1.1 200 OK',
+            'Content-Type: application/json; charset=UTF-8',
+            'Content-Length: %d' % (len(payload),),
+            '',
+            payload,
+            '',
+        ])
+    lines.append('--%s--' % (BOUNDARY,))
+    response = {'content-type': 'multipart/mixed; boundary=%s' % (BOUNDARY,)}
+    return response, '\r\n'.join(lines).encode('utf-8')
+
+
+def _email_encode(batch):
+    """Encode the batch body using the :mod:`email` package."""
+    multi = MIMEMultipart()
+    for method, uri, headers, body in batch._requests:
+        multi.attach(MIMEApplicationHTTP(method, uri, headers, body))
+    buf = StringIO()
+    Generator(buf, False, 0).flatten(multi)
+    return buf.getvalue().split('\n\n', 1)[1]
+
+
+def _email_decode(response, content):
+    """Decode the batch response using the :mod:`email` package."""
+    parser = Parser()
+    message = parser.parsestr(
+        'Content-Type: %s\nMIME-Version: 1.0\n\n%s' % (
+            response['content-type'], content.decode('utf-8')))
+    results = []
+    for part in message.get_payload():
+        _, rest = part.get_payload().split('\n', 1)
+        results.append(json.loads(parser.parsestr(rest).get_payload()))
+    return results
+
+
+def _report(label, func, iterations):
+    """Time ``func`` and print the cost per 100-request batch."""
+    best = min(timeit.repeat(func, number=iterations, repeat=3))
+    per_batch = best / iterations
+    print('%-28s %9.1f usec / batch  %9.0f batches / sec' % (
+        label, per_batch * 1e6, 1.0 / per_batch))
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    batch = _make_batch()
+    response, content = _make_response()
+    assert len(list(_unpack_batch_response(response, content))) == BATCH_SIZE
+
+    print('%d requests per batch' % (BATCH_SIZE,))
+    _report('encode (email package)',
+            lambda: _email_encode(batch), args.iterations)
+    _report('encode (Batch)',
+            batch._prepare_batch_request, args.iterations)
+    _report('decode (email package)',
+            lambda: _email_decode(response, content), args.iterations)
+    _report('decode (Batch)',
+            lambda: list(_unpack_batch_response(response, content)),
+            args.iterations)
+
+
+if __name__ == '__main__':
+    main()
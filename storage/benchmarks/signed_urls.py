@@ -0,0 +1,91 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark signed URL generation, in URLs per second.
+
+Compares :meth:`google.cloud.storage.blob.Blob.generate_signed_url` with
+:class:`google.cloud.storage.signing.URLSigner`, signing in process, in a
+process pool, and answering repeated requests from its memo.  A throwaway
+RSA key is generated, so no real credentials are needed.
+
+Usage::
+
+    $ python storage/benchmarks/signed_urls.py [--urls N] [--processes N]
+"""
+
+import argparse
+import time
+
+import google.auth.crypt
+from google.oauth2 import service_account
+import rsa
+
+from google.cloud.storage.blob import Blob
+from google.cloud.storage.bucket import Bucket
+from google.cloud.storage.signing import URLSigner
+
+
+EXPIRATION = 2000000000
+
+
+def _make_credentials():
+    """Create service account credentials with a fresh 2048-bit key."""
+    _, private_key = rsa.newkeys(2048)
+    signer = google.auth.crypt.RSASigner.from_string(
+        private_key.save_pkcs1())
+    return service_account.Credentials(
+        signer, 'benchmark@example.com', 'https://example.com/token')
+
+
+def _report(label, func, count):
+    """Time ``func`` (which signs ``count`` URLs) and print the rate."""
+    start = time.time()
+    func()
+    elapsed = time.time() - start
+    print('%-32s %9.0f URLs / sec' % (label, count / elapsed))
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--urls', type=int, default=500)
+    parser.add_argument('--processes', type=int, default=4)
+    args = parser.parse_args()
+
+    credentials = _make_credentials()
+    bucket = Bucket(client=None, name='bucket')
+    blobs = [Blob('object-%06d' % (index,), bucket=bucket)
+             for index in range(args.urls)]
+
+    print('%d URLs, signer %s' % (
+        args.urls, type(credentials.signer).__module__))
+    _report('Blob.generate_signed_url', lambda: [
+        blob.generate_signed_url(EXPIRATION, credentials=credentials)
+        for blob in blobs], args.urls)
+
+    signer = URLSigner(credentials)
+    _report('URLSigner', lambda: signer.sign_urls(blobs, EXPIRATION),
+            args.urls)
+    _report('URLSigner (memoized)',
+            lambda: signer.sign_urls(blobs, EXPIRATION), args.urls)
+
+    with URLSigner(credentials, processes=args.processes) as signer:
+        # Start the worker processes before timing.
+        signer.sign_urls(blobs[:2], EXPIRATION - 3600)
+        _report('URLSigner (%d processes)' % (args.processes,),
+                lambda: signer.sign_urls(blobs, EXPIRATION), args.urls)
+
+
+if __name__ == '__main__':
+    main()
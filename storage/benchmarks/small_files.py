@@ -0,0 +1,108 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark uploading and downloading many small files.
+
+Runs :class:`google.cloud.storage.transfer.TransferManager` with an
+increasing number of workers against
+:class:`google.cloud.storage.local.LocalStorageHttp`, delaying each request
+by a simulated round-trip time.
+
+Usage::
+
+    $ python storage/benchmarks/small_files.py [--files N] [--rtt SECONDS]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from google.cloud.storage.client import Client
+from google.cloud.storage.local import LocalStorageHttp
+from google.cloud.storage.transfer import TransferManager
+
+
+FILE_SIZE = 1024
+WORKER_COUNTS = (1, 4, 16, 64)
+
+
+class _SlowHttp(LocalStorageHttp):
+    """Local stand-in delaying each request by a fixed round-trip time."""
+
+    def __init__(self, root, rtt):
+        super(_SlowHttp, self).__init__(root)
+        self._rtt = rtt
+
+    def request(self, *args, **kwargs):
+        time.sleep(self._rtt)
+        return super(_SlowHttp, self).request(*args, **kwargs)
+
+
+def _make_files(directory, count):
+    """Write ``count`` files of ``FILE_SIZE`` bytes into ``directory``."""
+    os.makedirs(directory)
+    paths = []
+    for index in range(count):
+        path = os.path.join(directory, 'file-%05d' % (index,))
+        with open(path, 'wb') as file_obj:
+            file_obj.write(os.urandom(FILE_SIZE))
+        paths.append(path)
+    return paths
+
+
+def _report(label, manager):
+    """Print the throughput of a transfer manager."""
+    stats = manager.stats
+    print('%-24s %8.1f files / sec  %8.1f KiB / sec  %d failures' % (
+        label, stats.files_per_second, stats.bytes_per_second / 1024,
+        stats.failures))
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--files', type=int, default=200)
+    parser.add_argument('--rtt', type=float, default=0.02)
+    args = parser.parse_args()
+
+    tempdir = tempfile.mkdtemp()
+    try:
+        paths = _make_files(os.path.join(tempdir, 'source'), args.files)
+        client = Client(project='benchmark', http=_SlowHttp(
+            os.path.join(tempdir, 'storage'), args.rtt))
+        bucket = client.create_bucket('benchmark')
+
+        print('%d files of %d bytes, %.0f ms per request' % (
+            args.files, FILE_SIZE, args.rtt * 1000))
+        for max_workers in WORKER_COUNTS:
+            prefix = 'workers-%d/' % (max_workers,)
+            pairs = [(path, bucket.blob(prefix + os.path.basename(path)))
+                     for path in paths]
+            manager = TransferManager(client, max_workers=max_workers)
+            manager.upload(pairs)
+            _report('upload (%d workers)' % (max_workers,), manager)
+
+            manager = TransferManager(client, max_workers=max_workers)
+            manager.download([
+                (os.path.join(tempdir, 'downloads', blob.name), blob)
+                for _, blob in pairs])
+            _report('download (%d workers)' % (max_workers,), manager)
+    finally:
+        shutil.rmtree(tempdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -19,6 +19,17 @@ These are *not* part of the API.
 
 import base64
 from hashlib import md5
+import io
+import zlib
+
+import httplib2
+
+
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+"""Window bits selecting the gzip container for :mod:`zlib`."""
+
+_GZIP_BLOCK_SIZE = 256 * 1024
+"""Bytes read from, or written to, a wrapped stream at a time."""
 
 
 class _PropertyMixin(object):
@@ -177,3 +188,223 @@ def _base64_md5hash(buffer_object):
     _write_buffer_to_hash(buffer_object, hash_obj)
     digest_bytes = hash_obj.digest()
     return base64.b64encode(digest_bytes)
+
+
+class _GzipReader(object):
+    """Read-only stream gzip-compressing another stream as it is read.
+
+    At most one block of input and one chunk of output are held in memory,
+    so arbitrarily large streams can be uploaded compressed.  The stream
+    is not seekable, except back into the chunk last read, which is what
+    a resumable upload needs when the server persists part of a chunk.
+
+    :type stream: file
+    :param stream: A file handle open for reading.
+
+    :type size: int
+    :param size: (Optional) The number of bytes to read from ``stream``;
+                 by default, read it to the end.
+
+    :type compresslevel: int
+    :param compresslevel: (Optional) The :mod:`zlib` compression level.
+    """
+
+    def __init__(self, stream, size=None, compresslevel=6):
+        self._stream = stream
+        self._remaining = size
+        self._compressor = zlib.compressobj(
+            compresslevel, zlib.DEFLATED, _GZIP_WBITS)
+        self._buffer = b''
+        self._last = b''
+        self._position = 0
+        self._done = False
+
+    def _fill(self, size):
+        """Compress input until ``size`` bytes are buffered, or to the end.
+
+        :type size: int
+        :param size: The number of bytes wanted; negative for all of them.
+        """
+        while not self._done and (size < 0 or len(self._buffer) < size):
+            block_size = _GZIP_BLOCK_SIZE
+            if self._remaining is not None:
+                block_size = min(block_size, self._remaining)
+            data = self._stream.read(block_size) if block_size else b''
+            if data:
+                if self._remaining is not None:
+                    self._remaining -= len(data)
+                self._buffer += self._compressor.compress(data)
+            else:
+                self._buffer += self._compressor.flush()
+                self._done = True
+
+    def read(self, size=-1):
+        """Read compressed bytes.
+
+        :type size: int
+        :param size: (Optional) The number of bytes to read; fewer are only
+                     returned at the end of the stream.
+
+        :rtype: bytes
+        :returns: The compressed bytes.
+        """
+        if size is None:
+            size = -1
+        self._fill(size)
+        if size < 0:
+            size = len(self._buffer)
+        result, self._buffer = self._buffer[:size], self._buffer[size:]
+        self._last = result
+        self._position += len(result)
+        return result
+
+    def tell(self):
+        """Current position in the compressed stream.
+
+        :rtype: int
+        :returns: The number of compressed bytes read so far.
+        """
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """Rewind into the chunk last read.
+
+        :type offset: int
+        :param offset: The position in the compressed stream.
+
+        :type whence: int
+        :param whence: Must be :data:`io.SEEK_SET`.
+
+        :raises: :exc:`ValueError` if the position is outside of the chunk
+                 last read.
+        """
+        start = self._position - len(self._last)
+        if whence != io.SEEK_SET or not start <= offset <= self._position:
+            raise ValueError(
+                'Can only seek back into the last chunk read', offset)
+        keep = offset - start
+        self._buffer = self._last[keep:] + self._buffer
+        self._last = self._last[:keep]
+        self._position = offset
+
+    @staticmethod
+    def seekable():
+        """Whether arbitrary seeks are supported.
+
+        :rtype: bool
+        :returns: ``False``.
+        """
+        return False
+
+
+class _GunzipWriter(object):
+    """Write-only stream gzip-decompressing into another stream.
+
+    Each write is decompressed in bounded blocks, so neither large objects
+    nor highly compressible ones are held in memory.  Concatenated gzip
+    members are decompressed one after the other, as ``gunzip`` does.
+
+    :type stream: file
+    :param stream: A file handle open for writing.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._decompressor = zlib.decompressobj(_GZIP_WBITS)
+
+    def write(self, data):
+        """Decompress data, writing the result to the wrapped stream.
+
+        :type data: bytes
+        :param data: The next compressed bytes.
+        """
+        while data:
+            self._stream.write(
+                self._decompressor.decompress(data, _GZIP_BLOCK_SIZE))
+            if self._decompressor.unconsumed_tail:
+                data = self._decompressor.unconsumed_tail
+            elif self._decompressor.unused_data:
+                data = self._decompressor.unused_data
+                self._decompressor = zlib.decompressobj(_GZIP_WBITS)
+            else:
+                data = b''
+
+    def close(self):
+        """Flush the last decompressed bytes.
+
+        The wrapped stream is left open.
+
+        :raises: :exc:`ValueError` if the compressed data was truncated.
+        """
+        self._stream.write(self._decompressor.flush())
+        if not getattr(self._decompressor, 'eof', True):
+            raise ValueError('Compressed data ended before the end marker.')
+
+
+def _keep_content_encoded(response):
+    """Hide the ``Content-Encoding`` of a response from httplib2.
+
+    :type response: :class:`~six.moves.http_client.HTTPResponse`
+    :param response: A response whose body has not been read.
+
+    :rtype: :class:`~six.moves.http_client.HTTPResponse`
+    :returns: ``response``, without its ``Content-Encoding`` header.
+    """
+    del response.msg['content-encoding']
+    return response
+
+
+class _EncodedHTTPConnection(httplib2.HTTPConnectionWithTimeout):
+    """HTTP connection whose response bodies httplib2 leaves encoded."""
+
+    def getresponse(self):
+        return _keep_content_encoded(
+            httplib2.HTTPConnectionWithTimeout.getresponse(self))
+
+
+class _EncodedHTTPSConnection(httplib2.HTTPSConnectionWithTimeout):
+    """HTTPS connection whose response bodies httplib2 leaves encoded."""
+
+    def getresponse(self):
+        return _keep_content_encoded(
+            httplib2.HTTPSConnectionWithTimeout.getresponse(self))
+
+
+class _EncodedHttp(object):
+    """Transport returning content-encoded response bodies as they are.
+
+    httplib2 decompresses any response with a ``gzip`` content encoding,
+    which fails for a range of the compressed bytes.  Requests sent through
+    this wrapper use connections which hide the encoding from it.
+
+    The connections are kept by the wrapped transport, which is reused for
+    any later request to the same host: it must not be shared.
+
+    :type http: :class:`httplib2.Http`
+    :param http: A transport of its own, with no open connection.
+    """
+
+    connections = {
+        'http': _EncodedHTTPConnection,
+        'https': _EncodedHTTPSConnection,
+    }
+    """Connection types by URL scheme, as used by
+    :func:`google.cloud.streaming.http_wrapper.make_api_request`."""
+
+    def __init__(self, http):
+        self._http = http
+
+    def request(self, *args, **kwargs):
+        """Send a request through the wrapped transport.
+
+        :type args: tuple
+        :param args: Positional arguments of :meth:`httplib2.Http.request`.
+
+        :type kwargs: dict
+        :param kwargs: Keyword arguments of :meth:`httplib2.Http.request`,
+                       including ``connection_type``.
+
+        :rtype: tuple
+        :returns: The response and its undecoded body.
+        """
+        return self._http.request(*args, **kwargs)
@@ -15,6 +15,7 @@
 """Create / interact with Google Cloud Storage connections."""
 
 from google.cloud import _http
+from google.cloud.storage._helpers import _EncodedHttp
 
 
 class Connection(_http.JSONConnection):
@@ -25,7 +26,10 @@ class Connection(_http.JSONConnection):
                         connection.
 
     :type http: :class:`httplib2.Http` or class that defines ``request()``.
-    :param http: (Optional) HTTP object to make requests.
+    :param http: (Optional) HTTP object to make requests. If passed, it is
+                 shared by every thread using this connection, so it must be
+                 safe for concurrent use. If not passed, each thread gets its
+                 own HTTP object (:class:`httplib2.Http` is not thread-safe).
     """
 
     API_BASE_URL = _http.API_BASE_URL
@@ -41,3 +45,17 @@ class Connection(_http.JSONConnection):
              'https://www.googleapis.com/auth/devstorage.read_only',
              'https://www.googleapis.com/auth/devstorage.read_write')
     """The scopes required for authenticating as a Cloud Storage consumer."""
+
+    _HTTP_PER_THREAD = True
+
+    def _make_encoded_http(self):
+        """Create a transport leaving content-encoded bodies as they are.
+
+        :rtype: :class:`~google.cloud.storage._helpers._EncodedHttp`
+        :returns: A wrapper around a new transport, or ``None`` if an
+                  ``http`` object was passed to the constructor, through
+                  which all requests must then go.
+        """
+        if self._http is not None:
+            return None
+        return _EncodedHttp(self._make_http())
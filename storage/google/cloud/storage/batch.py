@@ -15,17 +15,19 @@
 
 See: https://cloud.google.com/storage/docs/json_api/v1/how-tos/batch
 """
+import collections
 from email.encoders import encode_noop
-from email.generator import Generator
 from email.mime.application import MIMEApplication
-from email.mime.multipart import MIMEMultipart
-from email.parser import Parser
-import io
 import json
+import re
+import uuid
 
 import httplib2
 import six
 
+from google.cloud._helpers import _chunked
+from google.cloud._helpers import _map_concurrently
+from google.cloud.exceptions import GoogleCloudError
 from google.cloud.exceptions import make_exception
 from google.cloud.storage._http import Connection
 
@@ -123,17 +125,42 @@ class _FutureDict(object):
         raise KeyError('Cannot set %r -> %r on a future' % (key, value))
 
 
+class BatchResult(collections.namedtuple('BatchResult', 'item value error')):
+    """The outcome of one item sent through auto-split batches.
+
+    :type item: object
+    :param item: The item passed in (e.g. a blob or a blob name).
+
+    :type value: object
+    :param value: The value produced for the item (e.g. the newly copied
+                  :class:`~google.cloud.storage.blob.Blob`), or ``None`` if
+                  the request failed.
+
+    :type error: :class:`~google.cloud.exceptions.GoogleCloudError`
+    :param error: The error returned for the item, or ``None`` if the
+                  request succeeded.
+    """
+
+
 class Batch(Connection):
     """Proxy an underlying connection, batching up change operations.
 
     :type client: :class:`google.cloud.storage.client.Client`
     :param client: The client to use for making connections.
+
+    :type raise_exception: bool
+    :param raise_exception: (Optional) If True (the default), :meth:`finish`
+                            raises the first error returned for a deferred
+                            request.  If False, failed requests are left for
+                            the caller to inspect in the returned responses.
     """
-    _MAX_BATCH_SIZE = 1000
+    _MAX_BATCH_SIZE = 100
+    """Maximum number of requests the JSON API accepts in one batch."""
 
-    def __init__(self, client):
+    def __init__(self, client, raise_exception=True):
         super(Batch, self).__init__()
         self._client = client
+        self._raise_exception = raise_exception
         self._requests = []
         self._target_objects = []
 
@@ -184,24 +211,21 @@ class Batch(Connection):
         if len(self._requests) == 0:
             raise ValueError("No deferred requests")
 
-        multi = MIMEMultipart()
-
-        for method, uri, headers, body in self._requests:
-            subrequest = MIMEApplicationHTTP(method, uri, headers, body)
-            multi.attach(subrequest)
+        parts = [_encode_subrequest(method, uri, headers, body)
+                 for method, uri, headers, body in self._requests]
 
-        # The `email` package expects to deal with "native" strings
-        if six.PY3:  # pragma: NO COVER  Python3
-            buf = io.StringIO()
-        else:
-            buf = io.BytesIO()
-        generator = Generator(buf, False, 0)
-        generator.flatten(multi)
-        payload = buf.getvalue()
+        boundary = _make_boundary()
+        while any(boundary in part for part in parts):
+            boundary = _make_boundary()  # pragma: NO COVER
 
-        # Strip off redundant header text
-        _, body = payload.split('\n\n', 1)
-        return dict(multi._headers), body
+        delimiter = '--' + boundary + '\n'
+        body = delimiter + ('\n' + delimiter).join(parts)
+        body += '\n--' + boundary + '--\n'
+        headers = {
+            'Content-Type': 'multipart/mixed; boundary="%s"' % (boundary,),
+            'MIME-Version': '1.0',
+        }
+        return headers, body
 
     def _finish_futures(self, responses):
         """Apply all the batch responses to the futures created.
@@ -228,7 +252,7 @@ class Batch(Connection):
             elif target_object is not None:
                 target_object._properties = sub_payload
 
-        if exception_args is not None:
+        if exception_args is not None and self._raise_exception:
             raise make_exception(*exception_args)
 
     def finish(self):
@@ -236,6 +260,8 @@ class Batch(Connection):
 
         :rtype: list of tuples
         :returns: one ``(headers, payload)`` tuple per deferred request.
+        :raises: :class:`~google.cloud.exceptions.GoogleCloudError` if the
+                 batch request as a whole fails.
         """
         headers, body = self._prepare_batch_request()
 
@@ -246,6 +272,9 @@ class Batch(Connection):
         # current batch.
         response, content = self._client._base_connection._make_request(
             'POST', url, data=body, headers=headers)
+        if not 200 <= response.status < 300:
+            raise make_exception(response, content,
+                                 error_info='POST ' + url)
         responses = list(_unpack_batch_response(response, content))
         self._finish_futures(responses)
         return responses
@@ -266,30 +295,240 @@ class Batch(Connection):
             self._client._pop_batch()
 
 
-def _generate_faux_mime_message(parser, response, content):
-    """Convert response, content -> (multipart) email.message.
+def _finish_chunk(client, chunk, request_func):
+    """Send the requests for one chunk of items as a single batch.
 
-    Helper for _unpack_batch_response.
+    Helper for :func:`_run_batched`.
+
+    :type client: :class:`~google.cloud.storage.client.Client`
+    :param client: The client used to send the batch.
+
+    :type chunk: list
+    :param chunk: The items whose requests fit in one batch.
+
+    :type request_func: callable
+    :param request_func: See :func:`_run_batched`.
+
+    :rtype: list of :class:`BatchResult`
+    :returns: One result per item in ``chunk``.
     """
-    # We coerce to bytes to get consistent concat across
-    # Py2 and Py3. Percent formatting is insufficient since
-    # it includes the b in Py3.
-    if not isinstance(content, six.binary_type):
-        content = content.encode('utf-8')
-    content_type = response['content-type']
-    if not isinstance(content_type, six.binary_type):
-        content_type = content_type.encode('utf-8')
-    faux_message = b''.join([
-        b'Content-Type: ',
-        content_type,
-        b'\nMIME-Version: 1.0\n\n',
-        content,
-    ])
+    batch = Batch(client, raise_exception=False)
+    values = []
+    spans = []
+    # Push / pop by hand rather than using the context manager, since we
+    # need the responses returned by ``finish``.
+    client._push_batch(batch)
+    try:
+        for item in chunk:
+            start = len(batch._requests)
+            values.append(request_func(item, client))
+            spans.append((start, len(batch._requests)))
+    finally:
+        client._pop_batch()
+
+    responses = []
+    batch_error = None
+    if batch._requests:
+        try:
+            responses = batch.finish()
+        except GoogleCloudError as exc:
+            batch_error = exc
+
+    results = []
+    for item, value, (start, end) in zip(chunk, values, spans):
+        error = batch_error
+        if error is None:
+            for index in six.moves.range(start, end):
+                resp_headers, payload = responses[index]
+                if not 200 <= resp_headers.status < 300:
+                    method, url = batch._requests[index][:2]
+                    error = make_exception(resp_headers, payload,
+                                           error_info=method + ' ' + url)
+                    break
+        if error is not None:
+            value = None
+        results.append(BatchResult(item, value, error))
+    return results
+
+
+def _run_batched(client, items, request_func, max_workers=None):
+    """Send requests for many items through concurrent, auto-split batches.
+
+    Items are grouped into batches of at most ``Batch._MAX_BATCH_SIZE``
+    requests, and up to ``max_workers`` batches are sent at once.  Errors
+    for individual items are reported in the results rather than raised.
+
+    :type client: :class:`~google.cloud.storage.client.Client`
+    :param client: The client used to send the batches.
+
+    :type items: iterable
+    :param items: The items to process.  Consumed lazily, so it may be a
+                  generator (e.g. a blob listing).
+
+    :type request_func: callable
+    :param request_func: Takes ``(item, client)`` and issues the request for
+                         ``item`` through ``client`` (which will be inside a
+                         batch).  Should issue a single request; its return
+                         value becomes the result's ``value``.
+
+    :type max_workers: int
+    :param max_workers: (Optional) The number of batches to send
+                        concurrently.
+
+    :rtype: iterator
+    :returns: One :class:`BatchResult` per item, in the order of ``items``.
+    """
+    def _finish(chunk):
+        """Send one chunk in the current (worker) thread."""
+        return _finish_chunk(client, chunk, request_func)
+
+    chunks = _chunked(items, Batch._MAX_BATCH_SIZE)
+    for results in _map_concurrently(_finish, chunks, max_workers):
+        for result in results:
+            yield result
+
+
+_SUBREQUEST_HEADERS = 'Content-Type: application/http\nMIME-Version: 1.0\n\n'
+"""Headers for each part of a batch request body."""
+
+_BLANK_LINE = re.compile(r'\n\r?\n')
+
+
+def _make_boundary():
+    """Create a random multipart boundary.
+
+    :rtype: str
+    :returns: A boundary of the same form as those produced by the
+              :mod:`email` package.
+    """
+    return '===============%s==' % (uuid.uuid4().hex,)
+
+
+def _encode_subrequest(method, uri, headers, body):
+    """Encode a deferred request as the ``application/http`` part of a batch.
+
+    Produces the same output as flattening a :class:`MIMEApplicationHTTP`
+    (including its part headers), without the overhead of the :mod:`email`
+    package.
+
+    :type method: str
+    :param method: HTTP method
+
+    :type uri: str
+    :param uri: URI for HTTP request
 
-    if six.PY2:
-        return parser.parsestr(faux_message)
-    else:  # pragma: NO COVER  Python3
-        return parser.parsestr(faux_message.decode('utf-8'))
+    :type headers:  dict
+    :param headers: HTTP headers
+
+    :type body: str
+    :param body: (Optional) HTTP payload
+
+    :rtype: str
+    :returns: The encoded part (without its boundary delimiter).
+    """
+    if isinstance(body, dict):
+        body = json.dumps(body)
+        headers = dict(headers)
+        headers['Content-Type'] = 'application/json'
+        headers['Content-Length'] = len(body)
+    if body is None:
+        body = ''
+    elif isinstance(body, six.binary_type):
+        body = body.decode('utf-8')
+    lines = ['%s %s HTTP/1.1' % (method, uri)]
+    lines.extend(['%s: %s' % (key, value)
+                  for key, value in sorted(headers.items())])
+    lines.append('')
+    lines.append(body)
+    return _SUBREQUEST_HEADERS + '\n'.join(lines)
+
+
+def _get_boundary(content_type):
+    """Extract the boundary from a ``multipart/*`` content type.
+
+    :type content_type: str
+    :param content_type: The value of a ``Content-Type`` header.
+
+    :rtype: str
+    :returns: The boundary, or ``None`` if the content type is not multipart
+              or has no boundary.
+    """
+    media_type, _, params = content_type.partition(';')
+    if not media_type.strip().lower().startswith('multipart/'):
+        return None
+    for param in params.split(';'):
+        name, _, value = param.partition('=')
+        if name.strip().lower() == 'boundary':
+            return value.strip().strip('"')
+    return None
+
+
+def _split_header_block(text):
+    """Split a MIME / HTTP message into its header block and its body.
+
+    :type text: str
+    :param text: The message, starting with its first header line.
+
+    :rtype: tuple (str, str)
+    :returns: The header block and the body.  If the message has no blank
+              line, it is all headers.
+    """
+    if text.startswith('\n'):
+        return '', text[1:]
+    if text.startswith('\r\n'):
+        return '', text[2:]
+    match = _BLANK_LINE.search(text)
+    if match is None:
+        return text, ''
+    return text[:match.start()], text[match.end():]
+
+
+def _parse_headers(header_block):
+    """Parse a block of header lines.
+
+    :type header_block: str
+    :param header_block: ``Name: value`` lines, possibly folded.
+
+    :rtype: dict
+    :returns: Header values, keyed by lower-cased header name.
+    """
+    headers = {}
+    name = None
+    for line in header_block.split('\n'):
+        line = line.rstrip('\r')
+        if not line:
+            continue
+        if line[0] in ' \t' and name is not None:
+            headers[name] += ' ' + line.strip()
+            continue
+        name, _, value = line.partition(':')
+        name = name.strip().lower()
+        headers[name] = value.strip()
+    return headers
+
+
+def _unpack_subresponse(part):
+    """Convert one part of a batch response -> (headers, payload).
+
+    Helper for _unpack_batch_response.
+
+    :type part: str
+    :param part: The text of the part, between its boundary delimiters.
+
+    :rtype: tuple
+    :returns: The emulated :class:`httplib2.Response` and its payload.
+    """
+    _, message = _split_header_block(part)
+    status_line, _, message = message.partition('\n')
+    status = status_line.split(' ', 2)[1]
+    header_block, payload = _split_header_block(message)
+    msg_headers = _parse_headers(header_block)
+    msg_headers['status'] = status
+    headers = httplib2.Response(msg_headers)
+    ctype = msg_headers.get('content-type')
+    if ctype and ctype.startswith('application/json'):
+        payload = json.loads(payload)
+    return headers, payload
 
 
 def _unpack_batch_response(response, content):
@@ -298,27 +537,45 @@ def _unpack_batch_response(response, content):
     Creates a generator of tuples of emulating the responses to
     :meth:`httplib2.Http.request` (a pair of headers and payload).
 
+    Parts are located and decoded one at a time, so the first results are
+    available before the whole response has been parsed.
+
     :type response: :class:`httplib2.Response`
     :param response: HTTP response / headers from a request.
 
     :type content: str
     :param content: Response payload with a batch response.
     """
-    parser = Parser()
-    message = _generate_faux_mime_message(parser, response, content)
+    if isinstance(content, six.binary_type):
+        content = content.decode('utf-8')
+    content_type = response['content-type']
+    if isinstance(content_type, six.binary_type):
+        content_type = content_type.decode('utf-8')
 
-    if not isinstance(message._payload, list):
+    boundary = _get_boundary(content_type)
+    if boundary is None:
         raise ValueError('Bad response:  not multi-part')
 
-    for subrequest in message._payload:
-        status_line, rest = subrequest._payload.split('\n', 1)
-        _, status, _ = status_line.split(' ', 2)
-        sub_message = parser.parsestr(rest)
-        payload = sub_message._payload
-        ctype = sub_message['Content-Type']
-        msg_headers = dict(sub_message._headers)
-        msg_headers['status'] = status
-        headers = httplib2.Response(msg_headers)
-        if ctype and ctype.startswith('application/json'):
-            payload = json.loads(payload)
-        yield headers, payload
+    # Each delimiter must start a line; the line break before it belongs
+    # to the delimiter rather than to the preceding part.
+    delimiter = '--' + boundary
+    if content.startswith(delimiter):
+        start = 0
+    else:
+        start = content.find('\n' + delimiter)
+        if start == -1:
+            raise ValueError('Bad response:  not multi-part')
+        start += 1
+
+    while not content.startswith('--', start + len(delimiter)):
+        part_start = content.find('\n', start) + 1
+        if part_start == 0:
+            break  # Truncated after the last delimiter.
+        end = content.find('\n' + delimiter, part_start)
+        if end == -1:
+            end = len(content)
+        part_end = end
+        if content[part_end - 1:part_end] == '\r':
+            part_end -= 1
+        yield _unpack_subresponse(content[part_start:part_end])
+        start = end + 1
@@ -34,11 +34,15 @@ from google.cloud._helpers import _bytes_to_unicode
 from google.cloud.credentials import generate_signed_url
 from google.cloud.exceptions import NotFound
 from google.cloud.exceptions import make_exception
+from google.cloud.storage._helpers import _GunzipWriter
+from google.cloud.storage._helpers import _GzipReader
 from google.cloud.storage._helpers import _PropertyMixin
 from google.cloud.storage._helpers import _scalar_property
 from google.cloud.storage.acl import ObjectACL
 from google.cloud.streaming.http_wrapper import Request
+from google.cloud.streaming.exceptions import TransferInvalidError
 from google.cloud.streaming.http_wrapper import make_api_request
+from google.cloud.streaming.mapped_file import MappedFile
 from google.cloud.streaming.transfer import Download
 from google.cloud.streaming.transfer import RESUMABLE_UPLOAD
 from google.cloud.streaming.transfer import Upload
@@ -290,7 +294,9 @@ class Blob(_PropertyMixin):
         """
         return self.bucket.delete_blob(self.name, client=client)
 
-    def download_to_file(self, file_obj, client=None):
+    def download_to_file(self, file_obj, client=None, decompress=False,
+                         progress_callback=None, adaptive_chunksize=False,
+                         limiter=None, priority=0):
         """Download the contents of this blob into a file-like object.
 
         .. note::
@@ -319,33 +325,85 @@ class Blob(_PropertyMixin):
         :param client: Optional. The client to use.  If not passed, falls back
                        to the ``client`` stored on the blob's bucket.
 
-        :raises: :class:`google.cloud.exceptions.NotFound`
+        :type decompress: bool
+        :param decompress: (Optional) If True, write the blob's data
+                           gzip-decompressed.  The data, which must be in
+                           gzip format, is downloaded as stored and
+                           decompressed chunk by chunk.  Blobs stored with a
+                           ``gzip`` :attr:`content_encoding` are downloaded
+                           over connections of their own; if the client
+                           was passed an ``http`` object, they are instead
+                           decompressed by the server, which sends them
+                           whole in one response, held in memory.
+
+        :type progress_callback: callable
+        :param progress_callback: (Optional) Called after each chunk with a
+                                  ``TransferProgress`` (see
+                                  :mod:`google.cloud.streaming.transfer`).
+
+        :type adaptive_chunksize: bool
+        :param adaptive_chunksize: (Optional) If True, grow the chunk size
+                                   while chunks transfer quickly, and shrink
+                                   it when requests are retried.
+
+        :type limiter: :class:`~google.cloud.streaming.throttling.\
+                       BandwidthLimiter`
+        :param limiter: (Optional) The limiter charged for the data
+                        transferred.  Defaults to the process-wide limiter,
+                        if any.
+
+        :type priority: int
+        :param priority: (Optional) The priority of this transfer when
+                         waiting on the limiter.
+
+        :raises: :class:`google.cloud.exceptions.NotFound`;
+                 :class:`ValueError` if ``decompress`` is True and the
+                 data is truncated.
         """
         client = self._require_client(client)
         if self.media_link is None:  # not yet loaded
             self.reload()
 
         download_url = self.media_link
+        headers = _get_encryption_headers(self._encryption_key)
+
+        # Use ``_base_connection`` rather ``_connection`` since the current
+        # connection may be a batch. A batch wraps a client's connection,
+        # but does not store the ``http`` object.
+        http = client._base_connection.http
+        stream = file_obj
+        if decompress:
+            stream = _GunzipWriter(file_obj)
+            if self.content_encoding == 'gzip':
+                # Without ``Accept-Encoding: gzip``, the server decompresses
+                # the data itself, ignoring the requested ranges; with it,
+                # httplib2 would decompress each range, which fails.
+                encoded_http = client._base_connection._make_encoded_http()
+                if encoded_http is None:
+                    headers['Accept-Encoding'] = 'identity'
+                    stream = file_obj
+                else:
+                    headers['Accept-Encoding'] = 'gzip'
+                    http = encoded_http
 
         # Use apitools 'Download' facility.
-        download = Download.from_stream(file_obj)
+        download = Download.from_stream(
+            stream, progress_callback=progress_callback,
+            adaptive_chunksize=adaptive_chunksize, limiter=limiter,
+            priority=priority)
 
         if self.chunk_size is not None:
             download.chunksize = self.chunk_size
 
-        headers = _get_encryption_headers(self._encryption_key)
-
         request = Request(download_url, 'GET', headers)
-
-        # Use ``_base_connection`` rather ``_connection`` since the current
-        # connection may be a batch. A batch wraps a client's connection,
-        # but does not store the ``http`` object. The rest (API_BASE_URL and
-        # build_api_url) are also defined on the Batch class, but we just
-        # use the wrapped connection since it has all three (http,
-        # API_BASE_URL and build_api_url).
-        download.initialize_download(request, client._base_connection.http)
-
-    def download_to_filename(self, filename, client=None):
+        download.initialize_download(request, http)
+        if stream is not file_obj:
+            stream.close()
+
+    def download_to_filename(self, filename, client=None, decompress=False,
+                             progress_callback=None,
+                             adaptive_chunksize=False, limiter=None,
+                             priority=0):
         """Download the contents of this blob into a named file.
 
         :type filename: str
@@ -356,15 +414,40 @@ class Blob(_PropertyMixin):
         :param client: Optional. The client to use.  If not passed, falls back
                        to the ``client`` stored on the blob's bucket.
 
+        :type decompress: bool
+        :param decompress: (Optional) If True, write the blob's data
+                           gzip-decompressed; see :meth:`download_to_file`.
+
+        :type progress_callback: callable
+        :param progress_callback: (Optional) Called after each chunk; see
+                                  :meth:`download_to_file`.
+
+        :type adaptive_chunksize: bool
+        :param adaptive_chunksize: (Optional) If True, adapt the chunk size;
+                                   see :meth:`download_to_file`.
+
+        :type limiter: :class:`~google.cloud.streaming.throttling.\
+                       BandwidthLimiter`
+        :param limiter: (Optional) The limiter charged for the data
+                        transferred; see :meth:`download_to_file`.
+
+        :type priority: int
+        :param priority: (Optional) The priority of this transfer when
+                         waiting on the limiter.
+
         :raises: :class:`google.cloud.exceptions.NotFound`
         """
         with open(filename, 'wb') as file_obj:
-            self.download_to_file(file_obj, client=client)
+            self.download_to_file(file_obj, client=client,
+                                  decompress=decompress,
+                                  progress_callback=progress_callback,
+                                  adaptive_chunksize=adaptive_chunksize,
+                                  limiter=limiter, priority=priority)
 
         mtime = time.mktime(self.updated.timetuple())
         os.utime(file_obj.name, (mtime, mtime))
 
-    def download_as_string(self, client=None):
+    def download_as_string(self, client=None, limiter=None, priority=0):
         """Download the contents of this blob as a string.
 
         :type client: :class:`~google.cloud.storage.client.Client` or
@@ -372,12 +455,22 @@ class Blob(_PropertyMixin):
         :param client: Optional. The client to use.  If not passed, falls back
                        to the ``client`` stored on the blob's bucket.
 
+        :type limiter: :class:`~google.cloud.streaming.throttling.\
+                       BandwidthLimiter`
+        :param limiter: (Optional) The limiter charged for the data
+                        transferred; see :meth:`download_to_file`.
+
+        :type priority: int
+        :param priority: (Optional) The priority of this transfer when
+                         waiting on the limiter.
+
         :rtype: bytes
         :returns: The data stored in this blob.
         :raises: :class:`google.cloud.exceptions.NotFound`
         """
         string_buffer = BytesIO()
-        self.download_to_file(string_buffer, client=client)
+        self.download_to_file(string_buffer, client=client, limiter=limiter,
+                              priority=priority)
         return string_buffer.getvalue()
 
     @staticmethod
@@ -392,7 +485,9 @@ class Blob(_PropertyMixin):
 
     # pylint: disable=too-many-locals
     def upload_from_file(self, file_obj, rewind=False, size=None,
-                         content_type=None, num_retries=6, client=None):
+                         content_type=None, num_retries=6, client=None,
+                         gzip=False, progress_callback=None,
+                         adaptive_chunksize=False, limiter=None, priority=0):
         """Upload the contents of this blob from a file-like object.
 
         The content type of the upload will either be
@@ -447,6 +542,34 @@ class Blob(_PropertyMixin):
         :param client: Optional. The client to use.  If not passed, falls back
                        to the ``client`` stored on the blob's bucket.
 
+        :type gzip: bool
+        :param gzip: (Optional) If True, compress the data chunk by chunk as
+                     it is uploaded, and store it with a ``gzip``
+                     :attr:`content_encoding`.  The server decompresses it
+                     for clients which don't accept gzip.  The upload is
+                     always resumable, and ``size`` need not be known.
+
+        :type progress_callback: callable
+        :param progress_callback: (Optional) Called after each chunk with a
+                                  ``TransferProgress`` (see
+                                  :mod:`google.cloud.streaming.transfer`);
+                                  a simple upload reports once, when done.
+
+        :type adaptive_chunksize: bool
+        :param adaptive_chunksize: (Optional) If True, grow the chunk size
+                                   while chunks transfer quickly, and shrink
+                                   it when requests are retried.
+
+        :type limiter: :class:`~google.cloud.streaming.throttling.\
+                       BandwidthLimiter`
+        :param limiter: (Optional) The limiter charged for the data
+                        transferred.  Defaults to the process-wide limiter,
+                        if any.
+
+        :type priority: int
+        :param priority: (Optional) The priority of this transfer when
+                         waiting on the limiter.
+
         :raises: :class:`ValueError` if size is not passed in and can not be
                  determined; :class:`google.cloud.exceptions.GoogleCloudError`
                  if the upload response returns an error status.
@@ -468,7 +591,11 @@ class Blob(_PropertyMixin):
 
         # Get the basic stats about the file.
         total_bytes = size
-        if total_bytes is None:
+        if gzip:
+            # The compressed size is only known once it has all been read.
+            file_obj = _GzipReader(file_obj, size)
+            total_bytes = None
+        elif total_bytes is None:
             if hasattr(file_obj, 'fileno'):
                 try:
                     total_bytes = os.fstat(file_obj.fileno()).st_size
@@ -484,13 +611,18 @@ class Blob(_PropertyMixin):
         headers.update(_get_encryption_headers(self._encryption_key))
 
         upload = Upload(file_obj, content_type, total_bytes,
-                        auto_transfer=False)
+                        auto_transfer=False,
+                        progress_callback=progress_callback,
+                        adaptive_chunksize=adaptive_chunksize,
+                        limiter=limiter, priority=priority)
 
         if self.chunk_size is not None:
             upload.chunksize = self.chunk_size
 
             if total_bytes is None:
                 upload.strategy = RESUMABLE_UPLOAD
+        elif gzip:
+            upload.strategy = RESUMABLE_UPLOAD
         elif total_bytes is None:
             raise ValueError('total bytes could not be determined. Please '
                              'pass an explicit size, or supply a chunk size '
@@ -507,6 +639,13 @@ class Blob(_PropertyMixin):
 
         # Use apitools 'Upload' facility.
         request = Request(upload_url, 'POST', headers)
+        if gzip:
+            # Sent as metadata when the resumable upload is started.
+            request.headers['content-type'] = 'application/json'
+            request.body = json.dumps({
+                'contentEncoding': 'gzip',
+                'contentType': content_type,
+            })
 
         upload.configure_request(upload_config, request, url_builder)
         query_params = url_builder.query_params
@@ -519,10 +658,14 @@ class Blob(_PropertyMixin):
         if upload.strategy == RESUMABLE_UPLOAD:
             http_response = upload.stream_file(use_chunks=True)
         else:
+            # The whole media body is sent at once.
+            upload._throttle(total_bytes)
             http_response = make_api_request(connection.http, request,
                                              retries=num_retries)
 
         self._check_response_error(request, http_response)
+        if upload.strategy != RESUMABLE_UPLOAD:
+            upload.report_progress(total_bytes, total_bytes)
         response_content = http_response.content
 
         if not isinstance(response_content,
@@ -531,7 +674,10 @@ class Blob(_PropertyMixin):
         self._set_properties(json.loads(response_content))
     # pylint: enable=too-many-locals
 
-    def upload_from_filename(self, filename, content_type=None, client=None):
+    def upload_from_filename(self, filename, content_type=None, client=None,
+                             gzip=False, progress_callback=None,
+                             adaptive_chunksize=False, memory_map=False,
+                             limiter=None, priority=0):
         """Upload this blob's contents from the content of a named file.
 
         The content type of the upload will either be
@@ -560,16 +706,78 @@ class Blob(_PropertyMixin):
                       ``NoneType``
         :param client: Optional. The client to use.  If not passed, falls back
                        to the ``client`` stored on the blob's bucket.
+
+        :type gzip: bool
+        :param gzip: (Optional) If True, compress the file as it is uploaded;
+                     see :meth:`upload_from_file`.
+
+        :type progress_callback: callable
+        :param progress_callback: (Optional) Called after each chunk; see
+                                  :meth:`upload_from_file`.
+
+        :type adaptive_chunksize: bool
+        :param adaptive_chunksize: (Optional) If True, adapt the chunk size;
+                                   see :meth:`upload_from_file`.
+
+        :type memory_map: bool
+        :param memory_map: (Optional) If True, map the file into memory
+                           and send views of it, rather than reading it into
+                           Python objects chunk by chunk.  Its MD5 hash is
+                           computed as it is sent, and checked against the
+                           uploaded object's.  Only pass True if the file
+                           cannot be truncated during the upload: accessing
+                           the truncated part of a mapping kills the process
+                           (``SIGBUS``) rather than raising an exception.
+                           Ignored when ``gzip`` is set.
+
+        :type limiter: :class:`~google.cloud.streaming.throttling.\
+                       BandwidthLimiter`
+        :param limiter: (Optional) The limiter charged for the data
+                        transferred; see :meth:`upload_from_file`.
+
+        :type priority: int
+        :param priority: (Optional) The priority of this transfer when
+                         waiting on the limiter.
+
+        :raises: :class:`~google.cloud.streaming.exceptions.\
+                 TransferInvalidError` if the uploaded object's MD5 hash
+                 differs from the mapped file's.
         """
         content_type = content_type or self._properties.get('contentType')
         if content_type is None:
             content_type, _ = mimetypes.guess_type(filename)
 
         with open(filename, 'rb') as file_obj:
-            self.upload_from_file(
-                file_obj, content_type=content_type, client=client)
-
-    def upload_from_string(self, data, content_type='text/plain', client=None):
+            mapped = None
+            if memory_map and not gzip:
+                try:
+                    mapped = MappedFile(file_obj)
+                except (ValueError, EnvironmentError):
+                    pass  # Empty, or can't be mapped: read it instead.
+            if mapped is None:
+                self.upload_from_file(
+                    file_obj, content_type=content_type, client=client,
+                    gzip=gzip, progress_callback=progress_callback,
+                    adaptive_chunksize=adaptive_chunksize, limiter=limiter,
+                    priority=priority)
+                return
+
+            with mapped:
+                self.upload_from_file(
+                    mapped, size=len(mapped), content_type=content_type,
+                    client=client, progress_callback=progress_callback,
+                    adaptive_chunksize=adaptive_chunksize, limiter=limiter,
+                    priority=priority)
+                md5_hash = _bytes_to_unicode(
+                    base64.b64encode(mapped.md5_digest()))
+            if self.md5_hash is not None and self.md5_hash != md5_hash:
+                raise TransferInvalidError(
+                    'MD5 hash of uploaded object %s (%s) differs from that '
+                    'of %s (%s)' % (self.name, self.md5_hash, filename,
+                                    md5_hash))
+
+    def upload_from_string(self, data, content_type='text/plain', client=None,
+                           limiter=None, priority=0):
         """Upload contents of this blob from the provided string.
 
         .. note::
@@ -595,6 +803,15 @@ class Blob(_PropertyMixin):
                       ``NoneType``
         :param client: Optional. The client to use.  If not passed, falls back
                        to the ``client`` stored on the blob's bucket.
+
+        :type limiter: :class:`~google.cloud.streaming.throttling.\
+                       BandwidthLimiter`
+        :param limiter: (Optional) The limiter charged for the data
+                        transferred; see :meth:`upload_from_file`.
+
+        :type priority: int
+        :param priority: (Optional) The priority of this transfer when
+                         waiting on the limiter.
         """
         if isinstance(data, six.text_type):
             data = data.encode('utf-8')
@@ -602,7 +819,8 @@ class Blob(_PropertyMixin):
         string_buffer.write(data)
         self.upload_from_file(
             file_obj=string_buffer, rewind=True, size=len(data),
-            content_type=content_type, client=client)
+            content_type=content_type, client=client, limiter=limiter,
+            priority=priority)
 
     def make_public(self, client=None):
         """Make this blob public giving all users read access.
@@ -641,7 +859,8 @@ class Blob(_PropertyMixin):
             _target_object=self)
         self._set_properties(api_response)
 
-    def rewrite(self, source, token=None, client=None):
+    def rewrite(self, source, token=None, client=None,
+                max_bytes_rewritten_per_call=None):
         """Rewrite source blob into this one.
 
         :type source: :class:`Blob`
@@ -657,6 +876,14 @@ class Blob(_PropertyMixin):
         :param client: Optional. The client to use.  If not passed, falls back
                        to the ``client`` stored on the blob's bucket.
 
+        :type max_bytes_rewritten_per_call: int
+        :param max_bytes_rewritten_per_call: Optional. The maximum number of
+                                             bytes to rewrite per call; must
+                                             be a multiple of 1 MiB.  Only
+                                             used by the server when a
+                                             rewrite spans locations or
+                                             storage classes.
+
         :rtype: tuple
         :returns: ``(token, bytes_rewritten, total_bytes)``, where ``token``
                   is a rewrite token (``None`` if the rewrite is complete),
@@ -669,10 +896,12 @@ class Blob(_PropertyMixin):
         headers.update(_get_encryption_headers(
             source._encryption_key, source=True))
 
+        query_params = {}
         if token:
-            query_params = {'rewriteToken': token}
-        else:
-            query_params = {}
+            query_params['rewriteToken'] = token
+        if max_bytes_rewritten_per_call is not None:
+            query_params['maxBytesRewrittenPerCall'] = (
+                max_bytes_rewritten_per_call)
 
         api_response = client._connection.api_request(
             method='POST', path=source.path + '/rewriteTo' + self.path,
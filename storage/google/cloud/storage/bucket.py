@@ -23,8 +23,11 @@ from google.cloud.exceptions import NotFound
 from google.cloud.iterator import HTTPIterator
 from google.cloud.storage._helpers import _PropertyMixin
 from google.cloud.storage._helpers import _scalar_property
+from google.cloud.storage.acl import _ACLEntity
 from google.cloud.storage.acl import BucketACL
 from google.cloud.storage.acl import DefaultObjectACL
+from google.cloud.storage.batch import Batch
+from google.cloud.storage.batch import _run_batched
 from google.cloud.storage.blob import Blob
 
 
@@ -78,12 +81,6 @@ class Bucket(_PropertyMixin):
     :param name: The name of the bucket.
     """
 
-    _MAX_OBJECTS_FOR_ITERATION = 256
-    """Maximum number of existing objects allowed in iteration.
-
-    This is used in Bucket.delete() and Bucket.make_public().
-    """
-
     _STORAGE_CLASSES = ('STANDARD', 'NEARLINE', 'DURABLE_REDUCED_AVAILABILITY',
                         'MULTI_REGIONAL', 'REGIONAL', 'COLDLINE')
 
@@ -240,9 +237,46 @@ class Bucket(_PropertyMixin):
         except NotFound:
             return None
 
+    def get_blobs(self, blob_names, client=None, max_workers=None):
+        """Get many blob objects by name, using batched requests.
+
+        Uses :meth:`get_blob` to fetch each individual blob, sending the
+        requests in batches of up to 100, with up to ``max_workers`` batches
+        in flight at once.  Missing blobs do not raise.
+
+        :type blob_names: iterable
+        :param blob_names: The names of the blobs to retrieve.
+
+        :type client: :class:`~google.cloud.storage.client.Client` or
+                      ``NoneType``
+        :param client: Optional. The client to use.  If not passed, falls back
+                       to the ``client`` stored on the current bucket.
+
+        :type max_workers: int
+        :param max_workers: (Optional) The number of batches to send
+                            concurrently.
+
+        :rtype: list
+        :returns: One :class:`google.cloud.storage.blob.Blob` per name, in the
+                  order given, or None for each blob which doesn't exist.
+        :raises: The first error other than
+                 :class:`~google.cloud.exceptions.NotFound` returned for a
+                 blob.
+        """
+        def _get(blob_name, client):
+            """Issue the GET for a single blob name."""
+            return self.get_blob(blob_name, client=client)
+
+        client = self._require_client(client)
+        results = list(_run_batched(
+            client, blob_names, _get, max_workers=max_workers))
+        _check_bulk_results(results, on_error=lambda blob_name: None)
+        return [result.value for result in results]
+
     def list_blobs(self, max_results=None, page_token=None, prefix=None,
                    delimiter=None, versions=None,
-                   projection='noAcl', fields=None, client=None):
+                   projection='noAcl', fields=None, client=None,
+                   start_offset=None, end_offset=None):
         """Return an iterator used to find blobs in the bucket.
 
         :type max_results: int
@@ -280,6 +314,15 @@ class Bucket(_PropertyMixin):
         :param client: (Optional) The client to use.  If not passed, falls back
                        to the ``client`` stored on the current bucket.
 
+        :type start_offset: str
+        :param start_offset: (Optional) Only return blobs whose names are
+                             lexicographically greater than or equal to
+                             this value.
+
+        :type end_offset: str
+        :param end_offset: (Optional) Only return blobs whose names are
+                           lexicographically less than this value.
+
         :rtype: :class:`~google.cloud.iterator.Iterator`
         :returns: Iterator of all :class:`~google.cloud.storage.blob.Blob`
                   in this bucket matching the arguments.
@@ -300,6 +343,12 @@ class Bucket(_PropertyMixin):
         if fields is not None:
             extra_params['fields'] = fields
 
+        if start_offset is not None:
+            extra_params['startOffset'] = start_offset
+
+        if end_offset is not None:
+            extra_params['endOffset'] = end_offset
+
         client = self._require_client(client)
         path = self.path + '/o'
         iterator = HTTPIterator(
@@ -310,7 +359,8 @@ class Bucket(_PropertyMixin):
         iterator.prefixes = set()
         return iterator
 
-    def delete(self, force=False, client=None):
+    def delete(self, force=False, client=None, max_workers=None,
+               progress_callback=None):
         """Delete this bucket.
 
         The bucket **must** be empty in order to submit a delete request. If
@@ -322,10 +372,9 @@ class Bucket(_PropertyMixin):
         (and ``force=False``), will raise
         :class:`google.cloud.exceptions.Conflict`.
 
-        If ``force=True`` and the bucket contains more than 256 objects / blobs
-        this will cowardly refuse to delete the objects (or the bucket). This
-        is to prevent accidental bucket deletion and to prevent extremely long
-        runtime of this method.
+        If ``force=True``, the bucket's blobs are listed page by page and
+        deleted in concurrent batches as they are found, so memory use does
+        not grow with the number of blobs.
 
         :type force: bool
         :param force: If True, empties the bucket's objects then deletes it.
@@ -335,26 +384,29 @@ class Bucket(_PropertyMixin):
         :param client: Optional. The client to use.  If not passed, falls back
                        to the ``client`` stored on the current bucket.
 
-        :raises: :class:`ValueError` if ``force`` is ``True`` and the bucket
-                 contains more than 256 objects / blobs.
+        :type max_workers: int
+        :param max_workers: (Optional) The number of batches of deletions to
+                            send concurrently (only used if ``force=True``).
+
+        :type progress_callback: callable
+        :param progress_callback: (Optional) Called with the number of blobs
+                                  processed so far, after each batch of
+                                  deletions (only used if ``force=True``).
+
+        :raises: The first error (other than
+                 :class:`~google.cloud.exceptions.NotFound`) returned while
+                 deleting the bucket's blobs.
         """
         client = self._require_client(client)
         if force:
-            blobs = list(self.list_blobs(
-                max_results=self._MAX_OBJECTS_FOR_ITERATION + 1,
-                client=client))
-            if len(blobs) > self._MAX_OBJECTS_FOR_ITERATION:
-                message = (
-                    'Refusing to delete bucket with more than '
-                    '%d objects. If you actually want to delete '
-                    'this bucket, please delete the objects '
-                    'yourself before calling Bucket.delete().'
-                ) % (self._MAX_OBJECTS_FOR_ITERATION,)
-                raise ValueError(message)
-
+            blobs = self.list_blobs(
+                fields='items/name,nextPageToken', client=client)
+            results = _run_batched(
+                client, blobs, self._delete_blob_request,
+                max_workers=max_workers)
             # Ignore 404 errors on delete.
-            self.delete_blobs(blobs, on_error=lambda blob: None,
-                              client=client)
+            _check_bulk_results(results, progress_callback,
+                                on_error=lambda blob: None)
 
         # We intentionally pass `_target_object=None` since a DELETE
         # request has no response value (whether in a standard request or
@@ -399,14 +451,23 @@ class Bucket(_PropertyMixin):
         client._connection.api_request(
             method='DELETE', path=blob_path, _target_object=None)
 
-    def delete_blobs(self, blobs, on_error=None, client=None):
+    def delete_blobs(self, blobs, on_error=None, client=None,
+                     max_workers=None):
         """Deletes a list of blobs from the current bucket.
 
-        Uses :meth:`delete_blob` to delete each individual blob.
+        Uses :meth:`delete_blob` to delete each individual blob, sending
+        the deletions in batches of up to 100 requests, with up to
+        ``max_workers`` batches in flight at once.
+
+        .. note::
+
+           Every deletion is attempted before any error is raised, so a
+           missing blob does not prevent the others from being deleted.
 
-        :type blobs: list
-        :param blobs: A list of :class:`~google.cloud.storage.blob.Blob`-s or
-                      blob names to delete.
+        :type blobs: iterable
+        :param blobs: A list (or other iterable) of
+                      :class:`~google.cloud.storage.blob.Blob`-s or blob
+                      names to delete.
 
         :type on_error: callable
         :param on_error: (Optional) Takes single argument: ``blob``. Called
@@ -418,20 +479,38 @@ class Bucket(_PropertyMixin):
         :param client: (Optional) The client to use.  If not passed, falls back
                        to the ``client`` stored on the current bucket.
 
+        :type max_workers: int
+        :param max_workers: (Optional) The number of batches to send
+                            concurrently.
+
+        :rtype: list of :class:`~google.cloud.storage.batch.BatchResult`
+        :returns: One result per blob, in the order given.
         :raises: :class:`~google.cloud.exceptions.NotFound` (if
-                 `on_error` is not passed).
-        """
-        for blob in blobs:
-            try:
-                blob_name = blob
-                if not isinstance(blob_name, six.string_types):
-                    blob_name = blob.name
-                self.delete_blob(blob_name, client=client)
-            except NotFound:
-                if on_error is not None:
-                    on_error(blob)
-                else:
-                    raise
+                 `on_error` is not passed), or the first other error
+                 returned for a blob.
+        """
+        client = self._require_client(client)
+        results = list(_run_batched(
+            client, blobs, self._delete_blob_request,
+            max_workers=max_workers))
+        _check_bulk_results(results, on_error=on_error)
+        return results
+
+    def _delete_blob_request(self, blob, client):
+        """Delete a blob given either the blob or its name.
+
+        Helper for :meth:`delete_blobs` and :meth:`delete`.
+
+        :type blob: :class:`~google.cloud.storage.blob.Blob` or str
+        :param blob: The blob (or blob name) to delete.
+
+        :type client: :class:`~google.cloud.storage.client.Client`
+        :param client: The client to use.
+        """
+        blob_name = blob
+        if not isinstance(blob_name, six.string_types):
+            blob_name = blob.name
+        self.delete_blob(blob_name, client=client)
 
     def copy_blob(self, blob, destination_bucket, new_name=None,
                   client=None, preserve_acl=True):
@@ -501,6 +580,146 @@ class Bucket(_PropertyMixin):
         blob.delete(client=client)
         return new_blob
 
+    def copy_blobs(self, blobs, destination_bucket, new_names=None,
+                   client=None, max_workers=None):
+        """Copy many blobs to the given bucket, using batched requests.
+
+        Uses :meth:`copy_blob` to copy each individual blob, sending the
+        copies in batches of up to 100 requests, with up to ``max_workers``
+        batches in flight at once.  Errors are reported per blob rather than
+        raised.
+
+        :type blobs: iterable
+        :param blobs: The :class:`~google.cloud.storage.blob.Blob`-s to copy.
+
+        :type destination_bucket: :class:`google.cloud.storage.bucket.Bucket`
+        :param destination_bucket: The bucket into which the blobs should be
+                                   copied.
+
+        :type new_names: iterable
+        :param new_names: (Optional) New names for the copies, matching
+                          ``blobs`` one-to-one.  Defaults to the source names.
+
+        :type client: :class:`~google.cloud.storage.client.Client` or
+                      ``NoneType``
+        :param client: Optional. The client to use.  If not passed, falls back
+                       to the ``client`` stored on the current bucket.
+
+        :type max_workers: int
+        :param max_workers: (Optional) The number of batches to send
+                            concurrently.
+
+        :rtype: list of :class:`~google.cloud.storage.batch.BatchResult`
+        :returns: One result per blob, in the order given; the ``value`` of
+                  each successful result is the new blob.
+        :raises: :class:`ValueError` if ``new_names`` is passed and does not
+                 have as many items as ``blobs``.
+        """
+        def _copy(pair, client):
+            """Issue the copy for a single ``(blob, new_name)`` pair."""
+            blob, new_name = pair
+            return self.copy_blob(blob, destination_bucket, new_name,
+                                  client=client)
+
+        client = self._require_client(client)
+        if new_names is None:
+            pairs = ((blob, None) for blob in blobs)
+        else:
+            blobs = list(blobs)
+            new_names = list(new_names)
+            if len(blobs) != len(new_names):
+                raise ValueError(
+                    'Expected one new name per blob', len(blobs),
+                    len(new_names))
+            pairs = six.moves.zip(blobs, new_names)
+        return [
+            result._replace(item=result.item[0])
+            for result in _run_batched(
+                client, pairs, _copy, max_workers=max_workers)]
+
+    def patch_blobs(self, blobs, client=None, max_workers=None):
+        """Send the changed properties of many blobs, using batched requests.
+
+        Uses :meth:`~google.cloud.storage.blob.Blob.patch` for each
+        individual blob, sending the updates in batches of up to 100
+        requests, with up to ``max_workers`` batches in flight at once.
+        Errors are reported per blob rather than raised.
+
+        :type blobs: iterable
+        :param blobs: The :class:`~google.cloud.storage.blob.Blob`-s to
+                      update, with their new property values already set.
+
+        :type client: :class:`~google.cloud.storage.client.Client` or
+                      ``NoneType``
+        :param client: Optional. The client to use.  If not passed, falls back
+                       to the ``client`` stored on the current bucket.
+
+        :type max_workers: int
+        :param max_workers: (Optional) The number of batches to send
+                            concurrently.
+
+        :rtype: list of :class:`~google.cloud.storage.batch.BatchResult`
+        :returns: One result per blob, in the order given.
+        """
+        def _patch(blob, client):
+            """Issue the update for a single blob."""
+            blob.patch(client=client)
+            return blob
+
+        client = self._require_client(client)
+        return list(_run_batched(
+            client, blobs, _patch, max_workers=max_workers))
+
+    def make_blobs_public(self, blobs, client=None, max_workers=None):
+        """Grant all users read access to many blobs, using batched requests.
+
+        Unlike :meth:`~google.cloud.storage.blob.Blob.make_public`, this
+        adds the ``allUsers`` entry directly (without first loading each
+        blob's ACL), sending the requests in batches of up to 100, with up
+        to ``max_workers`` batches in flight at once.  Errors are reported
+        per blob rather than raised.
+
+        :type blobs: iterable
+        :param blobs: :class:`~google.cloud.storage.blob.Blob`-s or blob
+                      names in this bucket.
+
+        :type client: :class:`~google.cloud.storage.client.Client` or
+                      ``NoneType``
+        :param client: Optional. The client to use.  If not passed, falls back
+                       to the ``client`` stored on the current bucket.
+
+        :type max_workers: int
+        :param max_workers: (Optional) The number of batches to send
+                            concurrently.
+
+        :rtype: list of :class:`~google.cloud.storage.batch.BatchResult`
+        :returns: One result per blob, in the order given.
+        """
+        client = self._require_client(client)
+        return list(_run_batched(
+            client, blobs, self._grant_public_read, max_workers=max_workers))
+
+    def _grant_public_read(self, blob, client):
+        """Add an ``allUsers`` reader entry to a blob's ACL.
+
+        Helper for :meth:`make_blobs_public`.
+
+        :type blob: :class:`~google.cloud.storage.blob.Blob` or str
+        :param blob: The blob (or blob name) to make public.
+
+        :type client: :class:`~google.cloud.storage.client.Client`
+        :param client: The client to use.
+        """
+        blob_name = blob
+        if not isinstance(blob_name, six.string_types):
+            blob_name = blob.name
+        data = {'entity': 'allUsers', 'role': _ACLEntity.READER_ROLE}
+        # We intentionally pass `_target_object=None` since the response
+        # describes the ACL entry, not the blob.
+        acl_path = Blob.path_helper(self.path, blob_name) + '/acl'
+        client._connection.api_request(
+            method='POST', path=acl_path, data=data, _target_object=None)
+
     @property
     def cors(self):
         """Retrieve or set CORS policies configured for this bucket.
@@ -782,12 +1001,13 @@ class Bucket(_PropertyMixin):
         """
         return self.configure_website(None, None)
 
-    def make_public(self, recursive=False, future=False, client=None):
+    def make_public(self, recursive=False, future=False, client=None,
+                    max_workers=None, progress_callback=None):
         """Make a bucket public.
 
-        If ``recursive=True`` and the bucket contains more than 256
-        objects / blobs this will cowardly refuse to make the objects public.
-        This is to prevent extremely long runtime of this method.
+        If ``recursive=True``, the bucket's blobs are listed page by page and
+        made public in concurrent batches (see :meth:`make_blobs_public`) as
+        they are found, so memory use does not grow with the number of blobs.
 
         :type recursive: bool
         :param recursive: If True, this will make all blobs inside the bucket
@@ -801,6 +1021,18 @@ class Bucket(_PropertyMixin):
                       ``NoneType``
         :param client: Optional. The client to use.  If not passed, falls back
                        to the ``client`` stored on the current bucket.
+
+        :type max_workers: int
+        :param max_workers: (Optional) The number of batches of ACL updates to
+                            send concurrently (only used if
+                            ``recursive=True``).
+
+        :type progress_callback: callable
+        :param progress_callback: (Optional) Called with the number of blobs
+                                  processed so far, after each batch of ACL
+                                  updates (only used if ``recursive=True``).
+
+        :raises: The first error returned while updating a blob's ACL.
         """
         self.acl.all().grant_read()
         self.acl.save(client=client)
@@ -813,19 +1045,47 @@ class Bucket(_PropertyMixin):
             doa.save(client=client)
 
         if recursive:
-            blobs = list(self.list_blobs(
-                projection='full',
-                max_results=self._MAX_OBJECTS_FOR_ITERATION + 1,
-                client=client))
-            if len(blobs) > self._MAX_OBJECTS_FOR_ITERATION:
-                message = (
-                    'Refusing to make public recursively with more than '
-                    '%d objects. If you actually want to make every object '
-                    'in this bucket public, please do it on the objects '
-                    'yourself.'
-                ) % (self._MAX_OBJECTS_FOR_ITERATION,)
-                raise ValueError(message)
-
-            for blob in blobs:
-                blob.acl.all().grant_read()
-                blob.acl.save(client=client)
+            client = self._require_client(client)
+            blobs = self.list_blobs(
+                fields='items/name,nextPageToken', client=client)
+            results = _run_batched(
+                client, blobs, self._grant_public_read,
+                max_workers=max_workers)
+            _check_bulk_results(results, progress_callback)
+
+
+def _check_bulk_results(results, progress_callback=None, on_error=None):
+    """Consume bulk operation results, raising the first unhandled error.
+
+    :type results: iterable
+    :param results: :class:`~google.cloud.storage.batch.BatchResult`
+                    instances, e.g. as returned by
+                    :func:`~google.cloud.storage.batch._run_batched`.
+
+    :type progress_callback: callable
+    :param progress_callback: (Optional) Called with the number of results
+                              consumed so far, after each full batch and
+                              once at the end.
+
+    :type on_error: callable
+    :param on_error: (Optional) Called with the item of each result whose
+                     error is :class:`~google.cloud.exceptions.NotFound`;
+                     if not passed, those errors are raised too.
+
+    :raises: The first error not handled by ``on_error``.
+    """
+    processed = 0
+    for result in results:
+        processed += 1
+        if result.error is not None:
+            if isinstance(result.error, NotFound) and on_error is not None:
+                on_error(result.item)
+            else:
+                raise result.error
+        if (progress_callback is not None and
+                processed % Batch._MAX_BATCH_SIZE == 0):
+            progress_callback(processed)
+
+    if (progress_callback is not None and
+            processed % Batch._MAX_BATCH_SIZE != 0):
+        progress_callback(processed)
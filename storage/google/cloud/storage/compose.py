@@ -0,0 +1,197 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Concatenate and append to blobs on the server, using compose requests.
+
+A single compose request accepts at most 32 source objects.  :func:`concat`
+accepts any number, composing them in a balanced tree of intermediate
+objects, each level of which is composed concurrently:
+
+.. code-block:: python
+
+  >>> from google.cloud import storage
+  >>> from google.cloud.storage.compose import append
+  >>> from google.cloud.storage.compose import concat
+  >>> client = storage.Client()
+  >>> bucket = client.bucket('my-bucket')
+  >>> shards = list(bucket.list_blobs(prefix='output/shard-'))
+  >>> destination = bucket.blob('output/all')
+  >>> destination.content_type = 'text/plain'
+  >>> concat(destination, shards, max_workers=8)
+  >>> append(destination, b'trailer\\n')
+"""
+
+import uuid
+
+from google.cloud._helpers import _map_concurrently
+
+
+_MAX_COMPOSE_SOURCES = 32
+"""Maximum number of source objects of one compose request."""
+
+_APPEND_FIELDS = (
+    'cacheControl',
+    'contentDisposition',
+    'contentEncoding',
+    'contentLanguage',
+    'contentType',
+    'metadata',
+)
+"""Properties of a blob kept when appending to it."""
+
+
+def concat(destination, sources, client=None, max_workers=None):
+    """Concatenate any number of blobs into a destination blob.
+
+    Up to 32 sources are composed directly into ``destination``.  More are
+    split into as few groups of at most 32 as possible, of (nearly) equal
+    size, each composed into an intermediate blob, and so on until 32 or
+    fewer remain; the intermediate blobs of each level are composed
+    concurrently.  They are named after ``destination`` and deleted once
+    done, whether or not the concatenation succeeds.
+
+    :type destination: :class:`~google.cloud.storage.blob.Blob`
+    :param destination: The blob to create (or replace), with its
+                        :attr:`~google.cloud.storage.blob.Blob.content_type`
+                        set.
+
+    :type sources: list of :class:`~google.cloud.storage.blob.Blob`
+    :param sources: The blobs to concatenate, in order.  They must be in the
+                    same bucket as ``destination``.
+
+    :type client: :class:`~google.cloud.storage.client.Client` or
+                  ``NoneType``
+    :param client: Optional. The client to use.  If not passed, falls back
+                   to the ``client`` stored on the destination's bucket.
+
+    :type max_workers: int
+    :param max_workers: (Optional) The maximum number of concurrent compose
+                        requests.
+
+    :rtype: :class:`~google.cloud.storage.blob.Blob`
+    :returns: ``destination``, with the properties of the composed object.
+    :raises: :exc:`ValueError` if ``sources`` is empty or in another bucket,
+             or if the destination's ``content_type`` is not set.
+    """
+    sources = list(sources)
+    if not sources:
+        raise ValueError('No source blobs to concatenate.')
+    for source in sources:
+        if source.bucket.name != destination.bucket.name:
+            raise ValueError(
+                'Source %r is not in bucket %r.' % (
+                    source.name, destination.bucket.name))
+    if destination.content_type is None:
+        raise ValueError("Destination 'content_type' not set.")
+
+    prefix = '%s.concat-%s/' % (destination.name, uuid.uuid4().hex)
+    intermediates = []
+
+    def _compose(item):
+        """Compose one group of blobs into its target."""
+        target, group = item
+        target.compose(group, client=client)
+        return target
+
+    try:
+        level = 0
+        while len(sources) > _MAX_COMPOSE_SOURCES:
+            level += 1
+            items = []
+            num_groups = -(-len(sources) // _MAX_COMPOSE_SOURCES)
+            for index, group in enumerate(
+                    _split_evenly(sources, num_groups)):
+                target = destination.bucket.blob(
+                    '%s%d-%d' % (prefix, level, index))
+                target.content_type = destination.content_type
+                items.append((target, group))
+            intermediates.extend(target for target, _ in items)
+            sources = list(_map_concurrently(
+                _compose, items, max_workers=max_workers))
+        destination.compose(sources, client=client)
+    finally:
+        if intermediates:
+            destination.bucket.delete_blobs(
+                intermediates, on_error=lambda blob: None, client=client,
+                max_workers=max_workers)
+    return destination
+
+
+def append(blob, data, client=None):
+    """Append data to an existing blob.
+
+    The data is uploaded to a temporary blob, which is composed onto the
+    end of ``blob`` and then deleted.  The blob's content type, content
+    encoding and other metadata are kept.
+
+    .. note::
+
+       Concurrent appends to the same blob are not serialized: one of the
+       appended pieces of data may be lost.
+
+    :type blob: :class:`~google.cloud.storage.blob.Blob`
+    :param blob: The blob to append to.  Its properties are reloaded if its
+                 :attr:`~google.cloud.storage.blob.Blob.content_type` is not
+                 set.
+
+    :type data: bytes or str
+    :param data: The data to append.  Text is encoded as UTF-8.
+
+    :type client: :class:`~google.cloud.storage.client.Client` or
+                  ``NoneType``
+    :param client: Optional. The client to use.  If not passed, falls back
+                   to the ``client`` stored on the blob's bucket.
+
+    :rtype: :class:`~google.cloud.storage.blob.Blob`
+    :returns: ``blob``, with the properties of the extended object.
+    """
+    if blob.content_type is None:
+        blob.reload(client=client)
+
+    bucket = blob.bucket
+    piece = bucket.blob('%s.append-%s' % (blob.name, uuid.uuid4().hex))
+    piece.upload_from_string(data, content_type=blob.content_type,
+                             client=client)
+    try:
+        destination = bucket.blob(blob.name)
+        for field in _APPEND_FIELDS:
+            if field in blob._properties:
+                destination._properties[field] = blob._properties[field]
+        destination.compose([blob, piece], client=client)
+    finally:
+        piece.delete(client=client)
+    blob._set_properties(destination._properties)
+    return blob
+
+
+def _split_evenly(items, count):
+    """Split a list into contiguous groups whose sizes differ by at most one.
+
+    :type items: list
+    :param items: The items to split.
+
+    :type count: int
+    :param count: The number of groups; at most ``len(items)``.
+
+    :rtype: list of list
+    :returns: The non-empty groups, in order.
+    """
+    size, remainder = divmod(len(items), count)
+    groups = []
+    start = 0
+    for index in range(count):
+        end = start + size + (1 if index < remainder else 0)
+        groups.append(items[start:end])
+        start = end
+    return groups
@@ -0,0 +1,179 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""List very large buckets by walking shards of the namespace concurrently.
+
+:meth:`~google.cloud.storage.bucket.Bucket.list_blobs` follows a single
+chain of page tokens.  :func:`list_blobs_sharded` instead splits the
+namespace into contiguous name ranges (discovered from the "directories"
+under a prefix, or given by the caller), lists the ranges concurrently
+and merges the pages into one stream of blobs:
+
+.. code-block:: python
+
+  >>> import shelve
+  >>> from google.cloud import storage
+  >>> from google.cloud.storage.listing import list_blobs_sharded
+  >>> bucket = storage.Client().bucket('my-bucket')
+  >>> with open('inventory.txt', 'a') as inventory:
+  ...     for blob in list_blobs_sharded(
+  ...             bucket, max_workers=16, checkpoint=shelve.open('shards')):
+  ...         inventory.write(blob.name + '\\n')
+"""
+
+from google.cloud._helpers import _merge_concurrently
+
+
+_SPLIT_POINTS_KEY = 'split_points'
+_SHARD_KEY_TEMPLATE = 'shard:%s'
+
+
+def list_blobs_sharded(bucket, prefix=None, split_points=None, delimiter='/',
+                       ordered=False, max_workers=None, checkpoint=None,
+                       fields=None, versions=None, client=None):
+    """Iterate over the blobs of a bucket, listing shards concurrently.
+
+    The namespace is split at ``split_points`` into contiguous ranges,
+    each listed with ``startOffset`` / ``endOffset``.  If no split points
+    are passed, the "directories" one level below ``prefix`` (as reported
+    for ``delimiter``) are used.
+
+    :type bucket: :class:`~google.cloud.storage.bucket.Bucket`
+    :param bucket: The bucket to list.
+
+    :type prefix: str
+    :param prefix: (Optional) Only list blobs whose names start with this.
+
+    :type split_points: list
+    :param split_points: (Optional) Blob names at which to split the
+                         namespace.
+
+    :type delimiter: str
+    :param delimiter: (Optional) Delimiter used to discover split points
+                      when ``split_points`` is not passed.
+
+    :type ordered: bool
+    :param ordered: (Optional) If true, yield the blobs sorted by name (as
+                    a single listing would); otherwise yield each page as
+                    soon as it arrives.
+
+    :type max_workers: int
+    :param max_workers: (Optional) The maximum number of shards listed
+                        concurrently.
+
+    :type checkpoint: :class:`collections.MutableMapping`
+    :param checkpoint: (Optional) Storage for the split points and the
+                       progress of each shard, e.g. a :class:`shelve.Shelf`.
+                       A shard's progress is recorded once the blobs of a
+                       page have been consumed, so that a listing resumed
+                       from the same checkpoint yields every blob at least
+                       once (at most one page per shard is repeated).
+
+    :type fields: str
+    :param fields: (Optional) Selector for a partial response, as for
+                   :meth:`~google.cloud.storage.bucket.Bucket.list_blobs`;
+                   must include ``nextPageToken``.
+
+    :type versions: bool
+    :param versions: (Optional) Whether object versions should be returned
+                     as separate blobs.
+
+    :type client: :class:`~google.cloud.storage.client.Client` or
+                  ``NoneType``
+    :param client: (Optional) The client to use.  If not passed, falls back
+                   to the ``client`` stored on ``bucket``.
+
+    :rtype: :class:`~types.GeneratorType`
+    :returns: A generator of :class:`~google.cloud.storage.blob.Blob`.
+    """
+    if checkpoint is not None and _SPLIT_POINTS_KEY in checkpoint:
+        split_points = checkpoint[_SPLIT_POINTS_KEY]
+    elif split_points is None:
+        split_points = _discover_split_points(
+            bucket, prefix, delimiter, versions, client)
+    split_points = sorted(set(split_points))
+    if checkpoint is not None:
+        checkpoint[_SPLIT_POINTS_KEY] = split_points
+
+    shards = []
+    for start, end in zip([None] + split_points, split_points + [None]):
+        key = _SHARD_KEY_TEMPLATE % (start or '',)
+        token = None
+        if checkpoint is not None and key in checkpoint:
+            token = checkpoint[key]
+            if token is None:
+                continue  # The shard is done.
+        shards.append((key, bucket.list_blobs(
+            prefix=prefix, page_token=token, fields=fields,
+            versions=versions, client=client, start_offset=start,
+            end_offset=end)))
+
+    pages = _merge_concurrently(
+        [_list_shard(key, iterator) for key, iterator in shards],
+        ordered=ordered, max_workers=max_workers)
+    try:
+        for key, blobs, token in pages:
+            for blob in blobs:
+                yield blob
+            if checkpoint is not None:
+                checkpoint[key] = token
+    finally:
+        pages.close()
+
+
+def _discover_split_points(bucket, prefix, delimiter, versions, client):
+    """List the "directories" directly below a prefix.
+
+    :type bucket: :class:`~google.cloud.storage.bucket.Bucket`
+    :param bucket: The bucket to list.
+
+    :type prefix: str
+    :param prefix: The prefix to list below.
+
+    :type delimiter: str
+    :param delimiter: The delimiter separating "directories".
+
+    :type versions: bool
+    :param versions: Whether object versions are listed.
+
+    :type client: :class:`~google.cloud.storage.client.Client` or
+                  ``NoneType``
+    :param client: The client to use.
+
+    :rtype: list
+    :returns: The prefixes of the "directories".
+    """
+    iterator = bucket.list_blobs(
+        prefix=prefix, delimiter=delimiter, versions=versions,
+        fields='prefixes,nextPageToken', client=client)
+    for _ in iterator.pages:
+        pass
+    return list(iterator.prefixes)
+
+
+def _list_shard(key, iterator):
+    """List one shard, yielding its pages.
+
+    :type key: str
+    :param key: The checkpoint key of the shard.
+
+    :type iterator: :class:`~google.cloud.iterator.Iterator`
+    :param iterator: The listing of the shard, not yet started.
+
+    :rtype: :class:`~types.GeneratorType`
+    :returns: A generator of ``(key, blobs, next_page_token)`` tuples, the
+              token being ``None`` for the last page of the shard.
+    """
+    for page in iterator.pages:
+        yield key, list(page), iterator.next_page_token
@@ -0,0 +1,1308 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Serve the Cloud Storage JSON API from a local directory.
+
+A :class:`LocalStorageHttp` stands in for :class:`httplib2.Http`.  Pass it
+as the ``http`` of a :class:`~google.cloud.storage.client.Client` and
+requests are answered from files under a directory rather than by the
+service, so that tests and benchmarks run offline and reproducibly:
+
+.. code-block:: python
+
+  >>> from google.cloud import storage
+  >>> from google.cloud.storage.local import LocalStorageHttp
+  >>> http = LocalStorageHttp('/tmp/fake-gcs')
+  >>> client = storage.Client(project='my-project', http=http)
+  >>> bucket = client.create_bucket('my-bucket')
+  >>> bucket.blob('hello.txt').upload_from_string('Hello!')
+
+Supported are:
+
+- buckets:  create, get, patch, list and delete;
+- objects:  media, multipart and resumable uploads, ranged downloads,
+  metadata get / patch / delete, listing (with prefixes, delimiters,
+  offsets, versions and pagination), copy, compose and rewrite (including
+  ``maxBytesRewrittenPerCall``);
+- generations, metagenerations, object versioning and the
+  ``if[Source](Meta)Generation(Not)Match`` preconditions;
+- batch requests.
+
+ACLs are stored as plain metadata and are not enforced.  Objects stored
+with a ``gzip`` content encoding are decompressed for clients which don't
+accept gzip, as the service does.
+"""
+
+import base64
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+import zlib
+
+import httplib2
+import six
+from six.moves import http_client
+from six.moves.urllib.parse import parse_qsl
+from six.moves.urllib.parse import quote
+from six.moves.urllib.parse import unquote
+from six.moves.urllib.parse import urlsplit
+
+from google.cloud._helpers import _RFC3339_MICROS
+from google.cloud.storage.batch import _get_boundary
+from google.cloud.storage.batch import _parse_headers
+from google.cloud.storage.batch import _split_header_block
+
+
+_BUCKET_FILE = 'bucket.json'
+_OBJECTS_DIR = 'objects'
+_UPLOADS_DIR = '.uploads'
+_DEFAULT_MAX_RESULTS = 1000
+_MAX_COMPOSE_SOURCES = 32
+_RESUME_INCOMPLETE = 308
+
+_READ_ONLY_OBJECT_FIELDS = frozenset([
+    'bucket', 'componentCount', 'etag', 'generation', 'id', 'kind',
+    'md5Hash', 'mediaLink', 'metageneration', 'name', 'selfLink', 'size',
+    'timeCreated', 'timeDeleted', 'updated',
+])
+_READ_ONLY_BUCKET_FIELDS = frozenset([
+    'etag', 'id', 'kind', 'metageneration', 'name', 'projectNumber',
+    'selfLink', 'timeCreated', 'updated',
+])
+
+
+class LocalStorageHttp(object):
+    """An :class:`httplib2.Http` workalike serving a local directory.
+
+    Requests are matched on their path only, whatever their host; links
+    in responses (e.g. ``mediaLink``) use the host of the request.  One
+    instance may be shared by any number of threads and clients.
+
+    :type root: str
+    :param root: The directory holding the buckets; created if needed.
+                 Each bucket is a sub-directory, so a directory left by an
+                 earlier run is served again.
+    """
+
+    def __init__(self, root):
+        self._root = root
+        self._lock = threading.RLock()
+        self._last_generation = 0
+        self._uploads = {}
+        if not os.path.isdir(root):
+            os.makedirs(root)
+
+    @property
+    def root(self):
+        """The directory holding the buckets.
+
+        :rtype: str
+        :returns: The directory passed to the constructor.
+        """
+        return self._root
+
+    def request(self, uri, method='GET', body=None, headers=None,
+                redirections=None, connection_type=None):
+        """Answer a request as the Cloud Storage JSON API would.
+
+        The signature matches :meth:`httplib2.Http.request`.
+
+        :type uri: str
+        :param uri: The URL requested.
+
+        :type method: str
+        :param method: The HTTP method.
+
+        :type body: bytes, str, :class:`memoryview` or file-like object
+        :param body: (Optional) The request payload.
+
+        :type headers: dict
+        :param headers: (Optional) The request headers.
+
+        :type redirections: int
+        :param redirections: Ignored.
+
+        :type connection_type: type
+        :param connection_type: Ignored.
+
+        :rtype: tuple
+        :returns: The :class:`httplib2.Response` and its content (bytes).
+        """
+        del redirections, connection_type
+        if hasattr(body, 'read'):
+            body = body.read()
+        if isinstance(body, memoryview):
+            body = body.tobytes()
+        elif isinstance(body, six.text_type):
+            body = body.encode('utf-8')
+        headers = dict((key.lower(), str(value))
+                       for key, value in (headers or {}).items())
+        status, response_headers, content = self._respond(
+            method.upper(), uri, headers, body or b'')
+        response_headers['status'] = str(status)
+        response_headers.setdefault('content-length', str(len(content)))
+        return httplib2.Response(response_headers), content
+
+    def _respond(self, method, uri, headers, body):
+        """Route a request, turning errors into error responses.
+
+        :rtype: tuple
+        :returns: The status, the response headers and the content.
+        """
+        try:
+            with self._lock:
+                return self._route(
+                    _LocalRequest(method, uri, headers, body))
+        except _HttpError as exc:
+            return _json_response(exc.status, {'error': {
+                'code': exc.status,
+                'message': exc.message,
+                'errors': [{'message': exc.message, 'reason': exc.reason}],
+            }})
+
+    # pylint: disable=too-many-return-statements,too-many-branches
+    def _route(self, request):
+        """Dispatch a request on its path.
+
+        :type request: :class:`_LocalRequest`
+        :param request: The request.
+
+        :rtype: tuple
+        :returns: The status, the response headers and the content.
+        :raises: :exc:`_HttpError` if the request can't be answered.
+        """
+        parts = request.path.strip('/').split('/')
+        method = request.method
+        if parts in (['batch'], ['batch', 'storage', 'v1']):
+            if method == 'POST':
+                return self._batch(request)
+        elif parts[:3] == ['upload', 'storage', 'v1']:
+            if len(parts) == 6 and parts[3] == 'b' and parts[5] == 'o':
+                return self._upload(request, unquote(parts[4]))
+        elif parts[:3] == ['download', 'storage', 'v1']:
+            if (len(parts) == 7 and parts[3] == 'b' and parts[5] == 'o' and
+                    method == 'GET'):
+                return self._get_media(
+                    request, unquote(parts[4]), unquote(parts[6]))
+        elif parts[:2] == ['storage', 'v1'] and parts[2:3] == ['b']:
+            return self._route_bucket(request, parts[3:])
+        raise _HttpError(http_client.NOT_FOUND,
+                         'No such endpoint: %s %s' % (method, request.path))
+
+    def _route_bucket(self, request, parts):
+        """Dispatch a request on a path below ``/storage/v1/b``.
+
+        :rtype: tuple
+        :returns: The status, the response headers and the content.
+        :raises: :exc:`_HttpError` if the request can't be answered.
+        """
+        method = request.method
+        if not parts:
+            if method == 'GET':
+                return self._list_buckets(request)
+            if method == 'POST':
+                return self._create_bucket(request)
+            raise _method_not_allowed(method)
+        bucket_name = unquote(parts[0])
+        rest = parts[1:]
+        if not rest:
+            if method == 'GET':
+                return _json_response(
+                    http_client.OK, self._check_bucket(
+                        request, self._load_bucket(bucket_name)))
+            if method in ('PATCH', 'PUT'):
+                return self._update_bucket(request, bucket_name)
+            if method == 'DELETE':
+                return self._delete_bucket(request, bucket_name)
+            raise _method_not_allowed(method)
+        if rest in (['acl'], ['defaultObjectAcl']) and method == 'GET':
+            bucket = self._load_bucket(bucket_name)
+            return _json_response(http_client.OK, {
+                'items': bucket.get(rest[0], [])})
+        if rest == ['o']:
+            if method == 'GET':
+                return self._list_objects(request, bucket_name)
+            raise _method_not_allowed(method)
+        if len(rest) < 2 or rest[0] != 'o':
+            raise _HttpError(http_client.NOT_FOUND, 'No such endpoint')
+        object_name = unquote(rest[1])
+        action = rest[2:]
+        if not action:
+            if method == 'GET':
+                if request.query.get('alt') == 'media':
+                    return self._get_media(request, bucket_name, object_name)
+                return _json_response(http_client.OK, self._get_object(
+                    request, bucket_name, object_name))
+            if method in ('PATCH', 'PUT'):
+                return self._update_object(request, bucket_name, object_name)
+            if method == 'DELETE':
+                return self._delete_object(request, bucket_name, object_name)
+            raise _method_not_allowed(method)
+        if action == ['acl'] and method == 'GET':
+            return _json_response(http_client.OK, {
+                'items': self._get_object(
+                    request, bucket_name, object_name).get('acl', [])})
+        if action == ['compose'] and method == 'POST':
+            return self._compose(request, bucket_name, object_name)
+        if (len(action) == 5 and action[0] in ('copyTo', 'rewriteTo') and
+                action[1] == 'b' and action[3] == 'o' and method == 'POST'):
+            destination = (unquote(action[2]), unquote(action[4]))
+            if action[0] == 'copyTo':
+                return self._copy(
+                    request, (bucket_name, object_name), destination)
+            return self._rewrite(
+                request, (bucket_name, object_name), destination)
+        raise _HttpError(http_client.NOT_FOUND, 'No such endpoint')
+    # pylint: enable=too-many-return-statements,too-many-branches
+
+    # Buckets.
+
+    def _bucket_dir(self, bucket_name):
+        """Directory holding a bucket.
+
+        :rtype: str
+        :returns: The path of the directory.
+        """
+        if not bucket_name or '/' in bucket_name or bucket_name[0] == '.':
+            raise _HttpError(http_client.BAD_REQUEST,
+                             'Invalid bucket name: %r' % (bucket_name,))
+        return os.path.join(self._root, bucket_name)
+
+    def _load_bucket(self, bucket_name):
+        """Load a bucket's resource.
+
+        :rtype: dict
+        :returns: The stored resource.
+        :raises: :exc:`_HttpError` if the bucket doesn't exist.
+        """
+        path = os.path.join(self._bucket_dir(bucket_name), _BUCKET_FILE)
+        if not os.path.exists(path):
+            raise _HttpError(http_client.NOT_FOUND,
+                             'Bucket %s not found' % (bucket_name,))
+        return _read_json(path)
+
+    def _save_bucket(self, bucket):
+        """Store a bucket's resource.
+
+        :type bucket: dict
+        :param bucket: The resource.
+        """
+        _write_file(os.path.join(self._bucket_dir(bucket['name']),
+                                 _BUCKET_FILE),
+                    json.dumps(bucket, sort_keys=True).encode('utf-8'))
+
+    @staticmethod
+    def _check_bucket(request, bucket):
+        """Apply metageneration preconditions to a bucket.
+
+        :rtype: dict
+        :returns: ``bucket``.
+        """
+        _check_preconditions(request.query, None, bucket, 'if')
+        return bucket
+
+    def _list_buckets(self, request):
+        """List buckets, a page at a time."""
+        prefix = request.query.get('prefix', '')
+        names = sorted(
+            name for name in os.listdir(self._root)
+            if name.startswith(prefix) and os.path.exists(
+                os.path.join(self._root, name, _BUCKET_FILE)))
+        token = request.query.get('pageToken')
+        if token:
+            names = [name for name in names if name > _decode_token(token)]
+        page, more = _paginate(names, request.query)
+        resource = {'kind': 'storage#buckets'}
+        if page:
+            resource['items'] = [self._load_bucket(name) for name in page]
+        if more:
+            resource['nextPageToken'] = _encode_token(page[-1])
+        return _json_response(http_client.OK, resource)
+
+    def _create_bucket(self, request):
+        """Create a bucket from the JSON body."""
+        metadata = request.json()
+        name = metadata.get('name')
+        directory = self._bucket_dir(name)
+        if os.path.exists(os.path.join(directory, _BUCKET_FILE)):
+            raise _HttpError(http_client.CONFLICT,
+                             'Bucket %s already exists' % (name,),
+                             reason='conflict')
+        now = _now()
+        bucket = {
+            'kind': 'storage#bucket',
+            'id': name,
+            'name': name,
+            'projectNumber': '0',
+            'metageneration': '1',
+            'location': 'US',
+            'storageClass': 'STANDARD',
+            'timeCreated': now,
+            'updated': now,
+            'selfLink': request.base_url + '/storage/v1/b/' + quote(
+                name, safe=''),
+        }
+        _update_fields(bucket, metadata, _READ_ONLY_BUCKET_FIELDS)
+        bucket['etag'] = _etag(bucket)
+        if not os.path.isdir(os.path.join(directory, _OBJECTS_DIR)):
+            os.makedirs(os.path.join(directory, _OBJECTS_DIR))
+        self._save_bucket(bucket)
+        return _json_response(http_client.OK, bucket)
+
+    def _update_bucket(self, request, bucket_name):
+        """Patch or replace a bucket's metadata."""
+        bucket = self._check_bucket(request, self._load_bucket(bucket_name))
+        changes = request.json()
+        if request.method == 'PUT':
+            for key in list(bucket):
+                if key not in _READ_ONLY_BUCKET_FIELDS:
+                    del bucket[key]
+        _update_fields(bucket, changes, _READ_ONLY_BUCKET_FIELDS)
+        bucket['metageneration'] = str(int(bucket['metageneration']) + 1)
+        bucket['updated'] = _now()
+        bucket['etag'] = _etag(bucket)
+        self._save_bucket(bucket)
+        return _json_response(http_client.OK, bucket)
+
+    def _delete_bucket(self, request, bucket_name):
+        """Delete an empty bucket."""
+        self._check_bucket(request, self._load_bucket(bucket_name))
+        directory = self._bucket_dir(bucket_name)
+        if os.listdir(os.path.join(directory, _OBJECTS_DIR)):
+            raise _HttpError(http_client.CONFLICT,
+                             'Bucket %s is not empty' % (bucket_name,),
+                             reason='conflict')
+        shutil.rmtree(directory)
+        return _no_content()
+
+    # Objects.
+
+    def _object_dir(self, bucket_name, object_name):
+        """Directory holding the generations of an object.
+
+        :rtype: str
+        :returns: The path of the directory.
+        """
+        self._load_bucket(bucket_name)
+        if not object_name:
+            raise _HttpError(http_client.BAD_REQUEST, 'Object name required')
+        return os.path.join(self._bucket_dir(bucket_name), _OBJECTS_DIR,
+                            quote(object_name, safe=''))
+
+    def _generations(self, bucket_name, object_name):
+        """Load the stored generations of an object, newest last.
+
+        :rtype: list
+        :returns: The resources, live or archived.
+        """
+        directory = self._object_dir(bucket_name, object_name)
+        if not os.path.isdir(directory):
+            return []
+        generations = sorted(
+            int(name[:-len('.json')]) for name in os.listdir(directory)
+            if name.endswith('.json'))
+        return [_read_json(os.path.join(directory, '%d.json' % (generation,)))
+                for generation in generations]
+
+    def _find_object(self, bucket_name, object_name, generation=None):
+        """Load the live generation of an object, or a given generation.
+
+        :rtype: dict
+        :returns: The stored resource.
+        :raises: :exc:`_HttpError` if there is no such object.
+        """
+        for resource in reversed(self._generations(bucket_name, object_name)):
+            if generation is None:
+                if 'timeDeleted' not in resource:
+                    return resource
+            elif resource['generation'] == str(generation):
+                return resource
+        raise _HttpError(http_client.NOT_FOUND, 'Object %s/%s not found' % (
+            bucket_name, object_name))
+
+    def _live_object(self, bucket_name, object_name):
+        """Load the live generation of an object, if any.
+
+        :rtype: dict
+        :returns: The stored resource, or ``None``.
+        """
+        try:
+            return self._find_object(bucket_name, object_name)
+        except _HttpError:
+            return None
+
+    def _get_object(self, request, bucket_name, object_name):
+        """Load an object's resource, applying the request's preconditions.
+
+        :rtype: dict
+        :returns: The stored resource.
+        """
+        resource = self._find_object(bucket_name, object_name,
+                                     request.query.get('generation'))
+        _check_preconditions(request.query, resource, resource, 'if')
+        return resource
+
+    def _data_path(self, resource):
+        """File holding the data of one generation of an object.
+
+        :rtype: str
+        :returns: The path of the file.
+        """
+        return os.path.join(
+            self._object_dir(resource['bucket'], resource['name']),
+            resource['generation'] + '.bin')
+
+    def _save_object(self, resource):
+        """Store an object's resource.
+
+        :type resource: dict
+        :param resource: The resource.
+        """
+        resource['etag'] = _etag(resource)
+        _write_file(
+            os.path.join(self._object_dir(resource['bucket'],
+                                          resource['name']),
+                         resource['generation'] + '.json'),
+            json.dumps(resource, sort_keys=True).encode('utf-8'))
+
+    def _next_generation(self):
+        """Allocate a generation number, increasing and time-based.
+
+        :rtype: int
+        :returns: The generation.
+        """
+        generation = max(self._last_generation + 1, int(time.time() * 1e6))
+        self._last_generation = generation
+        return generation
+
+    def _retire(self, resource):
+        """Make a live generation non-current.
+
+        The generation is archived if the bucket has versioning enabled;
+        otherwise it is removed.
+
+        :type resource: dict
+        :param resource: The generation's resource.
+        """
+        bucket = self._load_bucket(resource['bucket'])
+        if bucket.get('versioning', {}).get('enabled'):
+            resource['timeDeleted'] = _now()
+            self._save_object(resource)
+        else:
+            directory = self._object_dir(resource['bucket'], resource['name'])
+            os.remove(os.path.join(directory,
+                                   resource['generation'] + '.json'))
+            os.remove(self._data_path(resource))
+            if not os.listdir(directory):
+                os.rmdir(directory)
+
+    def _write_object(self, request, bucket_name, metadata, data_path,
+                      component_count=None):
+        """Create a new live generation of an object.
+
+        :type request: :class:`_LocalRequest`
+        :param request: The request, holding its preconditions.
+
+        :type bucket_name: str
+        :param bucket_name: The bucket.
+
+        :type metadata: dict
+        :param metadata: The object's metadata, including its name.
+
+        :type data_path: str
+        :param data_path: A file holding the data, which is moved.
+
+        :type component_count: int
+        :param component_count: (Optional) For composite objects, the number
+                                of components.
+
+        :rtype: tuple
+        :returns: The status, the response headers and the content.
+        """
+        name = metadata.get('name')
+        directory = self._object_dir(bucket_name, name)
+        live = self._live_object(bucket_name, name)
+        _check_preconditions(request.query, live, live, 'if')
+        now = _now()
+        generation = str(self._next_generation())
+        resource = {
+            'kind': 'storage#object',
+            'bucket': bucket_name,
+            'name': name,
+            'id': '%s/%s/%s' % (bucket_name, name, generation),
+            'generation': generation,
+            'metageneration': '1',
+            'contentType': 'application/octet-stream',
+            'storageClass': 'STANDARD',
+            'timeCreated': now,
+            'updated': now,
+            'size': str(os.path.getsize(data_path)),
+            'md5Hash': _md5_file(data_path),
+            'selfLink': _object_url(request.base_url + '/storage/v1',
+                                    bucket_name, name),
+            'mediaLink': '%s?generation=%s&alt=media' % (
+                _object_url(request.base_url + '/download/storage/v1',
+                            bucket_name, name), generation),
+        }
+        if component_count is not None:
+            resource['componentCount'] = component_count
+        _update_fields(resource, metadata, _READ_ONLY_OBJECT_FIELDS)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        os.rename(data_path, self._data_path(resource))
+        self._save_object(resource)
+        if live is not None:
+            self._retire(live)
+        return _json_response(http_client.OK, resource)
+
+    def _update_object(self, request, bucket_name, object_name):
+        """Patch or replace an object's metadata."""
+        resource = self._get_object(request, bucket_name, object_name)
+        changes = request.json()
+        if request.method == 'PUT':
+            for key in list(resource):
+                if key not in _READ_ONLY_OBJECT_FIELDS:
+                    del resource[key]
+            resource.setdefault('contentType', 'application/octet-stream')
+        _update_fields(resource, changes, _READ_ONLY_OBJECT_FIELDS)
+        resource['metageneration'] = str(int(resource['metageneration']) + 1)
+        resource['updated'] = _now()
+        self._save_object(resource)
+        return _json_response(http_client.OK, resource)
+
+    def _delete_object(self, request, bucket_name, object_name):
+        """Delete the live generation of an object, or a given generation."""
+        resource = self._get_object(request, bucket_name, object_name)
+        if 'generation' in request.query:
+            directory = self._object_dir(bucket_name, object_name)
+            os.remove(os.path.join(directory,
+                                   resource['generation'] + '.json'))
+            os.remove(self._data_path(resource))
+            if not os.listdir(directory):
+                os.rmdir(directory)
+        else:
+            self._retire(resource)
+        return _no_content()
+
+    def _get_media(self, request, bucket_name, object_name):
+        """Answer a download, honoring ``Range`` headers."""
+        resource = self._get_object(request, bucket_name, object_name)
+        with open(self._data_path(resource), 'rb') as file_obj:
+            data = file_obj.read()
+        headers = {
+            'content-type': resource.get('contentType',
+                                         'application/octet-stream'),
+            'x-goog-generation': resource['generation'],
+        }
+        if resource.get('contentEncoding') == 'gzip':
+            if 'gzip' not in request.headers.get('accept-encoding', ''):
+                # Decompressive transcoding ignores ranges.
+                data = zlib.decompress(data, 16 + zlib.MAX_WBITS)
+                return http_client.OK, headers, data
+            headers['content-encoding'] = 'gzip'
+        byte_range = _parse_range(request.headers.get('range'), len(data))
+        if byte_range is None:
+            return http_client.OK, headers, data
+        start, end = byte_range
+        headers['content-range'] = 'bytes %d-%d/%d' % (start, end, len(data))
+        return http_client.PARTIAL_CONTENT, headers, data[start:end + 1]
+
+    # pylint: disable=too-many-locals
+    def _list_objects(self, request, bucket_name):
+        """List objects, a page at a time."""
+        self._load_bucket(bucket_name)
+        query = request.query
+        prefix = query.get('prefix', '')
+        delimiter = query.get('delimiter')
+        start_offset = query.get('startOffset')
+        end_offset = query.get('endOffset')
+        versions = query.get('versions') in ('true', 'True')
+        directory = os.path.join(self._bucket_dir(bucket_name), _OBJECTS_DIR)
+
+        entries = []
+        prefixes = set()
+        for object_name in sorted(unquote(name)
+                                  for name in os.listdir(directory)):
+            if not object_name.startswith(prefix):
+                continue
+            if start_offset is not None and object_name < start_offset:
+                continue
+            if end_offset is not None and object_name >= end_offset:
+                continue
+            if delimiter:
+                index = object_name.find(delimiter, len(prefix))
+                if index != -1:
+                    found = object_name[:index + len(delimiter)]
+                    if found not in prefixes:
+                        prefixes.add(found)
+                        entries.append(((found, 0), None))
+                    continue
+            for resource in self._generations(bucket_name, object_name):
+                if versions or 'timeDeleted' not in resource:
+                    entries.append(
+                        ((object_name, int(resource['generation'])),
+                         resource))
+
+        token = query.get('pageToken')
+        if token:
+            after = tuple(_decode_token(token))
+            entries = [entry for entry in entries if entry[0] > after]
+        page, more = _paginate(entries, query)
+        resource = {'kind': 'storage#objects'}
+        items = [entry for _, entry in page if entry is not None]
+        if items:
+            resource['items'] = items
+        page_prefixes = [key[0] for key, entry in page if entry is None]
+        if page_prefixes:
+            resource['prefixes'] = page_prefixes
+        if more:
+            resource['nextPageToken'] = _encode_token(list(page[-1][0]))
+        return _json_response(http_client.OK, resource)
+    # pylint: enable=too-many-locals
+
+    # Uploads.
+
+    def _temp_path(self):
+        """A fresh path for data not yet stored as an object.
+
+        :rtype: str
+        :returns: The path, in the same file system as the buckets.
+        """
+        directory = os.path.join(self._root, _UPLOADS_DIR)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        return os.path.join(directory, uuid.uuid4().hex)
+
+    def _upload(self, request, bucket_name):
+        """Answer an upload of any type."""
+        self._load_bucket(bucket_name)
+        upload_type = request.query.get('uploadType')
+        if 'upload_id' in request.query:
+            return self._upload_chunk(request, request.query['upload_id'])
+        if request.method != 'POST':
+            raise _method_not_allowed(request.method)
+        if upload_type == 'media':
+            metadata = {'name': request.query.get('name')}
+            if 'content-type' in request.headers:
+                metadata['contentType'] = request.headers['content-type']
+            data = request.body
+        elif upload_type == 'multipart':
+            metadata, data, content_type = _parse_multipart(request)
+            metadata.setdefault('contentType', content_type)
+            if 'name' in request.query:
+                metadata['name'] = request.query['name']
+        elif upload_type == 'resumable':
+            return self._start_resumable(request, bucket_name)
+        else:
+            raise _HttpError(http_client.BAD_REQUEST,
+                             'Unknown uploadType: %r' % (upload_type,))
+        path = self._temp_path()
+        _write_file(path, data)
+        return self._write_object(request, bucket_name, metadata, path)
+
+    def _start_resumable(self, request, bucket_name):
+        """Start a resumable upload session."""
+        metadata = request.json()
+        if 'name' in request.query:
+            metadata['name'] = request.query['name']
+        if not metadata.get('name'):
+            raise _HttpError(http_client.BAD_REQUEST, 'Object name required')
+        content_type = request.headers.get('x-upload-content-type')
+        if content_type:
+            metadata.setdefault('contentType', content_type)
+        upload_id = uuid.uuid4().hex
+        path = self._temp_path()
+        _write_file(path, b'')
+        self._uploads[upload_id] = {
+            'bucket': bucket_name,
+            'metadata': metadata,
+            'path': path,
+            'request': request,
+        }
+        location = '%s/upload/storage/v1/b/%s/o?uploadType=resumable&' \
+            'upload_id=%s' % (request.base_url, quote(bucket_name, safe=''),
+                              upload_id)
+        return http_client.OK, {'location': location}, b''
+
+    def _upload_chunk(self, request, upload_id):
+        """Answer a chunk (or a status query) of a resumable upload."""
+        session = self._uploads.get(upload_id)
+        if session is None:
+            raise _HttpError(http_client.NOT_FOUND,
+                             'No such upload: %s' % (upload_id,))
+        if request.method == 'DELETE':
+            del self._uploads[upload_id]
+            os.remove(session['path'])
+            return _no_content()
+        persisted = os.path.getsize(session['path'])
+        start, total = _parse_content_range(
+            request.headers.get('content-range', 'bytes */*'))
+        data = request.body
+        if start is not None:
+            if start > persisted:
+                raise _HttpError(http_client.BAD_REQUEST,
+                                 'Chunk starts at %d, expected %d' % (
+                                     start, persisted))
+            data = data[persisted - start:]
+            with open(session['path'], 'ab') as file_obj:
+                file_obj.write(data)
+            persisted += len(data)
+        if total is not None and persisted >= total:
+            del self._uploads[upload_id]
+            # Preconditions are those of the request starting the upload.
+            return self._write_object(session['request'], session['bucket'],
+                                      session['metadata'], session['path'])
+        headers = {}
+        if persisted:
+            headers['range'] = 'bytes=0-%d' % (persisted - 1,)
+        return _RESUME_INCOMPLETE, headers, b''
+
+    # Copy, compose and rewrite.
+
+    def _copy_source(self, request, source):
+        """Load the source of a copy or rewrite.
+
+        :rtype: dict
+        :returns: The source's resource.
+        """
+        resource = self._find_object(
+            source[0], source[1], request.query.get('sourceGeneration'))
+        _check_preconditions(request.query, resource, resource, 'ifSource')
+        return resource
+
+    def _copy_data(self, source, metadata):
+        """Copy a source's data and metadata, to be written elsewhere.
+
+        :type source: dict
+        :param source: The source's resource.
+
+        :type metadata: dict
+        :param metadata: Overrides for the destination's metadata.
+
+        :rtype: tuple
+        :returns: The destination's metadata and a file holding its data.
+        """
+        path = self._temp_path()
+        shutil.copyfile(self._data_path(source), path)
+        destination = dict(
+            (key, value) for key, value in source.items()
+            if key not in _READ_ONLY_OBJECT_FIELDS)
+        _update_fields(destination, metadata, _READ_ONLY_OBJECT_FIELDS)
+        return destination, path
+
+    def _copy(self, request, source, destination):
+        """Copy an object."""
+        source_resource = self._copy_source(request, source)
+        self._load_bucket(destination[0])
+        metadata, path = self._copy_data(source_resource, request.json())
+        metadata['name'] = destination[1]
+        return self._write_object(request, destination[0], metadata, path)
+
+    def _rewrite(self, request, source, destination):
+        """Rewrite an object, in several calls if asked to."""
+        source_resource = self._copy_source(request, source)
+        self._load_bucket(destination[0])
+        size = int(source_resource['size'])
+        offset = 0
+        token = request.query.get('rewriteToken')
+        if token:
+            state = _decode_token(token)
+            if state['source'] != [source[0], source[1],
+                                   source_resource['generation']]:
+                raise _HttpError(http_client.BAD_REQUEST,
+                                 'Invalid rewrite token')
+            offset = state['offset']
+        limit = request.query.get('maxBytesRewrittenPerCall')
+        offset = size if limit is None else min(size, offset + int(limit))
+
+        metadata, path = self._copy_data(source_resource, request.json())
+        metadata['name'] = destination[1]
+        result = {
+            'kind': 'storage#rewriteResponse',
+            'totalBytesRewritten': str(offset),
+            'objectSize': str(size),
+            'done': offset >= size,
+        }
+        if offset < size:
+            os.remove(path)
+            result['rewriteToken'] = _encode_token({
+                'source': [source[0], source[1],
+                           source_resource['generation']],
+                'offset': offset,
+            })
+            # The destination, as it will be once written.
+            result['resource'] = dict(metadata, bucket=destination[0],
+                                      size=str(size))
+            return _json_response(http_client.OK, result)
+        _, _, content = self._write_object(
+            request, destination[0], metadata, path)
+        result['resource'] = json.loads(content.decode('utf-8'))
+        return _json_response(http_client.OK, result)
+
+    def _compose(self, request, bucket_name, object_name):
+        """Concatenate objects of a bucket into one."""
+        body = request.json()
+        sources = body.get('sourceObjects', [])
+        if not sources or len(sources) > _MAX_COMPOSE_SOURCES:
+            raise _HttpError(http_client.BAD_REQUEST,
+                             'Between 1 and %d source objects required' % (
+                                 _MAX_COMPOSE_SOURCES,))
+        path = self._temp_path()
+        component_count = 0
+        with open(path, 'wb') as out:
+            for source in sources:
+                resource = self._find_object(bucket_name, source['name'],
+                                             source.get('generation'))
+                preconditions = source.get('objectPreconditions', {})
+                _check_preconditions(preconditions, resource, resource, 'if')
+                component_count += resource.get('componentCount', 1)
+                with open(self._data_path(resource), 'rb') as file_obj:
+                    shutil.copyfileobj(file_obj, out)
+        metadata = dict(body.get('destination') or {})
+        metadata['name'] = object_name
+        return self._write_object(request, bucket_name, metadata, path,
+                                  component_count=component_count)
+
+    # Batches.
+
+    def _batch(self, request):
+        """Answer each part of a ``multipart/mixed`` batch request."""
+        boundary = _get_boundary(request.headers.get('content-type', ''))
+        if boundary is None:
+            raise _HttpError(http_client.BAD_REQUEST,
+                             'Batch requests must be multipart')
+        response_boundary = 'batch_' + uuid.uuid4().hex
+        parts = []
+        for index, part in enumerate(_split_multipart(
+                request.body, boundary.encode('ascii'))):
+            _, message = _split_header_block(part.decode('utf-8'))
+            request_line, _, message = message.partition('\n')
+            method, uri = request_line.split()[:2]
+            header_block, body = _split_header_block(message)
+            status, headers, content = self._respond(
+                method, uri, _parse_headers(header_block),
+                body.encode('utf-8'))
+            lines = ['HTTP/1.1 %d %s' % (
+                status, http_client.responses.get(status, ''))]
+            lines.extend('%s: %s' % (key.title(), value)
+                         for key, value in sorted(headers.items()))
+            lines.append('Content-Length: %d' % (len(content),))
+            parts.append('\r\n'.join([
+                'Content-Type: application/http',
+                'Content-ID: <response-%d>' % (index + 1,),
+                '',
+            ] + lines + ['', content.decode('utf-8')]))
+        delimiter = '--' + response_boundary
+        content = ('\r\n'.join(delimiter + '\r\n' + part for part in parts) +
+                   '\r\n' + delimiter + '--\r\n')
+        return http_client.OK, {
+            'content-type': 'multipart/mixed; boundary=%s' % (
+                response_boundary,),
+        }, content.encode('utf-8')
+
+
+class _LocalRequest(object):
+    """A parsed request.
+
+    :type method: str
+    :param method: The HTTP method.
+
+    :type uri: str
+    :param uri: The URL requested.
+
+    :type headers: dict
+    :param headers: The request headers, keyed by lower-cased name.
+
+    :type body: bytes
+    :param body: The request payload.
+    """
+
+    def __init__(self, method, uri, headers, body):
+        parsed = urlsplit(uri)
+        self.method = method
+        self.path = parsed.path
+        self.query = dict(parse_qsl(parsed.query, keep_blank_values=True))
+        self.base_url = '%s://%s' % (parsed.scheme or 'http',
+                                     parsed.netloc or 'localhost')
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        """Parse the payload as a JSON object.
+
+        :rtype: dict
+        :returns: The parsed payload; empty if there is none.
+        :raises: :exc:`_HttpError` if the payload is not a JSON object.
+        """
+        if not self.body.strip():
+            return {}
+        try:
+            value = json.loads(self.body.decode('utf-8'))
+        except ValueError:
+            value = None
+        if not isinstance(value, dict):
+            raise _HttpError(http_client.BAD_REQUEST, 'Invalid JSON payload')
+        return value
+
+
+class _HttpError(Exception):
+    """An error to be sent as a JSON error response.
+
+    :type status: int
+    :param status: The HTTP status.
+
+    :type message: str
+    :param message: The error message.
+
+    :type reason: str
+    :param reason: (Optional) The error reason, as the service reports it.
+    """
+
+    def __init__(self, status, message, reason='invalid'):
+        super(_HttpError, self).__init__(status, message)
+        self.status = status
+        self.message = message
+        self.reason = reason
+
+
+def _method_not_allowed(method):
+    """Error for a method not supported on a path.
+
+    :rtype: :exc:`_HttpError`
+    :returns: The error to raise.
+    """
+    return _HttpError(http_client.METHOD_NOT_ALLOWED,
+                      'Method %s not allowed' % (method,))
+
+
+def _json_response(status, resource):
+    """Build a JSON response.
+
+    :rtype: tuple
+    :returns: The status, the response headers and the content.
+    """
+    return status, {'content-type': 'application/json; charset=UTF-8'}, \
+        json.dumps(resource).encode('utf-8')
+
+
+def _no_content():
+    """Build an empty response.
+
+    :rtype: tuple
+    :returns: The status, the response headers and the content.
+    """
+    return http_client.NO_CONTENT, {}, b''
+
+
+def _check_preconditions(conditions, resource, metadata, prefix):
+    """Apply generation / metageneration preconditions.
+
+    :type conditions: dict
+    :param conditions: The query parameters (or ``objectPreconditions``).
+
+    :type resource: dict
+    :param resource: The live object, or ``None`` if there is none; its
+                     generation is checked.
+
+    :type metadata: dict
+    :param metadata: The object or bucket whose metageneration is checked.
+
+    :type prefix: str
+    :param prefix: ``'if'`` or ``'ifSource'``.
+
+    :raises: :exc:`_HttpError` if a precondition fails.
+    """
+    generation = '0' if resource is None else resource['generation']
+    metageneration = None if metadata is None else metadata['metageneration']
+    checks = [
+        ('GenerationMatch', generation, True),
+        ('GenerationNotMatch', generation, False),
+        ('MetagenerationMatch', metageneration, True),
+        ('MetagenerationNotMatch', metageneration, False),
+    ]
+    for name, actual, should_match in checks:
+        expected = conditions.get(prefix + name)
+        if expected is None:
+            continue
+        if (str(expected) == actual) != should_match:
+            raise _HttpError(http_client.PRECONDITION_FAILED,
+                             'Precondition %s%s failed' % (prefix, name),
+                             reason='conditionNotMet')
+
+
+def _update_fields(resource, changes, read_only):
+    """Apply a metadata patch, ignoring read-only fields.
+
+    Fields set to ``None`` are removed; ``metadata`` is merged key by key.
+
+    :type resource: dict
+    :param resource: The resource to update.
+
+    :type changes: dict
+    :param changes: The patch.
+
+    :type read_only: frozenset
+    :param read_only: Fields which the patch can't change.
+    """
+    for key, value in changes.items():
+        if key in read_only:
+            continue
+        if value is None:
+            resource.pop(key, None)
+        elif key == 'metadata' and isinstance(value, dict):
+            merged = dict(resource.get('metadata') or {})
+            _update_fields(merged, value, frozenset())
+            resource['metadata'] = merged
+        else:
+            resource[key] = value
+
+
+def _paginate(entries, query):
+    """Take one page of entries.
+
+    :type entries: list
+    :param entries: The entries following the page token.
+
+    :type query: dict
+    :param query: The query parameters, holding ``maxResults``.
+
+    :rtype: tuple
+    :returns: The page, and whether more entries follow it.
+    """
+    max_results = int(query.get('maxResults', _DEFAULT_MAX_RESULTS))
+    max_results = max(1, min(max_results, _DEFAULT_MAX_RESULTS))
+    return entries[:max_results], len(entries) > max_results
+
+
+def _encode_token(value):
+    """Encode a value as an opaque page / rewrite token.
+
+    :rtype: str
+    :returns: The token.
+    """
+    return base64.urlsafe_b64encode(
+        json.dumps(value).encode('utf-8')).decode('ascii')
+
+
+def _decode_token(token):
+    """Decode a token made by :func:`_encode_token`.
+
+    :rtype: object
+    :returns: The encoded value.
+    :raises: :exc:`_HttpError` if the token is invalid.
+    """
+    try:
+        return json.loads(base64.urlsafe_b64decode(
+            token.encode('ascii')).decode('utf-8'))
+    except (TypeError, ValueError, UnicodeError):
+        raise _HttpError(http_client.BAD_REQUEST,
+                         'Invalid token: %r' % (token,))
+
+
+def _parse_range(header, size):
+    """Parse a ``Range`` header.
+
+    :type header: str
+    :param header: The header, or ``None``.
+
+    :type size: int
+    :param size: The size of the object.
+
+    :rtype: tuple
+    :returns: The first and last byte, or ``None`` for the whole object.
+    :raises: :exc:`_HttpError` if the range can't be satisfied.
+    """
+    if not header or not header.startswith('bytes=') or not size:
+        return None
+    first, _, last = header[len('bytes='):].partition('-')
+    if not first:
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start = int(first)
+        end = size - 1 if not last else min(int(last), size - 1)
+    if start >= size or end < start:
+        raise _HttpError(http_client.REQUESTED_RANGE_NOT_SATISFIABLE,
+                         'Range %s not satisfiable' % (header,))
+    return start, end
+
+
+def _parse_content_range(header):
+    """Parse the ``Content-Range`` header of a resumable upload chunk.
+
+    :type header: str
+    :param header: e.g. ``bytes 0-99/*``, ``bytes 100-199/200`` or
+                   ``bytes */200``.
+
+    :rtype: tuple
+    :returns: The first byte of the chunk (``None`` if the request carries
+              no data) and the total size (``None`` if unknown).
+    :raises: :exc:`_HttpError` if the header is malformed.
+    """
+    if not header.startswith('bytes '):
+        raise _HttpError(http_client.BAD_REQUEST,
+                         'Invalid Content-Range: %r' % (header,))
+    span, _, total = header[len('bytes '):].partition('/')
+    start = None if span == '*' else int(span.partition('-')[0])
+    return start, None if total == '*' else int(total)
+
+
+def _split_multipart(content, boundary):
+    """Split a multipart payload into its parts.
+
+    :type content: bytes
+    :param content: The payload.
+
+    :type boundary: bytes
+    :param boundary: The boundary.
+
+    :rtype: list
+    :returns: The parts, without their delimiters and the line breaks
+              around them.
+    """
+    parts = []
+    for chunk in content.split(b'--' + boundary)[1:]:
+        if chunk.startswith(b'--'):
+            break  # The close delimiter.
+        if chunk.startswith(b'\r\n'):
+            chunk = chunk[2:]
+        elif chunk.startswith(b'\n'):
+            chunk = chunk[1:]
+        if chunk.endswith(b'\r\n'):
+            chunk = chunk[:-2]
+        elif chunk.endswith(b'\n'):
+            chunk = chunk[:-1]
+        parts.append(chunk)
+    return parts
+
+
+def _split_part(part):
+    """Split a MIME part into its headers and its body.
+
+    :type part: bytes
+    :param part: The part.
+
+    :rtype: tuple
+    :returns: The headers (a dict keyed by lower-cased name) and the body.
+    """
+    for line_break in (b'\r\n', b'\n'):
+        if part.startswith(line_break):  # No headers.
+            return {}, part[len(line_break):]
+    for separator in (b'\r\n\r\n', b'\n\n'):
+        index = part.find(separator)
+        if index != -1:
+            return (_parse_headers(part[:index].decode('latin-1')),
+                    part[index + len(separator):])
+    return _parse_headers(part.decode('latin-1')), b''
+
+
+def _parse_multipart(request):
+    """Parse a ``multipart/related`` upload.
+
+    :type request: :class:`_LocalRequest`
+    :param request: The upload request.
+
+    :rtype: tuple
+    :returns: The metadata, the media and the media's content type.
+    :raises: :exc:`_HttpError` if the payload is malformed.
+    """
+    boundary = _get_boundary(request.headers.get('content-type', ''))
+    parts = [] if boundary is None else _split_multipart(
+        request.body, boundary.encode('ascii'))
+    if len(parts) != 2:
+        raise _HttpError(http_client.BAD_REQUEST,
+                         'Multipart uploads need metadata and media parts')
+    (_, metadata), (media_headers, media) = [
+        _split_part(part) for part in parts]
+    try:
+        metadata = json.loads(metadata.decode('utf-8'))
+    except ValueError:
+        raise _HttpError(http_client.BAD_REQUEST, 'Invalid JSON metadata')
+    return metadata, media, media_headers.get(
+        'content-type', 'application/octet-stream')
+
+
+def _object_url(base, bucket_name, object_name):
+    """URL of an object below an API base.
+
+    :rtype: str
+    :returns: The URL.
+    """
+    return '%s/b/%s/o/%s' % (base, quote(bucket_name, safe=''),
+                             quote(object_name, safe=''))
+
+
+def _read_json(path):
+    """Load a JSON file.
+
+    :rtype: dict
+    :returns: The parsed file.
+    """
+    with open(path, 'rb') as file_obj:
+        return json.loads(file_obj.read().decode('utf-8'))
+
+
+def _write_file(path, data):
+    """Write a file atomically, so readers never see a partial file.
+
+    :type path: str
+    :param path: The path of the file.
+
+    :type data: bytes
+    :param data: The contents.
+    """
+    temp_path = '%s.%s.tmp' % (path, uuid.uuid4().hex)
+    with open(temp_path, 'wb') as file_obj:
+        file_obj.write(data)
+    if os.path.exists(path):
+        os.remove(path)
+    os.rename(temp_path, path)
+
+
+def _md5_file(path):
+    """Compute the base64-encoded MD5 hash of a file.
+
+    :rtype: str
+    :returns: The hash, as the service reports it.
+    """
+    hash_obj = hashlib.md5()
+    with open(path, 'rb') as file_obj:
+        for block in iter(lambda: file_obj.read(1 << 20), b''):
+            hash_obj.update(block)
+    return base64.b64encode(hash_obj.digest()).decode('ascii')
+
+
+def _etag(resource):
+    """Compute an ETag for a resource.
+
+    :rtype: str
+    :returns: A value which changes whenever the resource does.
+    """
+    payload = json.dumps(
+        dict((key, value) for key, value in resource.items()
+             if key != 'etag'), sort_keys=True).encode('utf-8')
+    return base64.b64encode(hashlib.md5(payload).digest()).decode('ascii')
+
+
+def _now():
+    """The current time, as the service formats timestamps.
+
+    :rtype: str
+    :returns: An RFC 3339 timestamp, in UTC.
+    """
+    return datetime.datetime.utcnow().strftime(_RFC3339_MICROS)
@@ -0,0 +1,259 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Drive many server-side rewrites concurrently.
+
+Rewrites which cross locations or storage classes may take many calls to
+:meth:`~google.cloud.storage.blob.Blob.rewrite` to complete.  A
+:class:`RewriteManager` runs the token loops for many objects at once,
+optionally checkpointing the tokens so that an interrupted run can be
+resumed, and reports the aggregate progress:
+
+.. code-block:: python
+
+  >>> import shelve
+  >>> from google.cloud import storage
+  >>> from google.cloud.storage.rewrite import RewriteManager
+  >>> client = storage.Client()
+  >>> source = client.bucket('source-bucket')
+  >>> destination = client.bucket('archive-bucket')
+  >>> pairs = [(blob, destination.blob(blob.name))
+  ...          for blob in source.list_blobs()]
+  >>> manager = RewriteManager(client, checkpoint=shelve.open('tokens'))
+  >>> results = manager.rewrite(pairs, delete_source=True)
+"""
+
+import collections
+import functools
+import threading
+
+from google.cloud._helpers import _map_concurrently
+from google.cloud.exceptions import BadRequest
+from google.cloud.exceptions import NotFound
+
+
+class RewriteResult(collections.namedtuple(
+        'RewriteResult', 'source destination total_bytes error')):
+    """The outcome of rewriting one object.
+
+    :type source: :class:`~google.cloud.storage.blob.Blob`
+    :param source: The blob which was rewritten.
+
+    :type destination: :class:`~google.cloud.storage.blob.Blob`
+    :param destination: The blob rewritten into; its properties are
+                        updated from the last rewrite response.
+
+    :type total_bytes: int
+    :param total_bytes: The size of the object, or ``None`` if the rewrite
+                        failed.
+
+    :type error: :class:`Exception`
+    :param error: The error which stopped the rewrite (e.g. a
+                  :class:`~google.cloud.exceptions.GoogleCloudError` or a
+                  :class:`socket.error`), or ``None`` if it succeeded.
+    """
+
+
+class RewriteManager(object):
+    """Run the rewrite token loops of many objects concurrently.
+
+    :type client: :class:`~google.cloud.storage.client.Client` or
+                  ``NoneType``
+    :param client: Optional. The client to use.  If not passed, each rewrite
+                   falls back to the ``client`` stored on the destination
+                   blob's bucket.
+
+    :type max_workers: int
+    :param max_workers: (Optional) The maximum number of objects rewritten
+                        concurrently.
+
+    :type max_bytes_rewritten_per_call: int
+    :param max_bytes_rewritten_per_call: (Optional) Passed to each
+                                         :meth:`~.Blob.rewrite` call; must
+                                         be a multiple of 1 MiB.
+
+    :type checkpoint: :class:`collections.MutableMapping`
+    :param checkpoint: (Optional) Storage for the tokens of unfinished
+                       rewrites, e.g. a :class:`shelve.Shelf`.  Tokens found
+                       in it are used to resume the corresponding rewrites,
+                       and are removed once those complete, or dropped if
+                       the service rejects them (e.g. once expired), the
+                       rewrite then starting over.  The rewrite
+                       parameters (destination, encryption keys,
+                       ``max_bytes_rewritten_per_call``) must not change
+                       between runs.
+
+    :type progress_callback: callable
+    :param progress_callback: (Optional) Called with
+                              ``(bytes_rewritten, total_bytes)`` summed over
+                              the objects seen so far, after each rewrite
+                              call.  Calls are serialized.
+    """
+
+    def __init__(self, client=None, max_workers=None,
+                 max_bytes_rewritten_per_call=None, checkpoint=None,
+                 progress_callback=None):
+        self._client = client
+        self._max_workers = max_workers
+        self._max_bytes_rewritten_per_call = max_bytes_rewritten_per_call
+        self._checkpoint = checkpoint
+        self._progress_callback = progress_callback
+        self._lock = threading.Lock()
+        self._progress = {}
+        self._bytes_rewritten = 0
+        self._total_bytes = 0
+
+    @property
+    def bytes_rewritten(self):
+        """Bytes rewritten so far, across all objects.
+
+        :rtype: int
+        :returns: The aggregate number of bytes rewritten.
+        """
+        return self._bytes_rewritten
+
+    @property
+    def total_bytes(self):
+        """Total bytes to rewrite, across the objects seen so far.
+
+        :rtype: int
+        :returns: The aggregate size of the objects.
+        """
+        return self._total_bytes
+
+    def rewrite(self, pairs, delete_source=False):
+        """Rewrite each source blob into its destination blob.
+
+        A failed rewrite does not stop the others; its token (if any) is
+        kept in the checkpoint so that a later run can resume it.
+
+        :type pairs: iterable
+        :param pairs: ``(source, destination)`` tuples of
+                      :class:`~google.cloud.storage.blob.Blob`.
+
+        :type delete_source: bool
+        :param delete_source: (Optional) If true, delete each source blob
+                              once its rewrite completes, i.e. move the
+                              objects.
+
+        :rtype: list
+        :returns: A :class:`RewriteResult` for each pair, in order.
+        """
+        rewrite_one = functools.partial(
+            self._rewrite_one, delete_source=delete_source)
+        return list(_map_concurrently(
+            rewrite_one, pairs, max_workers=self._max_workers))
+
+    def _rewrite_one(self, pair, delete_source):
+        """Run the token loop for one object.
+
+        :type pair: tuple
+        :param pair: ``(source, destination)`` blobs.
+
+        :type delete_source: bool
+        :param delete_source: Whether to delete the source blob once done.
+
+        :rtype: :class:`RewriteResult`
+        :returns: The outcome of the rewrite.
+        """
+        source, destination = pair
+        key = _checkpoint_key(source, destination)
+        token = None
+        if self._checkpoint is not None:
+            with self._lock:
+                token = self._checkpoint.get(key)
+        resumed = token is not None
+
+        try:
+            while True:
+                try:
+                    token, rewritten, total = destination.rewrite(
+                        source, token=token, client=self._client,
+                        max_bytes_rewritten_per_call=(
+                            self._max_bytes_rewritten_per_call))
+                except (BadRequest, NotFound):
+                    if not resumed:
+                        raise
+                    # The checkpointed token was rejected: start over.
+                    resumed = False
+                    token = None
+                    self._forget(key)
+                    continue
+                resumed = False
+                self._record(key, token, rewritten, total)
+                if token is None:
+                    break
+            if delete_source:
+                source.delete(client=self._client)
+        except Exception as exc:  # pylint: disable=broad-except
+            return RewriteResult(source, destination, None, exc)
+
+        return RewriteResult(source, destination, total, None)
+
+    def _forget(self, key):
+        """Drop a rewrite token from the checkpoint.
+
+        :type key: str
+        :param key: The checkpoint key of the rewrite.
+        """
+        with self._lock:
+            self._checkpoint.pop(key, None)
+
+    def _record(self, key, token, rewritten, total):
+        """Checkpoint a rewrite token and update the aggregate progress.
+
+        :type key: str
+        :param key: The checkpoint key of the rewrite.
+
+        :type token: str
+        :param token: The token for the next call, or ``None`` if done.
+
+        :type rewritten: int
+        :param rewritten: Bytes of the object rewritten so far.
+
+        :type total: int
+        :param total: The size of the object.
+        """
+        with self._lock:
+            if self._checkpoint is not None:
+                if token is None:
+                    self._checkpoint.pop(key, None)
+                else:
+                    self._checkpoint[key] = token
+
+            old_rewritten, old_total = self._progress.get(key, (0, 0))
+            self._progress[key] = (rewritten, total)
+            self._bytes_rewritten += rewritten - old_rewritten
+            self._total_bytes += total - old_total
+
+            if self._progress_callback is not None:
+                self._progress_callback(
+                    self._bytes_rewritten, self._total_bytes)
+
+
+def _checkpoint_key(source, destination):
+    """Identify a rewrite in the checkpoint.
+
+    :type source: :class:`~google.cloud.storage.blob.Blob`
+    :param source: The blob being rewritten.
+
+    :type destination: :class:`~google.cloud.storage.blob.Blob`
+    :param destination: The blob being rewritten into.
+
+    :rtype: str
+    :returns: A key naming both objects.
+    """
+    return '%s/%s -> %s/%s' % (
+        source.bucket.name, source.name,
+        destination.bucket.name, destination.name)
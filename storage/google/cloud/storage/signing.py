@@ -0,0 +1,296 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Generate many signed URLs quickly.
+
+:meth:`~google.cloud.storage.blob.Blob.generate_signed_url` is convenient
+for a few URLs.  A :class:`URLSigner` is meant for signing in bulk: it
+looks up the credentials' signer once, memoizes the URLs it generates,
+rounds expirations up so that URLs requested close together in time are
+shared, and can spread the RSA signatures over a pool of processes:
+
+.. code-block:: python
+
+  >>> import datetime
+  >>> from google.oauth2 import service_account
+  >>> from google.cloud.storage.signing import URLSigner
+  >>> credentials = service_account.Credentials.from_service_account_file(
+  ...     'key.json')
+  >>> with URLSigner(credentials, processes=4) as signer:
+  ...     urls = signer.sign_urls(
+  ...         bucket.list_blobs(), datetime.timedelta(hours=1))
+"""
+
+import collections
+from concurrent.futures import ProcessPoolExecutor
+import threading
+
+import google.auth.credentials
+from six.moves.urllib.parse import quote
+
+from google.cloud.credentials import _get_expiration_seconds
+from google.cloud.credentials import generate_signed_url
+from google.cloud._helpers import _chunked
+from google.cloud.storage.blob import _API_ACCESS_ENDPOINT
+
+
+_PROCESS_CHUNK_SIZE = 256
+
+
+class URLSigner(object):
+    """Sign URLs for many blobs with one set of credentials.
+
+    :type credentials: :class:`google.auth.credentials.Signing`
+    :param credentials: Credentials with a private key (e.g. those of a
+                        service account).
+
+    :type expiration_granularity: int
+    :param expiration_granularity: (Optional) Expirations are rounded up to
+                                   a multiple of this many seconds, so that
+                                   URLs generated within that period for the
+                                   same request can be reused.  Pass ``1``
+                                   to use the exact expiration.
+
+    :type cache_size: int
+    :param cache_size: (Optional) The maximum number of URLs memoized; pass
+                       ``0`` to disable memoization.
+
+    :type processes: int
+    :param processes: (Optional) If passed, sign in a pool of this many
+                      processes; otherwise sign in the calling thread.
+                      Only useful with a signer which can be pickled.
+
+    :raises AttributeError: If ``credentials`` cannot sign.
+    """
+
+    def __init__(self, credentials, expiration_granularity=60,
+                 cache_size=4096, processes=None):
+        if not isinstance(credentials, google.auth.credentials.Signing):
+            raise AttributeError(
+                'URLSigner requires credentials with a private key, got %s'
+                % (type(credentials),))
+        self._credentials = _CachedSigner(
+            credentials.signer, credentials.signer_email)
+        self._expiration_granularity = expiration_granularity
+        self._cache_size = cache_size
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._processes = processes
+        self._executor = None
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Shut down the process pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def sign_url(self, blob, expiration, method='GET', content_type=None,
+                 generation=None, response_disposition=None,
+                 response_type=None):
+        """Generate a signed URL for one blob.
+
+        The arguments match those of
+        :meth:`~google.cloud.storage.blob.Blob.generate_signed_url`.
+
+        :type blob: :class:`~google.cloud.storage.blob.Blob`
+        :param blob: The blob to sign a URL for.
+
+        :type expiration: int, long, datetime.datetime, datetime.timedelta
+        :param expiration: When the signed URL should expire, before
+                           rounding.
+
+        :type method: str
+        :param method: The HTTP verb that will be used when requesting the URL.
+
+        :type content_type: str
+        :param content_type: (Optional) The content type of the object.
+
+        :type generation: str
+        :param generation: (Optional) The generation of the object to fetch.
+
+        :type response_disposition: str
+        :param response_disposition: (Optional) Content disposition of
+                                     responses to requests for the signed URL.
+
+        :type response_type: str
+        :param response_type: (Optional) Content type of responses to requests
+                              for the signed URL.
+
+        :rtype: str
+        :returns: A signed URL.
+        """
+        return self.sign_urls(
+            [blob], expiration, method=method, content_type=content_type,
+            generation=generation, response_disposition=response_disposition,
+            response_type=response_type)[0]
+
+    def sign_urls(self, blobs, expiration, method='GET', content_type=None,
+                  generation=None, response_disposition=None,
+                  response_type=None):
+        """Generate signed URLs for many blobs.
+
+        The arguments other than ``blobs`` are those of :meth:`sign_url`,
+        and apply to every blob.
+
+        :type blobs: iterable
+        :param blobs: The :class:`~google.cloud.storage.blob.Blob` instances
+                      to sign URLs for.
+
+        :rtype: list
+        :returns: The signed URLs, in the order of ``blobs``.
+        """
+        expiration = self._round_expiration(expiration)
+        requests = [{
+            'resource': '/%s/%s' % (blob.bucket.name,
+                                    quote(blob.name, safe='')),
+            'expiration': expiration,
+            'method': method,
+            'content_type': content_type,
+            'generation': generation,
+            'response_disposition': response_disposition,
+            'response_type': response_type,
+        } for blob in blobs]
+        keys = [tuple(sorted(request.items())) for request in requests]
+
+        urls = [None] * len(requests)
+        missing = collections.OrderedDict()
+        with self._lock:
+            for index, key in enumerate(keys):
+                url = self._cache.get(key)
+                if url is None:
+                    missing.setdefault(key, requests[index])
+                    self.misses += 1
+                else:
+                    urls[index] = url
+                    self.hits += 1
+
+        signed = dict(zip(missing, self._sign(list(missing.values()))))
+
+        with self._lock:
+            for index, key in enumerate(keys):
+                if urls[index] is None:
+                    urls[index] = signed[key]
+            if self._cache_size:
+                for key, url in signed.items():
+                    self._cache[key] = url
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return urls
+
+    def _round_expiration(self, expiration):
+        """Round an expiration up to the configured granularity.
+
+        :type expiration: int, long, datetime.datetime, datetime.timedelta
+        :param expiration: When the signed URL should expire.
+
+        :rtype: int
+        :returns: The rounded expiration, in seconds since the epoch.
+        """
+        expiration = _get_expiration_seconds(expiration)
+        granularity = self._expiration_granularity
+        return -(-expiration // granularity) * granularity
+
+    def _sign(self, requests):
+        """Sign requests, in a process pool if configured.
+
+        :type requests: list
+        :param requests: Keyword arguments for
+                         :func:`google.cloud.credentials.generate_signed_url`.
+
+        :rtype: list
+        :returns: The signed URLs, in order.
+        """
+        if self._processes is None or len(requests) <= 1:
+            return _sign_requests(self._credentials, requests)
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self._processes)
+        futures = [
+            self._executor.submit(_sign_requests, self._credentials, chunk)
+            for chunk in _chunked(requests, _PROCESS_CHUNK_SIZE)]
+        return [url for future in futures for url in future.result()]
+
+
+class _CachedSigner(google.auth.credentials.Signing):
+    """Signing credentials holding a signer looked up once.
+
+    Unlike most credentials, instances can be pickled (and so sent to
+    worker processes) whenever the signer can.
+
+    :type signer: :class:`google.auth.crypt.Signer`
+    :param signer: The signer.
+
+    :type signer_email: str
+    :param signer_email: The e-mail address of the signing account.
+    """
+
+    def __init__(self, signer, signer_email):
+        self._signer = signer
+        self._signer_email = signer_email
+
+    @property
+    def signer(self):
+        """The signer.
+
+        :rtype: :class:`google.auth.crypt.Signer`
+        :returns: The signer passed to the constructor.
+        """
+        return self._signer
+
+    @property
+    def signer_email(self):
+        """The e-mail address of the signing account.
+
+        :rtype: str
+        :returns: The address passed to the constructor.
+        """
+        return self._signer_email
+
+    def sign_bytes(self, message):
+        """Sign bytes.
+
+        :type message: bytes
+        :param message: The message to sign.
+
+        :rtype: bytes
+        :returns: The signature.
+        """
+        return self._signer.sign(message)
+
+
+def _sign_requests(credentials, requests):
+    """Generate signed URLs; run in worker processes.
+
+    :type credentials: :class:`_CachedSigner`
+    :param credentials: The credentials to sign with.
+
+    :type requests: list
+    :param requests: Keyword arguments for
+                     :func:`google.cloud.credentials.generate_signed_url`.
+
+    :rtype: list
+    :returns: The signed URLs, in order.
+    """
+    return [
+        generate_signed_url(credentials, api_access_endpoint=(
+            _API_ACCESS_ENDPOINT), **request)
+        for request in requests]
@@ -0,0 +1,410 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Synchronize a local directory tree with a prefix in a bucket.
+
+Only files whose size, modification time or (optionally) MD5 hash differ
+from the other side are transferred.  The remote side is compared using
+the metadata returned by a single listing of the prefix, so no
+per-object requests are made for unchanged files.
+
+.. code-block:: python
+
+  >>> from google.cloud import storage
+  >>> from google.cloud.storage.sync import sync_to_bucket
+  >>> client = storage.Client()
+  >>> bucket = client.bucket('my-bucket')
+  >>> report = sync_to_bucket('/var/www', bucket, prefix='www/',
+  ...                         delete=True)
+  >>> report.bytes_per_second
+  10485760.0
+"""
+
+import calendar
+import collections
+import os
+import time
+
+from google.cloud._helpers import _bytes_to_unicode
+from google.cloud._helpers import _map_concurrently
+from google.cloud.storage._helpers import _base64_md5hash
+from google.cloud.storage.transfer import _ensure_directory
+
+
+_LIST_FIELDS = 'items(name,size,md5Hash,updated,mediaLink),nextPageToken'
+
+
+class SyncReport(collections.namedtuple(
+        'SyncReport', 'copied deleted skipped bytes elapsed dry_run')):
+    """Summary of a directory synchronization.
+
+    :type copied: list
+    :param copied: Paths (relative to the synchronized root, using ``/`` as
+                   the separator) which were (or, for a dry run, would be)
+                   copied.
+
+    :type deleted: list
+    :param deleted: Relative paths which were (or would be) deleted from
+                    the destination.
+
+    :type skipped: int
+    :param skipped: Number of files which were already up to date.
+
+    :type bytes: int
+    :param bytes: Number of bytes copied (or which would be copied).
+
+    :type elapsed: float
+    :param elapsed: Wall-clock seconds spent, including the listings.
+
+    :type dry_run: bool
+    :param dry_run: Whether the synchronization only computed the changes.
+    """
+
+    @property
+    def bytes_per_second(self):
+        """Transfer throughput of the synchronization.
+
+        :rtype: float
+        :returns: Bytes copied per second, or ``0.0`` for a dry run.
+        """
+        if self.dry_run or not self.elapsed:
+            return 0.0
+        return self.bytes / self.elapsed
+
+    @property
+    def files_per_second(self):
+        """File throughput of the synchronization.
+
+        :rtype: float
+        :returns: Files copied per second, or ``0.0`` for a dry run.
+        """
+        if self.dry_run or not self.elapsed:
+            return 0.0
+        return len(self.copied) / self.elapsed
+
+
+def sync_to_bucket(source_dir, bucket, prefix='', delete=False,
+                   checksum=False, dry_run=False, client=None,
+                   max_workers=None):
+    """Upload the changed files of a local directory tree to a bucket.
+
+    A file is uploaded when no blob exists for it, when the sizes differ,
+    or when the local file was modified after the blob was last updated.
+    If ``checksum`` is true, the MD5 hash of the local file is compared
+    instead of the modification time, for blobs which have one.
+
+    :type source_dir: str
+    :param source_dir: The local directory to upload.
+
+    :type bucket: :class:`~google.cloud.storage.bucket.Bucket`
+    :param bucket: The destination bucket.
+
+    :type prefix: str
+    :param prefix: (Optional) Prefix of the destination blob names; treated
+                   as a "directory", i.e. a trailing ``/`` is added if
+                   missing.
+
+    :type delete: bool
+    :param delete: (Optional) If true, delete blobs under ``prefix`` which
+                   have no corresponding local file.
+
+    :type checksum: bool
+    :param checksum: (Optional) If true, compare MD5 hashes rather than
+                     modification times.
+
+    :type dry_run: bool
+    :param dry_run: (Optional) If true, only report what would be done.
+
+    :type client: :class:`~google.cloud.storage.client.Client` or
+                  ``NoneType``
+    :param client: Optional. The client to use.  If not passed, falls back
+                   to the ``client`` stored on ``bucket``.
+
+    :type max_workers: int
+    :param max_workers: (Optional) The maximum number of concurrent
+                        transfers.
+
+    :rtype: :class:`SyncReport`
+    :returns: A summary of the changes.
+    """
+    start = time.time()
+    prefix = _normalize_prefix(prefix)
+    local_files = _list_local(source_dir)
+    blobs = _list_remote(bucket, prefix, client)
+
+    to_copy = []
+    for name in sorted(local_files):
+        path, size, mtime = local_files[name]
+        blob = blobs.get(name)
+        if (blob is None or blob.size != size or
+                _differs(path, mtime, blob, checksum,
+                         _utc_timestamp(blob.updated) < mtime)):
+            to_copy.append((name, path, size))
+    to_delete = []
+    if delete:
+        to_delete = sorted(set(blobs) - set(local_files))
+
+    def _upload(item):
+        name, path, size = item
+        bucket.blob(prefix + name).upload_from_filename(path, client=client)
+        return size
+
+    if not dry_run:
+        list(_map_concurrently(_upload, to_copy, max_workers=max_workers))
+        if to_delete:
+            bucket.delete_blobs(
+                [blobs[name] for name in to_delete],
+                on_error=lambda blob: None, client=client,
+                max_workers=max_workers)
+
+    return SyncReport(
+        copied=[name for name, _, _ in to_copy],
+        deleted=to_delete,
+        skipped=len(local_files) - len(to_copy),
+        bytes=sum(size for _, _, size in to_copy),
+        elapsed=time.time() - start,
+        dry_run=dry_run)
+
+
+def sync_from_bucket(bucket, destination_dir, prefix='', delete=False,
+                     checksum=False, dry_run=False, client=None,
+                     max_workers=None):
+    """Download the changed blobs under a prefix to a local directory tree.
+
+    A blob is downloaded when no local file exists for it, when the sizes
+    differ, or when the blob was updated after the local file was last
+    modified.  Downloaded files are stamped with the blob's ``updated``
+    time (see :meth:`~google.cloud.storage.blob.Blob.download_to_filename`),
+    so that unchanged files are skipped by the next synchronization.  If
+    ``checksum`` is true, the MD5 hash of the local file is compared
+    instead of the modification time, for blobs which have one.
+
+    :type bucket: :class:`~google.cloud.storage.bucket.Bucket`
+    :param bucket: The source bucket.
+
+    :type destination_dir: str
+    :param destination_dir: The local directory to download into; created
+                            if it does not exist.
+
+    :type prefix: str
+    :param prefix: (Optional) Prefix of the source blob names; treated
+                   as a "directory", i.e. a trailing ``/`` is added if
+                   missing.
+
+    :type delete: bool
+    :param delete: (Optional) If true, delete local files which have no
+                   corresponding blob under ``prefix``.
+
+    :type checksum: bool
+    :param checksum: (Optional) If true, compare MD5 hashes rather than
+                     modification times.
+
+    :type dry_run: bool
+    :param dry_run: (Optional) If true, only report what would be done.
+
+    :type client: :class:`~google.cloud.storage.client.Client` or
+                  ``NoneType``
+    :param client: Optional. The client to use.  If not passed, falls back
+                   to the ``client`` stored on ``bucket``.
+
+    :type max_workers: int
+    :param max_workers: (Optional) The maximum number of concurrent
+                        transfers.
+
+    :rtype: :class:`SyncReport`
+    :returns: A summary of the changes.
+
+    :raises: :class:`ValueError` if a blob name would resolve to a path
+             outside of ``destination_dir``.
+    """
+    start = time.time()
+    prefix = _normalize_prefix(prefix)
+    blobs = _list_remote(bucket, prefix, client)
+    local_files = _list_local(destination_dir)
+
+    to_copy = []
+    for name in sorted(blobs):
+        blob = blobs[name]
+        local = local_files.get(name)
+        if local is None:
+            to_copy.append((name, _local_path(destination_dir, name), blob))
+            continue
+        path, size, mtime = local
+        if blob.size != size or _differs(
+                path, mtime, blob, checksum, _local_timestamp(blob) > mtime):
+            to_copy.append((name, path, blob))
+    to_delete = []
+    if delete:
+        to_delete = sorted(set(local_files) - set(blobs))
+
+    def _download(item):
+        _, path, blob = item
+        _ensure_directory(os.path.dirname(path))
+        blob.download_to_filename(path, client=client)
+        return blob.size
+
+    if not dry_run:
+        list(_map_concurrently(_download, to_copy, max_workers=max_workers))
+        for name in to_delete:
+            os.remove(local_files[name][0])
+
+    return SyncReport(
+        copied=[name for name, _, _ in to_copy],
+        deleted=to_delete,
+        skipped=len(blobs) - len(to_copy),
+        bytes=sum(blob.size for _, _, blob in to_copy),
+        elapsed=time.time() - start,
+        dry_run=dry_run)
+
+
+def _normalize_prefix(prefix):
+    """Add a trailing ``/`` to a non-empty prefix.
+
+    :type prefix: str
+    :param prefix: A blob name prefix.
+
+    :rtype: str
+    :returns: The prefix, ending with ``/`` unless empty.
+    """
+    if prefix and not prefix.endswith('/'):
+        prefix += '/'
+    return prefix
+
+
+def _list_local(root):
+    """Map the files under a local directory by their relative path.
+
+    :type root: str
+    :param root: The local directory; need not exist.
+
+    :rtype: dict
+    :returns: Mapping of ``/``-separated relative path to a
+              ``(path, size, mtime)`` tuple.
+    """
+    files = {}
+    for dirpath, _, filenames in os.walk(root):
+        relative = os.path.relpath(dirpath, root)
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            stat = os.stat(path)
+            name = os.path.normpath(os.path.join(relative, filename))
+            files[name.replace(os.sep, '/')] = (
+                path, stat.st_size, stat.st_mtime)
+    return files
+
+
+def _list_remote(bucket, prefix, client):
+    """Map the blobs under a prefix by their name relative to the prefix.
+
+    Only the fields needed to compare blobs with local files are requested,
+    and "directory placeholder" blobs (whose names end with ``/``) are
+    ignored.
+
+    :type bucket: :class:`~google.cloud.storage.bucket.Bucket`
+    :param bucket: The bucket to list.
+
+    :type prefix: str
+    :param prefix: The normalized prefix.
+
+    :type client: :class:`~google.cloud.storage.client.Client` or
+                  ``NoneType``
+    :param client: The client to use.
+
+    :rtype: dict
+    :returns: Mapping of relative name to
+              :class:`~google.cloud.storage.blob.Blob`.
+    """
+    blobs = {}
+    for blob in bucket.list_blobs(prefix=prefix or None, fields=_LIST_FIELDS,
+                                  client=client):
+        if not blob.name.endswith('/'):
+            blobs[blob.name[len(prefix):]] = blob
+    return blobs
+
+
+def _local_path(root, name):
+    """Resolve a relative blob name to a path under a local directory.
+
+    :type root: str
+    :param root: The local directory.
+
+    :type name: str
+    :param name: A ``/``-separated name relative to the synchronized prefix.
+
+    :rtype: str
+    :returns: The local path.
+    :raises: :class:`ValueError` if the path is outside of ``root``.
+    """
+    path = os.path.normpath(os.path.join(root, *name.split('/')))
+    relative = os.path.relpath(path, root)
+    if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+        raise ValueError('Blob name escapes the destination directory', name)
+    return path
+
+
+def _differs(path, mtime, blob, checksum, newer):
+    """Decide whether a local file and a same-sized blob differ.
+
+    :type path: str
+    :param path: The local file.
+
+    :type mtime: float
+    :param mtime: The local file's modification time.
+
+    :type blob: :class:`~google.cloud.storage.blob.Blob`
+    :param blob: The blob, as returned by the listing.
+
+    :type checksum: bool
+    :param checksum: Whether to compare MD5 hashes.
+
+    :type newer: bool
+    :param newer: Whether the source side is newer than the destination.
+
+    :rtype: bool
+    :returns: Whether the file should be copied.
+    """
+    if checksum and blob.md5_hash is not None:
+        with open(path, 'rb') as file_obj:
+            return _bytes_to_unicode(_base64_md5hash(file_obj)) != (
+                blob.md5_hash)
+    return newer
+
+
+def _utc_timestamp(value):
+    """Convert a timezone-aware datetime to seconds since the epoch.
+
+    Keeps the fractional seconds, so that a file modified in the same
+    second as its upload, but before it, is not considered newer.
+
+    :type value: :class:`datetime.datetime`
+    :param value: The datetime to convert.
+
+    :rtype: float
+    :returns: The POSIX timestamp.
+    """
+    return calendar.timegm(value.utctimetuple()) + value.microsecond / 1e6
+
+
+def _local_timestamp(blob):
+    """Compute the modification time a download of ``blob`` is stamped with.
+
+    Mirrors :meth:`~google.cloud.storage.blob.Blob.download_to_filename`.
+
+    :type blob: :class:`~google.cloud.storage.blob.Blob`
+    :param blob: The blob, as returned by the listing.
+
+    :rtype: float
+    :returns: The modification time.
+    """
+    return time.mktime(blob.updated.timetuple())
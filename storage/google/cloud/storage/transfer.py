@@ -0,0 +1,348 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Upload or download many files concurrently.
+
+Transfers of small files are dominated by request latency.  A
+:class:`TransferManager` runs many of them at once on a pool of worker
+threads; each worker reuses its own persistent connection (see
+:class:`~google.cloud.storage._http.Connection`), so throughput grows with
+the number of workers rather than being bound by the round-trip time:
+
+.. code-block:: python
+
+  >>> from google.cloud import storage
+  >>> from google.cloud.storage.transfer import TransferManager
+  >>> client = storage.Client()
+  >>> bucket = client.bucket('my-bucket')
+  >>> pairs = [(path, bucket.blob(os.path.basename(path)))
+  ...          for path in paths]
+  >>> manager = TransferManager(client, max_workers=32)
+  >>> failed = [result for result in manager.upload(pairs)
+  ...           if result.error is not None]
+  >>> manager.stats.files_per_second
+  412.5
+"""
+
+import collections
+import functools
+import os
+import random
+import socket
+import threading
+import time
+
+import httplib2
+from six.moves import http_client
+
+from google.cloud._helpers import _map_concurrently
+from google.cloud.exceptions import ServerError
+from google.cloud.exceptions import TooManyRequests
+from google.cloud.streaming.exceptions import HttpError
+
+
+_DEFAULT_NUM_RETRIES = 3
+_DEFAULT_RETRY_DELAY = 1.0
+_MAX_RETRY_DELAY = 30.0
+_TOO_MANY_REQUESTS = 429
+
+_RETRYABLE_ERRORS = (
+    ServerError,
+    TooManyRequests,
+    http_client.HTTPException,
+    httplib2.HttpLib2Error,
+    socket.error,
+    socket.timeout,
+)
+
+
+class TransferResult(collections.namedtuple(
+        'TransferResult', 'path blob bytes attempts error')):
+    """The outcome of transferring one file.
+
+    :type path: str
+    :param path: The local file.
+
+    :type blob: :class:`~google.cloud.storage.blob.Blob`
+    :param blob: The blob uploaded or downloaded; its properties are
+                 updated by uploads.
+
+    :type bytes: int
+    :param bytes: The size of the file, or ``None`` if the transfer failed.
+
+    :type attempts: int
+    :param attempts: The number of attempts made.
+
+    :type error: Exception
+    :param error: The error which stopped the transfer, or ``None`` if it
+                  succeeded.
+    """
+
+
+class TransferStats(collections.namedtuple(
+        'TransferStats', 'files bytes failures retries elapsed')):
+    """Aggregate statistics of a :class:`TransferManager`.
+
+    :type files: int
+    :param files: Number of files transferred.
+
+    :type bytes: int
+    :param bytes: Number of bytes transferred.
+
+    :type failures: int
+    :param failures: Number of files which could not be transferred.
+
+    :type retries: int
+    :param retries: Number of attempts which were retried.
+
+    :type elapsed: float
+    :param elapsed: Wall-clock seconds spent in :meth:`~.upload` and
+                    :meth:`~.download` calls.
+    """
+
+    @property
+    def bytes_per_second(self):
+        """Transfer throughput.
+
+        :rtype: float
+        :returns: Bytes transferred per second.
+        """
+        if not self.elapsed:
+            return 0.0
+        return self.bytes / self.elapsed
+
+    @property
+    def files_per_second(self):
+        """File throughput.
+
+        :rtype: float
+        :returns: Files transferred per second.
+        """
+        if not self.elapsed:
+            return 0.0
+        return self.files / self.elapsed
+
+
+class TransferManager(object):
+    """Upload or download many files concurrently, retrying failures.
+
+    A failed transfer is retried if its error is transient (a server error,
+    rate limiting, or a network error), after an exponential, jittered
+    delay.  Other errors, and errors persisting once the retries are
+    exhausted, are reported in the transfer's :class:`TransferResult`
+    without stopping the other transfers.
+
+    :type client: :class:`~google.cloud.storage.client.Client` or
+                  ``NoneType``
+    :param client: Optional. The client to use.  If not passed, each
+                   transfer falls back to the ``client`` stored on the
+                   blob's bucket.
+
+    :type max_workers: int
+    :param max_workers: (Optional) The maximum number of concurrent
+                        transfers.
+
+    :type num_retries: int
+    :param num_retries: (Optional) The number of times a transfer is
+                        retried after a transient error.
+
+    :type retry_delay: float
+    :param retry_delay: (Optional) The delay, in seconds, before the first
+                        retry; doubled for each further retry, up to 30
+                        seconds, and randomized by up to 50%.
+
+    :type progress_callback: callable
+    :param progress_callback: (Optional) Called with the
+                              :class:`TransferStats` after each file.
+                              Calls are serialized.
+    """
+
+    def __init__(self, client=None, max_workers=None,
+                 num_retries=_DEFAULT_NUM_RETRIES,
+                 retry_delay=_DEFAULT_RETRY_DELAY, progress_callback=None):
+        self._client = client
+        self._max_workers = max_workers
+        self._num_retries = num_retries
+        self._retry_delay = retry_delay
+        self._progress_callback = progress_callback
+        self._lock = threading.Lock()
+        self._stats = TransferStats(0, 0, 0, 0, 0.0)
+
+    @property
+    def stats(self):
+        """Aggregate statistics of the transfers run so far.
+
+        :rtype: :class:`TransferStats`
+        :returns: The totals, over all calls of this manager.
+        """
+        return self._stats
+
+    def upload(self, pairs, **kwargs):
+        """Upload each file to its blob.
+
+        :type pairs: iterable
+        :param pairs: ``(path, blob)`` tuples, with the local path of the
+                      file and the :class:`~google.cloud.storage.blob.Blob`
+                      to upload it to.
+
+        :type kwargs: dict
+        :param kwargs: (Optional) Passed to each
+                       :meth:`~google.cloud.storage.blob.Blob.\\
+                       upload_from_filename` call, e.g. ``content_type``.
+
+        :rtype: list
+        :returns: A :class:`TransferResult` for each pair, in order.
+        """
+        def _upload(path, blob):
+            size = os.path.getsize(path)
+            blob.upload_from_filename(path, client=self._client, **kwargs)
+            return size
+
+        return self._run(_upload, pairs)
+
+    def download(self, pairs, **kwargs):
+        """Download each blob to its file.
+
+        Missing parent directories of the files are created.
+
+        :type pairs: iterable
+        :param pairs: ``(path, blob)`` tuples, with the local path of the
+                      file and the :class:`~google.cloud.storage.blob.Blob`
+                      to download into it.
+
+        :type kwargs: dict
+        :param kwargs: (Optional) Passed to each
+                       :meth:`~google.cloud.storage.blob.Blob.\\
+                       download_to_filename` call.
+
+        :rtype: list
+        :returns: A :class:`TransferResult` for each pair, in order.
+        """
+        def _download(path, blob):
+            _ensure_directory(os.path.dirname(path))
+            blob.download_to_filename(path, client=self._client, **kwargs)
+            return os.path.getsize(path)
+
+        return self._run(_download, pairs)
+
+    def _run(self, transfer, pairs):
+        """Run transfers concurrently, timing them.
+
+        :type transfer: callable
+        :param transfer: Takes a path and a blob, and returns the number of
+                         bytes transferred.
+
+        :type pairs: iterable
+        :param pairs: ``(path, blob)`` tuples.
+
+        :rtype: list
+        :returns: A :class:`TransferResult` for each pair, in order.
+        """
+        start = time.time()
+        try:
+            return list(_map_concurrently(
+                functools.partial(self._transfer_one, transfer), pairs,
+                max_workers=self._max_workers))
+        finally:
+            with self._lock:
+                self._stats = self._stats._replace(
+                    elapsed=self._stats.elapsed + time.time() - start)
+
+    def _transfer_one(self, transfer, pair):
+        """Transfer one file, retrying transient errors.
+
+        :type transfer: callable
+        :param transfer: Takes a path and a blob, and returns the number of
+                         bytes transferred.
+
+        :type pair: tuple
+        :param pair: ``(path, blob)``.
+
+        :rtype: :class:`TransferResult`
+        :returns: The outcome of the transfer.
+        """
+        path, blob = pair
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                num_bytes = transfer(path, blob)
+            except Exception as exc:  # pylint: disable=broad-except
+                if attempts > self._num_retries or not _is_retryable(exc):
+                    self._record(failures=1)
+                    return TransferResult(path, blob, None, attempts, exc)
+                self._record(retries=1)
+                time.sleep(self._backoff(attempts))
+                continue
+            self._record(files=1, bytes=num_bytes)
+            return TransferResult(path, blob, num_bytes, attempts, None)
+
+    def _backoff(self, attempts):
+        """Compute the delay before a retry.
+
+        :type attempts: int
+        :param attempts: The number of attempts made so far.
+
+        :rtype: float
+        :returns: The delay, in seconds.
+        """
+        delay = min(self._retry_delay * 2 ** (attempts - 1), _MAX_RETRY_DELAY)
+        return delay * random.uniform(0.5, 1.0)
+
+    def _record(self, **counts):
+        """Add to the aggregate statistics, and report them.
+
+        :type counts: dict
+        :param counts: Increments of :class:`TransferStats` fields.
+        """
+        with self._lock:
+            self._stats = self._stats._replace(**dict(
+                (field, getattr(self._stats, field) + count)
+                for field, count in counts.items()))
+            if (self._progress_callback is not None and
+                    'retries' not in counts):
+                self._progress_callback(self._stats)
+
+
+def _is_retryable(exc):
+    """Decide whether a transfer error is transient.
+
+    :type exc: Exception
+    :param exc: The error raised by a transfer.
+
+    :rtype: bool
+    :returns: True for server errors, rate limiting and network errors.
+    """
+    if isinstance(exc, HttpError):
+        # Raised by resumable uploads.
+        return (exc.status_code == _TOO_MANY_REQUESTS or
+                exc.status_code >= http_client.INTERNAL_SERVER_ERROR)
+    if isinstance(exc, EnvironmentError) and exc.filename is not None:
+        return False  # An error with the local file.
+    return isinstance(exc, _RETRYABLE_ERRORS)
+
+
+def _ensure_directory(directory):
+    """Create a directory and its parents, if missing.
+
+    :type directory: str
+    :param directory: The directory; may be empty, for the current one.
+    """
+    if directory and not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError:
+            # Another worker may have created it concurrently.
+            if not os.path.isdir(directory):
+                raise
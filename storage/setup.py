@@ -53,6 +53,10 @@ REQUIREMENTS = [
     'google-cloud-core >= 0.22.1, < 0.23dev',
 ]
 
+EXTRAS_REQUIREMENTS = {
+    ':python_version<"3.2"': ['futures >= 3.0.0'],
+}
+
 setup(
     name='google-cloud-storage',
     version='0.22.0',
@@ -64,5 +68,6 @@ setup(
     ],
     packages=find_packages(),
     install_requires=REQUIREMENTS,
+    extras_require=EXTRAS_REQUIREMENTS,
     **SETUP_BASE
 )
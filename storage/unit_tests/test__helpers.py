@@ -176,6 +176,223 @@ class Test__base64_md5hash(unittest.TestCase):
         self.assertEqual(MD5.hash_obj._blocks, [BYTES_TO_SIGN])
 
 
+class Test_GzipReader(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.storage._helpers import _GzipReader
+
+        return _GzipReader
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    @staticmethod
+    def _gunzip(data):
+        import zlib
+
+        return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+
+    def test_read_all(self):
+        from io import BytesIO
+
+        data = b'abc' * 1000
+        reader = self._make_one(BytesIO(data))
+        compressed = reader.read()
+        self.assertLess(len(compressed), len(data))
+        self.assertEqual(self._gunzip(compressed), data)
+        self.assertEqual(reader.tell(), len(compressed))
+        self.assertEqual(reader.read(), b'')
+        self.assertFalse(reader.seekable())
+
+    def test_read_in_chunks_bounded(self):
+        from io import BytesIO
+
+        import mock
+
+        data = bytes(bytearray(range(256))) * 1024
+        source = BytesIO(data)
+        reader = self._make_one(source, compresslevel=0)
+
+        with mock.patch('google.cloud.storage._helpers._GZIP_BLOCK_SIZE',
+                        new=1024):
+            first = reader.read(100)
+            # Only as much input as needed was compressed for the read.
+            self.assertLess(source.tell(), len(data) // 4)
+            chunks = [first]
+            while True:
+                chunk = reader.read(5000)
+                chunks.append(chunk)
+                if len(chunk) < 5000:
+                    break
+
+        self.assertEqual(len(first), 100)
+        self.assertEqual(self._gunzip(b''.join(chunks)), data)
+        self.assertEqual(reader.tell(), len(b''.join(chunks)))
+
+    def test_read_w_size(self):
+        from io import BytesIO
+
+        reader = self._make_one(BytesIO(b'abcdef'), size=4)
+        self.assertEqual(self._gunzip(reader.read(None)), b'abcd')
+
+    def test_seek_into_last_chunk(self):
+        from io import BytesIO
+
+        data = b'0123456789' * 100
+        reader = self._make_one(BytesIO(data), compresslevel=0)
+        first = reader.read(50)
+        second = reader.read(50)
+
+        reader.seek(70)
+        self.assertEqual(reader.tell(), 70)
+        rest = reader.read()
+        self.assertEqual(rest[:30], second[20:])
+        self.assertEqual(self._gunzip(first + second[:20] + rest), data)
+
+    def test_seek_outside_last_chunk(self):
+        import io
+
+        reader = self._make_one(io.BytesIO(b'0123456789' * 100))
+        reader.read(10)
+        reader.read(10)
+        with self.assertRaises(ValueError):
+            reader.seek(5)
+        with self.assertRaises(ValueError):
+            reader.seek(25)
+        with self.assertRaises(ValueError):
+            reader.seek(0, io.SEEK_END)
+        reader.seek(20)
+        reader.seek(10)
+        self.assertEqual(reader.tell(), 10)
+
+
+class Test_GunzipWriter(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.storage._helpers import _GunzipWriter
+
+        return _GunzipWriter
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    @staticmethod
+    def _gzip(data):
+        import zlib
+
+        compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress(data) + compressor.flush()
+
+    def test_write_in_chunks(self):
+        from io import BytesIO
+
+        data = b'0123456789' * 1000
+        compressed = self._gzip(data)
+        stream = BytesIO()
+        writer = self._make_one(stream)
+        for start in range(0, len(compressed), 7):
+            writer.write(compressed[start:start + 7])
+        writer.write(b'')
+        writer.close()
+        self.assertEqual(stream.getvalue(), data)
+        self.assertFalse(stream.closed)
+
+    def test_write_bounded_blocks(self):
+        from io import BytesIO
+
+        import mock
+
+        data = b'\0' * 100000
+        stream = BytesIO()
+        written = []
+        stream.write = lambda chunk: written.append(len(chunk))
+        writer = self._make_one(stream)
+
+        with mock.patch('google.cloud.storage._helpers._GZIP_BLOCK_SIZE',
+                        new=4096):
+            writer.write(self._gzip(data))
+            writer.close()
+
+        self.assertEqual(sum(written), len(data))
+        self.assertLessEqual(max(written), 4096)
+
+    def test_write_concatenated_members(self):
+        from io import BytesIO
+
+        first = self._gzip(b'abc')
+        second = self._gzip(b'def')
+        stream = BytesIO()
+        writer = self._make_one(stream)
+        writer.write(first + second[:5])
+        writer.write(second[5:])
+        writer.write(self._gzip(b'ghi'))
+        writer.close()
+        self.assertEqual(stream.getvalue(), b'abcdefghi')
+
+    def test_close_truncated(self):
+        from io import BytesIO
+
+        stream = BytesIO()
+        writer = self._make_one(stream)
+        writer.write(self._gzip(b'abc' * 100)[:-4])
+        with self.assertRaises(ValueError):
+            writer.close()
+
+
+class Test__EncodedHTTPConnection(unittest.TestCase):
+
+    def _get_target_classes(self):
+        import httplib2
+        from google.cloud.storage._helpers import _EncodedHTTPConnection
+        from google.cloud.storage._helpers import _EncodedHTTPSConnection
+
+        return [(_EncodedHTTPConnection, httplib2.HTTPConnectionWithTimeout),
+                (_EncodedHTTPSConnection,
+                 httplib2.HTTPSConnectionWithTimeout)]
+
+    def test_getresponse_hides_content_encoding(self):
+        import mock
+
+        for klass, base in self._get_target_classes():
+            response = _HTTPResponse({'content-encoding': 'gzip',
+                                      'content-range': 'bytes 5-9/100'})
+            connection = klass('example.com')
+            with mock.patch.object(base, 'getresponse',
+                                   return_value=response):
+                self.assertIs(connection.getresponse(), response)
+            self.assertEqual(response.msg, {'content-range': 'bytes 5-9/100'})
+
+
+class Test_EncodedHttp(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.storage._helpers import _EncodedHttp
+
+        return _EncodedHttp
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_request(self):
+        from google.cloud.storage._helpers import _EncodedHTTPSConnection
+        from google.cloud.streaming.http_wrapper import Request
+        from google.cloud.streaming.http_wrapper import make_api_request
+
+        http = _HTTP(({'status': '206'}, b'\x1f\x8b'))
+        encoded_http = self._make_one(http)
+
+        response = make_api_request(
+            encoded_http, Request('https://example.com/media', 'GET'))
+
+        self.assertEqual(response.content, b'\x1f\x8b')
+        (args, kwargs), = http._requested
+        self.assertEqual(args, ('https://example.com/media',))
+        self.assertIs(kwargs['connection_type'], _EncodedHTTPSConnection)
+
+
 class _Connection(object):
 
     def __init__(self, *responses):
@@ -228,3 +445,21 @@ class _Client(object):
 
     def __init__(self, connection):
         self._connection = connection
+
+
+class _HTTPResponse(object):
+
+    def __init__(self, headers):
+        self.msg = headers
+
+
+class _HTTP(object):
+
+    def __init__(self, *responses):
+        self._responses = responses
+        self._requested = []
+
+    def request(self, *args, **kwargs):
+        self._requested.append((args, kwargs))
+        response, self._responses = self._responses[0], self._responses[1:]
+        return response
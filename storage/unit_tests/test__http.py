@@ -48,3 +48,52 @@ class TestConnection(unittest.TestCase):
                          '/'.join(['', 'storage', conn.API_VERSION, 'foo']))
         parms = dict(parse_qsl(qs))
         self.assertEqual(parms['bar'], 'baz')
+
+    def test_http_w_explicit_http(self):
+        http = object()
+        conn = self._make_one(http=http)
+        self.assertIs(conn.http, http)
+
+    def test_http_wo_credentials(self):
+        import httplib2
+
+        conn = self._make_one()
+        http = conn.http
+        self.assertIsInstance(http, httplib2.Http)
+        self.assertIs(conn.http, http)
+
+    def test_http_w_credentials(self):
+        import google.auth.credentials
+        import google_auth_httplib2
+        import mock
+
+        credentials = mock.Mock(spec=google.auth.credentials.Credentials)
+        conn = self._make_one(credentials=credentials)
+        http = conn.http
+        self.assertIsInstance(http, google_auth_httplib2.AuthorizedHttp)
+        self.assertIs(http.credentials, credentials)
+
+    def test_http_per_thread(self):
+        import threading
+
+        conn = self._make_one()
+        found = []
+        thread = threading.Thread(target=lambda: found.append(conn.http))
+        thread.start()
+        thread.join()
+        self.assertIsNot(found[0], conn.http)
+
+    def test_make_encoded_http(self):
+        import httplib2
+        from google.cloud.storage._helpers import _EncodedHttp
+
+        conn = self._make_one()
+        encoded_http = conn._make_encoded_http()
+        self.assertIsInstance(encoded_http, _EncodedHttp)
+        self.assertIsInstance(encoded_http._http, httplib2.Http)
+        self.assertIsNot(encoded_http._http, conn.http)
+        self.assertIsNot(conn._make_encoded_http()._http, encoded_http._http)
+
+    def test_make_encoded_http_w_explicit_http(self):
+        conn = self._make_one(http=object())
+        self.assertIsNone(conn._make_encoded_http())
@@ -76,6 +76,33 @@ class TestMIMEApplicationHTTP(unittest.TestCase):
         self.assertEqual(mah.get_payload().splitlines(), LINES)
 
 
+class Test__encode_subrequest(unittest.TestCase):
+
+    def _call_fut(self, method, uri, headers, body):
+        from google.cloud.storage.batch import _encode_subrequest
+
+        return _encode_subrequest(method, uri, headers, body)
+
+    def test_matches_mime_application_http(self):
+        from email.generator import Generator
+        from six.moves import StringIO
+        from google.cloud.storage.batch import MIMEApplicationHTTP
+
+        for body in (None, 'ABC', {'foo': 'bar'}):
+            headers = {'Content-Length': 3, 'X-Custom': 'yes'}
+            buf = StringIO()
+            Generator(buf, False, 0).flatten(MIMEApplicationHTTP(
+                'POST', '/path/to/api', dict(headers), body))
+            result = self._call_fut('POST', '/path/to/api', headers, body)
+            self.assertEqual(result, buf.getvalue())
+            # The caller's headers are left alone.
+            self.assertEqual(headers, {'Content-Length': 3, 'X-Custom': 'yes'})
+
+    def test_bytes_body(self):
+        result = self._call_fut('PUT', '/path', {}, b'DATA')
+        self.assertTrue(result.endswith('PUT /path HTTP/1.1\n\nDATA'))
+
+
 class TestBatch(unittest.TestCase):
 
     @staticmethod
@@ -376,6 +403,46 @@ class TestBatch(unittest.TestCase):
         self._check_subrequest_payload(chunks[0], 'GET', URL, {})
         self._check_subrequest_payload(chunks[1], 'GET', URL, {})
 
+    def test_finish_nonempty_with_status_failure_wo_raise(self):
+        import httplib2
+
+        URL = 'http://api.example.com/other_api'
+        expected = _Response()
+        expected['content-type'] = 'multipart/mixed; boundary="DEADBEEF="'
+        http = _HTTP((expected, _TWO_PART_MIME_RESPONSE_WITH_FAIL))
+        connection = _Connection(http=http)
+        client = _Client(connection)
+        batch = self._make_one(client, raise_exception=False)
+        batch.API_BASE_URL = 'http://api.example.com'
+        target1 = _MockObject()
+        target2 = _MockObject()
+        batch._do_request('GET', URL, {}, None, target1)
+        batch._do_request('GET', URL, {}, None, target2)
+        target2_future_before = target2._properties
+
+        result = batch.finish()
+
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result[1][0], httplib2.Response({
+            'content-length': '35',
+            'content-type': 'application/json; charset=UTF-8',
+            'status': '404',
+        }))
+        self.assertEqual(target1._properties, {'foo': 1, 'bar': 2})
+        self.assertIs(target2._properties, target2_future_before)
+
+    def test_finish_batch_request_failure(self):
+        from google.cloud.exceptions import Forbidden
+
+        URL = 'http://api.example.com/other_api'
+        expected = _Response(status=403)
+        http = _HTTP((expected, b'{"error": {"message": "Nope"}}'))
+        connection = _Connection(http=http)
+        client = _Client(connection)
+        batch = self._make_one(client)
+        batch._do_request('GET', URL, {}, None, None)
+        self.assertRaises(Forbidden, batch.finish)
+
     def test_finish_nonempty_non_multipart_response(self):
         URL = 'http://api.example.com/other_api'
         expected = _Response()
@@ -466,6 +533,101 @@ class TestBatch(unittest.TestCase):
         self.assertIsInstance(target3._properties, _FutureDict)
 
 
+class Test__run_batched(unittest.TestCase):
+
+    def _call_fut(self, client, items, request_func, max_workers=None):
+        from google.cloud.storage.batch import _run_batched
+
+        return _run_batched(client, items, request_func,
+                            max_workers=max_workers)
+
+    @staticmethod
+    def _make_client(http):
+        from google.cloud.storage.client import Client
+
+        client = Client(project='PROJECT', credentials=_make_credentials())
+        client._base_connection._http = http
+        return client
+
+    @staticmethod
+    def _get_request(item, client):
+        target = _MockObject()
+        client._connection.api_request(
+            method='GET', path='/b/%s' % (item,), _target_object=target)
+        return target
+
+    def test_empty(self):
+        http = _HTTP()
+        client = self._make_client(http)
+        results = self._call_fut(client, [], self._get_request)
+        self.assertEqual(list(results), [])
+        self.assertEqual(http._requests, [])
+
+    def test_per_item_results(self):
+        from google.cloud.exceptions import NotFound
+
+        expected = _Response()
+        expected['content-type'] = 'multipart/mixed; boundary="DEADBEEF="'
+        http = _HTTP((expected, _TWO_PART_MIME_RESPONSE_WITH_FAIL))
+        client = self._make_client(http)
+
+        results = list(self._call_fut(client, ['a', 'b'], self._get_request))
+
+        self.assertEqual(len(http._requests), 1)
+        first, second = results
+        self.assertEqual(first.item, 'a')
+        self.assertEqual(first.value._properties, {'foo': 1, 'bar': 2})
+        self.assertIsNone(first.error)
+        self.assertEqual(second.item, 'b')
+        self.assertIsNone(second.value)
+        self.assertIsInstance(second.error, NotFound)
+        self.assertIn('/b/b', second.error.message)
+        self.assertEqual(list(client._batch_stack), [])
+
+    def test_batch_failure(self):
+        from google.cloud.exceptions import ServiceUnavailable
+
+        http = _HTTP((_Response(status=503), b''))
+        client = self._make_client(http)
+
+        results = list(self._call_fut(client, ['a', 'b'], self._get_request))
+
+        self.assertEqual([result.item for result in results], ['a', 'b'])
+        self.assertEqual([result.value for result in results], [None, None])
+        for result in results:
+            self.assertIsInstance(result.error, ServiceUnavailable)
+
+    def test_items_wo_requests(self):
+        http = _HTTP()
+        client = self._make_client(http)
+
+        results = list(self._call_fut(
+            client, ['a'], lambda item, client: item.upper()))
+
+        self.assertEqual(http._requests, [])
+        self.assertEqual(results[0].value, 'A')
+        self.assertIsNone(results[0].error)
+
+    def test_splits_batches(self):
+        import mock
+
+        chunks = []
+
+        def _finish_chunk(client, chunk, request_func):
+            chunks.append(chunk)
+            return [chunk[0]] * len(chunk)
+
+        with mock.patch('google.cloud.storage.batch.Batch._MAX_BATCH_SIZE',
+                        new=2):
+            with mock.patch('google.cloud.storage.batch._finish_chunk',
+                            new=_finish_chunk):
+                results = list(self._call_fut(
+                    None, range(5), None, max_workers=1))
+
+        self.assertEqual(chunks, [[0, 1], [2, 3], [4]])
+        self.assertEqual(results, [0, 0, 2, 2, 4])
+
+
 class Test__unpack_batch_response(unittest.TestCase):
 
     def _call_fut(self, response, content):
@@ -502,6 +664,75 @@ class Test__unpack_batch_response(unittest.TestCase):
         CONTENT = _THREE_PART_MIME_RESPONSE.decode('utf-8')
         self._unpack_helper(RESPONSE, CONTENT)
 
+    def test_crlf(self):
+        RESPONSE = {'content-type': 'multipart/mixed; boundary="DEADBEEF="'}
+        CONTENT = _THREE_PART_MIME_RESPONSE.replace(b'\n', b'\r\n')
+        self._unpack_helper(RESPONSE, CONTENT)
+
+    def test_preamble_and_unquoted_boundary(self):
+        RESPONSE = {'content-type': 'multipart/mixed; charset=UTF-8; '
+                                    'BOUNDARY=DEADBEEF='}
+        CONTENT = b'This is a preamble.\n' + _THREE_PART_MIME_RESPONSE
+        self._unpack_helper(RESPONSE, CONTENT)
+
+    def test_not_multipart(self):
+        RESPONSE = {'content-type': 'text/plain'}
+        result = self._call_fut(RESPONSE, b'NOT A MIME RESPONSE')
+        self.assertRaises(ValueError, list, result)
+
+    def test_multipart_wo_boundary(self):
+        RESPONSE = {'content-type': 'multipart/mixed'}
+        result = self._call_fut(RESPONSE, _THREE_PART_MIME_RESPONSE)
+        self.assertRaises(ValueError, list, result)
+
+    def test_boundary_not_found(self):
+        RESPONSE = {'content-type': 'multipart/mixed; boundary="OTHER"'}
+        result = self._call_fut(RESPONSE, _THREE_PART_MIME_RESPONSE)
+        self.assertRaises(ValueError, list, result)
+
+    def test_unterminated(self):
+        import httplib2
+
+        RESPONSE = {'content-type': 'multipart/mixed; boundary="XX"'}
+        CONTENT = (b'--XX\n'
+                   b'\n'
+                   b'HTTP/1.1 200 OK\n'
+                   b'Content-Type: text/plain;\n'
+                   b'  charset=UTF-8\n'
+                   b'\n'
+                   b'hello')
+        result = list(self._call_fut(RESPONSE, CONTENT))
+        response = httplib2.Response({
+            'content-type': 'text/plain; charset=UTF-8',
+            'status': '200',
+        })
+        self.assertEqual(result, [(response, 'hello')])
+
+    def test_part_wo_headers_crlf(self):
+        import httplib2
+
+        RESPONSE = {'content-type': 'multipart/mixed; boundary="XX"'}
+        CONTENT = (b'--XX\r\n'
+                   b'\r\n'
+                   b'HTTP/1.1 204 No Content\r\n'
+                   b'\r\n'
+                   b'\r\n'
+                   b'--XX--\r\n')
+        result = list(self._call_fut(RESPONSE, CONTENT))
+        self.assertEqual(result, [(httplib2.Response({'status': '204'}), '')])
+
+    def test_truncated_after_delimiter(self):
+        import httplib2
+
+        RESPONSE = {'content-type': 'multipart/mixed; boundary="XX"'}
+        CONTENT = (b'--XX\n'
+                   b'Content-Type: application/http\n'
+                   b'\n'
+                   b'HTTP/1.1 204 No Content\n'
+                   b'--XX')
+        result = list(self._call_fut(RESPONSE, CONTENT))
+        self.assertEqual(result, [(httplib2.Response({'status': '204'}), '')])
+
 
 _TWO_PART_MIME_RESPONSE_WITH_FAIL = b"""\
 --DEADBEEF=
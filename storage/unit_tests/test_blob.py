@@ -357,6 +357,127 @@ class Test_Blob(unittest.TestCase):
     def test_download_to_file_with_chunk_size(self):
         self._download_to_file_helper(chunk_size=3)
 
+    def test_download_to_file_decompress_gzip_data(self):
+        from io import BytesIO
+        import zlib
+
+        from six.moves.http_client import OK
+        from six.moves.http_client import PARTIAL_CONTENT
+
+        DATA = b'0123456789' * 100
+        compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        COMPRESSED = compressor.compress(DATA) + compressor.flush()
+        half = len(COMPRESSED) // 2
+        size = len(COMPRESSED)
+        chunk1_response = {'status': PARTIAL_CONTENT,
+                           'content-range': 'bytes 0-%d/%d' % (half - 1, size)}
+        chunk2_response = {'status': OK,
+                           'content-range': 'bytes %d-%d/%d' % (
+                               half, size - 1, size)}
+        connection = _Connection(
+            (chunk1_response, COMPRESSED[:half]),
+            (chunk2_response, COMPRESSED[half:]),
+        )
+        client = _Client(connection)
+        bucket = _Bucket(client)
+        properties = {'mediaLink': 'http://example.com/media/'}
+        blob = self._make_one('blob-name', bucket=bucket,
+                              properties=properties)
+        blob._CHUNK_SIZE_MULTIPLE = 1
+        blob.chunk_size = half
+        fh = BytesIO()
+        blob.download_to_file(fh, decompress=True)
+        self.assertEqual(fh.getvalue(), DATA)
+        rq = connection.http._requested
+        self.assertNotIn('Accept-Encoding', rq[0]['headers'])
+
+    def test_download_to_file_decompress_content_encoding(self):
+        from io import BytesIO
+        import zlib
+
+        from six.moves.http_client import OK
+        from six.moves.http_client import PARTIAL_CONTENT
+
+        DATA = b'0123456789' * 100
+        compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        COMPRESSED = compressor.compress(DATA) + compressor.flush()
+        half = len(COMPRESSED) // 2
+        size = len(COMPRESSED)
+        chunk1_response = {'status': PARTIAL_CONTENT,
+                           'content-range': 'bytes 0-%d/%d' % (half - 1, size)}
+        chunk2_response = {'status': OK,
+                           'content-range': 'bytes %d-%d/%d' % (
+                               half, size - 1, size)}
+        connection = _Connection()
+        encoded_http = connection._encoded_http = _HTTP(
+            (chunk1_response, COMPRESSED[:half]),
+            (chunk2_response, COMPRESSED[half:]),
+        )
+        client = _Client(connection)
+        bucket = _Bucket(client)
+        properties = {'mediaLink': 'http://example.com/media/',
+                      'contentEncoding': 'gzip'}
+        blob = self._make_one('blob-name', bucket=bucket,
+                              properties=properties)
+        blob._CHUNK_SIZE_MULTIPLE = 1
+        blob.chunk_size = half
+        fh = BytesIO()
+        blob.download_to_file(fh, decompress=True)
+        self.assertEqual(fh.getvalue(), DATA)
+        self.assertEqual(connection.http._requested, [])
+        rq = encoded_http._requested
+        self.assertEqual(len(rq), 2)
+        for request in rq:
+            self.assertEqual(request['headers']['Accept-Encoding'], 'gzip')
+        self.assertEqual(rq[1]['headers']['range'],
+                         'bytes=%d-%d' % (half, 2 * half - 1))
+
+    def test_download_to_file_decompress_content_encoding_w_http(self):
+        from io import BytesIO
+        from six.moves.http_client import OK
+
+        # With the client's own ``http`` object, the server decompresses
+        # the blob, ignoring the range: it is sent whole.
+        connection = _Connection(({'status': OK}, b'abcdef'))
+        client = _Client(connection)
+        bucket = _Bucket(client)
+        properties = {'mediaLink': 'http://example.com/media/',
+                      'contentEncoding': 'gzip'}
+        blob = self._make_one('blob-name', bucket=bucket,
+                              properties=properties)
+        fh = BytesIO()
+        blob.download_to_file(fh, decompress=True)
+        self.assertEqual(fh.getvalue(), b'abcdef')
+        rq = connection.http._requested
+        self.assertEqual(len(rq), 1)
+        self.assertEqual(rq[0]['headers']['Accept-Encoding'], 'identity')
+
+    def test_download_to_file_w_progress_callback(self):
+        from io import BytesIO
+        from six.moves.http_client import OK
+        from six.moves.http_client import PARTIAL_CONTENT
+
+        connection = _Connection(
+            ({'status': PARTIAL_CONTENT, 'content-range': 'bytes 0-2/6'},
+             b'abc'),
+            ({'status': OK, 'content-range': 'bytes 3-5/6'}, b'def'),
+        )
+        client = _Client(connection)
+        bucket = _Bucket(client)
+        properties = {'mediaLink': 'http://example.com/media/'}
+        blob = self._make_one('blob-name', bucket=bucket,
+                              properties=properties)
+        blob._CHUNK_SIZE_MULTIPLE = 1
+        blob.chunk_size = 3
+        reported = []
+        fh = BytesIO()
+        blob.download_to_file(fh, progress_callback=reported.append,
+                              adaptive_chunksize=True)
+        self.assertEqual(fh.getvalue(), b'abcdef')
+        self.assertEqual(
+            [(progress.bytes_transferred, progress.total_bytes)
+             for progress in reported], [(3, 6), (6, 6)])
+
     def test_download_to_filename(self):
         import os
         import time
@@ -461,6 +582,48 @@ class Test_Blob(unittest.TestCase):
         fetched = blob.download_as_string()
         self.assertEqual(fetched, b'abcdef')
 
+    def test_download_as_string_w_limiter(self):
+        from six.moves.http_client import OK
+        from six.moves.http_client import PARTIAL_CONTENT
+
+        connection = _Connection(
+            ({'status': PARTIAL_CONTENT, 'content-range': 'bytes 0-2/6'},
+             b'abc'),
+            ({'status': OK, 'content-range': 'bytes 3-5/6'}, b'def'),
+        )
+        client = _Client(connection)
+        bucket = _Bucket(client)
+        properties = {'mediaLink': 'http://example.com/media/'}
+        blob = self._make_one('blob-name', bucket=bucket,
+                              properties=properties)
+        blob._CHUNK_SIZE_MULTIPLE = 1
+        blob.chunk_size = 3
+        limiter = _Limiter()
+
+        fetched = blob.download_as_string(limiter=limiter, priority=2)
+
+        self.assertEqual(fetched, b'abcdef')
+        self.assertEqual(limiter._acquired, [(3, 2), (3, 2)])
+
+    def test_download_to_filename_w_limiter(self):
+        from six.moves.http_client import OK
+        from google.cloud._testing import _NamedTemporaryFile
+
+        connection = _Connection(
+            ({'status': OK, 'content-range': 'bytes 0-5/6'}, b'abcdef'))
+        client = _Client(connection)
+        bucket = _Bucket(client)
+        properties = {'mediaLink': 'http://example.com/media/',
+                      'updated': '2014-12-06T13:13:50.690Z'}
+        blob = self._make_one('blob-name', bucket=bucket,
+                              properties=properties)
+        limiter = _Limiter()
+
+        with _NamedTemporaryFile() as temp:
+            blob.download_to_filename(temp.name, limiter=limiter, priority=1)
+
+        self.assertEqual(limiter._acquired, [(6, 1)])
+
     def test_upload_from_file_size_failure(self):
         BLOB_NAME = 'blob-name'
         connection = _Connection()
@@ -735,6 +898,169 @@ class Test_Blob(unittest.TestCase):
             'redirections': 5,
         })
 
+    def test_upload_from_file_gzip(self):
+        import json
+        import zlib
+
+        from six.moves.http_client import OK
+        from six.moves.urllib.parse import parse_qsl
+        from six.moves.urllib.parse import urlsplit
+
+        UPLOAD_URL = 'http://example.com/upload/name/key'
+        DATA = b'ABCDEF' * 1000
+        loc_response = {'status': OK, 'location': UPLOAD_URL}
+        connection = _Connection(
+            (loc_response, b''),
+            ({'status': OK}, b'{"contentEncoding": "gzip"}'),
+        )
+        client = _Client(connection)
+        bucket = _Bucket(client)
+        blob = self._make_one('blob-name', bucket=bucket)
+
+        # No size is needed without a chunk size, since it isn't known.
+        blob.upload_from_file(_Stream(DATA), content_type='text/plain',
+                              gzip=True)
+
+        self.assertEqual(blob.content_encoding, 'gzip')
+        rq = connection.http._requested
+        self.assertEqual(len(rq), 2)
+
+        headers = {
+            x.title(): str(y) for x, y in rq[0]['headers'].items()}
+        self.assertNotIn('X-Upload-Content-Length', headers)
+        self.assertEqual(headers['X-Upload-Content-Type'], 'text/plain')
+        self.assertEqual(headers['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(rq[0]['body']), {
+            'contentEncoding': 'gzip',
+            'contentType': 'text/plain',
+        })
+        _, _, _, qs, _ = urlsplit(rq[0]['uri'])
+        self.assertEqual(dict(parse_qsl(qs)),
+                         {'uploadType': 'resumable', 'name': 'blob-name'})
+
+        body = rq[1]['body']
+        self.assertLess(len(body), len(DATA))
+        self.assertEqual(zlib.decompress(body, 16 + zlib.MAX_WBITS), DATA)
+        headers = {
+            x.title(): str(y) for x, y in rq[1]['headers'].items()}
+        self.assertEqual(headers['Content-Range'],
+                         'bytes 0-%d/%d' % (len(body) - 1, len(body)))
+
+    def test_upload_from_file_gzip_w_size_and_chunks(self):
+        from io import BytesIO
+        import zlib
+
+        from six.moves.http_client import OK
+        from google.cloud.streaming import http_wrapper
+
+        UPLOAD_URL = 'http://example.com/upload/name/key'
+        DATA = b'0123456789'
+        loc_response = {'status': OK, 'location': UPLOAD_URL}
+        chunk1_response = {'status': http_wrapper.RESUME_INCOMPLETE,
+                           'range': 'bytes 0-9'}
+        chunk2_response = {'status': http_wrapper.RESUME_INCOMPLETE,
+                           'range': 'bytes 0-19'}
+        connection = _Connection(
+            (loc_response, b''),
+            (chunk1_response, b''),
+            (chunk2_response, b''),
+            ({'status': OK}, b'{}'),
+        )
+        client = _Client(connection)
+        bucket = _Bucket(client)
+        blob = self._make_one('blob-name', bucket=bucket)
+        blob._CHUNK_SIZE_MULTIPLE = 1
+        blob.chunk_size = 10
+
+        blob.upload_from_file(BytesIO(DATA + b'ignored'), size=len(DATA),
+                              gzip=True)
+
+        rq = connection.http._requested
+        self.assertEqual(len(rq), 4)
+        bodies = [request['body'] for request in rq[1:]]
+        self.assertEqual([len(body) for body in bodies[:2]], [10, 10])
+        compressed = b''.join(bodies)
+        headers = {
+            x.title(): str(y) for x, y in rq[1]['headers'].items()}
+        self.assertEqual(headers['Content-Range'], 'bytes 0-9/*')
+        self.assertEqual(zlib.decompress(compressed, 16 + zlib.MAX_WBITS),
+                         DATA)
+
+    def test_upload_from_file_simple_w_progress_callback(self):
+        from io import BytesIO
+        from six.moves.http_client import OK
+
+        connection = _Connection(({'status': OK}, b'{}'))
+        client = _Client(connection)
+        bucket = _Bucket(client)
+        blob = self._make_one('blob-name', bucket=bucket)
+        reported = []
+        blob.upload_from_file(BytesIO(b'ABCDEF'), size=6,
+                              progress_callback=reported.append)
+        self.assertEqual(len(reported), 1)
+        self.assertEqual(reported[0].bytes_transferred, 6)
+        self.assertEqual(reported[0].total_bytes, 6)
+
+    def test_upload_from_file_simple_w_limiter(self):
+        from io import BytesIO
+        from six.moves.http_client import OK
+
+        connection = _Connection(({'status': OK}, b'{}'))
+        client = _Client(connection)
+        bucket = _Bucket(client)
+        blob = self._make_one('blob-name', bucket=bucket)
+        limiter = _Limiter()
+
+        blob.upload_from_file(BytesIO(b'ABCDEF'), size=6, limiter=limiter,
+                              priority=3)
+
+        self.assertEqual(len(connection.http._requested), 1)
+        self.assertEqual(limiter._acquired, [(6, 3)])
+
+    def test_upload_from_file_resumable_w_limiter(self):
+        from six.moves.http_client import OK
+        from google.cloud.streaming import http_wrapper
+
+        connection = _Connection(
+            ({'status': OK, 'location': 'http://example.com/upload'}, b''),
+            ({'status': http_wrapper.RESUME_INCOMPLETE, 'range': 'bytes 0-4'},
+             b''),
+            ({'status': OK}, b'{}'),
+        )
+        client = _Client(connection)
+        bucket = _Bucket(client)
+        blob = self._make_one('blob-name', bucket=bucket)
+        blob._CHUNK_SIZE_MULTIPLE = 1
+        blob.chunk_size = 5
+        limiter = _Limiter()
+
+        blob.upload_from_file(_Stream(b'ABCDEF'), limiter=limiter)
+
+        self.assertEqual(limiter._acquired, [(5, 0), (1, 0)])
+
+    def test_upload_from_file_resumable_w_progress_callback(self):
+        from six.moves.http_client import OK
+        from google.cloud.streaming import http_wrapper
+
+        connection = _Connection(
+            ({'status': OK, 'location': 'http://example.com/upload'}, b''),
+            ({'status': http_wrapper.RESUME_INCOMPLETE, 'range': 'bytes 0-4'},
+             b''),
+            ({'status': OK}, b'{}'),
+        )
+        client = _Client(connection)
+        bucket = _Bucket(client)
+        blob = self._make_one('blob-name', bucket=bucket)
+        blob._CHUNK_SIZE_MULTIPLE = 1
+        blob.chunk_size = 5
+        reported = []
+        blob.upload_from_file(_Stream(b'ABCDEF'),
+                              progress_callback=reported.append,
+                              adaptive_chunksize=True)
+        self.assertEqual(
+            [(progress.bytes_transferred, progress.total_bytes)
+             for progress in reported], [(5, None), (6, 6)])
+
     def test_upload_from_file_resumable_w_error(self):
         from six.moves.http_client import NOT_FOUND
         from six.moves.urllib.parse import parse_qsl
@@ -970,6 +1296,69 @@ class Test_Blob(unittest.TestCase):
             content_type_arg=EXPECTED_CONTENT_TYPE,
             expected_content_type=EXPECTED_CONTENT_TYPE)
 
+    def _upload_from_filename_mapped_helper(self, data, md5_hash=None,
+                                            **kw):
+        import base64
+        import hashlib
+        import json
+
+        from six.moves.http_client import OK
+        from google.cloud._testing import _NamedTemporaryFile
+
+        if md5_hash is None:
+            md5_hash = base64.b64encode(hashlib.md5(data).digest())
+            md5_hash = md5_hash.decode('ascii')
+        response = {'md5Hash': md5_hash, 'size': str(len(data))}
+        connection = _Connection(({'status': OK}, json.dumps(response)))
+        client = _Client(connection)
+        bucket = _Bucket(client)
+        blob = self._make_one('blob-name', bucket=bucket)
+
+        with _NamedTemporaryFile() as temp:
+            with open(temp.name, 'wb') as file_obj:
+                file_obj.write(data)
+            blob.upload_from_filename(temp.name, content_type='foo/bar',
+                                      **kw)
+
+        rq = connection.http._requested
+        self.assertEqual(len(rq), 1)
+        self.assertEqual(bytes(rq[0]['body']), data)
+        self.assertEqual(blob.md5_hash, md5_hash)
+        return rq[0]['body']
+
+    def test_upload_from_filename_memory_mapped(self):
+        body = self._upload_from_filename_mapped_helper(
+            b'ABCDEF', memory_map=True)
+        self.assertIsInstance(body, memoryview)
+
+    def test_upload_from_filename_memory_mapped_md5_mismatch(self):
+        from google.cloud.streaming.exceptions import TransferInvalidError
+
+        with self.assertRaises(TransferInvalidError):
+            self._upload_from_filename_mapped_helper(
+                b'ABCDEF', md5_hash='bWlzbWF0Y2g=', memory_map=True)
+
+    def test_upload_from_filename_wo_memory_map(self):
+        body = self._upload_from_filename_mapped_helper(
+            b'ABCDEF', md5_hash='bWlzbWF0Y2g=')
+        self.assertIsInstance(body, bytes)
+
+    def test_upload_from_filename_w_limiter(self):
+        limiter = _Limiter()
+        self._upload_from_filename_mapped_helper(
+            b'ABCDEF', memory_map=True, limiter=limiter, priority=1)
+        self.assertEqual(limiter._acquired, [(6, 1)])
+
+    def test_upload_from_filename_wo_memory_map_w_limiter(self):
+        limiter = _Limiter()
+        self._upload_from_filename_mapped_helper(
+            b'ABCDEF', limiter=limiter, priority=1)
+        self.assertEqual(limiter._acquired, [(6, 1)])
+
+    def test_upload_from_filename_empty_file(self):
+        body = self._upload_from_filename_mapped_helper(b'', memory_map=True)
+        self.assertEqual(body, b'')
+
     def test_upload_from_string_w_bytes(self):
         from six.moves.http_client import OK
         from six.moves.urllib.parse import parse_qsl
@@ -1010,6 +1399,19 @@ class Test_Blob(unittest.TestCase):
         self.assertEqual(headers['Content-Type'], 'text/plain')
         self.assertEqual(rq[0]['body'], DATA)
 
+    def test_upload_from_string_w_limiter(self):
+        from six.moves.http_client import OK
+
+        connection = _Connection(({'status': OK}, b'{}'))
+        client = _Client(connection)
+        bucket = _Bucket(client)
+        blob = self._make_one('blob-name', bucket=bucket)
+        limiter = _Limiter()
+
+        blob.upload_from_string(b'ABCDEF', limiter=limiter, priority=2)
+
+        self.assertEqual(limiter._acquired, [(6, 2)])
+
     def test_upload_from_string_w_text(self):
         from six.moves.http_client import OK
         from six.moves.urllib.parse import parse_qsl
@@ -1342,7 +1744,8 @@ class Test_Blob(unittest.TestCase):
         dest = self._make_one(BLOB_NAME, bucket=bucket,
                               encryption_key=DEST_KEY)
 
-        token, rewritten, size = dest.rewrite(source, token=TOKEN)
+        token, rewritten, size = dest.rewrite(
+            source, token=TOKEN, max_bytes_rewritten_per_call=1048576)
 
         self.assertIsNone(token)
         self.assertEqual(rewritten, 42)
@@ -1353,7 +1756,10 @@ class Test_Blob(unittest.TestCase):
         self.assertEqual(kw[0]['method'], 'POST')
         PATH = '/b/name/o/%s/rewriteTo/b/name/o/%s' % (BLOB_NAME, BLOB_NAME)
         self.assertEqual(kw[0]['path'], PATH)
-        self.assertEqual(kw[0]['query_params'], {'rewriteToken': TOKEN})
+        self.assertEqual(kw[0]['query_params'], {
+            'rewriteToken': TOKEN,
+            'maxBytesRewrittenPerCall': 1048576,
+        })
         SENT = {}
         self.assertEqual(kw[0]['data'], SENT)
 
@@ -1709,12 +2115,16 @@ class _Connection(_Responder):
     API_BASE_URL = 'http://example.com'
     USER_AGENT = 'testing 1.2.3'
     credentials = object()
+    _encoded_http = None
 
     def __init__(self, *responses):
         super(_Connection, self).__init__(*responses)
         self._signed = []
         self.http = _HTTP(*responses)
 
+    def _make_encoded_http(self):
+        return self._encoded_http
+
     def api_request(self, **kw):
         from six.moves.http_client import NOT_FOUND
         from google.cloud.exceptions import NotFound
@@ -1786,6 +2196,15 @@ class _Client(object):
         return self._base_connection
 
 
+class _Limiter(object):
+
+    def __init__(self):
+        self._acquired = []
+
+    def acquire(self, num_bytes, priority=0):
+        self._acquired.append((num_bytes, priority))
+
+
 class _Stream(object):
     _closed = False
 
@@ -213,6 +213,74 @@ class Test_Bucket(unittest.TestCase):
         self.assertEqual(kw['method'], 'GET')
         self.assertEqual(kw['path'], '/b/%s/o/%s' % (NAME, BLOB_NAME))
 
+    def test_get_blobs_empty(self):
+        NAME = 'name'
+        http = _HTTP()
+        client = _make_client(http)
+        bucket = self._make_one(client=client, name=NAME)
+        self.assertEqual(bucket.get_blobs([]), [])
+        self.assertEqual(http._requests, [])
+
+    def test_get_blobs_hit_and_miss(self):
+        NAME = 'name'
+        BLOB_NAME = 'blob-name'
+        NONESUCH = 'nonesuch'
+        http = _HTTP({
+            ('GET', '/b/%s/o/%s' % (NAME, BLOB_NAME)): (
+                200, {'name': BLOB_NAME, 'size': '42'}),
+        })
+        client = _make_client(http)
+        bucket = self._make_one(client=client, name=NAME)
+
+        blob, missing = bucket.get_blobs([BLOB_NAME, NONESUCH])
+
+        self.assertIsNone(missing)
+        self.assertIs(blob.bucket, bucket)
+        self.assertEqual(blob.name, BLOB_NAME)
+        self.assertEqual(blob.size, 42)
+        self.assertEqual(len(http._requests), 1)
+        self.assertEqual(http._sub_requests(), [
+            ('GET', '/b/%s/o/%s' % (NAME, BLOB_NAME)),
+            ('GET', '/b/%s/o/%s' % (NAME, NONESUCH)),
+        ])
+
+    def test_get_blobs_other_error(self):
+        from google.cloud.exceptions import Forbidden
+
+        NAME = 'name'
+        BLOB_NAME = 'blob-name'
+        http = _HTTP({
+            ('GET', '/b/%s/o/%s' % (NAME, BLOB_NAME)): (
+                403, {'error': {'message': 'Forbidden'}}),
+        })
+        client = _make_client(http)
+        bucket = self._make_one(client=client, name=NAME)
+        self.assertRaises(Forbidden, bucket.get_blobs, ['nonesuch', BLOB_NAME])
+
+    def test_get_blobs_splits_batches(self):
+        import mock
+
+        NAME = 'name'
+        BLOB_NAMES = ['blob-%d' % (index,) for index in range(5)]
+        http = _HTTP(dict(
+            (('GET', '/b/%s/o/%s' % (NAME, blob_name)),
+             (200, {'name': blob_name}))
+            for blob_name in BLOB_NAMES[1:]))
+        client = _make_client(http)
+        bucket = self._make_one(client=client, name=NAME)
+
+        with mock.patch('google.cloud.storage.batch.Batch._MAX_BATCH_SIZE',
+                        new=2):
+            blobs = bucket.get_blobs(iter(BLOB_NAMES), max_workers=3)
+
+        self.assertIsNone(blobs[0])
+        self.assertEqual([blob.name for blob in blobs[1:]], BLOB_NAMES[1:])
+        self.assertEqual(len(http._requests), 3)
+        self.assertEqual(
+            sorted(http._sub_requests()),
+            [('GET', '/b/%s/o/%s' % (NAME, blob_name))
+             for blob_name in BLOB_NAMES])
+
     def test_list_blobs_defaults(self):
         NAME = 'name'
         connection = _Connection({'items': []})
@@ -243,6 +311,8 @@ class Test_Bucket(unittest.TestCase):
             'versions': VERSIONS,
             'projection': PROJECTION,
             'fields': FIELDS,
+            'startOffset': 'a',
+            'endOffset': 'b',
         }
         connection = _Connection({'items': []})
         client = _Client(connection)
@@ -256,6 +326,8 @@ class Test_Bucket(unittest.TestCase):
             projection=PROJECTION,
             fields=FIELDS,
             client=client,
+            start_offset='a',
+            end_offset='b',
         )
         blobs = list(iterator)
         self.assertEqual(blobs, [])
@@ -318,58 +390,85 @@ class Test_Bucket(unittest.TestCase):
                 {'name': BLOB_NAME2},
             ],
         }
-        DELETE_BLOB1_RESP = DELETE_BLOB2_RESP = {}
-        connection = _Connection(GET_BLOBS_RESP, DELETE_BLOB1_RESP,
-                                 DELETE_BLOB2_RESP)
-        connection._delete_bucket = True
-        client = _Client(connection)
+        http = _HTTP({
+            ('GET', '/b/%s/o' % NAME): (200, GET_BLOBS_RESP),
+            ('DELETE', '/b/%s/o/%s' % (NAME, BLOB_NAME1)): (204, None),
+            ('DELETE', '/b/%s/o/%s' % (NAME, BLOB_NAME2)): (204, None),
+            ('DELETE', '/b/%s' % NAME): (204, None),
+        })
+        client = _make_client(http)
         bucket = self._make_one(client=client, name=NAME)
         result = bucket.delete(force=True)
         self.assertIsNone(result)
-        expected_cw = [{
-            'method': 'DELETE',
-            'path': bucket.path,
-            '_target_object': None,
-        }]
-        self.assertEqual(connection._deleted_buckets, expected_cw)
+        self.assertEqual(http._sub_requests(), [
+            ('GET', '/b/%s/o' % NAME),
+            ('DELETE', '/b/%s/o/%s' % (NAME, BLOB_NAME1)),
+            ('DELETE', '/b/%s/o/%s' % (NAME, BLOB_NAME2)),
+            ('DELETE', '/b/%s' % NAME),
+        ])
 
     def test_delete_force_miss_blobs(self):
         NAME = 'name'
         BLOB_NAME = 'blob-name1'
         GET_BLOBS_RESP = {'items': [{'name': BLOB_NAME}]}
         # Note the connection does not have a response for the blob.
-        connection = _Connection(GET_BLOBS_RESP)
-        connection._delete_bucket = True
-        client = _Client(connection)
+        http = _HTTP({
+            ('GET', '/b/%s/o' % NAME): (200, GET_BLOBS_RESP),
+            ('DELETE', '/b/%s' % NAME): (204, None),
+        })
+        client = _make_client(http)
         bucket = self._make_one(client=client, name=NAME)
         result = bucket.delete(force=True)
         self.assertIsNone(result)
-        expected_cw = [{
-            'method': 'DELETE',
-            'path': bucket.path,
-            '_target_object': None,
-        }]
-        self.assertEqual(connection._deleted_buckets, expected_cw)
+        self.assertEqual(http._sub_requests()[-1], ('DELETE', '/b/%s' % NAME))
+
+    def test_delete_force_many_blobs(self):
+        import mock
+        from six.moves.urllib.parse import parse_qs
+        from six.moves.urllib.parse import urlsplit
 
-    def test_delete_too_many(self):
         NAME = 'name'
-        BLOB_NAME1 = 'blob-name1'
-        BLOB_NAME2 = 'blob-name2'
-        GET_BLOBS_RESP = {
-            'items': [
-                {'name': BLOB_NAME1},
-                {'name': BLOB_NAME2},
-            ],
-        }
-        connection = _Connection(GET_BLOBS_RESP)
-        connection._delete_bucket = True
-        client = _Client(connection)
+        BLOB_NAMES = ['blob-%d' % (index,) for index in range(5)]
+        responses = dict(
+            (('DELETE', '/b/%s/o/%s' % (NAME, blob_name)), (204, None))
+            for blob_name in BLOB_NAMES)
+        responses[('GET', '/b/%s/o' % NAME)] = (200, {
+            'items': [{'name': blob_name} for blob_name in BLOB_NAMES],
+        })
+        responses[('DELETE', '/b/%s' % NAME)] = (204, None)
+        http = _HTTP(responses)
+        client = _make_client(http)
         bucket = self._make_one(client=client, name=NAME)
+        progress = []
+
+        with mock.patch('google.cloud.storage.batch.Batch._MAX_BATCH_SIZE',
+                        new=2):
+            bucket.delete(force=True, max_workers=2,
+                          progress_callback=progress.append)
+
+        self.assertEqual(progress, [2, 4, 5])
+        # One listing, three batches and the bucket deletion.
+        self.assertEqual(len(http._requests), 5)
+        _, list_uri, _, _ = http._requests[0]
+        query = parse_qs(urlsplit(list_uri).query)
+        self.assertEqual(query['fields'], ['items/name,nextPageToken'])
+        self.assertEqual(http._sub_requests()[-1], ('DELETE', '/b/%s' % NAME))
 
-        # Make the Bucket refuse to delete with 2 objects.
-        bucket._MAX_OBJECTS_FOR_ITERATION = 1
-        self.assertRaises(ValueError, bucket.delete, force=True)
-        self.assertEqual(connection._deleted_buckets, [])
+    def test_delete_force_w_error(self):
+        from google.cloud.exceptions import Forbidden
+
+        NAME = 'name'
+        BLOB_NAME = 'blob-name'
+        http = _HTTP({
+            ('GET', '/b/%s/o' % NAME): (200, {'items': [{'name': BLOB_NAME}]}),
+            ('DELETE', '/b/%s/o/%s' % (NAME, BLOB_NAME)): (
+                403, {'error': {'message': 'Forbidden'}}),
+            ('DELETE', '/b/%s' % NAME): (204, None),
+        })
+        client = _make_client(http)
+        bucket = self._make_one(client=client, name=NAME)
+        self.assertRaises(Forbidden, bucket.delete, force=True)
+        self.assertNotIn(('DELETE', '/b/%s' % NAME), http._sub_requests())
 
     def test_delete_blob_miss(self):
         from google.cloud.exceptions import NotFound
@@ -398,23 +497,28 @@ class Test_Bucket(unittest.TestCase):
 
     def test_delete_blobs_empty(self):
         NAME = 'name'
-        connection = _Connection()
-        client = _Client(connection)
+        http = _HTTP()
+        client = _make_client(http)
         bucket = self._make_one(client=client, name=NAME)
-        bucket.delete_blobs([])
-        self.assertEqual(connection._requested, [])
+        self.assertEqual(bucket.delete_blobs([]), [])
+        self.assertEqual(http._requests, [])
 
     def test_delete_blobs_hit(self):
         NAME = 'name'
         BLOB_NAME = 'blob-name'
-        connection = _Connection({})
-        client = _Client(connection)
+        http = _HTTP({
+            ('DELETE', '/b/%s/o/%s' % (NAME, BLOB_NAME)): (204, None),
+        })
+        client = _make_client(http)
         bucket = self._make_one(client=client, name=NAME)
-        bucket.delete_blobs([BLOB_NAME])
-        kw = connection._requested
-        self.assertEqual(len(kw), 1)
-        self.assertEqual(kw[0]['method'], 'DELETE')
-        self.assertEqual(kw[0]['path'], '/b/%s/o/%s' % (NAME, BLOB_NAME))
+        results = bucket.delete_blobs([BLOB_NAME])
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].item, BLOB_NAME)
+        self.assertIsNone(results[0].error)
+        self.assertEqual(len(http._requests), 1)
+        self.assertEqual(http._sub_requests(), [
+            ('DELETE', '/b/%s/o/%s' % (NAME, BLOB_NAME)),
+        ])
 
     def test_delete_blobs_miss_no_on_error(self):
         from google.cloud.exceptions import NotFound
@@ -422,33 +526,74 @@ class Test_Bucket(unittest.TestCase):
         NAME = 'name'
         BLOB_NAME = 'blob-name'
         NONESUCH = 'nonesuch'
-        connection = _Connection({})
-        client = _Client(connection)
+        http = _HTTP({
+            ('DELETE', '/b/%s/o/%s' % (NAME, BLOB_NAME)): (204, None),
+        })
+        client = _make_client(http)
         bucket = self._make_one(client=client, name=NAME)
         self.assertRaises(NotFound, bucket.delete_blobs, [BLOB_NAME, NONESUCH])
-        kw = connection._requested
-        self.assertEqual(len(kw), 2)
-        self.assertEqual(kw[0]['method'], 'DELETE')
-        self.assertEqual(kw[0]['path'], '/b/%s/o/%s' % (NAME, BLOB_NAME))
-        self.assertEqual(kw[1]['method'], 'DELETE')
-        self.assertEqual(kw[1]['path'], '/b/%s/o/%s' % (NAME, NONESUCH))
+        self.assertEqual(http._sub_requests(), [
+            ('DELETE', '/b/%s/o/%s' % (NAME, BLOB_NAME)),
+            ('DELETE', '/b/%s/o/%s' % (NAME, NONESUCH)),
+        ])
 
     def test_delete_blobs_miss_w_on_error(self):
         NAME = 'name'
         BLOB_NAME = 'blob-name'
         NONESUCH = 'nonesuch'
-        connection = _Connection({})
-        client = _Client(connection)
+        http = _HTTP({
+            ('DELETE', '/b/%s/o/%s' % (NAME, BLOB_NAME)): (204, None),
+        })
+        client = _make_client(http)
         bucket = self._make_one(client=client, name=NAME)
         errors = []
         bucket.delete_blobs([BLOB_NAME, NONESUCH], errors.append)
         self.assertEqual(errors, [NONESUCH])
-        kw = connection._requested
-        self.assertEqual(len(kw), 2)
-        self.assertEqual(kw[0]['method'], 'DELETE')
-        self.assertEqual(kw[0]['path'], '/b/%s/o/%s' % (NAME, BLOB_NAME))
-        self.assertEqual(kw[1]['method'], 'DELETE')
-        self.assertEqual(kw[1]['path'], '/b/%s/o/%s' % (NAME, NONESUCH))
+        self.assertEqual(http._sub_requests(), [
+            ('DELETE', '/b/%s/o/%s' % (NAME, BLOB_NAME)),
+            ('DELETE', '/b/%s/o/%s' % (NAME, NONESUCH)),
+        ])
+
+    def test_delete_blobs_other_error_w_on_error(self):
+        from google.cloud.exceptions import Forbidden
+
+        NAME = 'name'
+        BLOB_NAME = 'blob-name'
+        http = _HTTP({
+            ('DELETE', '/b/%s/o/%s' % (NAME, BLOB_NAME)): (
+                403, {'error': {'message': 'Forbidden'}}),
+        })
+        client = _make_client(http)
+        bucket = self._make_one(client=client, name=NAME)
+        errors = []
+        self.assertRaises(Forbidden, bucket.delete_blobs, [BLOB_NAME],
+                          errors.append)
+        self.assertEqual(errors, [])
+
+    def test_delete_blobs_splits_batches(self):
+        import mock
+        from google.cloud.storage.blob import Blob
+
+        NAME = 'name'
+        BLOB_NAMES = ['blob-%d' % (index,) for index in range(5)]
+        http = _HTTP(dict(
+            (('DELETE', '/b/%s/o/%s' % (NAME, blob_name)), (204, None))
+            for blob_name in BLOB_NAMES))
+        client = _make_client(http)
+        bucket = self._make_one(client=client, name=NAME)
+        blobs = [Blob(blob_name, bucket=bucket) for blob_name in BLOB_NAMES]
+
+        with mock.patch('google.cloud.storage.batch.Batch._MAX_BATCH_SIZE',
+                        new=2):
+            results = bucket.delete_blobs(iter(blobs), max_workers=3)
+
+        self.assertEqual([result.item for result in results], blobs)
+        self.assertEqual([result.error for result in results], [None] * 5)
+        self.assertEqual(len(http._requests), 3)
+        self.assertEqual(
+            sorted(http._sub_requests()),
+            [('DELETE', '/b/%s/o/%s' % (NAME, blob_name))
+             for blob_name in BLOB_NAMES])
 
     def test_copy_blobs_wo_name(self):
         SOURCE = 'source'
@@ -530,6 +675,129 @@ class Test_Bucket(unittest.TestCase):
         self.assertEqual(kw['method'], 'POST')
         self.assertEqual(kw['path'], COPY_PATH)
 
+    def test_copy_blobs(self):
+        from google.cloud.exceptions import NotFound
+        from google.cloud.storage.blob import Blob
+
+        SOURCE = 'source'
+        DEST = 'dest'
+        BLOB_NAME1 = 'blob-name1'
+        BLOB_NAME2 = 'blob-name2'
+        NEW_NAME = 'new-name'
+        copy_path = '/b/%s/o/%s/copyTo/b/%s/o/%s' % (
+            SOURCE, BLOB_NAME1, DEST, NEW_NAME)
+        http = _HTTP({
+            ('POST', copy_path): (200, {'name': NEW_NAME, 'size': '7'}),
+        })
+        client = _make_client(http)
+        source = self._make_one(client=client, name=SOURCE)
+        dest = self._make_one(client=client, name=DEST)
+        blob1 = Blob(BLOB_NAME1, bucket=source)
+        blob2 = Blob(BLOB_NAME2, bucket=source)
+
+        results = source.copy_blobs([blob1, blob2], dest,
+                                    new_names=[NEW_NAME, None])
+
+        self.assertEqual(len(http._requests), 1)
+        first, second = results
+        self.assertIs(first.item, blob1)
+        self.assertIsNone(first.error)
+        self.assertIs(first.value.bucket, dest)
+        self.assertEqual(first.value.name, NEW_NAME)
+        self.assertEqual(first.value.size, 7)
+        self.assertIs(second.item, blob2)
+        self.assertIsNone(second.value)
+        self.assertIsInstance(second.error, NotFound)
+
+    def test_copy_blobs_wo_new_names(self):
+        from google.cloud.storage.blob import Blob
+
+        SOURCE = 'source'
+        DEST = 'dest'
+        BLOB_NAME = 'blob-name'
+        copy_path = '/b/%s/o/%s/copyTo/b/%s/o/%s' % (
+            SOURCE, BLOB_NAME, DEST, BLOB_NAME)
+        http = _HTTP({('POST', copy_path): (200, {'name': BLOB_NAME})})
+        client = _make_client(http)
+        source = self._make_one(client=client, name=SOURCE)
+        dest = self._make_one(client=client, name=DEST)
+        blob = Blob(BLOB_NAME, bucket=source)
+
+        result, = source.copy_blobs([blob], dest)
+
+        self.assertIs(result.item, blob)
+        self.assertIsNone(result.error)
+        self.assertEqual(result.value.name, BLOB_NAME)
+        self.assertIs(result.value.bucket, dest)
+
+    def test_copy_blobs_w_mismatched_new_names(self):
+        from google.cloud.storage.blob import Blob
+
+        http = _HTTP({})
+        client = _make_client(http)
+        source = self._make_one(client=client, name='source')
+        dest = self._make_one(client=client, name='dest')
+        blobs = [Blob('blob-name1', bucket=source),
+                 Blob('blob-name2', bucket=source)]
+
+        self.assertRaises(ValueError, source.copy_blobs, blobs, dest,
+                          new_names=['new-name'])
+        self.assertRaises(ValueError, source.copy_blobs, iter(blobs[:1]),
+                          dest, new_names=iter(['new-name1', 'new-name2']))
+        self.assertEqual(http._requests, [])
+
+    def test_patch_blobs(self):
+        from google.cloud.storage.blob import Blob
+
+        NAME = 'name'
+        BLOB_NAME = 'blob-name'
+        METADATA = {'color': 'red'}
+        path = '/b/%s/o/%s' % (NAME, BLOB_NAME)
+        http = _HTTP({
+            ('PATCH', path): (200, {'name': BLOB_NAME, 'metadata': METADATA}),
+        })
+        client = _make_client(http)
+        bucket = self._make_one(client=client, name=NAME)
+        blob = Blob(BLOB_NAME, bucket=bucket)
+        blob.metadata = METADATA
+
+        result, = bucket.patch_blobs([blob])
+
+        self.assertIs(result.item, blob)
+        self.assertIs(result.value, blob)
+        self.assertIsNone(result.error)
+        self.assertEqual(blob.metadata, METADATA)
+        self.assertEqual(http._sub_requests(), [('PATCH', path)])
+        self.assertIn('"metadata": {"color": "red"}', http._requests[0][3])
+
+    def test_make_blobs_public(self):
+        import json
+        from google.cloud.storage.blob import Blob
+
+        NAME = 'name'
+        BLOB_NAME1 = 'blob-name1'
+        BLOB_NAME2 = 'blob-name2'
+        ENTRY = {'entity': 'allUsers', 'role': 'READER'}
+        http = _HTTP({
+            ('POST', '/b/%s/o/%s/acl' % (NAME, BLOB_NAME1)): (200, ENTRY),
+            ('POST', '/b/%s/o/%s/acl' % (NAME, BLOB_NAME2)): (200, ENTRY),
+        })
+        client = _make_client(http)
+        bucket = self._make_one(client=client, name=NAME)
+        blob1 = Blob(BLOB_NAME1, bucket=bucket)
+
+        results = bucket.make_blobs_public([blob1, BLOB_NAME2])
+
+        self.assertEqual([result.item for result in results],
+                         [blob1, BLOB_NAME2])
+        self.assertEqual([result.error for result in results], [None, None])
+        self.assertEqual(http._sub_requests(), [
+            ('POST', '/b/%s/o/%s/acl' % (NAME, BLOB_NAME1)),
+            ('POST', '/b/%s/o/%s/acl' % (NAME, BLOB_NAME2)),
+        ])
+        self.assertIn(json.dumps(ENTRY, sort_keys=True),
+                      http._requests[0][3])
+
     def test_rename_blob(self):
         BUCKET_NAME = 'BUCKET_NAME'
         BLOB_NAME = 'blob-name'
@@ -903,88 +1171,51 @@ class Test_Bucket(unittest.TestCase):
         self._make_public_w_future_helper(default_object_acl_loaded=False)
 
     def test_make_public_recursive(self):
-        import mock
         from google.cloud.storage.acl import _ACLEntity
 
-        _saved = []
-
-        class _Blob(object):
-            _granted = False
-
-            def __init__(self, bucket, name):
-                self._bucket = bucket
-                self._name = name
-
-            @property
-            def acl(self):
-                return self
-
-            # Faux ACL methods
-            def all(self):
-                return self
-
-            def grant_read(self):
-                self._granted = True
-
-            def save(self, client=None):
-                _saved.append(
-                    (self._bucket, self._name, self._granted, client))
-
-        def item_to_blob(self, item):
-            return _Blob(self.bucket, item['name'])
-
         NAME = 'name'
         BLOB_NAME = 'blob-name'
         permissive = [{'entity': 'allUsers', 'role': _ACLEntity.READER_ROLE}]
         after = {'acl': permissive, 'defaultObjectAcl': []}
-        connection = _Connection(after, {'items': [{'name': BLOB_NAME}]})
-        client = _Client(connection)
+        entry = {'entity': 'allUsers', 'role': _ACLEntity.READER_ROLE}
+        http = _HTTP({
+            ('PATCH', '/b/%s' % NAME): (200, after),
+            ('GET', '/b/%s/o' % NAME): (200, {'items': [{'name': BLOB_NAME}]}),
+            ('POST', '/b/%s/o/%s/acl' % (NAME, BLOB_NAME)): (200, entry),
+        })
+        client = _make_client(http)
         bucket = self._make_one(client=client, name=NAME)
         bucket.acl.loaded = True
         bucket.default_object_acl.loaded = True
+        progress = []
+
+        bucket.make_public(recursive=True, progress_callback=progress.append)
 
-        with mock.patch('google.cloud.storage.bucket._item_to_blob',
-                        new=item_to_blob):
-            bucket.make_public(recursive=True)
         self.assertEqual(list(bucket.acl), permissive)
         self.assertEqual(list(bucket.default_object_acl), [])
-        self.assertEqual(_saved, [(bucket, BLOB_NAME, True, None)])
-        kw = connection._requested
-        self.assertEqual(len(kw), 2)
-        self.assertEqual(kw[0]['method'], 'PATCH')
-        self.assertEqual(kw[0]['path'], '/b/%s' % NAME)
-        self.assertEqual(kw[0]['data'], {'acl': permissive})
-        self.assertEqual(kw[0]['query_params'], {'projection': 'full'})
-        self.assertEqual(kw[1]['method'], 'GET')
-        self.assertEqual(kw[1]['path'], '/b/%s/o' % NAME)
-        max_results = bucket._MAX_OBJECTS_FOR_ITERATION + 1
-        self.assertEqual(kw[1]['query_params'],
-                         {'maxResults': max_results, 'projection': 'full'})
-
-    def test_make_public_recursive_too_many(self):
+        self.assertEqual(progress, [1])
+        self.assertEqual(http._sub_requests(), [
+            ('PATCH', '/b/%s' % NAME),
+            ('GET', '/b/%s/o' % NAME),
+            ('POST', '/b/%s/o/%s/acl' % (NAME, BLOB_NAME)),
+        ])
+
+    def test_make_public_recursive_w_error(self):
+        from google.cloud.exceptions import NotFound
         from google.cloud.storage.acl import _ACLEntity
 
-        PERMISSIVE = [{'entity': 'allUsers', 'role': _ACLEntity.READER_ROLE}]
-        AFTER = {'acl': PERMISSIVE, 'defaultObjectAcl': []}
-
         NAME = 'name'
-        BLOB_NAME1 = 'blob-name1'
-        BLOB_NAME2 = 'blob-name2'
-        GET_BLOBS_RESP = {
-            'items': [
-                {'name': BLOB_NAME1},
-                {'name': BLOB_NAME2},
-            ],
-        }
-        connection = _Connection(AFTER, GET_BLOBS_RESP)
-        client = _Client(connection)
+        BLOB_NAME = 'blob-name'
+        permissive = [{'entity': 'allUsers', 'role': _ACLEntity.READER_ROLE}]
+        http = _HTTP({
+            ('PATCH', '/b/%s' % NAME): (200, {'acl': permissive}),
+            ('GET', '/b/%s/o' % NAME): (200, {'items': [{'name': BLOB_NAME}]}),
+        })
+        client = _make_client(http)
         bucket = self._make_one(client=client, name=NAME)
         bucket.acl.loaded = True
-        bucket.default_object_acl.loaded = True
 
-        # Make the Bucket refuse to make_public with 2 objects.
-        bucket._MAX_OBJECTS_FOR_ITERATION = 1
-        self.assertRaises(ValueError, bucket.make_public, recursive=True)
+        self.assertRaises(NotFound, bucket.make_public, recursive=True)
 
     def test_page_empty_response(self):
         from google.cloud.iterator import Page
@@ -1109,3 +1340,92 @@ class _Client(object):
     def __init__(self, connection, project=None):
         self._connection = connection
         self.project = project
+
+
+def _make_client(http):
+    import google.auth.credentials
+    import mock
+    from google.cloud.storage.client import Client
+
+    credentials = mock.Mock(spec=google.auth.credentials.Credentials)
+    client = Client(project='PROJECT', credentials=credentials)
+    client._base_connection._http = http
+    return client
+
+
+class _Response(dict):
+
+    def __init__(self, status=200, **kw):
+        self.status = status
+        super(_Response, self).__init__(**kw)
+
+
+class _HTTP(object):
+    """Fake transport answering plain and batch requests by path.
+
+    ``responses`` maps ``(method, path)``, with ``path`` relative to the
+    storage API root, onto ``(status, payload)``.  Other requests get a 404.
+    """
+
+    _BOUNDARY = 'DEADBEEF='
+    _SUB_REQUEST = r'^(GET|POST|PATCH|PUT|DELETE) (\S+) HTTP/1.1\r?$'
+
+    def __init__(self, responses=None):
+        self._responses = responses or {}
+        self._requests = []
+
+    def _respond(self, method, uri):
+        from six.moves.urllib.parse import urlsplit
+
+        path = urlsplit(uri).path[len('/storage/v1'):]
+        not_found = (404, {'error': {'message': 'Not Found'}})
+        return self._responses.get((method, path), not_found)
+
+    def _sub_requests(self):
+        import re
+        from six.moves.urllib.parse import urlsplit
+
+        found = []
+        for method, uri, _, body in self._requests:
+            if uri.endswith('/batch'):
+                found.extend(re.findall(self._SUB_REQUEST, body, re.M))
+            else:
+                found.append((method, uri))
+        return [(method, urlsplit(uri).path[len('/storage/v1'):])
+                for method, uri in found]
+
+    def request(self, uri, method, headers, body):
+        import json
+        import re
+
+        self._requests.append((method, uri, headers, body))
+        if not uri.endswith('/batch'):
+            status, payload = self._respond(method, uri)
+            response = _Response(status)
+            response['content-type'] = 'application/json'
+            content = b'' if payload is None else json.dumps(payload)
+            return response, content
+
+        lines = []
+        for sub_method, sub_uri in re.findall(self._SUB_REQUEST, body, re.M):
+            status, payload = self._respond(sub_method, sub_uri)
+            lines.extend([
+                '--' + self._BOUNDARY,
+                'Content-Type: application/http',
+                '',
+                'HTTP/1.1 %d Status' % (status,),
+            ])
+            if payload is None:
+                lines.extend(['Content-Length: 0', '', ''])
+            else:
+                lines.extend([
+                    'Content-Type: application/json; charset=UTF-8',
+                    '',
+                    json.dumps(payload),
+                    '',
+                ])
+        lines.append('--%s--' % (self._BOUNDARY,))
+        response = _Response()
+        response['content-type'] = 'multipart/mixed; boundary="%s"' % (
+            self._BOUNDARY,)
+        return response, '\n'.join(lines)
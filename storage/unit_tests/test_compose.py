@@ -0,0 +1,199 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+
+def _make_bucket(root):
+    from google.cloud.storage.client import Client
+    from google.cloud.storage.local import LocalStorageHttp
+
+    client = Client(project='local', http=LocalStorageHttp(root))
+    return client.create_bucket('bucket')
+
+
+def _make_blobs(bucket, count):
+    blobs = []
+    for index in range(count):
+        blob = bucket.blob('shard-%03d' % (index,))
+        blob.upload_from_string(b'%03d,' % (index,))
+        blobs.append(blob)
+    return blobs
+
+
+class Test_concat(unittest.TestCase):
+
+    @staticmethod
+    def _call_fut(*args, **kwargs):
+        from google.cloud.storage.compose import concat
+
+        return concat(*args, **kwargs)
+
+    def test_wo_sources(self):
+        from google.cloud.storage.blob import Blob
+        from google.cloud.storage.bucket import Bucket
+
+        destination = Blob('dest', bucket=Bucket(None, name='bucket'))
+        destination.content_type = 'text/plain'
+        with self.assertRaises(ValueError):
+            self._call_fut(destination, [])
+
+    def test_source_in_other_bucket(self):
+        from google.cloud.storage.blob import Blob
+        from google.cloud.storage.bucket import Bucket
+
+        destination = Blob('dest', bucket=Bucket(None, name='bucket'))
+        destination.content_type = 'text/plain'
+        source = Blob('source', bucket=Bucket(None, name='other'))
+        with self.assertRaises(ValueError):
+            self._call_fut(destination, [source])
+
+    def test_wo_content_type(self):
+        from google.cloud.storage.blob import Blob
+        from google.cloud.storage.bucket import Bucket
+
+        bucket = Bucket(None, name='bucket')
+        destination = Blob('dest', bucket=bucket)
+        with self.assertRaises(ValueError):
+            self._call_fut(destination, [Blob('source', bucket=bucket)])
+
+    def test_single_compose(self):
+        from google.cloud._testing import _tempdir
+
+        with _tempdir() as tempdir:
+            bucket = _make_bucket(tempdir)
+            sources = _make_blobs(bucket, 32)
+            destination = bucket.blob('dest')
+            destination.content_type = 'text/csv'
+
+            result = self._call_fut(destination, iter(sources))
+
+            self.assertIs(result, destination)
+            self.assertEqual(destination.component_count, 32)
+            self.assertEqual(destination.content_type, 'text/csv')
+            self.assertEqual(
+                destination.download_as_string(),
+                b''.join(b'%03d,' % (index,) for index in range(32)))
+            self.assertEqual(len(list(bucket.list_blobs())), 33)
+
+    def test_compose_tree(self):
+        from google.cloud._testing import _tempdir
+
+        with _tempdir() as tempdir:
+            bucket = _make_bucket(tempdir)
+            sources = _make_blobs(bucket, 1100)
+            destination = bucket.blob('dest')
+            destination.content_type = 'text/csv'
+
+            self._call_fut(destination, sources, max_workers=4)
+
+            self.assertEqual(destination.component_count, 1100)
+            self.assertEqual(
+                destination.download_as_string(),
+                b''.join(b'%03d,' % (index,) for index in range(1100)))
+            names = set(blob.name for blob in bucket.list_blobs())
+            self.assertEqual(
+                names, set(['dest'] + [blob.name for blob in sources]))
+
+    def test_failure_deletes_intermediates(self):
+        from google.cloud._testing import _tempdir
+        from google.cloud.exceptions import NotFound
+
+        with _tempdir() as tempdir:
+            bucket = _make_bucket(tempdir)
+            sources = _make_blobs(bucket, 40)
+            sources.append(bucket.blob('nonesuch'))
+            destination = bucket.blob('dest')
+            destination.content_type = 'text/csv'
+
+            with self.assertRaises(NotFound):
+                self._call_fut(destination, sources)
+
+            names = set(blob.name for blob in bucket.list_blobs())
+            self.assertEqual(names, set(blob.name for blob in sources[:40]))
+
+
+class Test_append(unittest.TestCase):
+
+    @staticmethod
+    def _call_fut(*args, **kwargs):
+        from google.cloud.storage.compose import append
+
+        return append(*args, **kwargs)
+
+    def test_append(self):
+        from google.cloud._testing import _tempdir
+
+        with _tempdir() as tempdir:
+            bucket = _make_bucket(tempdir)
+            blob = bucket.blob('log')
+            blob.upload_from_string(b'first\n', content_type='text/plain')
+            blob.metadata = {'owner': 'me'}
+            blob.patch()
+
+            result = self._call_fut(blob, u'second\n')
+
+            self.assertIs(result, blob)
+            self.assertEqual(blob.component_count, 2)
+            self.assertEqual(blob.size, 13)
+            self.assertEqual(blob.download_as_string(), b'first\nsecond\n')
+            reloaded = bucket.get_blob('log')
+            self.assertEqual(reloaded.content_type, 'text/plain')
+            self.assertEqual(reloaded.metadata, {'owner': 'me'})
+            self.assertEqual([item.name for item in bucket.list_blobs()],
+                             ['log'])
+
+    def test_append_reloads_properties(self):
+        from google.cloud._testing import _tempdir
+
+        with _tempdir() as tempdir:
+            bucket = _make_bucket(tempdir)
+            bucket.blob('log').upload_from_string(
+                b'first\n', content_type='text/csv')
+            blob = bucket.blob('log')
+
+            self._call_fut(blob, b'second\n')
+
+            self.assertEqual(blob.content_type, 'text/csv')
+            self.assertEqual(blob.download_as_string(), b'first\nsecond\n')
+
+    def test_append_missing_blob(self):
+        from google.cloud._testing import _tempdir
+        from google.cloud.exceptions import NotFound
+
+        with _tempdir() as tempdir:
+            bucket = _make_bucket(tempdir)
+            blob = bucket.blob('nonesuch')
+            blob.content_type = 'text/plain'
+
+            with self.assertRaises(NotFound):
+                self._call_fut(blob, b'data')
+
+            self.assertEqual(list(bucket.list_blobs()), [])
+
+
+class Test__split_evenly(unittest.TestCase):
+
+    @staticmethod
+    def _call_fut(items, count):
+        from google.cloud.storage.compose import _split_evenly
+
+        return _split_evenly(items, count)
+
+    def test_even(self):
+        self.assertEqual(self._call_fut([1, 2, 3, 4], 2), [[1, 2], [3, 4]])
+
+    def test_uneven(self):
+        self.assertEqual(self._call_fut(list(range(7)), 3),
+                         [[0, 1, 2], [3, 4], [5, 6]])
@@ -0,0 +1,229 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+
+NAMES = [
+    'a.txt',
+    'a/1', 'a/2', 'a/3',
+    'b/1',
+    'b0',
+    'c/1', 'c/2', 'c/3', 'c/4', 'c/5',
+    'd',
+]
+
+
+class Test_list_blobs_sharded(unittest.TestCase):
+
+    def _call_fut(self, *args, **kw):
+        from google.cloud.storage.listing import list_blobs_sharded
+
+        return list_blobs_sharded(*args, **kw)
+
+    def test_discovered_ordered(self):
+        bucket = _Bucket(NAMES)
+        client = object()
+
+        blobs = self._call_fut(bucket, ordered=True, max_workers=2,
+                               fields='items/name,nextPageToken',
+                               client=client)
+
+        self.assertEqual([blob.name for blob in blobs], NAMES)
+        discovery = bucket._listed[0]
+        self.assertEqual(discovery['delimiter'], '/')
+        self.assertEqual(discovery['fields'], 'prefixes,nextPageToken')
+        self.assertIs(discovery['client'], client)
+        self.assertEqual(
+            [(kw['start_offset'], kw['end_offset'])
+             for kw in bucket._listed[1:]],
+            [(None, 'a/'), ('a/', 'b/'), ('b/', 'c/'), ('c/', None)])
+        for kw in bucket._listed[1:]:
+            self.assertEqual(kw['fields'], 'items/name,nextPageToken')
+            self.assertIsNone(kw['delimiter'])
+            self.assertIs(kw['client'], client)
+
+    def test_discovered_unordered_w_prefix(self):
+        bucket = _Bucket(NAMES)
+
+        blobs = self._call_fut(bucket, prefix='c/', versions=True)
+
+        self.assertEqual(sorted(blob.name for blob in blobs),
+                         ['c/1', 'c/2', 'c/3', 'c/4', 'c/5'])
+        self.assertEqual(len(bucket._listed), 2)
+        self.assertTrue(all(kw['prefix'] == 'c/' and kw['versions']
+                            for kw in bucket._listed))
+
+    def test_split_points_unordered(self):
+        bucket = _Bucket(NAMES)
+
+        blobs = list(self._call_fut(
+            bucket, split_points=['c', 'b', 'c'], max_workers=3))
+
+        self.assertEqual(sorted(blob.name for blob in blobs), NAMES)
+        self.assertEqual(
+            [(kw['start_offset'], kw['end_offset'])
+             for kw in bucket._listed],
+            [(None, 'b'), ('b', 'c'), ('c', None)])
+
+    def test_checkpoint_resume(self):
+        bucket = _Bucket(NAMES)
+        checkpoint = {}
+
+        blobs = self._call_fut(bucket, split_points=['b', 'c'], ordered=True,
+                               checkpoint=checkpoint)
+        seen = [next(blobs).name for _ in range(5)]
+        blobs.close()
+
+        self.assertEqual(seen, ['a.txt', 'a/1', 'a/2', 'a/3', 'b/1'])
+        self.assertEqual(checkpoint['split_points'], ['b', 'c'])
+        self.assertIsNone(checkpoint['shard:'])
+        self.assertNotIn('shard:b', checkpoint)
+        self.assertNotIn('shard:c', checkpoint)
+
+        bucket = _Bucket(NAMES)
+        blobs = self._call_fut(bucket, split_points=['x'], ordered=True,
+                               checkpoint=checkpoint)
+
+        self.assertEqual([blob.name for blob in blobs], NAMES[4:])
+        self.assertEqual(checkpoint, {
+            'split_points': ['b', 'c'],
+            'shard:': None,
+            'shard:b': None,
+            'shard:c': None,
+        })
+
+    def test_checkpoint_resume_w_token(self):
+        bucket = _Bucket(NAMES)
+        checkpoint = {'split_points': [], 'shard:': '4'}
+
+        blobs = self._call_fut(bucket, checkpoint=checkpoint)
+
+        self.assertEqual([blob.name for blob in blobs], NAMES[4:])
+        self.assertEqual(bucket._listed[0]['page_token'], '4')
+        self.assertEqual(checkpoint, {'split_points': [], 'shard:': None})
+
+    def test_checkpoint_tracks_pages(self):
+        bucket = _Bucket(NAMES)
+        checkpoint = {}
+
+        blobs = self._call_fut(bucket, split_points=[],
+                               checkpoint=checkpoint)
+        for _ in range(4):
+            next(blobs)
+        self.assertNotIn('shard:', checkpoint)
+        next(blobs)
+        blobs.close()
+        self.assertEqual(checkpoint['shard:'], '4')
+
+    def test_error(self):
+        from google.cloud.exceptions import ServiceUnavailable
+
+        bucket = _Bucket(NAMES, fail_at='c/3')
+
+        for ordered in (True, False):
+            blobs = self._call_fut(bucket, ordered=ordered)
+            with self.assertRaises(ServiceUnavailable):
+                list(blobs)
+
+    def test_consumer_stops_early(self):
+        import mock
+
+        names = ['%04d' % (index,) for index in range(200)]
+        bucket = _Bucket(names)
+        split_points = names[10::10]
+
+        with mock.patch('google.cloud._helpers._PUT_TIMEOUT', new=0):
+            blobs = self._call_fut(bucket, split_points=split_points,
+                                   max_workers=2)
+            next(blobs)
+            blobs.close()
+
+        # Shards not yet started when the consumer stopped are cancelled.
+        self.assertEqual(len(bucket._listed), len(split_points) + 1)
+        self.assertLess(len(bucket._started), len(split_points) + 1)
+
+
+class _Blob(object):
+
+    def __init__(self, name):
+        self.name = name
+
+
+class _Iterator(object):
+
+    PAGE_SIZE = 4
+
+    def __init__(self, names, page_token, fail_at, started=None):
+        self._names = names
+        self._started = started
+        self._fail_at = fail_at
+        self.next_page_token = page_token
+        self.prefixes = set()
+
+    @property
+    def pages(self):
+        from google.cloud.exceptions import ServiceUnavailable
+
+        if self._started is not None:
+            self._started.append(self)
+        index = int(self.next_page_token or 0)
+        while True:
+            page = self._names[index:index + self.PAGE_SIZE]
+            if self._fail_at in page:
+                raise ServiceUnavailable('oops')
+            index += self.PAGE_SIZE
+            if index < len(self._names):
+                self.next_page_token = str(index)
+            else:
+                self.next_page_token = None
+            yield [_Blob(name) for name in page]
+            if self.next_page_token is None:
+                return
+
+
+class _Bucket(object):
+
+    def __init__(self, names, fail_at=None):
+        self._names = names
+        self._fail_at = fail_at
+        self._listed = []
+        self._started = []
+
+    def list_blobs(self, prefix=None, delimiter=None, page_token=None,
+                   fields=None, versions=None, client=None,
+                   start_offset=None, end_offset=None):
+        self._listed.append({
+            'prefix': prefix,
+            'delimiter': delimiter,
+            'page_token': page_token,
+            'fields': fields,
+            'versions': versions,
+            'client': client,
+            'start_offset': start_offset,
+            'end_offset': end_offset,
+        })
+        names = [name for name in self._names
+                 if name.startswith(prefix or '') and
+                 (start_offset is None or name >= start_offset) and
+                 (end_offset is None or name < end_offset)]
+        if delimiter is None:
+            return _Iterator(names, page_token, self._fail_at, self._started)
+
+        iterator = _Iterator([], None, None)
+        for name in names:
+            head, sep, _ = name[len(prefix or ''):].partition(delimiter)
+            if sep:
+                iterator.prefixes.add((prefix or '') + head + sep)
+        return iterator
@@ -0,0 +1,826 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+
+class TestLocalStorageHttp(unittest.TestCase):
+
+    BASE = 'https://www.googleapis.com'
+    BUCKET = BASE + '/storage/v1/b/bucket'
+    UPLOAD = BASE + '/upload/storage/v1/b/bucket/o'
+
+    def setUp(self):
+        import tempfile
+
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.root)
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.storage.local import LocalStorageHttp
+
+        return LocalStorageHttp
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def _make_http(self, versioning=False):
+        http = self._make_one(self.root)
+        body = {'name': 'bucket'}
+        if versioning:
+            body['versioning'] = {'enabled': True}
+        self._json(http, 'POST', self.BASE + '/storage/v1/b', body)
+        return http
+
+    def _request(self, http, method, uri, body=None, headers=None, **query):
+        import json
+
+        from six.moves.urllib.parse import urlencode
+
+        if query:
+            uri += '?' + urlencode(sorted(query.items()))
+        response, content = http.request(uri, method=method, body=body,
+                                         headers=headers)
+        self.assertEqual(response['content-length'], str(len(content)))
+        if response.get('content-type', '').startswith('application/json'):
+            content = json.loads(content.decode('utf-8'))
+        return response.status, response, content
+
+    def _json(self, http, method, uri, body=None, expected=200, **query):
+        import json
+
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body)
+        status, _, content = self._request(
+            http, method, uri, body=body, **query)
+        self.assertEqual(status, expected, content)
+        return content
+
+    def _upload(self, http, name, data, expected=200, **query):
+        status, _, content = self._request(
+            http, 'POST', self.UPLOAD, body=data,
+            headers={'Content-Type': 'text/plain'},
+            uploadType='media', name=name, **query)
+        self.assertEqual(status, expected, content)
+        return content
+
+    def _download(self, http, name, headers=None, **query):
+        status, response, content = self._request(
+            http, 'GET', self.BUCKET + '/o/' + name, headers=headers,
+            alt='media', **query)
+        return status, response, content
+
+    def _names(self, listing):
+        return [item['name'] for item in listing.get('items', [])]
+
+    def test_ctor(self):
+        import os
+
+        root = os.path.join(self.root, 'nested', 'root')
+        http = self._make_one(root)
+        self.assertEqual(http.root, root)
+        self.assertTrue(os.path.isdir(root))
+        self._make_one(root)  # Reuses the directory.
+
+    def test_unknown_endpoints(self):
+        http = self._make_http()
+        for method, uri in [
+                ('GET', self.BASE + '/batch'),
+                ('GET', self.BASE + '/upload/storage/v1/b/bucket'),
+                ('POST', self.BASE + '/download/storage/v1/b/bucket/o/a'),
+                ('GET', self.BASE + '/storage/v2/b'),
+                ('GET', self.BUCKET + '/x'),
+                ('GET', self.BUCKET + '/o/a/x')]:
+            error = self._json(http, method, uri, expected=404)['error']
+            self.assertEqual(error['code'], 404)
+            self.assertEqual(error['errors'][0]['reason'], 'invalid')
+
+    def test_methods_not_allowed(self):
+        http = self._make_http()
+        for method, uri in [
+                ('PUT', self.BASE + '/storage/v1/b'),
+                ('POST', self.BUCKET),
+                ('POST', self.BUCKET + '/o'),
+                ('POST', self.BUCKET + '/o/a'),
+                ('GET', self.UPLOAD)]:
+            self._json(http, method, uri, expected=405)
+
+    def test_buckets(self):
+        import os
+
+        http = self._make_http()
+        bucket = self._json(http, 'GET', self.BUCKET)
+        self.assertEqual(bucket['kind'], 'storage#bucket')
+        self.assertEqual(bucket['name'], 'bucket')
+        self.assertEqual(bucket['metageneration'], '1')
+        self.assertEqual(bucket['selfLink'], self.BUCKET)
+
+        self._json(http, 'POST', self.BASE + '/storage/v1/b',
+                   {'name': 'bucket'}, expected=409)
+        self._json(http, 'POST', self.BASE + '/storage/v1/b',
+                   {'name': '.uploads'}, expected=400)
+        self._json(http, 'GET', self.BASE + '/storage/v1/b/missing',
+                   expected=404)
+
+        patched = self._json(http, 'PATCH', self.BUCKET, {
+            'labels': {'a': 'b'}, 'name': 'ignored', 'location': None},
+            ifMetagenerationMatch=1)
+        self.assertEqual(patched['labels'], {'a': 'b'})
+        self.assertEqual(patched['name'], 'bucket')
+        self.assertNotIn('location', patched)
+        self.assertEqual(patched['metageneration'], '2')
+        self.assertNotEqual(patched['etag'], bucket['etag'])
+        self._json(http, 'PATCH', self.BUCKET, {}, expected=412,
+                   ifMetagenerationMatch=1)
+
+        replaced = self._json(http, 'PUT', self.BUCKET, {'location': 'EU'})
+        self.assertEqual(replaced['location'], 'EU')
+        self.assertNotIn('labels', replaced)
+        self.assertEqual(replaced['metageneration'], '3')
+
+        self.assertEqual(self._json(http, 'GET', self.BUCKET + '/acl'),
+                         {'items': []})
+        self._json(http, 'PATCH', self.BUCKET,
+                   {'defaultObjectAcl': [{'entity': 'allUsers'}]})
+        self.assertEqual(
+            self._json(http, 'GET', self.BUCKET + '/defaultObjectAcl'),
+            {'items': [{'entity': 'allUsers'}]})
+
+        # A bucket whose metadata was lost is created again.
+        os.remove(os.path.join(self.root, 'bucket', 'bucket.json'))
+        self._json(http, 'POST', self.BASE + '/storage/v1/b',
+                   {'name': 'bucket'})
+
+    def test_list_buckets(self):
+        http = self._make_one(self.root)
+        for name in ['b-3', 'b-1', 'a', 'b-2']:
+            self._json(http, 'POST', self.BASE + '/storage/v1/b',
+                       {'name': name})
+
+        page = self._json(http, 'GET', self.BASE + '/storage/v1/b',
+                          prefix='b-', maxResults=2)
+        self.assertEqual(self._names(page), ['b-1', 'b-2'])
+        page = self._json(http, 'GET', self.BASE + '/storage/v1/b',
+                          prefix='b-', maxResults=2,
+                          pageToken=page['nextPageToken'])
+        self.assertEqual(self._names(page), ['b-3'])
+        self.assertNotIn('nextPageToken', page)
+
+        page = self._json(http, 'GET', self.BASE + '/storage/v1/b',
+                          prefix='c')
+        self.assertEqual(page, {'kind': 'storage#buckets'})
+        self._json(http, 'GET', self.BASE + '/storage/v1/b',
+                   pageToken='!', expected=400)
+
+    def test_delete_bucket(self):
+        import os
+
+        http = self._make_http()
+        self._upload(http, 'a', b'data')
+        self._json(http, 'DELETE', self.BUCKET, expected=409)
+        self._json(http, 'DELETE', self.BUCKET + '/o/a', expected=204)
+        self._json(http, 'DELETE', self.BUCKET, expected=204)
+        self.assertFalse(os.path.exists(os.path.join(self.root, 'bucket')))
+        self._json(http, 'GET', self.BUCKET, expected=404)
+
+    def test_media_upload_and_download(self):
+        import base64
+        import hashlib
+
+        http = self._make_http()
+        resource = self._upload(http, 'a/b c', b'0123456789')
+        self.assertEqual(resource['kind'], 'storage#object')
+        self.assertEqual(resource['name'], 'a/b c')
+        self.assertEqual(resource['bucket'], 'bucket')
+        self.assertEqual(resource['size'], '10')
+        self.assertEqual(resource['contentType'], 'text/plain')
+        self.assertEqual(resource['metageneration'], '1')
+        self.assertEqual(resource['md5Hash'], base64.b64encode(
+            hashlib.md5(b'0123456789').digest()).decode('ascii'))
+        self.assertEqual(resource['selfLink'], self.BUCKET + '/o/a%2Fb%20c')
+        self.assertEqual(
+            resource['mediaLink'],
+            self.BASE + '/download/storage/v1/b/bucket/o/a%2Fb%20c' +
+            '?generation=%s&alt=media' % (resource['generation'],))
+
+        self.assertEqual(self._json(http, 'GET', self.BUCKET + '/o/a%2Fb%20c'),
+                         resource)
+        status, response, content = self._download(http, 'a%2Fb%20c')
+        self.assertEqual((status, content), (200, b'0123456789'))
+        self.assertEqual(response['content-type'], 'text/plain')
+        self.assertEqual(response['x-goog-generation'],
+                         resource['generation'])
+
+        status, response, content = self._request(
+            http, 'GET', resource['mediaLink'],
+            headers={'Range': 'bytes=2-4'})
+        self.assertEqual((status, content), (206, b'234'))
+        self.assertEqual(response['content-range'], 'bytes 2-4/10')
+        for header, expected in [('bytes=8-', b'89'), ('bytes=7-100', b'789'),
+                                 ('bytes=-3', b'789'), ('bytes=-30', None)]:
+            status, _, content = self._download(
+                http, 'a%2Fb%20c', headers={'range': header})
+            self.assertEqual(status, 206)
+            self.assertEqual(content, expected or b'0123456789')
+        for header in ['bytes=10-', 'bytes=5-4']:
+            status, _, _ = self._download(
+                http, 'a%2Fb%20c', headers={'range': header})
+            self.assertEqual(status, 416)
+        status, _, content = self._download(
+            http, 'a%2Fb%20c', headers={'range': 'items=0-1'})
+        self.assertEqual((status, content), (200, b'0123456789'))
+
+        # No content type, no data.
+        status, _, content = self._request(
+            http, 'POST', self.UPLOAD, uploadType='media', name='empty')
+        self.assertEqual(content['contentType'], 'application/octet-stream')
+        status, _, content = self._download(http, 'empty',
+                                            headers={'range': 'bytes=0-9'})
+        self.assertEqual((status, content), (200, b''))
+
+        self._json(http, 'GET', self.BUCKET + '/o/missing', expected=404)
+        self._json(http, 'POST', self.UPLOAD, expected=400,
+                   uploadType='media')
+
+    def test_upload_bodies(self):
+        import io
+
+        http = self._make_http()
+        status, _, content = self._request(
+            http, 'POST', self.UPLOAD, body=io.BytesIO(b'file'),
+            uploadType='media', name='file')
+        self.assertEqual(content['size'], '4')
+        status, _, content = self._request(
+            http, 'POST', self.UPLOAD, body=memoryview(b'view')[1:],
+            uploadType='media', name='view')
+        self.assertEqual(content['size'], '3')
+        status, _, content = self._request(
+            http, 'POST', self.UPLOAD, body=u'é',
+            uploadType='media', name='text')
+        self.assertEqual(content['size'], '2')
+        self._json(http, 'POST', self.UPLOAD, expected=400,
+                   uploadType='unknown')
+
+    def test_multipart_upload(self):
+        http = self._make_http()
+        for line_break in ['\r\n', '\n']:
+            body = line_break.join([
+                '--==boundary==',
+                'Content-Type: application/json',
+                '',
+                '{"name": "a", "metadata": {"k": "v"}}',
+                '--==boundary==',
+                'Content-Type: image/png',
+                '',
+                'data',
+                '--==boundary==--',
+                '',
+            ]).encode('utf-8')
+            status, _, resource = self._request(
+                http, 'POST', self.UPLOAD, body=body, uploadType='multipart',
+                headers={'content-type':
+                         'multipart/related; boundary="==boundary=="'})
+            self.assertEqual(status, 200)
+            self.assertEqual(resource['name'], 'a')
+            self.assertEqual(resource['metadata'], {'k': 'v'})
+            self.assertEqual(resource['contentType'], 'image/png')
+            self.assertEqual(resource['size'], '4')
+
+        body = (b'--b\r\n\r\n{"contentType": "text/plain"}\r\n'
+                b'--b\r\nno-headers\r\n--b--')
+        status, _, resource = self._request(
+            http, 'POST', self.UPLOAD, body=body, uploadType='multipart',
+            name='named', headers={'content-type': 'multipart/related; b=b'})
+        self.assertEqual(status, 400)
+        status, _, resource = self._request(
+            http, 'POST', self.UPLOAD, body=body, uploadType='multipart',
+            name='named', headers={'content-type':
+                                   'multipart/related; boundary=b'})
+        self.assertEqual(status, 200, resource)
+        self.assertEqual(resource['name'], 'named')
+        self.assertEqual(resource['contentType'], 'text/plain')
+        self.assertEqual(resource['size'], '0')
+
+        status, _, resource = self._request(
+            http, 'POST', self.UPLOAD,
+            body=b'--b\r\n\r\nnot json\r\n--b\r\n\r\ndata\r\n--b--',
+            uploadType='multipart',
+            headers={'content-type': 'multipart/related; boundary=b'})
+        self.assertEqual(status, 400)
+
+    def test_resumable_upload(self):
+        http = self._make_http()
+        status, response, _ = self._request(
+            http, 'POST', self.UPLOAD, body='{"metadata": {"k": "v"}}',
+            headers={'X-Upload-Content-Type': 'text/csv'},
+            uploadType='resumable', name='big')
+        self.assertEqual(status, 200)
+        location = response['location']
+        self.assertTrue(location.startswith(self.UPLOAD + '?'))
+
+        status, response, _ = self._request(
+            http, 'PUT', location, headers={'Content-Range': 'bytes */*'})
+        self.assertEqual(status, 308)
+        self.assertNotIn('range', response)
+
+        status, response, _ = self._request(
+            http, 'PUT', location, body=b'01234',
+            headers={'Content-Range': 'bytes 0-4/*'})
+        self.assertEqual(status, 308)
+        self.assertEqual(response['range'], 'bytes=0-4')
+        # Resending overlapping data.
+        status, response, _ = self._request(
+            http, 'PUT', location, body=b'3456',
+            headers={'Content-Range': 'bytes 3-6/*'})
+        self.assertEqual(response['range'], 'bytes=0-6')
+        self._json(http, 'PUT', location, body=b'x', expected=400,
+                   headers={'Content-Range': 'bytes 9-9/*'})
+        self._json(http, 'PUT', location, expected=400,
+                   headers={'Content-Range': 'items 0-1/2'})
+        status, response, _ = self._request(
+            http, 'PUT', location, headers={'Content-Range': 'bytes */*'})
+        self.assertEqual((status, response['range']), (308, 'bytes=0-6'))
+
+        status, _, resource = self._request(
+            http, 'PUT', location, body=b'789',
+            headers={'Content-Range': 'bytes 7-9/10'})
+        self.assertEqual(status, 200)
+        self.assertEqual(resource['name'], 'big')
+        self.assertEqual(resource['contentType'], 'text/csv')
+        self.assertEqual(resource['metadata'], {'k': 'v'})
+        self.assertEqual(self._download(http, 'big')[2], b'0123456789')
+        self._json(http, 'PUT', location, expected=404,
+                   headers={'Content-Range': 'bytes */10'})
+
+    def test_resumable_upload_errors(self):
+        import os
+
+        http = self._make_http()
+        self._json(http, 'POST', self.UPLOAD, expected=400,
+                   uploadType='resumable')
+        self._json(http, 'POST', self.UPLOAD, body=[], expected=400,
+                   uploadType='resumable')
+        status, response, _ = self._request(
+            http, 'POST', self.UPLOAD, body='{"name": "a"}',
+            uploadType='resumable')
+        self._json(http, 'DELETE', response['location'], expected=204)
+        self.assertEqual(os.listdir(os.path.join(self.root, '.uploads')), [])
+        self._json(http, 'PUT', response['location'], expected=404)
+
+        # Preconditions are those of the initial request.
+        self._upload(http, 'a', b'old')
+        status, response, _ = self._request(
+            http, 'POST', self.UPLOAD, body='{"name": "a"}',
+            uploadType='resumable', ifGenerationMatch=0)
+        self._json(http, 'PUT', response['location'], body=b'new',
+                   expected=412, headers={'Content-Range': 'bytes 0-2/3'})
+
+    def test_generations(self):
+        http = self._make_http()
+        first = self._upload(http, 'a', b'one')
+        self._upload(http, 'a', b'two', expected=412, ifGenerationMatch=0)
+        self._upload(http, 'a', b'two', expected=412,
+                     ifGenerationNotMatch=first['generation'])
+        self._upload(http, 'b', b'new', expected=412, ifMetagenerationMatch=1)
+        second = self._upload(http, 'a', b'two',
+                              ifGenerationMatch=first['generation'],
+                              ifMetagenerationNotMatch=2)
+        self.assertGreater(int(second['generation']),
+                           int(first['generation']))
+        self.assertEqual(self._download(http, 'a')[2], b'two')
+        # Without versioning, the old generation is gone.
+        self._json(http, 'GET', self.BUCKET + '/o/a', expected=404,
+                   generation=first['generation'])
+
+        http = self._make_one(self.root)  # Generations still increase.
+        self.assertGreater(int(self._upload(http, 'a', b'3')['generation']),
+                           int(second['generation']))
+
+    def test_versioning(self):
+        http = self._make_http(versioning=True)
+        first = self._upload(http, 'a', b'one')
+        second = self._upload(http, 'a', b'two')
+
+        archived = self._json(http, 'GET', self.BUCKET + '/o/a',
+                              generation=first['generation'])
+        self.assertIn('timeDeleted', archived)
+        self.assertEqual(self._download(
+            http, 'a', generation=first['generation'])[2], b'one')
+        listing = self._json(http, 'GET', self.BUCKET + '/o', versions='true')
+        self.assertEqual(
+            [item['generation'] for item in listing['items']],
+            [first['generation'], second['generation']])
+        self.assertEqual(
+            len(self._json(http, 'GET', self.BUCKET + '/o')['items']), 1)
+
+        self._json(http, 'DELETE', self.BUCKET + '/o/a', expected=204)
+        self._json(http, 'GET', self.BUCKET + '/o/a', expected=404)
+        self._json(http, 'DELETE', self.BUCKET + '/o/a', expected=204,
+                   generation=first['generation'])
+        self._json(http, 'DELETE', self.BUCKET + '/o/a', expected=204,
+                   generation=second['generation'])
+        self.assertEqual(self._json(http, 'GET', self.BUCKET + '/o',
+                                    versions='true'),
+                         {'kind': 'storage#objects'})
+
+        # Retiring an object when versioning was disabled keeps the
+        # generations archived earlier.
+        first = self._upload(http, 'b', b'one')
+        self._upload(http, 'b', b'two')
+        self._json(http, 'PATCH', self.BUCKET, {'versioning': None})
+        self._json(http, 'DELETE', self.BUCKET + '/o/b', expected=204)
+        self._json(http, 'GET', self.BUCKET + '/o/b', expected=200,
+                   generation=first['generation'])
+
+    def test_patch_and_update_object(self):
+        http = self._make_http()
+        resource = self._upload(http, 'a', b'data')
+        patched = self._json(
+            http, 'PATCH', self.BUCKET + '/o/a',
+            {'metadata': {'a': '1', 'b': '2'}, 'cacheControl': 'no-cache',
+             'size': '100'}, ifMetagenerationMatch=1)
+        self.assertEqual(patched['metadata'], {'a': '1', 'b': '2'})
+        self.assertEqual(patched['size'], '4')
+        self.assertEqual(patched['metageneration'], '2')
+        self.assertEqual(patched['generation'], resource['generation'])
+        self.assertNotEqual(patched['etag'], resource['etag'])
+
+        patched = self._json(http, 'PATCH', self.BUCKET + '/o/a',
+                             {'metadata': {'a': None, 'c': '3'}})
+        self.assertEqual(patched['metadata'], {'b': '2', 'c': '3'})
+        self._json(http, 'PATCH', self.BUCKET + '/o/a', {}, expected=412,
+                   ifMetagenerationMatch=1)
+        self._json(http, 'PATCH', self.BUCKET + '/o/a', body='[1]',
+                   expected=400)
+        self._json(http, 'PATCH', self.BUCKET + '/o/a', body='{',
+                   expected=400)
+
+        updated = self._json(http, 'PUT', self.BUCKET + '/o/a',
+                             {'contentLanguage': 'en'})
+        self.assertEqual(updated['contentLanguage'], 'en')
+        self.assertEqual(updated['contentType'], 'application/octet-stream')
+        self.assertNotIn('metadata', updated)
+        self.assertNotIn('cacheControl', updated)
+
+        self.assertEqual(self._json(http, 'GET', self.BUCKET + '/o/a/acl'),
+                         {'items': []})
+
+    def test_gzip_content_encoding(self):
+        import gzip
+        import io
+
+        buf = io.BytesIO()
+        with gzip.GzipFile(fileobj=buf, mode='wb') as gzip_file:
+            gzip_file.write(b'hello' * 100)
+        http = self._make_http()
+        self._upload(http, 'a', buf.getvalue())
+        self._json(http, 'PATCH', self.BUCKET + '/o/a',
+                   {'contentEncoding': 'gzip'})
+
+        status, response, content = self._download(
+            http, 'a', headers={'range': 'bytes=0-9'})
+        self.assertEqual((status, content), (200, b'hello' * 100))
+        self.assertNotIn('content-encoding', response)
+
+        status, response, content = self._download(
+            http, 'a', headers={'accept-encoding': 'gzip',
+                                'range': 'bytes=0-9'})
+        self.assertEqual((status, content), (206, buf.getvalue()[:10]))
+        self.assertEqual(response['content-encoding'], 'gzip')
+
+    def test_list_objects(self):
+        http = self._make_http()
+        names = ['a', 'b/1', 'b/2', 'b/c/3', 'c', 'd/4']
+        for name in names:
+            self._upload(http, name, b'x')
+        url = self.BUCKET + '/o'
+
+        self.assertEqual(self._names(self._json(http, 'GET', url)), names)
+        listing = self._json(http, 'GET', url, delimiter='/')
+        self.assertEqual(self._names(listing), ['a', 'c'])
+        self.assertEqual(listing['prefixes'], ['b/', 'd/'])
+        listing = self._json(http, 'GET', url, delimiter='/', prefix='b/')
+        self.assertEqual(self._names(listing), ['b/1', 'b/2'])
+        self.assertEqual(listing['prefixes'], ['b/c/'])
+        listing = self._json(http, 'GET', url, startOffset='b/2',
+                             endOffset='d')
+        self.assertEqual(self._names(listing), ['b/2', 'b/c/3', 'c'])
+
+        pages = []
+        query = {'delimiter': '/', 'maxResults': 1}
+        while True:
+            listing = self._json(http, 'GET', url, **query)
+            pages.append((self._names(listing), listing.get('prefixes')))
+            if 'nextPageToken' not in listing:
+                break
+            query['pageToken'] = listing['nextPageToken']
+        self.assertEqual(pages, [(['a'], None), ([], ['b/']), (['c'], None),
+                                 ([], ['d/'])])
+
+        listing = self._json(http, 'GET', url, maxResults=0)
+        self.assertEqual(self._names(listing), ['a'])
+        self._json(http, 'GET', self.BASE + '/storage/v1/b/missing/o',
+                   expected=404)
+
+    def test_copy(self):
+        http = self._make_http()
+        self._json(http, 'POST', self.BASE + '/storage/v1/b',
+                   {'name': 'other'})
+        source = self._upload(http, 'a', b'data')
+        self._json(http, 'PATCH', self.BUCKET + '/o/a',
+                   {'metadata': {'k': 'v'}})
+
+        copied = self._json(http, 'POST',
+                            self.BUCKET + '/o/a/copyTo/b/other/o/b%2Fc',
+                            {'cacheControl': 'private'},
+                            ifSourceGenerationMatch=source['generation'],
+                            ifSourceMetagenerationMatch=2)
+        self.assertEqual(copied['bucket'], 'other')
+        self.assertEqual(copied['name'], 'b/c')
+        self.assertEqual(copied['metadata'], {'k': 'v'})
+        self.assertEqual(copied['cacheControl'], 'private')
+        self.assertEqual(copied['md5Hash'], source['md5Hash'])
+        self.assertEqual(copied['metageneration'], '1')
+        self.assertEqual(self._request(
+            http, 'GET', self.BASE + '/storage/v1/b/other/o/b%2Fc',
+            alt='media')[2], b'data')
+
+        self._json(http, 'POST', self.BUCKET + '/o/a/copyTo/b/other/o/d',
+                   expected=412, ifSourceGenerationMatch=0)
+        self._json(http, 'POST', self.BUCKET + '/o/a/copyTo/b/none/o/d',
+                   expected=404)
+        self._json(http, 'POST', self.BUCKET + '/o/a/copyTo/b/other/o/d',
+                   expected=404, sourceGeneration=1)
+
+    def test_rewrite(self):
+        http = self._make_http()
+        source = self._upload(http, 'a', b'0123456789')
+        url = self.BUCKET + '/o/a/rewriteTo/b/bucket/o/b'
+
+        result = self._json(http, 'POST', url, {'contentType': 'x/y'},
+                            maxBytesRewrittenPerCall=4)
+        self.assertEqual(result['kind'], 'storage#rewriteResponse')
+        self.assertEqual((result['totalBytesRewritten'],
+                          result['objectSize'], result['done']),
+                         ('4', '10', False))
+        self.assertEqual(result['resource']['name'], 'b')
+        self.assertEqual(result['resource']['contentType'], 'x/y')
+        self._json(http, 'GET', self.BUCKET + '/o/b', expected=404)
+
+        token = result['rewriteToken']
+        result = self._json(http, 'POST', url, {'contentType': 'x/y'},
+                            maxBytesRewrittenPerCall=4, rewriteToken=token)
+        self.assertEqual(result['totalBytesRewritten'], '8')
+        result = self._json(http, 'POST', url, {'contentType': 'x/y'},
+                            maxBytesRewrittenPerCall=4,
+                            rewriteToken=result['rewriteToken'])
+        self.assertTrue(result['done'])
+        self.assertNotIn('rewriteToken', result)
+        self.assertEqual(result['totalBytesRewritten'], '10')
+        self.assertEqual(result['resource']['contentType'], 'x/y')
+        self.assertEqual(result['resource']['md5Hash'], source['md5Hash'])
+        self.assertEqual(self._download(http, 'b')[2], b'0123456789')
+
+        # The token is for another source generation.
+        self._upload(http, 'a', b'changed')
+        self._json(http, 'POST', url, expected=400, rewriteToken=token)
+        result = self._json(http, 'POST', url)
+        self.assertTrue(result['done'])
+        self.assertEqual(result['totalBytesRewritten'], '7')
+
+    def test_compose(self):
+        http = self._make_http()
+        first = self._upload(http, 'a', b'abc')
+        self._upload(http, 'b', b'def')
+        url = self.BUCKET + '/o/c/compose'
+
+        composed = self._json(http, 'POST', url, {
+            'sourceObjects': [
+                {'name': 'a', 'generation': first['generation'],
+                 'objectPreconditions': {
+                     'ifGenerationMatch': first['generation']}},
+                {'name': 'b'}],
+            'destination': {'contentType': 'text/plain'}})
+        self.assertEqual(composed['componentCount'], 2)
+        self.assertEqual(composed['contentType'], 'text/plain')
+        self.assertEqual(self._download(http, 'c')[2], b'abcdef')
+
+        composed = self._json(http, 'POST', self.BUCKET + '/o/d/compose', {
+            'sourceObjects': [{'name': 'c'}, {'name': 'a'}]})
+        self.assertEqual(composed['componentCount'], 3)
+        self.assertEqual(composed['contentType'], 'application/octet-stream')
+        self.assertEqual(self._download(http, 'd')[2], b'abcdefabc')
+
+        self._json(http, 'POST', url, {'sourceObjects': []}, expected=400)
+        self._json(http, 'POST', url, {
+            'sourceObjects': [{'name': 'a'}] * 33}, expected=400)
+        self._json(http, 'POST', url, {
+            'sourceObjects': [{'name': 'a', 'objectPreconditions': {
+                'ifGenerationMatch': 1}}]}, expected=412)
+        self._json(http, 'POST', url, {
+            'sourceObjects': [{'name': 'missing'}]}, expected=404)
+
+    def test_batch(self):
+        from google.cloud.storage.batch import _encode_subrequest
+        from google.cloud.storage.batch import _unpack_batch_response
+
+        http = self._make_http()
+        self._upload(http, 'a', b'data')
+        parts = [
+            _encode_subrequest('GET', self.BUCKET + '/o/a', {}, None),
+            _encode_subrequest('PATCH', self.BUCKET + '/o/a', {},
+                               {'cacheControl': 'private'}),
+            _encode_subrequest('DELETE', self.BUCKET + '/o/missing', {},
+                               None),
+        ]
+        body = '--b\n' + '\n--b\n'.join(parts) + '\n--b--\n'
+        response, content = http.request(
+            self.BASE + '/batch', method='POST', body=body,
+            headers={'Content-Type': 'multipart/mixed; boundary="b"'})
+        self.assertEqual(response.status, 200)
+        results = list(_unpack_batch_response(response, content))
+        self.assertEqual([headers.status for headers, _ in results],
+                         [200, 200, 404])
+        self.assertEqual(results[0][1]['name'], 'a')
+        self.assertEqual(results[1][1]['cacheControl'], 'private')
+        self.assertEqual(results[2][1]['error']['code'], 404)
+
+        self._json(http, 'POST', self.BASE + '/batch/storage/v1',
+                   body={}, expected=400)
+
+    def test_threads(self):
+        import threading
+
+        http = self._make_http()
+        errors = []
+
+        def _work(index):
+            try:
+                for count in range(5):
+                    self._upload(http, 'obj-%d' % (index,),
+                                 str(count).encode('ascii'))
+            except Exception as exc:  # pragma: NO COVER
+                errors.append(exc)
+
+        threads = [threading.Thread(target=_work, args=(index,))
+                   for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        listing = self._json(http, 'GET', self.BUCKET + '/o')
+        self.assertEqual(self._names(listing),
+                         ['obj-%d' % (index,) for index in range(4)])
+
+
+class TestLocalStorageHttpWithClient(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.root)
+
+    def _make_client(self):
+        from google.cloud.storage.client import Client
+        from google.cloud.storage.local import LocalStorageHttp
+
+        return Client(project='local', http=LocalStorageHttp(self.root))
+
+    def test_transfers(self):
+        import io
+
+        client = self._make_client()
+        bucket = client.create_bucket('bucket')
+        data = b'0123456789' * 100000
+
+        simple = bucket.blob('simple')
+        simple.upload_from_string(data[:100], content_type='text/plain')
+        self.assertEqual(simple.size, 100)
+        self.assertEqual(simple.download_as_string(), data[:100])
+
+        chunked = bucket.blob('chunked', chunk_size=256 * 1024)
+        chunked.upload_from_file(io.BytesIO(data))
+        self.assertEqual(chunked.size, len(data))
+        out = io.BytesIO()
+        bucket.blob('chunked', chunk_size=256 * 1024).download_to_file(out)
+        self.assertEqual(out.getvalue(), data)
+
+        compressed = bucket.blob('compressed')
+        compressed.upload_from_file(io.BytesIO(data), gzip=True)
+        self.assertEqual(compressed.content_encoding, 'gzip')
+        self.assertLess(compressed.size, len(data))
+        out = io.BytesIO()
+        compressed.download_to_file(out, decompress=True)
+        self.assertEqual(out.getvalue(), data)
+
+    def test_objects(self):
+        from google.cloud.exceptions import NotFound
+
+        client = self._make_client()
+        bucket = client.create_bucket('bucket')
+        for name in ['a', 'b', 'dir/c']:
+            bucket.blob(name).upload_from_string(name.encode('utf-8'))
+
+        iterator = bucket.list_blobs(delimiter='/')
+        self.assertEqual([blob.name for blob in iterator], ['a', 'b'])
+        self.assertEqual(iterator.prefixes, set(['dir/']))
+
+        composed = bucket.blob('composed')
+        composed.content_type = 'text/plain'
+        composed.compose([bucket.blob('a'), bucket.blob('b')])
+        self.assertEqual(composed.download_as_string(), b'ab')
+
+        rewritten = bucket.blob('rewritten')
+        token, rewritten_bytes, total = rewritten.rewrite(composed)
+        self.assertEqual((token, rewritten_bytes, total), (None, 2, 2))
+
+        copied = bucket.copy_blob(bucket.blob('a'), bucket, 'copied')
+        self.assertEqual(copied.download_as_string(), b'a')
+
+        with client.batch():
+            bucket.delete_blob('copied')
+            bucket.delete_blob('composed')
+        self.assertIsNone(bucket.get_blob('copied'))
+        with self.assertRaises(NotFound):
+            bucket.blob('missing').download_as_string()
+        self.assertEqual([b.name for b in client.list_buckets()], ['bucket'])
+
+
+class Test__parse_range(unittest.TestCase):
+
+    def _call_fut(self, header, size):
+        from google.cloud.storage.local import _parse_range
+
+        return _parse_range(header, size)
+
+    def test_it(self):
+        self.assertIsNone(self._call_fut(None, 10))
+        self.assertIsNone(self._call_fut('bytes=0-1', 0))
+        self.assertEqual(self._call_fut('bytes=0-', 10), (0, 9))
+        self.assertEqual(self._call_fut('bytes=-4', 10), (6, 9))
+        self.assertEqual(self._call_fut('bytes=2-3', 10), (2, 3))
+
+
+class Test__parse_content_range(unittest.TestCase):
+
+    def _call_fut(self, header):
+        from google.cloud.storage.local import _parse_content_range
+
+        return _parse_content_range(header)
+
+    def test_it(self):
+        self.assertEqual(self._call_fut('bytes */*'), (None, None))
+        self.assertEqual(self._call_fut('bytes */10'), (None, 10))
+        self.assertEqual(self._call_fut('bytes 5-9/*'), (5, None))
+        self.assertEqual(self._call_fut('bytes 5-9/10'), (5, 10))
+
+
+class Test__split_part(unittest.TestCase):
+
+    def _call_fut(self, part):
+        from google.cloud.storage.local import _split_part
+
+        return _split_part(part)
+
+    def test_it(self):
+        self.assertEqual(self._call_fut(b'A: 1\r\n\r\nbody'),
+                         ({'a': '1'}, b'body'))
+        self.assertEqual(self._call_fut(b'A: 1\n\nbody\n\n'),
+                         ({'a': '1'}, b'body\n\n'))
+        self.assertEqual(self._call_fut(b'A: 1'), ({'a': '1'}, b''))
+        self.assertEqual(self._call_fut(b'\nbody'), ({}, b'body'))
+
+
+class Test__split_multipart(unittest.TestCase):
+
+    def _call_fut(self, content, boundary):
+        from google.cloud.storage.local import _split_multipart
+
+        return _split_multipart(content, boundary)
+
+    def test_it(self):
+        self.assertEqual(self._call_fut(b'--bx\n--b\r\ny--b--\r\nz', b'b'),
+                         [b'x', b'y'])
+        self.assertEqual(self._call_fut(b'--b\n\n--b', b'b'), [b'', b''])
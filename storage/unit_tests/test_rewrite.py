@@ -0,0 +1,204 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+
+class TestRewriteManager(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.storage.rewrite import RewriteManager
+
+        return RewriteManager
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_ctor_defaults(self):
+        manager = self._make_one()
+        self.assertIsNone(manager._client)
+        self.assertIsNone(manager._max_workers)
+        self.assertIsNone(manager._max_bytes_rewritten_per_call)
+        self.assertIsNone(manager._checkpoint)
+        self.assertIsNone(manager._progress_callback)
+        self.assertEqual(manager.bytes_rewritten, 0)
+        self.assertEqual(manager.total_bytes, 0)
+
+    def test_rewrite(self):
+        client = object()
+        source_1 = _Blob('src', 'one')
+        dest_1 = _Blob('dst', 'one', [('T1', 10, 30), ('T2', 20, 30),
+                                      (None, 30, 30)])
+        source_2 = _Blob('src', 'two')
+        dest_2 = _Blob('dst', 'two', [(None, 5, 5)])
+        progress = []
+        manager = self._make_one(
+            client=client, max_workers=1, max_bytes_rewritten_per_call=1024,
+            progress_callback=lambda *args: progress.append(args))
+
+        results = manager.rewrite([(source_1, dest_1), (source_2, dest_2)])
+
+        self.assertEqual(results, [
+            (source_1, dest_1, 30, None),
+            (source_2, dest_2, 5, None),
+        ])
+        self.assertEqual(dest_1._calls, [
+            (source_1, None, client, 1024),
+            (source_1, 'T1', client, 1024),
+            (source_1, 'T2', client, 1024),
+        ])
+        self.assertEqual(progress, [(10, 30), (20, 30), (30, 30), (35, 35)])
+        self.assertEqual(manager.bytes_rewritten, 35)
+        self.assertEqual(manager.total_bytes, 35)
+        self.assertFalse(source_1._deleted)
+
+    def test_rewrite_concurrent(self):
+        pairs = [(_Blob('src', str(index)),
+                  _Blob('dst', str(index), [('T', 1, 2), (None, 2, 2)]))
+                 for index in range(20)]
+        manager = self._make_one(max_workers=4)
+
+        results = manager.rewrite(pairs)
+
+        self.assertEqual([result.destination for result in results],
+                         [dest for _, dest in pairs])
+        self.assertEqual(manager.bytes_rewritten, 40)
+        self.assertEqual(manager.total_bytes, 40)
+
+    def test_rewrite_checkpoint_resume(self):
+        from google.cloud.exceptions import ServiceUnavailable
+
+        source = _Blob('src', 'blob')
+        error = ServiceUnavailable('oops')
+        dest = _Blob('dst', 'blob', [('T1', 10, 30), error])
+        checkpoint = {}
+        manager = self._make_one(checkpoint=checkpoint, max_workers=1)
+
+        results = manager.rewrite([(source, dest)], delete_source=True)
+
+        self.assertEqual(results, [(source, dest, None, error)])
+        self.assertEqual(checkpoint, {'src/blob -> dst/blob': 'T1'})
+        self.assertFalse(source._deleted)
+
+        dest = _Blob('dst', 'blob', [(None, 30, 30)])
+        manager = self._make_one(checkpoint=checkpoint, max_workers=1)
+
+        results = manager.rewrite([(source, dest)], delete_source=True)
+
+        self.assertEqual(results, [(source, dest, 30, None)])
+        self.assertEqual(dest._calls, [(source, 'T1', None, None)])
+        self.assertEqual(checkpoint, {})
+        self.assertEqual(source._deleted, [None])
+
+    def test_rewrite_transport_error(self):
+        import socket
+
+        error = socket.error('connection reset')
+        source_1 = _Blob('src', 'one')
+        dest_1 = _Blob('dst', 'one', [('T1', 10, 30), error])
+        source_2 = _Blob('src', 'two')
+        dest_2 = _Blob('dst', 'two', [(None, 5, 5)])
+        checkpoint = {}
+        manager = self._make_one(checkpoint=checkpoint, max_workers=1)
+
+        results = manager.rewrite([(source_1, dest_1), (source_2, dest_2)])
+
+        self.assertEqual(results, [
+            (source_1, dest_1, None, error),
+            (source_2, dest_2, 5, None),
+        ])
+        self.assertEqual(checkpoint, {'src/one -> dst/one': 'T1'})
+
+    def test_rewrite_checkpoint_token_rejected(self):
+        from google.cloud.exceptions import BadRequest
+        from google.cloud.exceptions import NotFound
+
+        for error in (BadRequest('expired'), NotFound('gone')):
+            source = _Blob('src', 'blob')
+            dest = _Blob('dst', 'blob', [error, ('T2', 10, 30),
+                                         (None, 30, 30)])
+            checkpoint = {'src/blob -> dst/blob': 'T1'}
+            manager = self._make_one(checkpoint=checkpoint, max_workers=1)
+
+            results = manager.rewrite([(source, dest)])
+
+            self.assertEqual(results, [(source, dest, 30, None)])
+            self.assertEqual(dest._calls, [
+                (source, 'T1', None, None),
+                (source, None, None, None),
+                (source, 'T2', None, None),
+            ])
+            self.assertEqual(checkpoint, {})
+
+    def test_rewrite_rejected_without_checkpoint_token(self):
+        from google.cloud.exceptions import BadRequest
+
+        source = _Blob('src', 'blob')
+        error = BadRequest('invalid')
+        dest = _Blob('dst', 'blob', [('T1', 10, 30), error])
+        checkpoint = {}
+        manager = self._make_one(checkpoint=checkpoint, max_workers=1)
+
+        results = manager.rewrite([(source, dest)])
+
+        # Only a token read from the checkpoint is dropped.
+        self.assertEqual(results, [(source, dest, None, error)])
+        self.assertEqual(len(dest._calls), 2)
+        self.assertEqual(checkpoint, {'src/blob -> dst/blob': 'T1'})
+
+    def test_rewrite_delete_source_error(self):
+        from google.cloud.exceptions import NotFound
+
+        client = object()
+        error = NotFound('gone')
+        source = _Blob('src', 'blob', delete_error=error)
+        dest = _Blob('dst', 'blob', [(None, 1, 1)])
+        manager = self._make_one(client=client)
+
+        results = manager.rewrite([(source, dest)], delete_source=True)
+
+        self.assertEqual(results, [(source, dest, None, error)])
+        self.assertEqual(source._deleted, [client])
+
+
+class _Bucket(object):
+
+    def __init__(self, name):
+        self.name = name
+
+
+class _Blob(object):
+
+    def __init__(self, bucket_name, name, responses=(), delete_error=None):
+        self.bucket = _Bucket(bucket_name)
+        self.name = name
+        self._responses = list(responses)
+        self._delete_error = delete_error
+        self._calls = []
+        self._deleted = []
+
+    def rewrite(self, source, token=None, client=None,
+                max_bytes_rewritten_per_call=None):
+        self._calls.append(
+            (source, token, client, max_bytes_rewritten_per_call))
+        response = self._responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def delete(self, client=None):
+        self._deleted.append(client)
+        if self._delete_error is not None:
+            raise self._delete_error
@@ -0,0 +1,209 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+
+class TestURLSigner(unittest.TestCase):
+
+    EXPIRATION = 1000000000
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.storage.signing import URLSigner
+
+        return URLSigner
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def _make_credentials(self):
+        import google.auth.credentials
+        import mock
+
+        credentials = mock.Mock(spec=google.auth.credentials.Signing)
+        credentials.signer = _Signer()
+        credentials.signer_email = 'signer@example.com'
+        return credentials
+
+    def _make_blob(self, name, bucket_name='bucket'):
+        from google.cloud.storage.blob import Blob
+        from google.cloud.storage.bucket import Bucket
+
+        return Blob(name, bucket=Bucket(client=None, name=bucket_name))
+
+    def _expected(self, resource, expiration, method='GET', **query):
+        import base64
+
+        from six.moves.urllib.parse import parse_qs
+        from six.moves.urllib.parse import urlencode
+
+        string_to_sign = '\n'.join([
+            method, '', query.pop('content_type', ''), str(expiration),
+            resource])
+        query.update({
+            'GoogleAccessId': 'signer@example.com',
+            'Expires': str(expiration),
+            'Signature': base64.b64encode(
+                _Signer.signature(string_to_sign).encode('utf-8')),
+        })
+        url = 'https://storage.googleapis.com%s?%s' % (
+            resource, urlencode(query))
+        return url.split('?')[0], parse_qs(url.split('?')[1])
+
+    def _split(self, url):
+        from six.moves.urllib.parse import parse_qs
+
+        base, query = url.split('?')
+        return base, parse_qs(query)
+
+    def test_ctor_wo_signing_credentials(self):
+        with self.assertRaises(AttributeError):
+            self._make_one(object())
+
+    def test_ctor_caches_signer(self):
+        credentials = self._make_credentials()
+        signer = self._make_one(credentials)
+        self.assertIs(signer._credentials.signer, credentials.signer)
+        self.assertEqual(signer._credentials.signer_email,
+                         'signer@example.com')
+
+    def test_sign_url(self):
+        signer = self._make_one(self._make_credentials(),
+                                expiration_granularity=1)
+
+        url = signer.sign_url(
+            self._make_blob('a b/c'), self.EXPIRATION, method='PUT',
+            content_type='text/plain', generation='123',
+            response_disposition='attachment', response_type='text/html')
+
+        self.assertEqual(self._split(url), self._expected(
+            '/bucket/a%20b%2Fc', self.EXPIRATION, method='PUT',
+            content_type='text/plain', generation='123',
+            **{'response-content-disposition': 'attachment',
+               'response-content-type': 'text/html'}))
+
+    def test_sign_urls_rounds_and_memoizes(self):
+        signer = self._make_one(self._make_credentials(),
+                                expiration_granularity=60)
+        blob_1 = self._make_blob('one')
+        blob_2 = self._make_blob('two')
+
+        urls = signer.sign_urls([blob_1, blob_2, blob_1], self.EXPIRATION + 1)
+
+        rounded = self.EXPIRATION + 20  # Next multiple of 60 seconds.
+        self.assertEqual([self._split(url) for url in urls], [
+            self._expected('/bucket/one', rounded),
+            self._expected('/bucket/two', rounded),
+            self._expected('/bucket/one', rounded),
+        ])
+        self.assertEqual(
+            len([message for message in signer._credentials.signer.signed
+                 if message.endswith('/bucket/one')]), 1)
+        self.assertEqual((signer.hits, signer.misses), (0, 3))
+
+        again = signer.sign_urls([blob_2], self.EXPIRATION + 2)
+        self.assertEqual(again, urls[1:2])
+        self.assertEqual((signer.hits, signer.misses), (1, 3))
+
+        self.assertNotEqual(signer.sign_url(blob_2, self.EXPIRATION + 100),
+                            urls[1])
+
+    def test_sign_urls_timedelta(self):
+        import datetime
+
+        import mock
+
+        from google.cloud._helpers import UTC
+
+        now = datetime.datetime.fromtimestamp(self.EXPIRATION, UTC)
+        signer = self._make_one(self._make_credentials())
+
+        with mock.patch('google.cloud.credentials._NOW',
+                        new=lambda: now.replace(tzinfo=None)):
+            url = signer.sign_url(self._make_blob('one'),
+                                  datetime.timedelta(seconds=30))
+
+        rounded = self.EXPIRATION + 80  # Next multiple of 60 seconds.
+        self.assertEqual(self._split(url),
+                         self._expected('/bucket/one', rounded))
+
+    def test_sign_urls_cache_bounded(self):
+        signer = self._make_one(self._make_credentials(), cache_size=2)
+        blobs = [self._make_blob(name) for name in 'abc']
+
+        signer.sign_urls(blobs, self.EXPIRATION)
+        self.assertEqual(len(signer._cache), 2)
+        signer.sign_urls(blobs[:1], self.EXPIRATION)
+        self.assertEqual((signer.hits, signer.misses), (0, 4))
+        signer.sign_urls(blobs[:1], self.EXPIRATION)
+        self.assertEqual((signer.hits, signer.misses), (1, 4))
+
+    def test_sign_urls_cache_disabled(self):
+        signer = self._make_one(self._make_credentials(), cache_size=0)
+        blob = self._make_blob('one')
+
+        signer.sign_urls([blob], self.EXPIRATION)
+        signer.sign_urls([blob], self.EXPIRATION)
+        self.assertEqual(signer._cache, {})
+        self.assertEqual((signer.hits, signer.misses), (0, 2))
+
+    def test_sign_urls_process_pool(self):
+        import mock
+
+        blobs = [self._make_blob('blob-%d' % (index,)) for index in range(5)]
+
+        with mock.patch(
+                'google.cloud.storage.signing._PROCESS_CHUNK_SIZE', new=2):
+            with self._make_one(self._make_credentials(),
+                                expiration_granularity=1,
+                                processes=2) as signer:
+                urls = signer.sign_urls(blobs, self.EXPIRATION)
+                executor = signer._executor
+                self.assertIsNotNone(executor)
+                urls += signer.sign_urls(blobs, self.EXPIRATION + 1)
+                self.assertIs(signer._executor, executor)
+                one = signer.sign_url(self._make_blob('one'), self.EXPIRATION)
+
+        self.assertIsNone(signer._executor)
+        self.assertEqual(
+            [self._split(url) for url in urls],
+            [self._expected('/bucket/blob-%d' % (index,), self.EXPIRATION)
+             for index in range(5)] +
+            [self._expected('/bucket/blob-%d' % (index,), self.EXPIRATION + 1)
+             for index in range(5)])
+        self.assertEqual(self._split(one),
+                         self._expected('/bucket/one', self.EXPIRATION))
+
+    def test_close_wo_executor(self):
+        signer = self._make_one(self._make_credentials())
+        signer.close()
+        self.assertIsNone(signer._executor)
+
+
+class _Signer(object):
+
+    def __init__(self):
+        self.signed = []
+
+    @staticmethod
+    def signature(string_to_sign):
+        return 'sig(%s)' % (string_to_sign,)
+
+    def sign(self, message):
+        self.signed.append(message)
+        return self.signature(message).encode('utf-8')
+
+    def __getstate__(self):
+        return {'signed': []}
@@ -0,0 +1,394 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+
+class _TempDirMixin(object):
+
+    def setUp(self):
+        import tempfile
+
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.root)
+
+    def _write(self, name, data, mtime=None):
+        import os
+
+        path = os.path.join(self.root, *name.split('/'))
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(path, 'wb') as file_obj:
+            file_obj.write(data)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+
+class TestSyncReport(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.storage.sync import SyncReport
+
+        return SyncReport
+
+    def _make_one(self, elapsed=2.0, dry_run=False):
+        return self._get_target_class()(
+            copied=['a', 'b'], deleted=[], skipped=1, bytes=1000,
+            elapsed=elapsed, dry_run=dry_run)
+
+    def test_throughput(self):
+        report = self._make_one()
+        self.assertEqual(report.bytes_per_second, 500.0)
+        self.assertEqual(report.files_per_second, 1.0)
+
+    def test_throughput_dry_run(self):
+        report = self._make_one(dry_run=True)
+        self.assertEqual(report.bytes_per_second, 0.0)
+        self.assertEqual(report.files_per_second, 0.0)
+
+    def test_throughput_no_elapsed(self):
+        report = self._make_one(elapsed=0.0)
+        self.assertEqual(report.bytes_per_second, 0.0)
+        self.assertEqual(report.files_per_second, 0.0)
+
+
+class Test_sync_to_bucket(_TempDirMixin, unittest.TestCase):
+
+    def _call_fut(self, *args, **kw):
+        from google.cloud.storage.sync import sync_to_bucket
+
+        return sync_to_bucket(*args, **kw)
+
+    def test_empty(self):
+        bucket = _Bucket([])
+        report = self._call_fut(self.root, bucket)
+        self.assertEqual(report.copied, [])
+        self.assertEqual(report.deleted, [])
+        self.assertEqual(report.skipped, 0)
+        self.assertEqual(report.bytes, 0)
+        self.assertFalse(report.dry_run)
+        self.assertEqual(bucket._listed, [(None, _FIELDS, None)])
+
+    def test_changes(self):
+        import base64
+        import hashlib
+
+        mtime = 1400000000
+        self._write('new.txt', b'new')
+        self._write('dir/size.txt', b'longer', mtime=mtime)
+        self._write('dir/older.txt', b'same', mtime=mtime)
+        self._write('newer.txt', b'same', mtime=mtime + 10)
+        md5 = base64.b64encode(hashlib.md5(b'same').digest()).decode('ascii')
+        bucket = _Bucket([
+            _Blob('pre/dir/', 0, None, mtime),
+            _Blob('pre/dir/size.txt', 3, None, mtime + 5),
+            _Blob('pre/dir/older.txt', 4, md5, mtime + 5),
+            _Blob('pre/newer.txt', 4, md5, mtime + 5),
+            _Blob('pre/gone.txt', 4, md5, mtime),
+        ])
+        client = object()
+
+        report = self._call_fut(self.root, bucket, prefix='pre', client=client,
+                                max_workers=2)
+
+        self.assertEqual(report.copied,
+                         ['dir/size.txt', 'new.txt', 'newer.txt'])
+        self.assertEqual(report.deleted, [])
+        self.assertEqual(report.skipped, 1)
+        self.assertEqual(report.bytes, 13)
+        self.assertEqual(bucket._listed, [('pre/', _FIELDS, client)])
+        uploaded = sorted(bucket._uploaded)
+        self.assertEqual([name for name, _, _ in uploaded],
+                         ['pre/dir/size.txt', 'pre/new.txt', 'pre/newer.txt'])
+        self.assertEqual(uploaded[0][1], b'longer')
+        self.assertTrue(all(used is client for _, _, used in uploaded))
+        self.assertEqual(bucket._deleted, [])
+
+    def test_checksum(self):
+        import base64
+        import hashlib
+
+        mtime = 1400000000
+        self._write('same.txt', b'same', mtime=mtime + 10)
+        self._write('changed.txt', b'abcd', mtime=mtime)
+        self._write('composite.txt', b'comp', mtime=mtime + 10)
+        md5 = base64.b64encode(hashlib.md5(b'same').digest()).decode('ascii')
+        bucket = _Bucket([
+            _Blob('same.txt', 4, md5, mtime),
+            _Blob('changed.txt', 4, md5, mtime + 5),
+            _Blob('composite.txt', 4, None, mtime),
+        ])
+
+        report = self._call_fut(self.root, bucket, checksum=True)
+
+        self.assertEqual(report.copied, ['changed.txt', 'composite.txt'])
+        self.assertEqual(report.skipped, 1)
+
+    def test_sub_second_mtime(self):
+        mtime = 1400000000
+        self._write('before.txt', b'same', mtime=mtime + 0.25)
+        self._write('after.txt', b'same', mtime=mtime + 0.75)
+        bucket = _Bucket([
+            _Blob('before.txt', 4, None, mtime + 0.5),
+            _Blob('after.txt', 4, None, mtime + 0.5),
+        ])
+
+        report = self._call_fut(self.root, bucket)
+
+        self.assertEqual(report.copied, ['after.txt'])
+        self.assertEqual(report.skipped, 1)
+
+    def test_delete(self):
+        self._write('keep.txt', b'keep')
+        bucket = _Bucket([
+            _Blob('keep.txt', 3, None, 0),
+            _Blob('gone.txt', 3, None, 0),
+        ])
+        client = object()
+
+        report = self._call_fut(self.root, bucket, delete=True, client=client,
+                                max_workers=3)
+
+        self.assertEqual(report.copied, ['keep.txt'])
+        self.assertEqual(report.deleted, ['gone.txt'])
+        self.assertEqual(len(bucket._deleted), 1)
+        blobs, on_error, used, max_workers = bucket._deleted[0]
+        self.assertEqual([blob.name for blob in blobs], ['gone.txt'])
+        self.assertIsNone(on_error(blobs[0]))
+        self.assertIs(used, client)
+        self.assertEqual(max_workers, 3)
+
+    def test_dry_run(self):
+        self._write('new.txt', b'new')
+        bucket = _Bucket([_Blob('gone.txt', 3, None, 0)])
+
+        report = self._call_fut(self.root, bucket, delete=True, dry_run=True)
+
+        self.assertTrue(report.dry_run)
+        self.assertEqual(report.copied, ['new.txt'])
+        self.assertEqual(report.deleted, ['gone.txt'])
+        self.assertEqual(report.bytes, 3)
+        self.assertEqual(bucket._uploaded, [])
+        self.assertEqual(bucket._deleted, [])
+
+
+class Test_sync_from_bucket(_TempDirMixin, unittest.TestCase):
+
+    def _call_fut(self, *args, **kw):
+        from google.cloud.storage.sync import sync_from_bucket
+
+        return sync_from_bucket(*args, **kw)
+
+    def _read(self, name):
+        import os
+
+        with open(os.path.join(self.root, *name.split('/')), 'rb') as file_obj:
+            return file_obj.read()
+
+    def test_changes(self):
+        import os
+        import time
+
+        mtime = 1400000000
+        local_mtime = time.mktime(
+            _Blob('', 0, None, mtime).updated.timetuple())
+        self._write('dir/same.txt', b'same', mtime=local_mtime)
+        self._write('dir/older.txt', b'same', mtime=local_mtime - 10)
+        self._write('size.txt', b'size', mtime=local_mtime)
+        self._write('local-only.txt', b'local')
+        bucket = _Bucket([
+            _Blob('pre/dir/', 0, None, mtime),
+            _Blob('pre/dir/same.txt', 4, None, mtime, b'SAME'),
+            _Blob('pre/dir/older.txt', 4, None, mtime, b'NEWR'),
+            _Blob('pre/size.txt', 2, None, mtime, b'sz'),
+            _Blob('pre/a/b/new.txt', 3, None, mtime, b'new'),
+            _Blob('pre/a/b/other.txt', 5, None, mtime, b'other'),
+        ])
+        client = object()
+
+        report = self._call_fut(bucket, self.root, prefix='pre/',
+                                client=client, max_workers=2)
+
+        self.assertEqual(report.copied, [
+            'a/b/new.txt', 'a/b/other.txt', 'dir/older.txt', 'size.txt'])
+        self.assertEqual(report.deleted, [])
+        self.assertEqual(report.skipped, 1)
+        self.assertEqual(report.bytes, 14)
+        self.assertEqual(bucket._listed, [('pre/', _FIELDS, client)])
+        self.assertEqual(self._read('dir/same.txt'), b'same')
+        self.assertEqual(self._read('dir/older.txt'), b'NEWR')
+        self.assertEqual(self._read('size.txt'), b'sz')
+        self.assertEqual(self._read('a/b/new.txt'), b'new')
+        self.assertEqual(self._read('local-only.txt'), b'local')
+        self.assertEqual(
+            os.path.getmtime(os.path.join(self.root, 'size.txt')),
+            local_mtime)
+
+        # A second pass finds nothing to do.
+        report = self._call_fut(bucket, self.root, prefix='pre/',
+                                client=client)
+        self.assertEqual(report.copied, [])
+        self.assertEqual(report.skipped, 5)
+
+    def test_checksum(self):
+        import base64
+        import hashlib
+
+        md5 = base64.b64encode(hashlib.md5(b'same').digest()).decode('ascii')
+        self._write('same.txt', b'same', mtime=1)
+        self._write('changed.txt', b'abcd')
+        bucket = _Bucket([
+            _Blob('same.txt', 4, md5, 1400000000),
+            _Blob('changed.txt', 4, md5, 1, b'same'),
+        ])
+
+        report = self._call_fut(bucket, self.root, checksum=True)
+
+        self.assertEqual(report.copied, ['changed.txt'])
+        self.assertEqual(self._read('same.txt'), b'same')
+        self.assertEqual(self._read('changed.txt'), b'same')
+
+    def test_delete(self):
+        import os
+
+        self._write('gone/file.txt', b'gone')
+        bucket = _Bucket([_Blob('new.txt', 3, None, 0, b'new')])
+
+        report = self._call_fut(bucket, self.root, delete=True)
+
+        self.assertEqual(report.copied, ['new.txt'])
+        self.assertEqual(report.deleted, ['gone/file.txt'])
+        self.assertFalse(
+            os.path.exists(os.path.join(self.root, 'gone', 'file.txt')))
+
+    def test_dry_run(self):
+        import os
+
+        self._write('gone.txt', b'gone')
+        bucket = _Bucket([_Blob('new.txt', 3, None, 0, b'new')])
+
+        report = self._call_fut(bucket, self.root, delete=True, dry_run=True)
+
+        self.assertTrue(report.dry_run)
+        self.assertEqual(report.copied, ['new.txt'])
+        self.assertEqual(report.deleted, ['gone.txt'])
+        self.assertEqual(os.listdir(self.root), ['gone.txt'])
+
+    def test_missing_destination(self):
+        import os
+
+        destination = os.path.join(self.root, 'missing')
+        bucket = _Bucket([_Blob('new.txt', 3, None, 0, b'new')])
+
+        report = self._call_fut(bucket, destination)
+
+        self.assertEqual(report.copied, ['new.txt'])
+        self.assertEqual(os.listdir(destination), ['new.txt'])
+
+    def test_name_escapes_destination(self):
+        bucket = _Bucket([_Blob('pre/../../evil.txt', 4, None, 0)])
+        with self.assertRaises(ValueError):
+            self._call_fut(bucket, self.root, prefix='pre')
+
+    def test_concurrent_makedirs(self):
+        import os
+
+        import mock
+
+        bucket = _Bucket([_Blob('dir/new.txt', 3, None, 0, b'new')])
+        real_makedirs = os.makedirs
+
+        def _racing_makedirs(path):
+            real_makedirs(path)
+            raise OSError('exists')
+
+        with mock.patch('os.makedirs', new=_racing_makedirs):
+            report = self._call_fut(bucket, self.root)
+
+        self.assertEqual(report.copied, ['dir/new.txt'])
+        self.assertEqual(self._read('dir/new.txt'), b'new')
+
+    def test_makedirs_failure(self):
+        import mock
+
+        bucket = _Bucket([_Blob('dir/new.txt', 3, None, 0, b'new')])
+
+        with mock.patch('os.makedirs', side_effect=OSError('denied')):
+            with self.assertRaises(OSError):
+                self._call_fut(bucket, self.root)
+
+
+_FIELDS = 'items(name,size,md5Hash,updated,mediaLink),nextPageToken'
+
+
+class _Blob(object):
+
+    def __init__(self, name, size, md5_hash, updated, data=b''):
+        import datetime
+
+        from google.cloud._helpers import UTC
+
+        self.name = name
+        self.size = size
+        self.md5_hash = md5_hash
+        self.updated = datetime.datetime.fromtimestamp(updated, UTC)
+        self._data = data
+        self._uploaded = []
+
+    def upload_from_filename(self, filename, client=None):
+        with open(filename, 'rb') as file_obj:
+            self._uploaded.append((self.name, file_obj.read(), client))
+
+    def download_to_filename(self, filename, client=None):
+        import os
+        import time
+
+        with open(filename, 'wb') as file_obj:
+            file_obj.write(self._data)
+        mtime = time.mktime(self.updated.timetuple())
+        os.utime(filename, (mtime, mtime))
+
+
+class _Bucket(object):
+
+    def __init__(self, blobs):
+        self._blobs = blobs
+        self._listed = []
+        self._created = []
+        self._deleted = []
+
+    @property
+    def _uploaded(self):
+        return [upload for blob in self._created
+                for upload in blob._uploaded]
+
+    def list_blobs(self, prefix=None, fields=None, client=None):
+        self._listed.append((prefix, fields, client))
+        return iter(self._blobs)
+
+    def blob(self, name):
+        blob = _Blob(name, None, None, 0)
+        self._created.append(blob)
+        return blob
+
+    def delete_blobs(self, blobs, on_error=None, client=None,
+                     max_workers=None):
+        self._deleted.append((blobs, on_error, client, max_workers))
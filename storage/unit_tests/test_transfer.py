@@ -0,0 +1,384 @@
+# Copyright 2016 Google Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+
+class TestTransferStats(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.storage.transfer import TransferStats
+
+        return TransferStats
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_rates(self):
+        stats = self._make_one(10, 2048, 1, 3, 4.0)
+        self.assertEqual(stats.bytes_per_second, 512.0)
+        self.assertEqual(stats.files_per_second, 2.5)
+
+    def test_rates_wo_elapsed(self):
+        stats = self._make_one(0, 0, 0, 0, 0.0)
+        self.assertEqual(stats.bytes_per_second, 0.0)
+        self.assertEqual(stats.files_per_second, 0.0)
+
+
+class TestTransferManager(unittest.TestCase):
+
+    @staticmethod
+    def _get_target_class():
+        from google.cloud.storage.transfer import TransferManager
+
+        return TransferManager
+
+    def _make_one(self, *args, **kw):
+        return self._get_target_class()(*args, **kw)
+
+    def test_ctor_defaults(self):
+        manager = self._make_one()
+        self.assertIsNone(manager._client)
+        self.assertIsNone(manager._max_workers)
+        self.assertEqual(manager._num_retries, 3)
+        self.assertEqual(manager._retry_delay, 1.0)
+        self.assertIsNone(manager._progress_callback)
+        self.assertEqual(manager.stats, (0, 0, 0, 0, 0.0))
+
+    def test_upload(self):
+        import os
+        from google.cloud._testing import _tempdir
+
+        client = object()
+        progress = []
+        manager = self._make_one(
+            client=client, max_workers=1,
+            progress_callback=progress.append)
+        blob_1 = _Blob('one')
+        blob_2 = _Blob('two')
+        with _tempdir() as tempdir:
+            path_1 = os.path.join(tempdir, 'one')
+            path_2 = os.path.join(tempdir, 'two')
+            with open(path_1, 'wb') as file_obj:
+                file_obj.write(b'abc')
+            with open(path_2, 'wb') as file_obj:
+                file_obj.write(b'defgh')
+
+            results = manager.upload([(path_1, blob_1), (path_2, blob_2)],
+                                     content_type='text/plain')
+
+        self.assertEqual(results, [
+            (path_1, blob_1, 3, 1, None),
+            (path_2, blob_2, 5, 1, None),
+        ])
+        self.assertEqual(blob_1._calls, [
+            ('upload', path_1, client, {'content_type': 'text/plain'})])
+        self.assertEqual(blob_2._calls, [
+            ('upload', path_2, client, {'content_type': 'text/plain'})])
+        self.assertEqual([stats[:4] for stats in progress],
+                         [(1, 3, 0, 0), (2, 8, 0, 0)])
+        self.assertEqual(manager.stats[:4], (2, 8, 0, 0))
+        self.assertGreater(manager.stats.elapsed, 0.0)
+
+    def test_upload_concurrent(self):
+        import os
+        from google.cloud._testing import _tempdir
+
+        manager = self._make_one(max_workers=4)
+        with _tempdir() as tempdir:
+            pairs = []
+            for index in range(20):
+                path = os.path.join(tempdir, str(index))
+                with open(path, 'wb') as file_obj:
+                    file_obj.write(b'x' * index)
+                pairs.append((path, _Blob(str(index))))
+
+            results = manager.upload(pairs)
+
+        self.assertEqual([result.blob for result in results],
+                         [blob for _, blob in pairs])
+        self.assertEqual([result.bytes for result in results],
+                         list(range(20)))
+        self.assertEqual(manager.stats[:4], (20, 190, 0, 0))
+
+    def test_upload_missing_file(self):
+        import os
+        from google.cloud._testing import _tempdir
+
+        manager = self._make_one(retry_delay=0)
+        blob = _Blob('missing')
+        with _tempdir() as tempdir:
+            path = os.path.join(tempdir, 'missing')
+            results = manager.upload([(path, blob)])
+
+        (result,) = results
+        self.assertIsNone(result.bytes)
+        self.assertEqual(result.attempts, 1)
+        self.assertIsInstance(result.error, OSError)
+        self.assertEqual(blob._calls, [])
+        self.assertEqual(manager.stats[:4], (0, 0, 1, 0))
+
+    def test_upload_retry(self):
+        import os
+        from google.cloud._testing import _Monkey
+        from google.cloud._testing import _tempdir
+        from google.cloud.exceptions import ServerError
+        from google.cloud.storage import transfer as MUT
+
+        sleeps = []
+        manager = self._make_one(retry_delay=2.0)
+        blob = _Blob('flaky', errors=[ServerError('one'), ServerError('two')])
+        with _tempdir() as tempdir:
+            path = os.path.join(tempdir, 'flaky')
+            with open(path, 'wb') as file_obj:
+                file_obj.write(b'abc')
+            with _Monkey(MUT.time, sleep=sleeps.append):
+                with _Monkey(MUT.random, uniform=lambda low, high: high):
+                    results = manager.upload([(path, blob)])
+
+        self.assertEqual(results, [(path, blob, 3, 3, None)])
+        self.assertEqual(sleeps, [2.0, 4.0])
+        self.assertEqual(manager.stats[:4], (1, 3, 0, 2))
+
+    def test_upload_retries_exhausted(self):
+        import os
+        from google.cloud._testing import _tempdir
+        from google.cloud.exceptions import ServiceUnavailable
+
+        errors = [ServiceUnavailable(str(index)) for index in range(3)]
+        manager = self._make_one(num_retries=2, retry_delay=0)
+        blob = _Blob('down', errors=list(errors))
+        with _tempdir() as tempdir:
+            path = os.path.join(tempdir, 'down')
+            with open(path, 'wb') as file_obj:
+                file_obj.write(b'abc')
+            results = manager.upload([(path, blob)])
+
+        self.assertEqual(results, [(path, blob, None, 3, errors[2])])
+        self.assertEqual(manager.stats[:4], (0, 0, 1, 2))
+
+    def test_upload_not_retryable(self):
+        import os
+        from google.cloud._testing import _tempdir
+        from google.cloud.exceptions import Forbidden
+
+        error = Forbidden('nope')
+        manager = self._make_one(retry_delay=0)
+        blob_1 = _Blob('forbidden', errors=[error])
+        blob_2 = _Blob('allowed')
+        with _tempdir() as tempdir:
+            path = os.path.join(tempdir, 'file')
+            with open(path, 'wb') as file_obj:
+                file_obj.write(b'abc')
+            results = manager.upload([(path, blob_1), (path, blob_2)])
+
+        self.assertEqual(results, [
+            (path, blob_1, None, 1, error),
+            (path, blob_2, 3, 1, None),
+        ])
+        self.assertEqual(manager.stats[:4], (1, 3, 1, 0))
+
+    def test_download(self):
+        import os
+        from google.cloud._testing import _tempdir
+
+        client = object()
+        manager = self._make_one(client=client)
+        blob_1 = _Blob('one', payload=b'abc')
+        blob_2 = _Blob('two', payload=b'defgh')
+        with _tempdir() as tempdir:
+            path_1 = os.path.join(tempdir, 'one')
+            path_2 = os.path.join(tempdir, 'nested', 'dir', 'two')
+
+            results = manager.download([(path_1, blob_1), (path_2, blob_2)])
+
+            with open(path_2, 'rb') as file_obj:
+                self.assertEqual(file_obj.read(), b'defgh')
+
+        self.assertEqual(results, [
+            (path_1, blob_1, 3, 1, None),
+            (path_2, blob_2, 5, 1, None),
+        ])
+        self.assertEqual(blob_1._calls, [('download', path_1, client, {})])
+        self.assertEqual(manager.stats[:4], (2, 8, 0, 0))
+
+    def test_download_concurrent_same_directory(self):
+        import os
+        from google.cloud._testing import _tempdir
+
+        manager = self._make_one(max_workers=8)
+        with _tempdir() as tempdir:
+            pairs = [(os.path.join(tempdir, 'sub', str(index)),
+                      _Blob(str(index), payload=b'xy'))
+                     for index in range(20)]
+
+            results = manager.download(pairs)
+
+            self.assertEqual(sorted(os.listdir(os.path.join(tempdir, 'sub'))),
+                             sorted(str(index) for index in range(20)))
+
+        self.assertEqual([result.error for result in results], [None] * 20)
+        self.assertEqual(manager.stats[:4], (20, 40, 0, 0))
+
+    def test_download_directory_is_file(self):
+        import os
+        from google.cloud._testing import _tempdir
+
+        manager = self._make_one(retry_delay=0)
+        blob = _Blob('blob', payload=b'abc')
+        with _tempdir() as tempdir:
+            parent = os.path.join(tempdir, 'file')
+            with open(parent, 'wb'):
+                pass
+            path = os.path.join(parent, 'sub', 'blob')
+
+            (result,) = manager.download([(path, blob)])
+
+        self.assertIsInstance(result.error, OSError)
+        self.assertEqual(result.attempts, 1)
+        self.assertEqual(blob._calls, [])
+
+    def test_w_local_storage(self):
+        import os
+        from google.cloud._testing import _tempdir
+        from google.cloud.storage.client import Client
+        from google.cloud.storage.local import LocalStorageHttp
+
+        with _tempdir() as tempdir:
+            http = LocalStorageHttp(os.path.join(tempdir, 'storage'))
+            client = Client(project='local', http=http)
+            bucket = client.create_bucket('bucket')
+            manager = self._make_one(client=client, max_workers=4)
+            upload_pairs = []
+            for index in range(10):
+                path = os.path.join(tempdir, 'up', str(index))
+                if not os.path.isdir(os.path.dirname(path)):
+                    os.makedirs(os.path.dirname(path))
+                with open(path, 'wb') as file_obj:
+                    file_obj.write(b'payload %d' % (index,))
+                upload_pairs.append((path, bucket.blob(str(index))))
+
+            uploaded = manager.upload(upload_pairs)
+            download_pairs = [
+                (os.path.join(tempdir, 'down', blob.name), blob)
+                for _, blob in upload_pairs]
+            downloaded = manager.download(download_pairs)
+
+            for index, (path, _) in enumerate(download_pairs):
+                with open(path, 'rb') as file_obj:
+                    self.assertEqual(file_obj.read(),
+                                     b'payload %d' % (index,))
+
+        self.assertEqual([result.error for result in uploaded + downloaded],
+                         [None] * 20)
+        self.assertEqual(manager.stats[:4], (20, 180, 0, 0))
+
+
+class Test__is_retryable(unittest.TestCase):
+
+    @staticmethod
+    def _call_fut(exc):
+        from google.cloud.storage.transfer import _is_retryable
+
+        return _is_retryable(exc)
+
+    def test_server_errors(self):
+        from google.cloud.exceptions import InternalServerError
+        from google.cloud.exceptions import TooManyRequests
+
+        self.assertTrue(self._call_fut(InternalServerError('oops')))
+        self.assertTrue(self._call_fut(TooManyRequests('slow down')))
+
+    def test_client_error(self):
+        from google.cloud.exceptions import NotFound
+
+        self.assertFalse(self._call_fut(NotFound('missing')))
+
+    def test_network_errors(self):
+        import socket
+        import httplib2
+        from six.moves import http_client
+
+        self.assertTrue(self._call_fut(socket.timeout()))
+        self.assertTrue(self._call_fut(socket.error('reset')))
+        self.assertTrue(self._call_fut(http_client.BadStatusLine('')))
+        self.assertTrue(self._call_fut(
+            httplib2.ServerNotFoundError('no host')))
+
+    def test_local_file_error(self):
+        import errno
+
+        error = IOError(errno.ENOSPC, 'No space left on device', '/tmp/x')
+        self.assertFalse(self._call_fut(error))
+
+    def test_other_error(self):
+        self.assertFalse(self._call_fut(ValueError('bad')))
+
+    def test_http_error(self):
+        from google.cloud.streaming.exceptions import HttpError
+
+        def _make_error(status):
+            return HttpError({'status': str(status)}, b'', 'http://example')
+
+        self.assertTrue(self._call_fut(_make_error(503)))
+        self.assertTrue(self._call_fut(_make_error(429)))
+        self.assertFalse(self._call_fut(_make_error(404)))
+
+
+class Test__ensure_directory(unittest.TestCase):
+
+    @staticmethod
+    def _call_fut(directory):
+        from google.cloud.storage.transfer import _ensure_directory
+
+        return _ensure_directory(directory)
+
+    def test_created_concurrently(self):
+        import os
+        from google.cloud._testing import _Monkey
+        from google.cloud._testing import _tempdir
+        from google.cloud.storage import transfer as MUT
+
+        def _makedirs(directory):
+            os.mkdir(directory)
+            raise OSError('File exists')
+
+        with _tempdir() as tempdir:
+            directory = os.path.join(tempdir, 'sub')
+            with _Monkey(MUT.os, makedirs=_makedirs):
+                self._call_fut(directory)
+            self.assertTrue(os.path.isdir(directory))
+
+
+class _Blob(object):
+
+    def __init__(self, name, errors=(), payload=b''):
+        self.name = name
+        self._errors = list(errors)
+        self._payload = payload
+        self._calls = []
+
+    def _call(self, kind, path, client, kwargs):
+        self._calls.append((kind, path, client, kwargs))
+        if self._errors:
+            raise self._errors.pop(0)
+
+    def upload_from_filename(self, filename, client=None, **kwargs):
+        self._call('upload', filename, client, kwargs)
+
+    def download_to_filename(self, filename, client=None, **kwargs):
+        self._call('download', filename, client, kwargs)
+        with open(filename, 'wb') as file_obj:
+            file_obj.write(self._payload)